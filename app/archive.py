@@ -0,0 +1,286 @@
+"""
+Arquivo de Eventos Encerrados (banco quente / banco frio)
+
+Os participantes de eventos encerrados podem ser movidos para um segundo
+arquivo SQLite (ARCHIVE_DATABASE_PATH), anexado às conexões com
+`ATTACH DATABASE ... AS arquivo`. O banco principal fica apenas com o evento
+em andamento: menor, mais rápido de consultar e de copiar em backups.
+
+O ParticipanteRepository direciona as leituras pelo evento_id: eventos
+arquivados são lidos de `arquivo.participantes` (modelo
+ParticipanteArquivado), os demais de `participantes`. Downloads e validações
+de certificados de anos anteriores continuam funcionando normalmente.
+
+Uso:
+    python utils/archive_events.py --listar
+    python utils/archive_events.py --arquivar 2024
+"""
+
+import logging
+import threading
+import time
+import weakref
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .models import (
+    ESQUEMA_ARQUIVO,
+    Evento,
+    Participante,
+    ParticipanteArquivado,
+    eventos_arquivados,
+    metadata_arquivo,
+    participantes_arquivo,
+)
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Tempo (em segundos) que a lista de eventos arquivados fica em cache
+ARCHIVE_CACHE_TTL = 60
+
+# Engines com o banco de arquivo anexado
+_engines_com_arquivo: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+# {engine: (expira_em, ids de eventos arquivados)}
+_cache_eventos: "weakref.WeakKeyDictionary[Engine, tuple]" = weakref.WeakKeyDictionary()
+_cache_lock = threading.Lock()
+
+
+def anexar_banco_arquivo(
+    engine: Engine, caminho: Path, criar_tabelas: bool = True
+) -> None:
+    """
+    Anexa o banco de arquivo a todas as conexões da engine.
+
+    Args:
+        engine: Engine síncrona (para engines assíncronas, use engine.sync_engine)
+        caminho: Arquivo SQLite do arquivo (criado se não existir)
+        criar_tabelas: Cria as tabelas do arquivo (requer uma engine síncrona)
+    """
+    if engine in _engines_com_arquivo:
+        return
+
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+
+    def _anexar(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"ATTACH DATABASE ? AS {ESQUEMA_ARQUIVO}", (str(caminho),))
+        finally:
+            cursor.close()
+
+    event.listen(engine, "connect", _anexar)
+
+    if criar_tabelas:
+        with engine.connect() as conn:
+            # Conexões abertas antes do listener (ex.: StaticPool) também precisam do ATTACH
+            anexados = [row[1] for row in conn.exec_driver_sql("PRAGMA database_list")]
+            if ESQUEMA_ARQUIVO not in anexados:
+                conn.exec_driver_sql(
+                    f"ATTACH DATABASE ? AS {ESQUEMA_ARQUIVO}", (str(caminho),)
+                )
+        metadata_arquivo.create_all(bind=engine)
+
+    _engines_com_arquivo.add(engine)
+    logger.info(f"✅ Banco de arquivo anexado: {caminho}")
+
+
+def arquivo_anexado(session: Session) -> bool:
+    """Verifica se a sessão está ligada a uma engine com o banco de arquivo."""
+    return _engine(session) in _engines_com_arquivo
+
+
+def _engine(session: Session) -> Engine:
+    bind = session.get_bind()
+    return bind.engine if hasattr(bind, "engine") else bind
+
+
+def obter_eventos_arquivados(session: Session) -> FrozenSet[int]:
+    """Retorna os IDs dos eventos arquivados (em cache por ARCHIVE_CACHE_TTL)."""
+    if not arquivo_anexado(session):
+        return frozenset()
+
+    engine = _engine(session)
+    agora = time.monotonic()
+    with _cache_lock:
+        em_cache = _cache_eventos.get(engine)
+        if em_cache and em_cache[0] > agora:
+            return em_cache[1]
+
+    ids = frozenset(session.scalars(select(eventos_arquivados.c.evento_id)))
+    with _cache_lock:
+        _cache_eventos[engine] = (agora + ARCHIVE_CACHE_TTL, ids)
+    return ids
+
+
+def invalidar_cache_eventos_arquivados() -> None:
+    """Descarta a lista de eventos arquivados em cache."""
+    with _cache_lock:
+        _cache_eventos.clear()
+
+
+def entidade_participante(session: Session, evento_id: Optional[int]) -> type:
+    """Retorna o modelo que guarda os participantes do evento."""
+    if evento_id is not None and evento_id in obter_eventos_arquivados(session):
+        return ParticipanteArquivado
+    return Participante
+
+
+def entidades_participante(session: Session) -> List[type]:
+    """Retorna os modelos a consultar quando o evento não é conhecido."""
+    if arquivo_anexado(session):
+        return [Participante, ParticipanteArquivado]
+    return [Participante]
+
+
+# ============= OPERAÇÕES DE ARQUIVAMENTO =============
+
+_NOMES_COLUNAS = [coluna.name for coluna in Participante.__table__.columns]
+
+
+def _mover_participantes(session: Session, evento_id: int, origem, destino) -> int:
+    """Copia os participantes do evento de uma tabela para outra e remove da origem."""
+    colunas_origem = [origem.c[nome] for nome in _NOMES_COLUNAS]
+    session.execute(
+        insert(destino).from_select(
+            _NOMES_COLUNAS,
+            select(*colunas_origem).where(origem.c.evento_id == evento_id),
+        )
+    )
+    return session.execute(
+        delete(origem).where(origem.c.evento_id == evento_id)
+    ).rowcount
+
+
+def arquivar_evento(evento_id: int) -> Dict[str, Any]:
+    """
+    Move os participantes de um evento encerrado para o banco de arquivo.
+
+    A cópia, a remoção do banco principal e o registro em eventos_arquivados
+    acontecem na mesma transação.
+
+    Args:
+        evento_id: ID do evento
+
+    Returns:
+        Dicionário com evento_id, ano e participantes movidos
+
+    Raises:
+        ValueError: Se o arquivo não estiver configurado ou o evento não puder ser arquivado
+    """
+    from .db import db_manager
+
+    with db_manager.get_db_session() as session:
+        if not arquivo_anexado(session):
+            raise ValueError(
+                "Banco de arquivo não configurado. Defina ARCHIVE_DATABASE_PATH."
+            )
+
+        evento = session.get(Evento, evento_id)
+        if not evento:
+            raise ValueError(f"Evento {evento_id} não encontrado")
+        if evento_id in obter_eventos_arquivados(session):
+            raise ValueError(f"O evento {evento.ano} já está arquivado")
+
+        ano_atual = session.scalar(select(func.max(Evento.ano)))
+        if evento.ano == ano_atual:
+            raise ValueError(
+                f"O evento {evento.ano} é o evento atual e não pode ser arquivado"
+            )
+
+        # O SQLite reutiliza IDs acima do maior ID restante: os IDs arquivados
+        # precisam ficar abaixo dele para nunca se repetirem no banco principal
+        maior_id_evento = session.scalar(
+            select(func.max(Participante.id)).where(Participante.evento_id == evento_id)
+        )
+        maior_id_restante = session.scalar(
+            select(func.max(Participante.id)).where(Participante.evento_id != evento_id)
+        )
+        if maior_id_evento is not None and (
+            maior_id_restante is None or maior_id_evento > maior_id_restante
+        ):
+            raise ValueError(
+                f"O evento {evento.ano} tem as inscrições mais recentes do banco. "
+                "Arquive-o depois que houver inscrições no evento atual."
+            )
+
+        movidos = _mover_participantes(
+            session, evento_id, Participante.__table__, participantes_arquivo
+        )
+        session.execute(
+            insert(eventos_arquivados).values(
+                evento_id=evento_id,
+                ano=evento.ano,
+                participantes=movidos,
+                arquivado_em=datetime.now().isoformat(),
+            )
+        )
+        ano = evento.ano
+
+    invalidar_cache_eventos_arquivados()
+    logger.info(f"✅ Evento {ano} arquivado: {movidos} participantes movidos")
+    return {"evento_id": evento_id, "ano": ano, "participantes": movidos}
+
+
+def restaurar_evento(evento_id: int) -> Dict[str, Any]:
+    """
+    Devolve os participantes de um evento arquivado ao banco principal.
+
+    Args:
+        evento_id: ID do evento
+
+    Returns:
+        Dicionário com evento_id e participantes restaurados
+
+    Raises:
+        ValueError: Se o evento não estiver arquivado
+    """
+    from .db import db_manager
+
+    with db_manager.get_db_session() as session:
+        if evento_id not in obter_eventos_arquivados(session):
+            raise ValueError(f"Evento {evento_id} não está arquivado")
+
+        movidos = _mover_participantes(
+            session, evento_id, participantes_arquivo, Participante.__table__
+        )
+        session.execute(
+            delete(eventos_arquivados).where(
+                eventos_arquivados.c.evento_id == evento_id
+            )
+        )
+
+    invalidar_cache_eventos_arquivados()
+    logger.info(f"✅ Evento {evento_id} restaurado: {movidos} participantes movidos")
+    return {"evento_id": evento_id, "participantes": movidos}
+
+
+def listar_eventos_arquivados() -> List[Dict[str, Any]]:
+    """Retorna os eventos arquivados, do mais recente para o mais antigo."""
+    from .db import db_manager
+
+    with db_manager.get_db_session() as session:
+        if not arquivo_anexado(session):
+            return []
+        rows = session.execute(
+            select(eventos_arquivados).order_by(eventos_arquivados.c.ano.desc())
+        )
+        return [dict(row._mapping) for row in rows]
+
+
+def compactar_banco_principal() -> None:
+    """Executa VACUUM no banco principal para devolver o espaço liberado ao disco."""
+    from .db import db_manager
+
+    if not db_manager._initialized:
+        db_manager.initialize()
+    with db_manager.engine.connect() as conn:
+        conn.exec_driver_sql("VACUUM main")
+    logger.info("✅ Banco principal compactado")
@@ -0,0 +1,389 @@
+"""
+Camada Assíncrona de Banco de Dados
+
+Contraparte assíncrona (aiosqlite) de app/db.py para caminhos de leitura com
+muitas consultas concorrentes. Usada pela página de validação de certificados
+(ServicoValidacao.verificar_certificado_async) e pela verificação de
+elegibilidade para download (verificar_elegibilidade_downloads).
+
+Os repositórios e as funções de fábrica têm os mesmos nomes e métodos dos
+equivalentes síncronos, de modo que a migração de um chamador consiste em
+trocar o import e adicionar `await`:
+
+    from app.async_db import async_db_manager, get_participante_repository
+
+    async with async_db_manager.get_db_session() as session:
+        repo = get_participante_repository(session)
+        participante = await repo.get_by_email_hash(email_hash, evento_id)
+"""
+
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Iterable, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import joinedload
+from sqlalchemy.pool import NullPool, StaticPool
+
+from .archive import (
+    anexar_banco_arquivo,
+    entidade_participante,
+    entidades_participante,
+)
+from .core import settings
+from .instrumentation import instalar_instrumentacao
+from .models import Cidade, Evento, Funcao, Participante
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+def create_async_database_engine(database_url: str) -> AsyncEngine:
+    """
+    Cria e retorna uma engine assíncrona de banco de dados.
+
+    Bancos SQLite em arquivo usam NullPool: cada sessão abre sua própria conexão
+    aiosqlite, o que permite leituras realmente concorrentes e evita prender
+    conexões a um event loop específico (o Streamlit cria um loop por chamada
+    de asyncio.run). Bancos em memória usam StaticPool para compartilhar a base.
+    """
+    if database_url.startswith("sqlite+aiosqlite://"):
+        em_memoria = database_url in (
+            "sqlite+aiosqlite://",
+            "sqlite+aiosqlite:///:memory:",
+        )
+        return create_async_engine(
+            database_url,
+            poolclass=StaticPool if em_memoria else NullPool,
+            connect_args={"check_same_thread": False, "timeout": 20},
+            echo=False,
+        )
+    return create_async_engine(database_url, echo=False)
+
+
+class AsyncDatabaseManager:
+    """Gerenciador assíncrono do banco de dados (somente leitura de esquema: não cria tabelas)."""
+
+    def __init__(self, database_url: Optional[str] = None):
+        self.database_url = database_url
+        self.engine: Optional[AsyncEngine] = None
+        self.session_factory: Optional[async_sessionmaker] = None
+        self._initialized = False
+
+    def initialize(self) -> None:
+        """Cria a engine e a factory de sessões assíncronas."""
+        if self._initialized:
+            return
+
+        try:
+            self.engine = create_async_database_engine(
+                self.database_url or settings.async_database_url
+            )
+            instalar_instrumentacao(self.engine.sync_engine)
+            # As tabelas do arquivo são criadas pelo gerenciador síncrono
+            if settings.archive_database_path and (
+                self.database_url or settings.async_database_url
+            ).startswith("sqlite"):
+                anexar_banco_arquivo(
+                    self.engine.sync_engine,
+                    settings.archive_database_path,
+                    criar_tabelas=False,
+                )
+            self.session_factory = async_sessionmaker(
+                self.engine, autoflush=False, expire_on_commit=False
+            )
+            self._initialized = True
+        except Exception as e:
+            logger.error(f"❌ Erro ao inicializar banco de dados assíncrono: {e}")
+            raise
+
+    @asynccontextmanager
+    async def get_db_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """Context manager assíncrono com commit/rollback automático."""
+        if not self._initialized:
+            self.initialize()
+
+        session = self.session_factory()
+        try:
+            yield session
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"❌ Erro na transação assíncrona do banco de dados: {e}")
+            raise
+        finally:
+            await session.close()
+
+    async def check_connection(self) -> bool:
+        """Verifica se a conexão assíncrona com o banco de dados está ativa."""
+        try:
+            async with self.get_db_session() as session:
+                await session.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            logger.error(f"❌ Erro na conexão assíncrona com o banco de dados: {e}")
+            return False
+
+    async def dispose(self) -> None:
+        """Fecha as conexões da engine assíncrona."""
+        if self.engine is not None:
+            await self.engine.dispose()
+
+
+# Instância global do gerenciador assíncrono
+async_db_manager = AsyncDatabaseManager()
+
+
+# ============= REPOSITÓRIOS =============
+
+
+class BaseRepository:
+    """Repositório base assíncrono com operações de leitura comuns."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_id(self, model_class: type, id: int) -> Optional[Any]:
+        """Busca um registro pelo ID."""
+        return await self.session.get(model_class, id)
+
+    async def get_all(self, model_class: type) -> list[Any]:
+        """Retorna todos os registros de uma tabela."""
+        return list((await self.session.scalars(select(model_class))).all())
+
+    async def count(self, model_class: type) -> int:
+        """Retorna a quantidade de registros de uma tabela."""
+        return await self.session.scalar(select(func.count()).select_from(model_class))
+
+
+class EventoRepository(BaseRepository):
+    """Repositório assíncrono para operações com Eventos."""
+
+    async def get_by_ano(self, ano: int) -> Optional[Evento]:
+        """Busca um evento pelo ano."""
+        return await self.session.scalar(select(Evento).where(Evento.ano == ano))
+
+    async def get_current_event(self) -> Optional[Evento]:
+        """Retorna o evento mais recente."""
+        return await self.session.scalar(
+            select(Evento).order_by(Evento.ano.desc()).limit(1)
+        )
+
+
+class CidadeRepository(BaseRepository):
+    """Repositório assíncrono para operações com Cidades."""
+
+    async def get_all_ordered(self) -> list[Cidade]:
+        """Retorna todas as cidades ordenadas por estado e nome."""
+        result = await self.session.scalars(
+            select(Cidade).order_by(Cidade.estado, Cidade.nome)
+        )
+        return list(result.all())
+
+
+class FuncaoRepository(BaseRepository):
+    """Repositório assíncrono para operações com Funções."""
+
+    async def get_all_ordered(self) -> list[Funcao]:
+        """Retorna todas as funções ordenadas por nome."""
+        result = await self.session.scalars(select(Funcao).order_by(Funcao.nome_funcao))
+        return list(result.all())
+
+
+class ParticipanteRepository(BaseRepository):
+    """Repositório assíncrono para leituras de Participantes (com o mesmo direcionamento ao arquivo)."""
+
+    async def _entidade(self, evento_id: int) -> type:
+        """Modelo (Participante ou ParticipanteArquivado) que guarda o evento."""
+        return await self.session.run_sync(entidade_participante, evento_id)
+
+    async def get_by_email_hash(
+        self, email_hash: str, evento_id: int
+    ) -> Optional[Participante]:
+        """Busca um participante pelo hash do email e evento."""
+        P = await self._entidade(evento_id)
+        return await self.session.scalar(
+            select(P).where(P.email_hash == email_hash, P.evento_id == evento_id)
+        )
+
+    async def get_by_hash_validacao(
+        self, hash_validacao: str
+    ) -> Optional[Participante]:
+        """Busca o participante dono de um hash de validação (banco principal e arquivo)."""
+        for P in await self.session.run_sync(entidades_participante):
+            participante = await self.session.scalar(
+                select(P)
+                .options(
+                    joinedload(P.evento), joinedload(P.cidade), joinedload(P.funcao)
+                )
+                .where(P.hash_validacao == hash_validacao)
+            )
+            if participante:
+                return participante
+        return None
+
+    async def get_validated_participants(
+        self, evento_id: int, cidade_id: Optional[int] = None
+    ) -> list[Participante]:
+        """Retorna participantes validados de um evento."""
+        P = await self._entidade(evento_id)
+        query = select(P).where(P.evento_id == evento_id, P.validado == True)
+        if cidade_id:
+            query = query.where(P.cidade_id == cidade_id)
+        result = await self.session.scalars(query.order_by(P.data_inscricao.desc()))
+        return list(result.all())
+
+    def _query_listagem(
+        self,
+        P: type,
+        columns: Iterable[Any],
+        evento_id: int,
+        cidade_ids: Optional[Iterable[int]],
+        funcao_id: Optional[int],
+        validado: Optional[bool],
+        email_hash: Optional[str],
+    ):
+        """Monta a query filtrada usada pela listagem paginada e pela contagem."""
+        query = select(*columns).where(P.evento_id == evento_id)
+        if cidade_ids is not None:
+            query = query.where(P.cidade_id.in_(list(cidade_ids)))
+        if funcao_id:
+            query = query.where(P.funcao_id == funcao_id)
+        if validado is not None:
+            query = query.where(P.validado == validado)
+        if email_hash:
+            query = query.where(P.email_hash == email_hash)
+        return query
+
+    async def get_page(
+        self,
+        evento_id: int,
+        cidade_ids: Optional[Iterable[int]] = None,
+        funcao_id: Optional[int] = None,
+        validado: Optional[bool] = None,
+        email_hash: Optional[str] = None,
+        cursor: Optional[Tuple[str, int]] = None,
+        limit: int = 50,
+    ) -> Tuple[list[Row], Optional[Tuple[str, int]]]:
+        """
+        Retorna uma página de participantes usando paginação por cursor (keyset).
+
+        Mesma semântica de ParticipanteRepository.get_page em app/db.py.
+        """
+        from .db import ParticipanteRepository as ParticipanteRepositorySync
+
+        if cidade_ids is not None and not cidade_ids:
+            return [], None
+
+        P = await self._entidade(evento_id)
+        query = self._query_listagem(
+            P,
+            ParticipanteRepositorySync.colunas_listagem(P),
+            evento_id,
+            cidade_ids,
+            funcao_id,
+            validado,
+            email_hash,
+        )
+
+        if cursor:
+            data_cursor, id_cursor = cursor
+            query = query.where(
+                or_(
+                    P.data_inscricao < data_cursor,
+                    and_(P.data_inscricao == data_cursor, P.id < id_cursor),
+                )
+            )
+
+        # Buscar uma linha extra para saber se existe próxima página
+        result = await self.session.execute(
+            query.order_by(P.data_inscricao.desc(), P.id.desc()).limit(limit + 1)
+        )
+        linhas = list(result.all())
+
+        proximo_cursor = None
+        if len(linhas) > limit:
+            linhas = linhas[:limit]
+            ultima = linhas[-1]
+            proximo_cursor = (ultima.data_inscricao, ultima.id)
+
+        return linhas, proximo_cursor
+
+    async def iter_pages(
+        self,
+        evento_id: int,
+        cidade_ids: Optional[Iterable[int]] = None,
+        funcao_id: Optional[int] = None,
+        validado: Optional[bool] = None,
+        limit: int = 500,
+    ) -> AsyncIterator[list[Row]]:
+        """Percorre todas as páginas de get_page, para exportações em massa."""
+        cursor = None
+        while True:
+            linhas, cursor = await self.get_page(
+                evento_id,
+                cidade_ids=cidade_ids,
+                funcao_id=funcao_id,
+                validado=validado,
+                cursor=cursor,
+                limit=limit,
+            )
+            if linhas:
+                yield linhas
+            if cursor is None:
+                return
+
+    async def count_filtered(
+        self,
+        evento_id: int,
+        cidade_ids: Optional[Iterable[int]] = None,
+        funcao_id: Optional[int] = None,
+        validado: Optional[bool] = None,
+        email_hash: Optional[str] = None,
+    ) -> int:
+        """Conta participantes com os mesmos filtros aceitos por get_page."""
+        if cidade_ids is not None and not cidade_ids:
+            return 0
+
+        P = await self._entidade(evento_id)
+        return await self.session.scalar(
+            self._query_listagem(
+                P,
+                (func.count(P.id),),
+                evento_id,
+                cidade_ids,
+                funcao_id,
+                validado,
+                email_hash,
+            )
+        )
+
+
+# ============= FACTORY FUNCTIONS =============
+
+
+def get_evento_repository(session: AsyncSession) -> EventoRepository:
+    """Retorna uma instância do repositório assíncrono de eventos."""
+    return EventoRepository(session)
+
+
+def get_cidade_repository(session: AsyncSession) -> CidadeRepository:
+    """Retorna uma instância do repositório assíncrono de cidades."""
+    return CidadeRepository(session)
+
+
+def get_funcao_repository(session: AsyncSession) -> FuncaoRepository:
+    """Retorna uma instância do repositório assíncrono de funções."""
+    return FuncaoRepository(session)
+
+
+def get_participante_repository(session: AsyncSession) -> ParticipanteRepository:
+    """Retorna uma instância do repositório assíncrono de participantes."""
+    return ParticipanteRepository(session)
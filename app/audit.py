@@ -0,0 +1,252 @@
+"""
+Registro Assíncrono de Auditoria
+
+Os eventos de auditoria são enfileirados em memória e gravados em lote por uma
+thread em segundo plano, quando a fila atinge AUDIT_BATCH_SIZE registros ou a
+cada AUDIT_FLUSH_INTERVAL_SECONDS. Assim as operações administrativas não
+pagam um INSERT (nem o lock de escrita do SQLite) por ação auditada.
+
+Ações críticas podem usar o modo síncrono, que grava o registro antes de
+retornar (opcionalmente dentro da transação do chamador). Os registros
+pendentes são gravados no encerramento do processo (atexit).
+
+Uso:
+    from app.audit import registrador_auditoria
+
+    registrador_auditoria.registrar(coordenador_id, "LOGIN_SUCCESS")
+    registrador_auditoria.registrar(
+        coordenador_id, "CREATE_COORDENADOR", detalhes, sincrono=True, sessao=session
+    )
+"""
+
+import atexit
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from .core import settings
+from .db import db_manager, get_auditoria_repository
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class RegistradorAuditoria:
+    """Fila de eventos de auditoria com gravação em lote em segundo plano."""
+
+    def __init__(
+        self,
+        fabrica_sessoes: Optional[Callable[[], Session]] = None,
+        intervalo: Optional[float] = None,
+        tamanho_lote: Optional[int] = None,
+        max_pendentes: Optional[int] = None,
+        assincrono: Optional[bool] = None,
+    ):
+        """
+        Args:
+            fabrica_sessoes: Factory de sessões para a gravação (padrão: banco configurado)
+            intervalo: Segundos máximos entre gravações (AUDIT_FLUSH_INTERVAL_SECONDS)
+            tamanho_lote: Registros que disparam uma gravação imediata (AUDIT_BATCH_SIZE)
+            max_pendentes: Limite da fila em memória; acima dele os mais antigos são
+                descartados (AUDIT_MAX_PENDING)
+            assincrono: False grava todos os registros de forma síncrona (AUDIT_ASYNC_ENABLED)
+        """
+        self._fabrica_sessoes = fabrica_sessoes
+        self.intervalo = (
+            intervalo if intervalo is not None else settings.audit_flush_interval
+        )
+        self.tamanho_lote = tamanho_lote or settings.audit_batch_size
+        self.max_pendentes = max_pendentes or settings.audit_max_pending
+        self.assincrono = (
+            assincrono if assincrono is not None else settings.audit_async_enabled
+        )
+
+        self._pendentes: deque = deque()
+        self._condicao = threading.Condition()
+        self._lock_gravacao = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._parando = False
+        self.descartados = 0
+
+    @property
+    def pendentes(self) -> int:
+        """Quantidade de registros aguardando gravação."""
+        with self._condicao:
+            return len(self._pendentes)
+
+    def registrar(
+        self,
+        coordenador_id: int,
+        acao: str,
+        detalhes: Optional[str] = None,
+        sincrono: bool = False,
+        sessao: Optional[Session] = None,
+    ) -> None:
+        """
+        Registra um evento de auditoria.
+
+        Args:
+            coordenador_id: ID do coordenador responsável pela ação
+            acao: Código da ação (ex.: LOGIN_SUCCESS)
+            detalhes: Descrição opcional
+            sincrono: Grava antes de retornar (para ações críticas)
+            sessao: No modo síncrono, grava dentro da transação do chamador
+        """
+        self.registrar_lote(
+            [{"coordenador_id": coordenador_id, "acao": acao, "detalhes": detalhes}],
+            sincrono=sincrono,
+            sessao=sessao,
+        )
+
+    def registrar_lote(
+        self,
+        registros: List[Dict],
+        sincrono: bool = False,
+        sessao: Optional[Session] = None,
+    ) -> None:
+        """
+        Registra vários eventos de auditoria de uma vez.
+
+        Args:
+            registros: Dicionários com coordenador_id, acao e detalhes
+            sincrono: Grava antes de retornar (para ações críticas)
+            sessao: No modo síncrono, grava dentro da transação do chamador
+        """
+        if not registros:
+            return
+
+        # O horário do evento é o do registro, não o da gravação
+        timestamp = datetime.now().isoformat()
+        registros = [{"timestamp": timestamp, **registro} for registro in registros]
+
+        if sincrono or not self.assincrono:
+            if sessao is not None:
+                get_auditoria_repository(sessao).create_audit_logs_bulk(registros)
+            else:
+                # Gravar antes os pendentes para preservar a ordem dos eventos
+                self.flush()
+                with self._lock_gravacao:
+                    self._gravar(registros)
+            return
+
+        with self._condicao:
+            self._enfileirar(registros)
+            if len(self._pendentes) >= self.tamanho_lote:
+                self._condicao.notify()
+        self._garantir_thread()
+
+    def flush(self) -> int:
+        """
+        Grava imediatamente todos os registros pendentes.
+
+        Returns:
+            Quantidade de registros gravados
+        """
+        with self._lock_gravacao:
+            with self._condicao:
+                registros = list(self._pendentes)
+                self._pendentes.clear()
+            if not registros:
+                return 0
+
+            gravados = 0
+            try:
+                while gravados < len(registros):
+                    lote = registros[gravados : gravados + self.tamanho_lote]
+                    self._gravar(lote)
+                    gravados += len(lote)
+            except Exception:
+                # Lotes não gravados voltam para o início da fila
+                with self._condicao:
+                    self._enfileirar(registros[gravados:], no_inicio=True)
+                raise
+            return gravados
+
+    def parar(self, timeout: float = 5.0) -> None:
+        """Encerra a thread de gravação e grava os registros pendentes."""
+        with self._condicao:
+            self._parando = True
+            self._condicao.notify()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(
+                f"❌ {self.pendentes} registros de auditoria não gravados no encerramento: {e}"
+            )
+
+    def _gravar(self, registros: List[Dict]) -> None:
+        """Grava um lote de registros em uma transação própria."""
+        if self._fabrica_sessoes is None:
+            self._fabrica_sessoes = db_manager.get_background_session_factory()
+
+        session = self._fabrica_sessoes()
+        try:
+            get_auditoria_repository(session).create_audit_logs_bulk(registros)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _enfileirar(self, registros: List[Dict], no_inicio: bool = False) -> None:
+        """Adiciona registros à fila respeitando o limite (chamar com a condição adquirida)."""
+        if no_inicio:
+            self._pendentes.extendleft(reversed(registros))
+        else:
+            self._pendentes.extend(registros)
+
+        excedente = len(self._pendentes) - self.max_pendentes
+        if excedente > 0:
+            for _ in range(excedente):
+                self._pendentes.popleft()
+            self.descartados += excedente
+            logger.warning(
+                f"⚠️ Fila de auditoria cheia: {excedente} registros mais antigos descartados"
+            )
+
+    def _garantir_thread(self) -> None:
+        """Inicia a thread de gravação na primeira utilização."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._condicao:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._parando = False
+            self._thread = threading.Thread(
+                target=self._executar, name="auditoria-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _executar(self) -> None:
+        """Laço da thread: grava por tamanho de lote ou por intervalo."""
+        while True:
+            with self._condicao:
+                self._condicao.wait_for(
+                    lambda: self._parando or len(self._pendentes) >= self.tamanho_lote,
+                    timeout=self.intervalo,
+                )
+                parando = self._parando
+
+            try:
+                gravados = self.flush()
+                if gravados:
+                    logger.debug(f"{gravados} registros de auditoria gravados")
+            except Exception as e:
+                # Os registros voltam para a fila e são tentados no próximo ciclo
+                logger.error(f"❌ Erro ao gravar registros de auditoria: {e}")
+
+            if parando:
+                return
+
+
+# Instância global do registrador de auditoria
+registrador_auditoria = RegistradorAuditoria()
+atexit.register(registrador_auditoria.parar)
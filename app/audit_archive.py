@@ -0,0 +1,161 @@
+"""
+Retenção e Arquivamento da Auditoria
+
+Registros de auditoria mais antigos que AUDIT_RETENTION_DAYS são movidos da
+tabela `auditoria` para arquivos JSON Lines comprimidos (gzip), particionados
+por dia:
+
+    data/auditoria/2025/05/auditoria-2025-05-19.jsonl.gz
+
+Cada lote é gravado no arquivo antes de ser removido do banco, na mesma
+transação da remoção. Se o processo for interrompido entre as duas etapas, o
+lote é arquivado de novo na próxima execução; a leitura descarta as linhas
+repetidas pelo ID.
+"""
+
+import gzip
+import json
+import logging
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .core import settings
+from .db import db_manager, get_auditoria_repository
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Registros lidos e removidos por transação durante o arquivamento
+AUDIT_ARCHIVE_BATCH_SIZE = 5000
+
+PREFIXO_ARQUIVO = "auditoria-"
+SUFIXO_ARQUIVO = ".jsonl.gz"
+
+
+def caminho_particao(dia: str, diretorio: Optional[Path] = None) -> Path:
+    """Retorna o arquivo de arquivo morto de um dia (AAAA-MM-DD)."""
+    diretorio = Path(diretorio or settings.audit_archive_dir)
+    ano, mes, _ = dia.split("-")
+    return diretorio / ano / mes / f"{PREFIXO_ARQUIVO}{dia}{SUFIXO_ARQUIVO}"
+
+
+def _anexar_particao(caminho: Path, registros: List[Dict[str, Any]]) -> None:
+    """Anexa registros a uma partição e força a gravação em disco."""
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    # Cada anexação cria um novo membro gzip; gzip.open lê todos em sequência
+    with open(caminho, "ab") as arquivo:
+        with gzip.GzipFile(fileobj=arquivo, mode="ab") as gz:
+            for registro in registros:
+                gz.write(
+                    (json.dumps(registro, ensure_ascii=False) + "\n").encode("utf-8")
+                )
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+
+
+def arquivar_auditoria(
+    dias_retencao: Optional[int] = None,
+    diretorio: Optional[Path] = None,
+    tamanho_lote: int = AUDIT_ARCHIVE_BATCH_SIZE,
+    agora: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Move registros de auditoria antigos para arquivos comprimidos por dia.
+
+    Args:
+        dias_retencao: Dias mantidos na tabela (padrão: AUDIT_RETENTION_DAYS)
+        diretorio: Diretório do arquivo morto (padrão: AUDIT_ARCHIVE_DIR)
+        tamanho_lote: Registros processados por transação
+        agora: Referência de data/hora (para testes)
+
+    Returns:
+        Dicionário com arquivados, limite e arquivos (partições alteradas)
+    """
+    if dias_retencao is None:
+        dias_retencao = settings.audit_retention_days
+    limite = ((agora or datetime.now()) - timedelta(days=dias_retencao)).isoformat()
+
+    arquivados = 0
+    arquivos = set()
+
+    while True:
+        with db_manager.get_db_session() as session:
+            repo = get_auditoria_repository(session)
+            linhas = repo.get_older_than(limite, limit=tamanho_lote)
+            if not linhas:
+                break
+
+            por_dia: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+            for linha in linhas:
+                por_dia[linha.timestamp[:10]].append(dict(linha._mapping))
+
+            for dia, registros in por_dia.items():
+                caminho = caminho_particao(dia, diretorio)
+                _anexar_particao(caminho, registros)
+                arquivos.add(caminho)
+
+            repo.delete_by_ids([linha.id for linha in linhas])
+            arquivados += len(linhas)
+
+        if len(linhas) < tamanho_lote:
+            break
+
+    if arquivados:
+        logger.info(
+            f"✅ {arquivados} registros de auditoria anteriores a {limite[:10]} "
+            f"arquivados em {len(arquivos)} arquivo(s)"
+        )
+
+    return {
+        "arquivados": arquivados,
+        "limite": limite,
+        "arquivos": sorted(str(caminho) for caminho in arquivos),
+    }
+
+
+def listar_arquivos_auditoria(diretorio: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Lista as partições arquivadas, da mais recente para a mais antiga."""
+    diretorio = Path(diretorio or settings.audit_archive_dir)
+    if not diretorio.exists():
+        return []
+
+    arquivos = []
+    for caminho in diretorio.glob(f"*/*/{PREFIXO_ARQUIVO}*{SUFIXO_ARQUIVO}"):
+        dia = caminho.name[len(PREFIXO_ARQUIVO) : -len(SUFIXO_ARQUIVO)]
+        arquivos.append(
+            {
+                "data": date.fromisoformat(dia),
+                "caminho": caminho,
+                "tamanho_bytes": caminho.stat().st_size,
+            }
+        )
+    return sorted(arquivos, key=lambda a: a["data"], reverse=True)
+
+
+def ler_auditoria_arquivada(
+    dia: date, diretorio: Optional[Path] = None
+) -> List[Dict[str, Any]]:
+    """
+    Lê os registros arquivados de um dia.
+
+    Args:
+        dia: Data da partição
+        diretorio: Diretório do arquivo morto (padrão: AUDIT_ARCHIVE_DIR)
+
+    Returns:
+        Registros ordenados por (timestamp, id), sem repetições
+    """
+    caminho = caminho_particao(dia.isoformat(), diretorio)
+    if not caminho.exists():
+        return []
+
+    registros = {}
+    with gzip.open(caminho, "rt", encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                registro = json.loads(linha)
+                registros[registro["id"]] = registro
+    return sorted(registros.values(), key=lambda r: (r["timestamp"], r["id"]))
@@ -13,7 +13,8 @@ from typing import Optional, Dict, Any
 
 from .core import settings
 from .models import Coordenador
-from .db import get_coordenador_repository, get_auditoria_repository, db_manager
+from .audit import registrador_auditoria
+from .db import get_coordenador_repository, db_manager
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -204,7 +205,6 @@ class AuthManager:
             try:
                 with db_manager.get_db_session() as session:
                     coord_repo = get_coordenador_repository(session)
-                    auditoria_repo = get_auditoria_repository(session)
 
                     coordenador = coord_repo.get_by_email(username)
 
@@ -239,7 +239,7 @@ class AuthManager:
 
                         # Registrar auditoria
                         if settings.enable_audit_logging:
-                            auditoria_repo.create_audit_log(
+                            registrador_auditoria.registrar(
                                 coordenador_id=coordenador.id,
                                 acao="LOGIN_SUCCESS",
                                 detalhes=f"Login realizado via streamlit-authenticator",
@@ -329,11 +329,10 @@ class AuthManager:
                 try:
                     with db_manager.get_db_session() as session:
                         coord_repo = get_coordenador_repository(session)
-                        auditoria_repo = get_auditoria_repository(session)
 
                         coordenador = coord_repo.get_by_email(user_email)
                         if coordenador and settings.enable_audit_logging:
-                            auditoria_repo.create_audit_log(
+                            registrador_auditoria.registrar(
                                 coordenador_id=coordenador.id,
                                 acao="LOGOUT",
                                 detalhes="Logout realizado",
@@ -515,7 +514,6 @@ def criar_coordenador(
 
         with db_manager.get_db_session() as session:
             coord_repo = get_coordenador_repository(session)
-            auditoria_repo = get_auditoria_repository(session)
 
             # Verificar se email já existe
             existing = coord_repo.get_by_email(email)
@@ -533,10 +531,13 @@ def criar_coordenador(
             # Registrar auditoria
             current_user = get_current_user_info()
             if current_user and settings.enable_audit_logging:
-                auditoria_repo.create_audit_log(
+                # Ação crítica: gravada na mesma transação da criação
+                registrador_auditoria.registrar(
                     coordenador_id=current_user["id"],
                     acao="CREATE_COORDENADOR",
                     detalhes=f"Criado coordenador: {nome} ({email})",
+                    sincrono=True,
+                    sessao=session,
                 )
 
             # Reinicializar authenticator para carregar novo usuário
@@ -0,0 +1,313 @@
+"""
+Backup Online do Banco de Dados
+
+Cópias do banco SQLite feitas com a API de backup online do SQLite
+(sqlite3.Connection.backup), sem parar a aplicação: as páginas são copiadas
+em pequenos passos (BACKUP_PAGES_PER_STEP) com uma pausa entre eles
+(BACKUP_STEP_PAUSE_MS), de modo que as escritas do Streamlit não fiquem
+bloqueadas durante a cópia.
+
+Cada snapshot é comprimido (gzip) em BACKUP_DIR e apenas os BACKUP_KEEP mais
+recentes são mantidos. O banco de arquivo de eventos encerrados
+(ARCHIVE_DATABASE_PATH), se existir, é copiado no mesmo backup:
+
+    data/backups/pint_of_science-20250519-030000.db.gz
+    data/backups/pint_of_science_arquivo-20250519-030000.db.gz
+
+Uso:
+    python utils/backup.py            # backup imediato
+    python utils/backup.py --agendar  # backups a cada BACKUP_INTERVAL_HOURS
+"""
+
+import gzip
+import logging
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .core import settings
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+SUFIXO_BACKUP = ".db.gz"
+FORMATO_DATA_BACKUP = "%Y%m%d-%H%M%S"
+
+
+def _prefixo_backup(banco: Path) -> str:
+    return f"{banco.stem}-"
+
+
+def _copiar_banco(
+    banco: Path,
+    diretorio: Path,
+    criado_em: datetime,
+    paginas_por_passo: int,
+    pausa_ms: float,
+) -> Dict[str, Any]:
+    """Copia um banco com a API de backup online e grava o snapshot comprimido."""
+    nome = f"{_prefixo_backup(banco)}{criado_em.strftime(FORMATO_DATA_BACKUP)}"
+    copia = diretorio / f"{nome}.db.tmp"
+    destino = diretorio / f"{nome}{SUFIXO_BACKUP}"
+    passos = {"paginas": 0}
+
+    def _progresso(status, restantes, total):
+        passos["paginas"] = total
+
+    try:
+        # Conexões próprias: o backup não disputa a conexão da aplicação
+        origem = sqlite3.connect(f"file:{banco}?mode=ro", uri=True, timeout=20)
+        try:
+            alvo = sqlite3.connect(copia)
+            try:
+                origem.backup(
+                    alvo,
+                    pages=paginas_por_passo,
+                    progress=_progresso,
+                    sleep=pausa_ms / 1000,
+                )
+            finally:
+                alvo.close()
+        finally:
+            origem.close()
+
+        # Comprimir em arquivo temporário e renomear: snapshots nunca ficam pela metade
+        comprimido = destino.with_suffix(".gz.tmp")
+        with open(copia, "rb") as entrada, gzip.open(comprimido, "wb") as saida:
+            shutil.copyfileobj(entrada, saida, length=1024 * 1024)
+        comprimido.replace(destino)
+        tamanho_banco = copia.stat().st_size
+    finally:
+        copia.unlink(missing_ok=True)
+
+    return {
+        "arquivo": str(destino),
+        "paginas": passos["paginas"],
+        "tamanho_banco_bytes": tamanho_banco,
+        "tamanho_bytes": destino.stat().st_size,
+    }
+
+
+def criar_backup(
+    banco: Optional[Path] = None,
+    diretorio: Optional[Path] = None,
+    paginas_por_passo: Optional[int] = None,
+    pausa_ms: Optional[float] = None,
+    manter: Optional[int] = None,
+    banco_arquivo: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """
+    Cria um snapshot comprimido do banco com a API de backup online do SQLite.
+
+    O banco de arquivo de eventos encerrados (ARCHIVE_DATABASE_PATH), quando
+    existe, recebe um snapshot com o mesmo horário e é rotacionado junto.
+
+    Args:
+        banco: Arquivo SQLite de origem (padrão: banco configurado em DATABASE_URL)
+        diretorio: Diretório dos snapshots (padrão: BACKUP_DIR)
+        paginas_por_passo: Páginas copiadas por passo (padrão: BACKUP_PAGES_PER_STEP)
+        pausa_ms: Pausa entre passos em milissegundos (padrão: BACKUP_STEP_PAUSE_MS)
+        manter: Snapshots mantidos após a rotação (padrão: BACKUP_KEEP)
+        banco_arquivo: Banco de arquivo (padrão: ARCHIVE_DATABASE_PATH, apenas
+            quando `banco` não é informado)
+
+    Returns:
+        Dicionário com arquivo, criado_em, duracao_s, paginas, tamanho_banco_bytes,
+        tamanho_bytes (comprimido), removidos (snapshots apagados na rotação) e
+        banco_arquivo (mesmos dados para o snapshot do arquivo, ou None)
+
+    Raises:
+        ValueError: Se o banco não for um arquivo SQLite existente
+    """
+    if banco is None and not settings.database_url.startswith("sqlite:///"):
+        raise ValueError(
+            "Backup online disponível apenas para bancos SQLite em arquivo"
+        )
+
+    if banco is None and banco_arquivo is None:
+        banco_arquivo = settings.archive_database_path
+    banco = Path(banco or settings.db_path)
+    diretorio = Path(diretorio or settings.backup_dir)
+    paginas_por_passo = paginas_por_passo or settings.backup_pages_per_step
+    pausa_ms = settings.backup_step_pause_ms if pausa_ms is None else pausa_ms
+
+    if not banco.exists():
+        raise ValueError(f"Banco de dados não encontrado: {banco}")
+    # O arquivo só é criado no primeiro evento arquivado
+    if banco_arquivo is not None and not Path(banco_arquivo).exists():
+        banco_arquivo = None
+
+    diretorio.mkdir(parents=True, exist_ok=True)
+    criado_em = datetime.now()
+
+    inicio = time.perf_counter()
+    resultado = _copiar_banco(banco, diretorio, criado_em, paginas_por_passo, pausa_ms)
+    arquivo = None
+    if banco_arquivo is not None:
+        arquivo = _copiar_banco(
+            Path(banco_arquivo), diretorio, criado_em, paginas_por_passo, pausa_ms
+        )
+    duracao = time.perf_counter() - inicio
+
+    resultado["removidos"] = rotacionar_backups(
+        banco=banco, diretorio=diretorio, manter=manter
+    )
+    if arquivo is not None:
+        arquivo["removidos"] = rotacionar_backups(
+            banco=Path(banco_arquivo), diretorio=diretorio, manter=manter
+        )
+
+    resultado.update(
+        {
+            "criado_em": criado_em.isoformat(timespec="seconds"),
+            "duracao_s": round(duracao, 2),
+            "banco_arquivo": arquivo,
+        }
+    )
+    tamanho_banco = resultado["tamanho_banco_bytes"]
+    logger.info(
+        f"✅ Backup criado em {duracao:.1f}s: {Path(resultado['arquivo']).name} "
+        f"({tamanho_banco / 1024 / 1024:.1f} MB → "
+        f"{resultado['tamanho_bytes'] / 1024 / 1024:.1f} MB)"
+    )
+    if arquivo is not None:
+        logger.info(f"✅ Backup do banco de arquivo: {Path(arquivo['arquivo']).name}")
+    return resultado
+
+
+def listar_backups(
+    banco: Optional[Path] = None, diretorio: Optional[Path] = None
+) -> List[Dict[str, Any]]:
+    """Lista os snapshots do banco, do mais recente para o mais antigo."""
+    banco = Path(banco or settings.db_path)
+    diretorio = Path(diretorio or settings.backup_dir)
+    if not diretorio.exists():
+        return []
+
+    prefixo = _prefixo_backup(banco)
+    backups = []
+    for caminho in diretorio.glob(f"{prefixo}*{SUFIXO_BACKUP}"):
+        try:
+            criado_em = datetime.strptime(
+                caminho.name[len(prefixo) : -len(SUFIXO_BACKUP)], FORMATO_DATA_BACKUP
+            )
+        except ValueError:
+            continue
+        backups.append(
+            {
+                "arquivo": caminho,
+                "criado_em": criado_em,
+                "tamanho_bytes": caminho.stat().st_size,
+            }
+        )
+    return sorted(backups, key=lambda b: b["criado_em"], reverse=True)
+
+
+def obter_ultimo_backup(
+    banco: Optional[Path] = None, diretorio: Optional[Path] = None
+) -> Optional[Dict[str, Any]]:
+    """Retorna o snapshot mais recente do banco (ou None)."""
+    backups = listar_backups(banco, diretorio)
+    return backups[0] if backups else None
+
+
+def rotacionar_backups(
+    banco: Optional[Path] = None,
+    diretorio: Optional[Path] = None,
+    manter: Optional[int] = None,
+) -> int:
+    """
+    Remove os snapshots mais antigos, mantendo os `manter` mais recentes.
+
+    Returns:
+        Quantidade de snapshots removidos
+    """
+    manter = settings.backup_keep if manter is None else manter
+    antigos = listar_backups(banco, diretorio)[max(manter, 1) :]
+    for backup in antigos:
+        backup["arquivo"].unlink(missing_ok=True)
+    if antigos:
+        logger.info(f"🗑️ {len(antigos)} backup(s) antigo(s) removido(s)")
+    return len(antigos)
+
+
+class AgendadorBackup:
+    """Thread em segundo plano que cria um backup a cada intervalo."""
+
+    def __init__(self, intervalo_horas: Optional[float] = None):
+        self.intervalo = timedelta(
+            hours=(
+                settings.backup_interval_hours
+                if intervalo_horas is None
+                else intervalo_horas
+            )
+        )
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def proximo_backup(self) -> datetime:
+        """Horário do próximo backup, contado a partir do último snapshot existente."""
+        ultimo = obter_ultimo_backup()
+        if not ultimo:
+            return datetime.now()
+        return ultimo["criado_em"] + self.intervalo
+
+    def iniciar(self) -> None:
+        """Inicia a thread do agendador (idempotente)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._parar.clear()
+            self._thread = threading.Thread(
+                target=self._executar, name="backup-scheduler", daemon=True
+            )
+            self._thread.start()
+        logger.info(f"✅ Agendador de backup iniciado (a cada {self.intervalo})")
+
+    def parar(self) -> None:
+        """Sinaliza a thread para encerrar."""
+        self._parar.set()
+
+    def _executar(self) -> None:
+        while not self._parar.is_set():
+            espera = (self.proximo_backup() - datetime.now()).total_seconds()
+            if espera > 0:
+                # Acorda ao menos a cada hora para reavaliar (ex.: backup manual)
+                self._parar.wait(min(espera, 3600))
+                continue
+            try:
+                criar_backup()
+            except Exception as e:
+                logger.error(f"❌ Erro no backup agendado: {e}")
+                # Evitar repetir a falha em laço apertado
+                self._parar.wait(min(self.intervalo.total_seconds(), 3600))
+
+
+_agendador: Optional[AgendadorBackup] = None
+_agendador_lock = threading.Lock()
+
+
+def iniciar_agendador_backup() -> Optional[AgendadorBackup]:
+    """
+    Inicia o agendador de backups do processo, se BACKUP_INTERVAL_HOURS > 0.
+
+    Pode ser chamada a cada execução de página: apenas a primeira chamada
+    cria a thread.
+    """
+    global _agendador
+
+    if settings.backup_interval_hours <= 0 or not settings.database_url.startswith(
+        "sqlite:///"
+    ):
+        return None
+
+    with _agendador_lock:
+        if _agendador is None:
+            _agendador = AgendadorBackup()
+            _agendador.iniciar()
+    return _agendador
@@ -0,0 +1,272 @@
+"""
+Servidor local compatível com a API de e-mail da Brevo (POST /v3/smtp/email)
+
+Permite exercitar o ServicoEmail sem a API real: testes de integração,
+medições de vazão e ensaios de resiliência rodam offline apontando
+BREVO_API_URL para o servidor.
+
+O contrato imitado:
+
+- Exige o cabeçalho api-key (401 sem ele)
+- Aceita "to" ou "messageVersions", com htmlContent e/ou textContent
+- Responde 201 com {"messageId"} ou {"messageIds"} (messageVersions)
+- Responde 400 se faltar um campo obrigatório ou se algum destinatário for
+  inválido (sem "@" ou no domínio reservado ".invalid"): a requisição inteira
+  é recusada, como na API real
+
+Parâmetros de simulação:
+
+- latencia_s / variacao_s: atraso de cada resposta (latência ± variação)
+- taxa_erro / status_erro: fração das requisições que falham (padrão: 500)
+- limite_por_segundo / retry_after: acima da cota, 429 com Retry-After
+
+Todas as requisições ficam registradas (ver `requisicoes` e `estatisticas`).
+
+Uso:
+    with ServidorBrevoStub(latencia_s=0.05) as stub:
+        settings.brevo_api_url = stub.url
+        ...
+"""
+
+import json
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+CAMINHO_ENVIO = "/v3/smtp/email"
+CAMINHO_ESTATISTICAS = "/stub/estatisticas"
+
+
+class ServidorBrevoStub:
+    """Servidor HTTP local que imita o envio de e-mails da Brevo."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        porta: int = 0,
+        latencia_s: float = 0.0,
+        variacao_s: float = 0.0,
+        taxa_erro: float = 0.0,
+        status_erro: int = 500,
+        limite_por_segundo: float = 0.0,
+        retry_after: Optional[float] = None,
+        semente: Optional[int] = None,
+    ):
+        """
+        Args:
+            host: Endereço de escuta
+            porta: Porta de escuta (0 escolhe uma porta livre)
+            latencia_s: Atraso médio de cada resposta
+            variacao_s: Variação máxima (±) do atraso
+            taxa_erro: Fração das requisições respondidas com status_erro
+            status_erro: Status das falhas simuladas
+            limite_por_segundo: Cota de requisições por segundo (0 desativa)
+            retry_after: Valor do Retry-After nas respostas 429 (padrão: segundos
+                inteiros até a cota liberar, como a API real)
+            semente: Semente do sorteio de latência e erros (reprodutibilidade)
+        """
+        self.latencia_s = latencia_s
+        self.variacao_s = variacao_s
+        self.taxa_erro = taxa_erro
+        self.status_erro = status_erro
+        self.limite_por_segundo = limite_por_segundo
+        self.retry_after = retry_after
+        self.requisicoes: List[Dict[str, Any]] = []
+        self._aleatorio = random.Random(semente)
+        self._lock = threading.Lock()
+        self._janela: List[float] = []
+        self._thread: Optional[threading.Thread] = None
+        self._servidor = ThreadingHTTPServer((host, porta), self._criar_handler())
+        self._servidor.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """URL do endpoint de envio (valor para BREVO_API_URL)."""
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}{CAMINHO_ENVIO}"
+
+    def iniciar(self) -> "ServidorBrevoStub":
+        """Inicia o servidor em uma thread daemon."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._servidor.serve_forever, name="brevo-stub", daemon=True
+            )
+            self._thread.start()
+            logger.info(f"📧 Stub da Brevo ouvindo em {self.url}")
+        return self
+
+    def parar(self) -> None:
+        """Encerra o servidor."""
+        if self._thread is not None:
+            self._servidor.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._servidor.server_close()
+
+    def __enter__(self) -> "ServidorBrevoStub":
+        return self.iniciar()
+
+    def __exit__(self, *exc_info) -> None:
+        self.parar()
+
+    def limpar(self) -> None:
+        """Descarta as requisições registradas."""
+        with self._lock:
+            self.requisicoes.clear()
+            self._janela.clear()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Resume as requisições registradas por status."""
+        with self._lock:
+            requisicoes = list(self.requisicoes)
+        por_status: Dict[int, int] = {}
+        for requisicao in requisicoes:
+            por_status[requisicao["status"]] = (
+                por_status.get(requisicao["status"], 0) + 1
+            )
+        aceitas = [r for r in requisicoes if r["status"] == 201]
+        duracao = (
+            requisicoes[-1]["recebida_em"] - requisicoes[0]["recebida_em"]
+            if len(requisicoes) > 1
+            else 0.0
+        )
+        return {
+            "requisicoes": len(requisicoes),
+            "por_status": por_status,
+            "mensagens_aceitas": sum(len(r["destinatarios"]) for r in aceitas),
+            "requisicoes_por_segundo": (
+                round(len(requisicoes) / duracao, 1) if duracao else None
+            ),
+        }
+
+    def _responder(
+        self, cabecalhos: Dict[str, str], corpo: Any
+    ) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        """Decide a resposta de um POST de envio: (status, corpo, cabeçalhos)."""
+        if not cabecalhos.get("api-key"):
+            return 401, {"code": "unauthorized", "message": "Key not found"}, {}
+
+        agora = time.monotonic()
+        with self._lock:
+            if self.limite_por_segundo > 0:
+                self._janela = [t for t in self._janela if agora - t < 1.0]
+                if len(self._janela) >= self.limite_por_segundo:
+                    espera = self.retry_after
+                    if espera is None:
+                        espera = math.ceil(1.0 - (agora - self._janela[0]))
+                    return (
+                        429,
+                        {"code": "too_many_requests", "message": "Rate limit"},
+                        {"Retry-After": f"{espera:g}"},
+                    )
+                self._janela.append(agora)
+            falhar = self._aleatorio.random() < self.taxa_erro
+
+        if falhar:
+            return self.status_erro, {"code": "internal_error"}, {}
+
+        destinatarios = _destinatarios(corpo)
+        erro = _validar(corpo, destinatarios)
+        if erro:
+            return 400, {"code": "invalid_parameter", "message": erro}, {}
+
+        ids = [f"<{uuid.uuid4().hex}@brevo.stub>" for _ in destinatarios]
+        if isinstance(corpo, dict) and "messageVersions" in corpo:
+            return 201, {"messageIds": ids}, {}
+        return 201, {"messageId": ids[0]}, {}
+
+    def _atraso(self) -> float:
+        with self._lock:
+            variacao = self._aleatorio.uniform(-self.variacao_s, self.variacao_s)
+        return max(0.0, self.latencia_s + variacao)
+
+    def _criar_handler(self) -> type:
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                if self.path != CAMINHO_ENVIO:
+                    self._enviar(404, {"code": "not_found"})
+                    return
+                bruto = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                try:
+                    corpo = json.loads(bruto or b"null")
+                except ValueError:
+                    corpo = None
+                cabecalhos = {k.lower(): v for k, v in self.headers.items()}
+
+                time.sleep(stub._atraso())
+                status, resposta, extras = stub._responder(cabecalhos, corpo)
+                with stub._lock:
+                    stub.requisicoes.append(
+                        {
+                            "recebida_em": time.monotonic(),
+                            "status": status,
+                            "corpo": corpo,
+                            "destinatarios": _destinatarios(corpo),
+                        }
+                    )
+                self._enviar(status, resposta, extras)
+
+            def do_GET(self):
+                if self.path == CAMINHO_ESTATISTICAS:
+                    self._enviar(200, stub.estatisticas())
+                else:
+                    self._enviar(404, {"code": "not_found"})
+
+            def _enviar(self, status, resposta, extras=None):
+                dados = json.dumps(resposta).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(dados)))
+                for nome, valor in (extras or {}).items():
+                    self.send_header(nome, valor)
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def log_message(self, *args):
+                pass
+
+        return _Handler
+
+
+def _destinatarios(corpo: Any) -> List[str]:
+    """E-mails dos destinatários de um corpo de requisição."""
+    if not isinstance(corpo, dict):
+        return []
+    versoes = corpo.get("messageVersions") or [corpo]
+    return [
+        destino.get("email", "")
+        for versao in versoes
+        if isinstance(versao, dict)
+        for destino in versao.get("to") or []
+        if isinstance(destino, dict)
+    ]
+
+
+def _validar(corpo: Any, destinatarios: List[str]) -> Optional[str]:
+    """Retorna a mensagem de erro da API para um corpo inválido (ou None)."""
+    if not isinstance(corpo, dict):
+        return "Invalid JSON body"
+    if not (corpo.get("sender") or {}).get("email"):
+        return "sender is missing"
+    if not corpo.get("subject"):
+        return "subject is missing"
+    if not (corpo.get("htmlContent") or corpo.get("textContent")):
+        return "htmlContent or textContent is missing"
+    if not destinatarios:
+        return "to is missing"
+    for email in destinatarios:
+        if "@" not in email or email.lower().endswith(".invalid"):
+            return f"email is not valid: {email}"
+    return None
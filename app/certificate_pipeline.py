@@ -0,0 +1,372 @@
+"""
+Pipeline de certificados anexados ao e-mail de liberação
+
+Com EMAIL_ATTACH_CERTIFICATES=true, o e-mail de certificado liberado leva o
+PDF anexado: o participante não precisa voltar ao site para gerá-lo, e a
+página de download deixa de receber o pico de acessos logo após a validação.
+
+O pipeline sobrepõe as duas etapas:
+
+- Geração: os PDFs são gerados em processos separados
+  (CERTIFICATE_RENDER_WORKERS), fora do GIL da aplicação
+- Envio: cada PDF pronto é enviado pelo despachante concorrente
+  (DespachanteEmail), enquanto os próximos ainda estão sendo gerados
+
+Os processos de geração formam um pool único por processo da aplicação, criado
+no primeiro lote e reaproveitado pelos seguintes (iniciar processos spawn
+reimporta a aplicação a cada vez); o pool é encerrado na saída (atexit).
+
+No máximo CERTIFICATE_PIPELINE_QUEUE_SIZE certificados ficam em andamento
+(gerando ou aguardando envio), o que limita a memória ocupada pelos PDFs. O
+progresso da execução atual fica disponível em `obter_progresso`.
+
+Se a geração de um certificado falhar, o e-mail é enviado sem anexo (apenas
+com o link de download).
+"""
+
+import atexit
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .core import settings
+from .db import db_manager, get_participante_repository
+from .email_dispatch import EMAIL_PROGRESS_LOG_EVERY, ResultadoDespacho
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Item da fila entre geração e envio: (destinatário, PDF em geração)
+ItemPipeline = Tuple[Dict[str, Any], Optional[Future]]
+
+_FIM = object()
+
+_progresso: Dict[str, Any] = {}
+_progresso_lock = threading.Lock()
+
+# Pool de processos de geração compartilhado pelos lotes (ver obter_pool_processos)
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_processos = 0
+_pool_lock = threading.Lock()
+
+
+def obter_pool_processos(processos: int) -> ProcessPoolExecutor:
+    """
+    Retorna o pool de processos de geração, criando-o no primeiro uso.
+
+    O pool é recriado se o número de processos mudar ou se um processo filho
+    tiver morrido (BrokenProcessPool).
+    """
+    global _pool, _pool_processos
+
+    with _pool_lock:
+        if _pool is None or _pool_processos != processos:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # spawn: a aplicação tem threads em execução, e fork() copiaria locks
+            # em estado inconsistente para os processos filhos
+            _pool = ProcessPoolExecutor(
+                max_workers=processos,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _pool_processos = processos
+            logger.info(f"✅ Pool de geração de certificados iniciado ({processos})")
+        return _pool
+
+
+def _descartar_pool(pool: Executor) -> None:
+    """Descarta um pool quebrado para que o próximo lote crie outro."""
+    global _pool
+
+    with _pool_lock:
+        if _pool is not pool:
+            return
+        _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+    logger.warning("⚠️ Pool de geração de certificados quebrado; será recriado")
+
+
+def encerrar_pool_processos() -> None:
+    """Encerra o pool de processos de geração (usado na saída do processo)."""
+    global _pool
+
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(encerrar_pool_processos)
+
+
+def renderizar_certificado(dados: Dict[str, Any]) -> bytes:
+    """
+    Gera o PDF a partir de dados simples (executado nos processos de geração).
+
+    Args:
+        dados: Campos de participante, evento, cidade e função, o nome já
+            descriptografado e o nome do coordenador geral
+
+    Returns:
+        Bytes do PDF
+    """
+    from .models import Cidade, Evento, Funcao, Participante
+    from .services import gerador_certificado
+
+    return gerador_certificado.gerar_certificado_pdf(
+        Participante(**dados["participante"]),
+        Evento(**dados["evento"]),
+        Cidade(**dados["cidade"]),
+        Funcao(**dados["funcao"]),
+        nome_completo=dados["nome_completo"],
+        nome_coordenador=dados["nome_coordenador"],
+    )
+
+
+def carregar_dados_renderizacao(
+    session: Session, destinatarios: List[Dict[str, Any]]
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Busca em uma query os dados de geração dos certificados dos destinatários.
+
+    O hash de validação é gerado (e gravado na sessão) para quem ainda não tem,
+    como no primeiro download.
+
+    Args:
+        session: Sessão do banco
+        destinatarios: Payloads com 'participante_id', 'nome' e 'email'
+
+    Returns:
+        Dicionário {participante_id: dados para renderizar_certificado}
+    """
+    from .services import servico_criptografia
+
+    por_id = {
+        dest["participante_id"]: dest
+        for dest in destinatarios
+        if dest.get("participante_id")
+    }
+    dados: Dict[int, Dict[str, Any]] = {}
+    rows = get_participante_repository(session).get_dados_certificados(por_id)
+    for participante, evento, cidade, funcao, nome_coordenador in rows:
+        dest = por_id[participante.id]
+        if not participante.validado:
+            continue
+        if not participante.hash_validacao:
+            participante.hash_validacao = (
+                servico_criptografia.gerar_hash_validacao_certificado(
+                    participante.id, evento.id, dest["email"], dest["nome"]
+                )
+            )
+        dados[participante.id] = {
+            "participante": {
+                "id": participante.id,
+                "evento_id": participante.evento_id,
+                "funcao_id": participante.funcao_id,
+                "datas_participacao": participante.datas_participacao,
+                "titulo_apresentacao": participante.titulo_apresentacao,
+                "hash_validacao": participante.hash_validacao,
+            },
+            "evento": {
+                "id": evento.id,
+                "ano": evento.ano,
+                "datas_evento": evento.datas_evento,
+            },
+            "cidade": {"id": cidade.id, "nome": cidade.nome, "estado": cidade.estado},
+            "funcao": {"id": funcao.id, "nome_funcao": funcao.nome_funcao},
+            "nome_completo": dest["nome"],
+            "nome_coordenador": (
+                nome_coordenador.upper() if nome_coordenador else "COORDENADOR GERAL"
+            ),
+        }
+    session.flush()
+    return dados
+
+
+def obter_progresso() -> Dict[str, Any]:
+    """Retorna o progresso da execução atual (ou da última) do pipeline."""
+    with _progresso_lock:
+        return dict(_progresso)
+
+
+def _atualizar_progresso(**valores: Any) -> None:
+    with _progresso_lock:
+        _progresso.update(valores)
+
+
+class PipelineCertificados:
+    """Gera certificados em processos paralelos e os envia anexados ao e-mail."""
+
+    def __init__(
+        self,
+        fabrica_sessoes: Optional[Callable[[], Session]] = None,
+        processos: Optional[int] = None,
+        tamanho_fila: Optional[int] = None,
+        renderizar: Callable[[Dict[str, Any]], bytes] = renderizar_certificado,
+    ):
+        """
+        Args:
+            fabrica_sessoes: Fábrica de sessões (padrão: sessões de segundo plano)
+            processos: Processos de geração (padrão: CERTIFICATE_RENDER_WORKERS;
+                0 gera na própria thread)
+            tamanho_fila: Certificados em andamento (padrão:
+                CERTIFICATE_PIPELINE_QUEUE_SIZE)
+            renderizar: Função de geração do PDF (precisa ser serializável)
+        """
+        self._fabrica_sessoes = fabrica_sessoes
+        self.processos = (
+            settings.certificate_render_workers if processos is None else processos
+        )
+        self.tamanho_fila = max(
+            1, tamanho_fila or settings.certificate_pipeline_queue_size
+        )
+        self.renderizar = renderizar
+
+    def _criar_executor(self):
+        """Context manager com o executor do lote (o pool de processos não é fechado)."""
+        if self.processos <= 0:
+            return ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="certificate-render"
+            )
+        return nullcontext(obter_pool_processos(self.processos))
+
+    def executar(
+        self,
+        destinatarios: List[Dict[str, Any]],
+        enviar: Callable[[Dict[str, Any], Optional[bytes]], bool],
+        despachar: Callable[..., ResultadoDespacho],
+        identificar: Optional[Callable[[Dict[str, Any]], str]] = None,
+    ) -> ResultadoDespacho:
+        """
+        Gera e envia os certificados dos destinatários.
+
+        Args:
+            destinatarios: Payloads com 'participante_id', 'nome', 'email' e
+                'link_download'
+            enviar: Envia o e-mail de um destinatário com o PDF (ou None, sem anexo)
+            despachar: DespachanteEmail.despachar (envio concorrente)
+            identificar: Identifica o destinatário nas falhas (padrão: e-mail)
+
+        Returns:
+            ResultadoDespacho com sucessos, falhas e os destinatários que falharam
+        """
+        identificar = identificar or (lambda dest: dest.get("email", ""))
+        inicio = time.perf_counter()
+        fabrica = self._fabrica_sessoes or db_manager.get_background_session_factory()
+        with fabrica() as session:
+            dados = carregar_dados_renderizacao(session, destinatarios)
+            session.commit()
+
+        total = len(destinatarios)
+        _atualizar_progresso(
+            total=total,
+            gerados=0,
+            enviados=0,
+            falhas_geracao=0,
+            em_andamento=0,
+            concluido=False,
+            iniciado_em=time.time(),
+        )
+        logger.info(
+            f"📧 Gerando {len(dados)} certificados em {max(self.processos, 1)} "
+            f"processo(s) para anexar a {total} e-mails"
+        )
+
+        # Um certificado só sai da fila (e libera a vaga) depois de enviado
+        vagas = threading.BoundedSemaphore(self.tamanho_fila)
+        prontos: "queue.Queue[Any]" = queue.Queue(maxsize=self.tamanho_fila + 1)
+        enfileirados = {"quantidade": 0}
+
+        def _gerado(futuro: Future, executor: Executor) -> None:
+            erro = futuro.exception()
+            with _progresso_lock:
+                if erro is None:
+                    _progresso["gerados"] += 1
+                else:
+                    _progresso["falhas_geracao"] += 1
+            if isinstance(erro, BrokenProcessPool):
+                _descartar_pool(executor)
+
+        def _produzir(executor: Executor) -> None:
+            try:
+                for dest in destinatarios:
+                    vagas.acquire()
+                    dados_dest = dados.get(dest.get("participante_id"))
+                    futuro = None
+                    if dados_dest is not None:
+                        futuro = executor.submit(self.renderizar, dados_dest)
+                        futuro.add_done_callback(lambda f: _gerado(f, executor))
+                    with _progresso_lock:
+                        _progresso["em_andamento"] += 1
+                    prontos.put((dest, futuro))
+                    enfileirados["quantidade"] += 1
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    _descartar_pool(executor)
+                logger.error(f"❌ Erro no pipeline de certificados: {e}")
+            finally:
+                prontos.put(_FIM)
+
+        def _itens() -> Iterator[ItemPipeline]:
+            while True:
+                item = prontos.get()
+                if item is _FIM:
+                    return
+                yield item
+
+        def _enviar(item: ItemPipeline) -> bool:
+            dest, futuro = item
+            try:
+                pdf = None
+                if futuro is not None:
+                    try:
+                        pdf = futuro.result()
+                    except Exception as e:
+                        logger.warning(
+                            f"⚠️ Certificado de {dest['email']} não gerado, "
+                            f"enviando apenas o link: {e}"
+                        )
+                return enviar(dest, pdf)
+            finally:
+                vagas.release()
+                with _progresso_lock:
+                    _progresso["em_andamento"] -= 1
+                    _progresso["enviados"] += 1
+                    enviados = _progresso["enviados"]
+                if enviados % EMAIL_PROGRESS_LOG_EVERY == 0:
+                    logger.info(f"📧 {enviados}/{total} certificados enviados")
+
+        with self._criar_executor() as executor:
+            produtor = threading.Thread(
+                target=_produzir,
+                args=(executor,),
+                name="certificate-pipeline",
+                daemon=True,
+            )
+            produtor.start()
+            resultado = despachar(
+                _itens(), _enviar, identificar=lambda item: identificar(item[0])
+            )
+            produtor.join()
+
+        # Destinatários que não chegaram a entrar no pipeline contam como falha
+        falhados = resultado.falhados + [
+            identificar(dest) for dest in destinatarios[enfileirados["quantidade"] :]
+        ]
+        sucessos = resultado.sucessos
+
+        duracao = time.perf_counter() - inicio
+        _atualizar_progresso(concluido=True, duracao_s=duracao)
+        logger.info(
+            f"🎉 {sucessos}/{total} certificados enviados por e-mail em {duracao:.1f}s"
+        )
+        return ResultadoDespacho(sucessos, len(falhados), falhados, duracao)
@@ -24,6 +24,25 @@ class Settings:
             "DATABASE_URL", "sqlite:///./pint_of_science.db"
         )
 
+        # Banco de arquivo para eventos encerrados (opcional, apenas SQLite)
+        archive_path = os.getenv("ARCHIVE_DATABASE_PATH")
+        self.archive_database_path: Optional[Path] = (
+            Path(archive_path) if archive_path else None
+        )
+
+        # Configurações de Backup (API de backup online do SQLite)
+        self.backup_dir: Path = Path(
+            os.getenv(
+                "BACKUP_DIR", str(Path(__file__).parent.parent / "data" / "backups")
+            )
+        )
+        self.backup_keep: int = int(os.getenv("BACKUP_KEEP", "7"))
+        self.backup_interval_hours: float = float(
+            os.getenv("BACKUP_INTERVAL_HOURS", "24")
+        )
+        self.backup_pages_per_step: int = int(os.getenv("BACKUP_PAGES_PER_STEP", "256"))
+        self.backup_step_pause_ms: float = float(os.getenv("BACKUP_STEP_PAUSE_MS", "5"))
+
         # Configurações de Criptografia
         self.encryption_key: Optional[str] = os.getenv("ENCRYPTION_KEY")
         self.certificate_secret_key: Optional[str] = os.getenv("CERTIFICATE_SECRET_KEY")
@@ -34,6 +53,90 @@ class Settings:
         self.brevo_sender_name: str = os.getenv(
             "BREVO_SENDER_NAME", "Pint of Science Brasil"
         )
+        # Endpoint de envio; aponte para o stub local (utils/brevo_stub.py) em testes
+        self.brevo_api_url: str = os.getenv(
+            "BREVO_API_URL", "https://api.brevo.com/v3/smtp/email"
+        )
+        # Requisições simultâneas à API de e-mail nos envios em lote
+        self.email_max_concurrency: int = int(os.getenv("EMAIL_MAX_CONCURRENCY", "8"))
+        # Destinatários por requisição (messageVersions); 1 envia um e-mail por requisição
+        self.email_batch_max_recipients: int = int(
+            os.getenv("EMAIL_BATCH_MAX_RECIPIENTS", "1000")
+        )
+        # Modelos de e-mail (templates/emails[/<ano>]) e formato do conteúdo:
+        # "html", "texto" (payload menor) ou "ambos" (HTML com alternativa em texto)
+        self.email_templates_dir: Path = Path(
+            os.getenv(
+                "EMAIL_TEMPLATES_DIR",
+                str(Path(__file__).parent.parent / "templates" / "emails"),
+            )
+        )
+        self.email_content_format: str = os.getenv(
+            "EMAIL_CONTENT_FORMAT", "html"
+        ).lower()
+        # Anexar o certificado em PDF ao e-mail de liberação, gerado em processos
+        # paralelos (0 processos gera na própria thread) com no máximo
+        # CERTIFICATE_PIPELINE_QUEUE_SIZE PDFs em memória
+        self.email_attach_certificates: bool = (
+            os.getenv("EMAIL_ATTACH_CERTIFICATES", "false").lower() == "true"
+        )
+        self.certificate_render_workers: int = int(
+            os.getenv(
+                "CERTIFICATE_RENDER_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))
+            )
+        )
+        self.certificate_pipeline_queue_size: int = int(
+            os.getenv("CERTIFICATE_PIPELINE_QUEUE_SIZE", "32")
+        )
+        # Cota de envio da conta: requisições por segundo (0 desativa) e rajada máxima
+        self.email_rate_limit_per_second: float = float(
+            os.getenv("EMAIL_RATE_LIMIT_PER_SECOND", "10")
+        )
+        self.email_rate_limit_burst: int = int(
+            os.getenv("EMAIL_RATE_LIMIT_BURST", "10")
+        )
+        # Timeouts das requisições à API de e-mail
+        self.email_connect_timeout_seconds: float = float(
+            os.getenv("EMAIL_CONNECT_TIMEOUT_SECONDS", "5")
+        )
+        self.email_read_timeout_seconds: float = float(
+            os.getenv("EMAIL_READ_TIMEOUT_SECONDS", "30")
+        )
+        # Circuit breaker: falhas seguidas que suspendem os envios e por quanto tempo
+        self.email_circuit_failure_threshold: int = int(
+            os.getenv("EMAIL_CIRCUIT_FAILURE_THRESHOLD", "5")
+        )
+        self.email_circuit_reset_seconds: float = float(
+            os.getenv("EMAIL_CIRCUIT_RESET_SECONDS", "60")
+        )
+
+        # Fila persistente de e-mails (outbox) e processador em segundo plano
+        self.email_outbox_poll_seconds: float = float(
+            os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "5")
+        )
+        self.email_outbox_batch_size: int = int(
+            os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "500")
+        )
+        self.email_outbox_max_attempts: int = int(
+            os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "5")
+        )
+        self.email_outbox_backoff_seconds: float = float(
+            os.getenv("EMAIL_OUTBOX_BACKOFF_SECONDS", "60")
+        )
+        self.email_outbox_backoff_max_seconds: float = float(
+            os.getenv("EMAIL_OUTBOX_BACKOFF_MAX_SECONDS", "3600")
+        )
+        self.email_outbox_retention_days: int = int(
+            os.getenv("EMAIL_OUTBOX_RETENTION_DAYS", "30")
+        )
+
+        # Métricas de envio: duração de cada intervalo e por quantos dias guardar
+        self.email_metrics_interval_seconds: float = float(
+            os.getenv("EMAIL_METRICS_INTERVAL_SECONDS", "60")
+        )
+        self.email_metrics_retention_days: int = int(
+            os.getenv("EMAIL_METRICS_RETENTION_DAYS", "14")
+        )
 
         # Configurações do Streamlit
         self.streamlit_server_port: int = int(
@@ -53,6 +156,30 @@ class Settings:
         self.enable_audit_logging: bool = (
             os.getenv("ENABLE_AUDIT_LOGGING", "false").lower() == "true"
         )
+        self.audit_async_enabled: bool = (
+            os.getenv("AUDIT_ASYNC_ENABLED", "true").lower() == "true"
+        )
+        self.audit_flush_interval: float = float(
+            os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "2")
+        )
+        self.audit_batch_size: int = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+        self.audit_max_pending: int = int(os.getenv("AUDIT_MAX_PENDING", "10000"))
+        self.audit_retention_days: int = int(os.getenv("AUDIT_RETENTION_DAYS", "365"))
+        self.audit_archive_dir: Path = Path(
+            os.getenv(
+                "AUDIT_ARCHIVE_DIR",
+                str(Path(__file__).parent.parent / "data" / "auditoria"),
+            )
+        )
+
+        # Configurações de Instrumentação de Consultas SQL
+        self.sql_instrumentation_enabled: bool = (
+            os.getenv("SQL_INSTRUMENTATION_ENABLED", "false").lower() == "true"
+        )
+        self.sql_slow_query_ms: float = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+        self.sql_n_plus_one_threshold: int = int(
+            os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5")
+        )
 
         # Configurações do Superadmin Inicial (opcional)
         self.initial_superadmin_email: Optional[str] = os.getenv(
@@ -107,6 +234,13 @@ class Settings:
             return Path(self.database_url.replace("sqlite:///", ""))
         return Path("pint_of_science.db")
 
+    @property
+    def async_database_url(self) -> str:
+        """Retorna a URL do banco para o driver assíncrono (sqlite+aiosqlite)."""
+        if self.database_url.startswith("sqlite://"):
+            return self.database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+        return self.database_url
+
 
 # Instância global de configurações
 settings = Settings()
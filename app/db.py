@@ -6,14 +6,24 @@ incluindo conexão, inicialização, migrações e repositórios de dados.
 """
 
 import logging
+import threading
+import time
 from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import List, Optional, Generator, Any
-from sqlalchemy import create_engine
+from typing import List, Optional, Generator, Any, Iterable, Tuple
+from sqlalchemy import and_, create_engine, exists, func, insert, or_, select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from .archive import (
+    anexar_banco_arquivo,
+    entidade_participante,
+    entidades_participante,
+)
 from .core import settings
+from .instrumentation import instalar_instrumentacao
 from .models import (
     Base,
     get_all_table_models,
@@ -26,6 +36,9 @@ from .models import (
     Participante,
     Auditoria,
     CoordenadorCidadeLink,
+    EmailOutbox,
+    NotificacaoEnfileirada,
+    EmailMetrica,
 )
 
 # Configurar logging
@@ -40,6 +53,8 @@ class DatabaseManager:
         self.engine = None
         self.session_factory = None
         self._initialized = False
+        self._background_session_factory = None
+        self._lock = threading.Lock()
 
     def initialize(self) -> None:
         """Inicializa o banco de dados e cria as tabelas."""
@@ -49,6 +64,13 @@ class DatabaseManager:
         try:
             # Criar engine
             self.engine = create_database_engine(settings.database_url)
+            instalar_instrumentacao(self.engine)
+
+            # Anexar o banco de arquivo de eventos encerrados, se configurado
+            if settings.archive_database_path and settings.database_url.startswith(
+                "sqlite"
+            ):
+                anexar_banco_arquivo(self.engine, settings.archive_database_path)
 
             # Criar tabelas
             Base.metadata.create_all(bind=self.engine)
@@ -62,6 +84,35 @@ class DatabaseManager:
             logger.error(f"❌ Erro ao inicializar banco de dados: {e}")
             raise
 
+    def get_background_session_factory(self) -> sessionmaker:
+        """
+        Retorna a factory de sessões para threads em segundo plano (auditoria, e-mails).
+
+        Bancos SQLite em arquivo ganham uma engine própria: a engine principal usa
+        StaticPool (uma única conexão), e um commit de uma thread em segundo plano
+        nessa conexão confirmaria também a transação em andamento de outra thread.
+        """
+        if not self._initialized:
+            self.initialize()
+
+        url = settings.database_url
+        if not url.startswith("sqlite:///") or ":memory:" in url:
+            return self.session_factory
+
+        with self._lock:
+            if self._background_session_factory is None:
+                engine = create_engine(
+                    url, connect_args={"check_same_thread": False, "timeout": 20}
+                )
+                if settings.archive_database_path:
+                    # Sem o ATTACH, participantes de eventos arquivados não seriam
+                    # encontrados (ex.: anexos do pipeline de certificados)
+                    anexar_banco_arquivo(
+                        engine, settings.archive_database_path, criar_tabelas=False
+                    )
+                self._background_session_factory = get_session_factory(engine)
+        return self._background_session_factory
+
     def get_session(self) -> Session:
         """Retorna uma sessão do banco de dados."""
         if not self._initialized:
@@ -113,6 +164,13 @@ class DatabaseManager:
             "tables": [model.__tablename__ for model in get_all_table_models()],
         }
 
+        from .backup import obter_ultimo_backup
+
+        ultimo_backup = obter_ultimo_backup()
+        info["last_backup"] = (
+            ultimo_backup["criado_em"].isoformat() if ultimo_backup else None
+        )
+
         return info
 
 
@@ -120,6 +178,18 @@ class DatabaseManager:
 db_manager = DatabaseManager()
 
 
+# Tamanho máximo de lote para cláusulas IN (abaixo do limite de variáveis do SQLite)
+IN_CLAUSE_BATCH_SIZE = 500
+
+
+def _em_lotes(
+    valores: list, tamanho: int = IN_CLAUSE_BATCH_SIZE
+) -> Generator[list, None, None]:
+    """Divide uma lista em lotes de tamanho limitado para uso em cláusulas IN."""
+    for i in range(0, len(valores), tamanho):
+        yield valores[i : i + tamanho]
+
+
 # ============= REPOSITÓRIOS =============
 
 
@@ -143,6 +213,10 @@ class BaseRepository:
         """Retorna todas as instâncias de um modelo."""
         return self.session.query(model_class).all()
 
+    def count(self, model_class: type) -> int:
+        """Conta as instâncias de um modelo sem carregá-las (SELECT COUNT)."""
+        return self.session.query(func.count()).select_from(model_class).scalar()
+
     def update(self, model_instance: Any) -> Any:
         """Atualiza uma instância no banco de dados."""
         self.session.merge(model_instance)
@@ -300,21 +374,104 @@ class CoordenadorRepository(BaseRepository):
 
 
 class ParticipanteRepository(BaseRepository):
-    """Repositório para operações com Participantes."""
+    """
+    Repositório para operações com Participantes.
+
+    Com o banco de arquivo anexado (app/archive.py), as consultas de um evento
+    arquivado são direcionadas para ParticipanteArquivado.
+    """
+
+    def _entidade(self, evento_id: int) -> type:
+        """Modelo (Participante ou ParticipanteArquivado) que guarda o evento."""
+        return entidade_participante(self.session, evento_id)
 
     def get_by_email_hash(
         self, email_hash: str, evento_id: int
     ) -> Optional[Participante]:
         """Busca um participante pelo hash do email e evento."""
+        P = self._entidade(evento_id)
         return (
-            self.session.query(Participante)
-            .filter(
-                Participante.email_hash == email_hash,
-                Participante.evento_id == evento_id,
-            )
+            self.session.query(P)
+            .filter(P.email_hash == email_hash, P.evento_id == evento_id)
             .first()
         )
 
+    def get_dados_certificado(self, email_hash: str, evento_id: int) -> Optional[Row]:
+        """
+        Busca tudo o que a emissão de um certificado precisa em uma única query.
+
+        Returns:
+            Row (Participante, Evento, Cidade, Funcao, nome_coordenador) ou None.
+            nome_coordenador é o nome do primeiro superadmin (None se não houver).
+        """
+        P = self._entidade(evento_id)
+        return self.session.execute(
+            self._select_dados_certificado(P).where(
+                P.email_hash == email_hash, P.evento_id == evento_id
+            )
+        ).first()
+
+    def get_dados_certificados(self, participante_ids: Iterable[int]) -> list[Row]:
+        """
+        Versão em lote de get_dados_certificado, pelos IDs dos participantes.
+
+        Returns:
+            Rows (Participante, Evento, Cidade, Funcao, nome_coordenador)
+        """
+        rows = []
+        for P in entidades_participante(self.session):
+            for lote in _em_lotes(list(participante_ids)):
+                rows.extend(
+                    self.session.execute(
+                        self._select_dados_certificado(P).where(P.id.in_(lote))
+                    ).all()
+                )
+        return rows
+
+    @staticmethod
+    def _select_dados_certificado(P: type):
+        """SELECT do participante com evento, cidade, função e coordenador geral."""
+        nome_coordenador = (
+            select(Coordenador.nome)
+            .where(Coordenador.is_superadmin == True)
+            .order_by(Coordenador.id.asc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        return (
+            select(
+                P,
+                Evento,
+                Cidade,
+                Funcao,
+                nome_coordenador.label("nome_coordenador"),
+            )
+            .join(Evento, P.evento_id == Evento.id)
+            .join(Cidade, P.cidade_id == Cidade.id)
+            .join(Funcao, P.funcao_id == Funcao.id)
+        )
+
+    def set_hash_validacao(
+        self, participante_id: int, evento_id: int, hash_validacao: str
+    ) -> None:
+        """Grava o hash de validação de um participante que ainda não o tem."""
+        P = self._entidade(evento_id)
+        self.session.execute(
+            update(P)
+            .where(P.id == participante_id, P.hash_validacao.is_(None))
+            .values(hash_validacao=hash_validacao)
+        )
+
+    def get_by_hash_validacao(self, hash_validacao: str) -> Optional[Participante]:
+        """Busca o participante dono de um hash de validação (banco principal e arquivo)."""
+        for P in entidades_participante(self.session):
+            participante = (
+                self.session.query(P).filter(P.hash_validacao == hash_validacao).first()
+            )
+            if participante:
+                return participante
+        return None
+
     def get_by_encrypted_email(
         self, email_encrypted: bytes, evento_id: int
     ) -> Optional[Participante]:
@@ -332,29 +489,283 @@ class ParticipanteRepository(BaseRepository):
         self, evento_id: int, cidade_id: Optional[int] = None
     ) -> list[Participante]:
         """Retorna participantes de um evento (opcionalmente filtrado por cidade)."""
-        query = self.session.query(Participante).filter(
-            Participante.evento_id == evento_id
-        )
+        P = self._entidade(evento_id)
+        query = self.session.query(P).filter(P.evento_id == evento_id)
         if cidade_id:
-            query = query.filter(Participante.cidade_id == cidade_id)
-        return query.order_by(Participante.data_inscricao.desc()).all()
+            query = query.filter(P.cidade_id == cidade_id)
+        return query.order_by(P.data_inscricao.desc()).all()
+
+    # Colunas retornadas pela listagem paginada (tuplas leves, sem objetos ORM)
+    _COLUNAS_LISTAGEM = (
+        "id",
+        "nome_completo_encrypted",
+        "email_encrypted",
+        "cidade_id",
+        "funcao_id",
+        "titulo_apresentacao",
+        "datas_participacao",
+        "validado",
+        "data_inscricao",
+    )
+
+    @classmethod
+    def colunas_listagem(cls, P: type = Participante) -> tuple:
+        """Colunas da listagem paginada no modelo informado."""
+        return tuple(getattr(P, nome) for nome in cls._COLUNAS_LISTAGEM)
+
+    def _query_listagem(
+        self,
+        P: type,
+        columns: Iterable[Any],
+        evento_id: int,
+        cidade_ids: Optional[Iterable[int]],
+        funcao_id: Optional[int],
+        validado: Optional[bool],
+        email_hash: Optional[str],
+    ):
+        """Monta a query filtrada usada pela listagem paginada e pela contagem."""
+        query = self.session.query(*columns).filter(P.evento_id == evento_id)
+        if cidade_ids is not None:
+            query = query.filter(P.cidade_id.in_(list(cidade_ids)))
+        if funcao_id:
+            query = query.filter(P.funcao_id == funcao_id)
+        if validado is not None:
+            query = query.filter(P.validado == validado)
+        if email_hash:
+            query = query.filter(P.email_hash == email_hash)
+        return query
+
+    def get_page(
+        self,
+        evento_id: int,
+        cidade_ids: Optional[Iterable[int]] = None,
+        funcao_id: Optional[int] = None,
+        validado: Optional[bool] = None,
+        email_hash: Optional[str] = None,
+        cursor: Optional[Tuple[str, int]] = None,
+        limit: int = 50,
+    ) -> Tuple[list[Row], Optional[Tuple[str, int]]]:
+        """
+        Retorna uma página de participantes usando paginação por cursor (keyset).
+
+        A ordenação é por (data_inscricao, id) decrescente, a mesma de
+        get_by_evento_cidade. O cursor é a chave da última linha da página
+        anterior, de modo que o custo de cada página não cresce com o offset.
+
+        Args:
+            evento_id: ID do evento
+            cidade_ids: Conjunto de IDs de cidades permitidas (None = todas)
+            funcao_id: Filtrar por função
+            validado: Filtrar por status de validação (None = todos)
+            email_hash: Busca exata pelo índice cego (hash SHA-256) do email
+            cursor: Tupla (data_inscricao, id) retornada pela página anterior
+            limit: Quantidade máxima de linhas na página
+
+        Returns:
+            Tupla com (linhas, próximo_cursor). próximo_cursor é None na última página.
+        """
+        if cidade_ids is not None and not cidade_ids:
+            return [], None
+
+        P = self._entidade(evento_id)
+        query = self._query_listagem(
+            P,
+            self.colunas_listagem(P),
+            evento_id,
+            cidade_ids,
+            funcao_id,
+            validado,
+            email_hash,
+        )
+
+        if cursor:
+            data_cursor, id_cursor = cursor
+            query = query.filter(
+                or_(
+                    P.data_inscricao < data_cursor,
+                    and_(P.data_inscricao == data_cursor, P.id < id_cursor),
+                )
+            )
+
+        # Buscar uma linha extra para saber se existe próxima página
+        linhas = (
+            query.order_by(P.data_inscricao.desc(), P.id.desc()).limit(limit + 1).all()
+        )
+
+        proximo_cursor = None
+        if len(linhas) > limit:
+            linhas = linhas[:limit]
+            ultima = linhas[-1]
+            proximo_cursor = (ultima.data_inscricao, ultima.id)
+
+        return linhas, proximo_cursor
+
+    def count_filtered(
+        self,
+        evento_id: int,
+        cidade_ids: Optional[Iterable[int]] = None,
+        funcao_id: Optional[int] = None,
+        validado: Optional[bool] = None,
+        email_hash: Optional[str] = None,
+    ) -> int:
+        """Conta participantes com os mesmos filtros aceitos por get_page."""
+        if cidade_ids is not None and not cidade_ids:
+            return 0
+
+        P = self._entidade(evento_id)
+        return self._query_listagem(
+            P,
+            (func.count(P.id),),
+            evento_id,
+            cidade_ids,
+            funcao_id,
+            validado,
+            email_hash,
+        ).scalar()
+
+    def count_by_evento(self) -> dict[int, int]:
+        """Retorna a quantidade de participantes por evento ({evento_id: total})."""
+        contagem = {}
+        for P in entidades_participante(self.session):
+            rows = (
+                self.session.query(P.evento_id, func.count(P.id))
+                .group_by(P.evento_id)
+                .all()
+            )
+            contagem.update({evento_id: total for evento_id, total in rows})
+        return contagem
+
+    def count_by_cidade(self, evento_id: int) -> list[Tuple[str, str, int]]:
+        """Retorna (cidade, estado, total) de participantes do evento, do maior para o menor."""
+        P = self._entidade(evento_id)
+        total = func.count(P.id)
+        return (
+            self.session.query(Cidade.nome, Cidade.estado, total)
+            .join(P, P.cidade_id == Cidade.id)
+            .filter(P.evento_id == evento_id)
+            .group_by(Cidade.id, Cidade.nome, Cidade.estado)
+            .order_by(total.desc(), Cidade.nome)
+            .all()
+        )
+
+    def count_by_funcao(self, evento_id: int) -> list[Tuple[str, int]]:
+        """Retorna (função, total) de participantes do evento, do maior para o menor."""
+        P = self._entidade(evento_id)
+        total = func.count(P.id)
+        return (
+            self.session.query(Funcao.nome_funcao, total)
+            .join(P, P.funcao_id == Funcao.id)
+            .filter(P.evento_id == evento_id)
+            .group_by(Funcao.id, Funcao.nome_funcao)
+            .order_by(total.desc(), Funcao.nome_funcao)
+            .all()
+        )
+
+    def count_by_validado(self, evento_id: int) -> dict[bool, int]:
+        """Retorna a quantidade de participantes validados e pendentes do evento."""
+        P = self._entidade(evento_id)
+        rows = (
+            self.session.query(P.validado, func.count(P.id))
+            .filter(P.evento_id == evento_id)
+            .group_by(P.validado)
+            .all()
+        )
+        contagem = {True: 0, False: 0}
+        for validado, total in rows:
+            contagem[bool(validado)] = total
+        return contagem
+
+    def count_by_dia_inscricao(self, evento_id: int) -> list[Tuple[str, int]]:
+        """Retorna (dia YYYY-MM-DD, total) de inscrições do evento em ordem cronológica."""
+        # data_inscricao é texto ISO 8601: os 10 primeiros caracteres são a data
+        P = self._entidade(evento_id)
+        dia = func.substr(P.data_inscricao, 1, 10)
+        return (
+            self.session.query(dia, func.count(P.id))
+            .filter(P.evento_id == evento_id)
+            .group_by(dia)
+            .order_by(dia)
+            .all()
+        )
 
     def get_validated_participants(
         self, evento_id: int, cidade_id: Optional[int] = None
     ) -> list[Participante]:
         """Retorna participantes validados de um evento."""
-        query = self.session.query(Participante).filter(
-            Participante.evento_id == evento_id, Participante.validado == True
+        P = self._entidade(evento_id)
+        query = self.session.query(P).filter(
+            P.evento_id == evento_id, P.validado == True
         )
         if cidade_id:
-            query = query.filter(Participante.cidade_id == cidade_id)
-        return query.order_by(Participante.data_inscricao.desc()).all()
+            query = query.filter(P.cidade_id == cidade_id)
+        return query.order_by(P.data_inscricao.desc()).all()
 
     def create_participante(self, **kwargs) -> Participante:
         """Cria um novo participante."""
         participante = Participante(**kwargs)
         return self.add(participante)
 
+    def get_existing_email_hashes(
+        self, evento_id: int, email_hashes: Iterable[str]
+    ) -> set[str]:
+        """Retorna quais dos hashes informados já estão inscritos no evento (SELECT com IN em lotes)."""
+        P = self._entidade(evento_id)
+        existentes = set()
+        for lote in _em_lotes(list(email_hashes)):
+            rows = self.session.execute(
+                select(P.email_hash).where(
+                    P.evento_id == evento_id, P.email_hash.in_(lote)
+                )
+            )
+            existentes.update(rows.scalars())
+        return existentes
+
+    def get_validation_status(self, participante_ids: Iterable[int]) -> dict[int, bool]:
+        """Retorna {id: validado} para os participantes informados (SELECT com IN em lotes)."""
+        status = {}
+        # IDs são únicos entre o banco principal e o arquivo (ver app/archive.py)
+        for P in entidades_participante(self.session):
+            for lote in _em_lotes(list(participante_ids)):
+                rows = self.session.query(P.id, P.validado).filter(P.id.in_(lote)).all()
+                status.update({participante_id: bool(v) for participante_id, v in rows})
+        return status
+
+    def set_validado_bulk(self, participante_ids: Iterable[int], validado: bool) -> int:
+        """
+        Atualiza o status de validação de vários participantes com UPDATE ... WHERE id IN.
+
+        Returns:
+            Quantidade de linhas atualizadas
+        """
+        atualizados = 0
+        for P in entidades_participante(self.session):
+            for lote in _em_lotes(list(participante_ids)):
+                result = self.session.execute(
+                    update(P)
+                    .where(P.id.in_(lote))
+                    .values(validado=validado)
+                    .execution_options(synchronize_session=False)
+                )
+                atualizados += result.rowcount
+        return atualizados
+
+    def get_contact_rows(self, participante_ids: Iterable[int]) -> list[Row]:
+        """Retorna (id, evento_id, nome_completo_encrypted, email_encrypted) dos participantes."""
+        rows = []
+        for P in entidades_participante(self.session):
+            for lote in _em_lotes(list(participante_ids)):
+                rows.extend(
+                    self.session.query(
+                        P.id,
+                        P.evento_id,
+                        P.nome_completo_encrypted,
+                        P.email_encrypted,
+                    )
+                    .filter(P.id.in_(lote))
+                    .all()
+                )
+        return sorted(rows, key=lambda row: row.id)
+
     def validate_participant(self, participante_id: int) -> bool:
         """Marca um participante como validado."""
         try:
@@ -392,6 +803,34 @@ class AuditoriaRepository(BaseRepository):
         )
         return self.add(auditoria)
 
+    def create_audit_logs_bulk(self, registros: List[dict]) -> int:
+        """
+        Insere vários registros de auditoria em um único INSERT (executemany).
+
+        Args:
+            registros: Dicionários com coordenador_id, acao e detalhes
+
+        Returns:
+            Quantidade de registros inseridos
+        """
+        if not registros:
+            return 0
+
+        timestamp = datetime.now().isoformat()
+        self.session.execute(
+            insert(Auditoria),
+            [
+                {
+                    "timestamp": registro.get("timestamp", timestamp),
+                    "coordenador_id": registro["coordenador_id"],
+                    "acao": registro["acao"],
+                    "detalhes": registro.get("detalhes"),
+                }
+                for registro in registros
+            ],
+        )
+        return len(registros)
+
     def get_by_coordenador(
         self, coordenador_id: int, limit: int = 100
     ) -> list[Auditoria]:
@@ -399,7 +838,7 @@ class AuditoriaRepository(BaseRepository):
         return (
             self.session.query(Auditoria)
             .filter(Auditoria.coordenador_id == coordenador_id)
-            .order_by(Auditoria.timestamp.desc())
+            .order_by(Auditoria.timestamp.desc(), Auditoria.id.desc())
             .limit(limit)
             .all()
         )
@@ -408,11 +847,371 @@ class AuditoriaRepository(BaseRepository):
         """Retorna os registros mais recentes de auditoria."""
         return (
             self.session.query(Auditoria)
-            .order_by(Auditoria.timestamp.desc())
+            .order_by(Auditoria.timestamp.desc(), Auditoria.id.desc())
             .limit(limit)
             .all()
         )
 
+    def get_page(
+        self,
+        coordenador_id: Optional[int] = None,
+        acao: Optional[str] = None,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        cursor: Optional[Tuple[str, int]] = None,
+        limit: int = 50,
+    ) -> Tuple[list[Row], Optional[Tuple[str, int]]]:
+        """
+        Retorna uma página de registros de auditoria usando paginação por cursor (keyset).
+
+        A ordenação é por (timestamp, id) decrescente, coberta pelos índices
+        ix_auditoria_*_timestamp_id para cada combinação de filtro.
+
+        Args:
+            coordenador_id: Filtrar por coordenador
+            acao: Filtrar por código da ação
+            data_inicio: Data inicial (inclusiva)
+            data_fim: Data final (inclusiva)
+            cursor: Tupla (timestamp, id) retornada pela página anterior
+            limit: Quantidade máxima de linhas na página
+
+        Returns:
+            Tupla com (linhas, próximo_cursor). próximo_cursor é None na última página.
+        """
+        query = self.session.query(
+            Auditoria.id,
+            Auditoria.timestamp,
+            Auditoria.coordenador_id,
+            Coordenador.nome.label("coordenador_nome"),
+            Auditoria.acao,
+            Auditoria.detalhes,
+        ).outerjoin(Coordenador, Coordenador.id == Auditoria.coordenador_id)
+
+        if coordenador_id:
+            query = query.filter(Auditoria.coordenador_id == coordenador_id)
+        if acao:
+            query = query.filter(Auditoria.acao == acao)
+        # timestamp é ISO 8601 em texto: a comparação de strings respeita a ordem cronológica
+        if data_inicio:
+            query = query.filter(Auditoria.timestamp >= data_inicio.isoformat())
+        if data_fim:
+            query = query.filter(
+                Auditoria.timestamp < (data_fim + timedelta(days=1)).isoformat()
+            )
+
+        if cursor:
+            timestamp_cursor, id_cursor = cursor
+            query = query.filter(
+                or_(
+                    Auditoria.timestamp < timestamp_cursor,
+                    and_(
+                        Auditoria.timestamp == timestamp_cursor,
+                        Auditoria.id < id_cursor,
+                    ),
+                )
+            )
+
+        # Buscar uma linha extra para saber se existe próxima página
+        linhas = (
+            query.order_by(Auditoria.timestamp.desc(), Auditoria.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        proximo_cursor = None
+        if len(linhas) > limit:
+            linhas = linhas[:limit]
+            ultima = linhas[-1]
+            proximo_cursor = (ultima.timestamp, ultima.id)
+
+        return linhas, proximo_cursor
+
+    def get_acoes(self) -> list[str]:
+        """Retorna os códigos de ação distintos presentes na auditoria."""
+        return list(
+            self.session.scalars(
+                select(Auditoria.acao).distinct().order_by(Auditoria.acao)
+            )
+        )
+
+    def get_older_than(self, limite: str, limit: int = 1000) -> list[Row]:
+        """
+        Retorna os registros com timestamp anterior ao limite, do mais antigo ao mais novo.
+
+        Args:
+            limite: Timestamp ISO 8601 (exclusivo)
+            limit: Quantidade máxima de linhas
+        """
+        return (
+            self.session.query(
+                Auditoria.id,
+                Auditoria.timestamp,
+                Auditoria.coordenador_id,
+                Auditoria.acao,
+                Auditoria.detalhes,
+            )
+            .filter(Auditoria.timestamp < limite)
+            .order_by(Auditoria.timestamp, Auditoria.id)
+            .limit(limit)
+            .all()
+        )
+
+    def delete_by_ids(self, ids: Iterable[int]) -> int:
+        """Remove registros de auditoria pelos IDs (em lotes de IN)."""
+        removidos = 0
+        for lote in _em_lotes(list(ids)):
+            removidos += (
+                self.session.query(Auditoria)
+                .filter(Auditoria.id.in_(lote))
+                .delete(synchronize_session=False)
+            )
+        return removidos
+
+
+class EmailOutboxRepository(BaseRepository):
+    """Repositório para a fila persistente de e-mails (outbox)."""
+
+    def enqueue_bulk(self, registros: List[dict]) -> int:
+        """
+        Enfileira várias mensagens em um único INSERT (executemany).
+
+        Args:
+            registros: Dicionários com tipo e payload_encrypted
+
+        Returns:
+            Quantidade de mensagens enfileiradas
+        """
+        if not registros:
+            return 0
+
+        agora = datetime.now().isoformat()
+        self.session.execute(
+            insert(EmailOutbox),
+            [
+                {
+                    "tipo": registro["tipo"],
+                    "payload_encrypted": registro["payload_encrypted"],
+                    "status": "pendente",
+                    "tentativas": 0,
+                    "proxima_tentativa": agora,
+                    "criado_em": agora,
+                }
+                for registro in registros
+            ],
+        )
+        return len(registros)
+
+    def claim_due(self, agora: datetime, limit: int) -> list[EmailOutbox]:
+        """
+        Reserva as mensagens pendentes cuja próxima tentativa já chegou.
+
+        As mensagens reservadas passam para o status "enviando" na transação atual.
+        """
+        mensagens = (
+            self.session.query(EmailOutbox)
+            .filter(
+                EmailOutbox.status == "pendente",
+                EmailOutbox.proxima_tentativa <= agora.isoformat(),
+            )
+            .order_by(EmailOutbox.proxima_tentativa, EmailOutbox.id)
+            .limit(limit)
+            .all()
+        )
+        for mensagem in mensagens:
+            mensagem.status = "enviando"
+        self.session.flush()
+        return mensagens
+
+    def mark_sent(self, ids: List[int]) -> int:
+        """Marca mensagens como enviadas."""
+        agora = datetime.now().isoformat()
+        atualizados = 0
+        for lote in _em_lotes(ids):
+            atualizados += self.session.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_(lote))
+                .values(status="enviado", enviado_em=agora, ultimo_erro=None)
+            ).rowcount
+        return atualizados
+
+    def mark_retry(
+        self,
+        mensagem_id: int,
+        proxima_tentativa: Optional[datetime],
+        erro: str,
+        contar_tentativa: bool = True,
+    ) -> None:
+        """
+        Registra uma tentativa que falhou.
+
+        Args:
+            mensagem_id: ID da mensagem
+            proxima_tentativa: Horário da nova tentativa; None move para a dead-letter
+            erro: Descrição do erro
+            contar_tentativa: False apenas adia a mensagem, sem consumir uma tentativa
+        """
+        valores = {"ultimo_erro": erro[:500]}
+        if contar_tentativa:
+            valores["tentativas"] = EmailOutbox.tentativas + 1
+        if proxima_tentativa is None:
+            valores["status"] = "falhou"
+        else:
+            valores["status"] = "pendente"
+            valores["proxima_tentativa"] = proxima_tentativa.isoformat()
+        self.session.execute(
+            update(EmailOutbox).where(EmailOutbox.id == mensagem_id).values(**valores)
+        )
+
+    def reset_in_flight(self) -> int:
+        """Devolve à fila as mensagens que ficaram "enviando" (processo interrompido)."""
+        return self.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.status == "enviando")
+            .values(status="pendente")
+        ).rowcount
+
+    def requeue_failed(self, ids: Optional[List[int]] = None) -> int:
+        """Devolve mensagens da dead-letter (status "falhou") à fila, zerando as tentativas."""
+        query = update(EmailOutbox).where(EmailOutbox.status == "falhou")
+        if ids is not None:
+            query = query.where(EmailOutbox.id.in_(ids))
+        return self.session.execute(
+            query.values(
+                status="pendente",
+                tentativas=0,
+                proxima_tentativa=datetime.now().isoformat(),
+            )
+        ).rowcount
+
+    def get_status_counts(self) -> dict:
+        """Retorna a quantidade de mensagens por status."""
+        return dict(
+            self.session.query(EmailOutbox.status, func.count())
+            .group_by(EmailOutbox.status)
+            .all()
+        )
+
+    def get_oldest_pending(self) -> Optional[str]:
+        """Retorna a data de criação da mensagem pendente mais antiga."""
+        return self.session.scalar(
+            select(func.min(EmailOutbox.criado_em)).where(
+                EmailOutbox.status.in_(["pendente", "enviando"])
+            )
+        )
+
+    def get_failed(self, limit: int = 100) -> list[EmailOutbox]:
+        """Retorna as mensagens da dead-letter, das mais recentes para as mais antigas."""
+        return (
+            self.session.query(EmailOutbox)
+            .filter(EmailOutbox.status == "falhou")
+            .order_by(EmailOutbox.id.desc())
+            .limit(limit)
+            .all()
+        )
+
+    def delete_sent_before(self, limite: datetime) -> int:
+        """Remove mensagens enviadas antes da data limite."""
+        return (
+            self.session.query(EmailOutbox)
+            .filter(
+                EmailOutbox.status == "enviado",
+                EmailOutbox.enviado_em < limite.isoformat(),
+            )
+            .delete(synchronize_session=False)
+        )
+
+
+class NotificacaoRepository(BaseRepository):
+    """Repositório do registro de notificações já enfileiradas para os participantes."""
+
+    def get_enqueued_ids(self, tipo: str, participante_ids: Iterable[int]) -> set[int]:
+        """Retorna os IDs dos participantes cuja mensagem do tipo já foi enfileirada."""
+        notificados: set[int] = set()
+        for lote in _em_lotes(list(participante_ids)):
+            notificados.update(
+                self.session.scalars(
+                    select(NotificacaoEnfileirada.participante_id).where(
+                        NotificacaoEnfileirada.tipo == tipo,
+                        NotificacaoEnfileirada.participante_id.in_(lote),
+                    )
+                )
+            )
+        return notificados
+
+    def record_bulk(self, tipo: str, participantes: List[Tuple[int, int]]) -> int:
+        """
+        Registra que uma mensagem foi enfileirada para vários participantes.
+
+        Deve ser chamado na transação que grava as mensagens na fila. Participantes
+        já registrados (reenvio forçado) têm o contador de enfileiramentos
+        incrementado; os demais entram em um único INSERT (executemany).
+
+        Args:
+            tipo: Tipo da mensagem (ver app/email_outbox.py)
+            participantes: Pares (participante_id, evento_id)
+
+        Returns:
+            Quantidade de participantes registrados
+        """
+        if not participantes:
+            return 0
+
+        agora = datetime.now().isoformat()
+        ja_registrados = self.get_enqueued_ids(tipo, [pid for pid, _ in participantes])
+        novos = [
+            {
+                "participante_id": pid,
+                "evento_id": evento_id,
+                "tipo": tipo,
+                "enfileiramentos": 1,
+                "enfileirado_em": agora,
+            }
+            for pid, evento_id in participantes
+            if pid not in ja_registrados
+        ]
+        if novos:
+            self.session.execute(insert(NotificacaoEnfileirada), novos)
+        for lote in _em_lotes(sorted(ja_registrados)):
+            self.session.execute(
+                update(NotificacaoEnfileirada)
+                .where(
+                    NotificacaoEnfileirada.tipo == tipo,
+                    NotificacaoEnfileirada.participante_id.in_(lote),
+                )
+                .values(
+                    enfileiramentos=NotificacaoEnfileirada.enfileiramentos + 1,
+                    enfileirado_em=agora,
+                )
+            )
+        return len(participantes)
+
+
+class EmailMetricaRepository(BaseRepository):
+    """Repositório da série temporal de métricas de envio de e-mails."""
+
+    def add_bulk(self, intervalos: List[dict]) -> int:
+        """Grava vários intervalos agregados em um único INSERT."""
+        if intervalos:
+            self.session.execute(insert(EmailMetrica), intervalos)
+        return len(intervalos)
+
+    def get_since(self, desde: datetime) -> list[EmailMetrica]:
+        """Retorna os intervalos iniciados a partir de `desde`, em ordem cronológica."""
+        return (
+            self.session.query(EmailMetrica)
+            .filter(EmailMetrica.inicio >= desde.isoformat())
+            .order_by(EmailMetrica.inicio, EmailMetrica.id)
+            .all()
+        )
+
+    def delete_before(self, limite: datetime) -> int:
+        """Remove os intervalos anteriores à data limite."""
+        return (
+            self.session.query(EmailMetrica)
+            .filter(EmailMetrica.inicio < limite.isoformat())
+            .delete(synchronize_session=False)
+        )
+
 
 # ============= FUNÇÕES DE FÁBRICA =============
 
@@ -447,6 +1246,21 @@ def get_auditoria_repository(session: Session) -> AuditoriaRepository:
     return AuditoriaRepository(session)
 
 
+def get_email_outbox_repository(session: Session) -> EmailOutboxRepository:
+    """Retorna uma instância do repositório da fila de e-mails."""
+    return EmailOutboxRepository(session)
+
+
+def get_notificacao_repository(session: Session) -> NotificacaoRepository:
+    """Retorna uma instância do repositório de notificações enviadas."""
+    return NotificacaoRepository(session)
+
+
+def get_email_metrica_repository(session: Session) -> EmailMetricaRepository:
+    """Retorna uma instância do repositório de métricas de envio de e-mails."""
+    return EmailMetricaRepository(session)
+
+
 # ============= FUNÇÕES DE CONVENIÊNCIA =============
 
 
@@ -603,6 +1417,20 @@ def _create_initial_data(session: Session) -> None:
         raise
 
 
+def _contar_registros_tabelas(session: Session) -> dict:
+    """Conta os registros de todas as tabelas em uma única query (subconsultas escalares)."""
+    modelos = get_all_table_models()
+    contagens = [
+        select(func.count())
+        .select_from(model)
+        .scalar_subquery()
+        .label(model.__tablename__)
+        for model in modelos
+    ]
+    row = session.execute(select(*contagens)).one()
+    return dict(row._mapping)
+
+
 def check_database_health() -> dict:
     """Verifica a saúde do banco de dados."""
     health_info = {
@@ -622,11 +1450,8 @@ def check_database_health() -> dict:
 
         # Verificar tabelas
         with db_manager.get_db_session() as session:
-            # Contar registros em cada tabela
-            table_counts = {}
-            for model in get_all_table_models():
-                count = session.query(model).count()
-                table_counts[model.__tablename__] = count
+            # Contar registros de todas as tabelas em uma única query
+            table_counts = _contar_registros_tabelas(session)
 
             health_info["details"]["table_counts"] = table_counts
             health_info["tables_created"] = all(
@@ -651,3 +1476,68 @@ def check_database_health() -> dict:
         logger.error(f"❌ Erro ao verificar saúde do banco de dados: {e}")
 
     return health_info
+
+
+# Tempo (em segundos) que o status leve do banco fica em cache no processo
+HEALTH_STATUS_CACHE_TTL = 30
+
+_health_status_cache: dict = {"status": None, "timestamp": 0.0}
+_health_status_lock = threading.Lock()
+
+
+def _verificar_status_leve() -> dict:
+    """Executa uma única query barata: testa a conexão e a existência dos dados iniciais."""
+    status = {"status": "healthy", "connection": False, "initial_data": False}
+
+    try:
+        with db_manager.get_db_session() as session:
+            # EXISTS para no primeiro registro encontrado, sem varrer as tabelas
+            row = session.execute(
+                select(
+                    exists().where(Cidade.id.isnot(None)).label("cidades"),
+                    exists().where(Funcao.id.isnot(None)).label("funcoes"),
+                    exists().where(Evento.id.isnot(None)).label("eventos"),
+                )
+            ).one()
+
+        status["connection"] = True
+        status["initial_data"] = all(row)
+        if not status["initial_data"]:
+            status["status"] = "warning"
+
+    except Exception as e:
+        status["status"] = "error"
+        status["error"] = str(e)
+        logger.error(f"❌ Erro ao verificar status do banco de dados: {e}")
+
+    return status
+
+
+def get_health_status(force_refresh: bool = False) -> dict:
+    """
+    Retorna o status resumido do banco de dados para exibição pública.
+
+    Diferente de check_database_health, não conta registros: usa uma única query
+    com EXISTS e guarda o resultado em cache por HEALTH_STATUS_CACHE_TTL segundos,
+    compartilhado entre todas as sessões do processo.
+
+    Args:
+        force_refresh: Ignora o cache e consulta o banco imediatamente
+
+    Returns:
+        Dicionário com "status" ("healthy", "warning" ou "error"), "connection",
+        "initial_data" e "checked_at" (ISO 8601)
+    """
+    with _health_status_lock:
+        agora = time.monotonic()
+        cache_valido = (
+            _health_status_cache["status"] is not None
+            and agora - _health_status_cache["timestamp"] < HEALTH_STATUS_CACHE_TTL
+        )
+        if force_refresh or not cache_valido:
+            status = _verificar_status_leve()
+            status["checked_at"] = datetime.now().isoformat()
+            _health_status_cache["status"] = status
+            _health_status_cache["timestamp"] = agora
+
+        return dict(_health_status_cache["status"])
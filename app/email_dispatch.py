@@ -0,0 +1,502 @@
+"""
+Despacho Concorrente de E-mails
+
+Envios em lote (ex.: certificados liberados após a validação) passam por um
+DespachanteEmail, que mantém:
+
+- Uma sessão HTTP (requests.Session) com pool de conexões: as conexões TCP/TLS
+  com a API do provedor são reutilizadas entre os envios
+- Um pool limitado de threads: no máximo EMAIL_MAX_CONCURRENCY requisições em
+  andamento, e a fila de envios pendentes também é limitada
+- A agregação dos resultados (sucessos, falhas e e-mails que falharam)
+
+Cada requisição à API (DespachanteEmail.post) passa ainda por:
+
+- Um limitador de taxa (token bucket) com a cota de envio da conta
+  (EMAIL_RATE_LIMIT_PER_SECOND, rajadas de até EMAIL_RATE_LIMIT_BURST)
+- Timeouts de conexão e de leitura (EMAIL_CONNECT_TIMEOUT_SECONDS,
+  EMAIL_READ_TIMEOUT_SECONDS): um provedor lento não prende a thread do Streamlit
+- Respostas 429 respeitam o cabeçalho Retry-After: o limitador pausa todos os
+  envios e a requisição é repetida
+- Um circuit breaker: após EMAIL_CIRCUIT_FAILURE_THRESHOLD falhas seguidas
+  (timeouts, erros de conexão ou 5xx) os envios são recusados por
+  EMAIL_CIRCUIT_RESET_SECONDS, e então uma requisição de teste decide se o
+  circuito fecha novamente
+
+A latência, o status e as retentativas de cada requisição alimentam as métricas
+de envio (app/email_metrics.py).
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, TypeVar
+
+from .core import settings
+from .email_metrics import (
+    STATUS_CIRCUITO_ABERTO,
+    STATUS_ERRO_CONEXAO,
+    STATUS_TIMEOUT,
+    ColetorMetricasEmail,
+    metricas_email,
+)
+
+# Check if requests is available
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Intervalo (em mensagens) entre os registros de progresso no log
+EMAIL_PROGRESS_LOG_EVERY = 100
+
+# Repetições de uma requisição que recebeu 429 (Too Many Requests)
+EMAIL_RETRY_AFTER_ATTEMPTS = 3
+
+# Maior espera (em segundos) aceita de um Retry-After; acima disso a requisição falha
+EMAIL_RETRY_AFTER_MAX_SECONDS = 60
+
+# Estados do circuit breaker
+CIRCUITO_FECHADO = "fechado"
+CIRCUITO_ABERTO = "aberto"
+CIRCUITO_MEIO_ABERTO = "meio_aberto"
+
+T = TypeVar("T")
+
+
+class ResultadoDespacho(NamedTuple):
+    """Resultado agregado de um envio em lote."""
+
+    sucessos: int
+    falhas: int
+    falhados: List[str]
+    duracao_s: float
+
+    @property
+    def por_segundo(self) -> float:
+        """Mensagens processadas por segundo."""
+        total = self.sucessos + self.falhas
+        return total / self.duracao_s if self.duracao_s > 0 else float(total)
+
+
+def criar_sessao_http(tamanho_pool: int) -> "requests.Session":
+    """
+    Cria uma sessão HTTP com pool de conexões para `tamanho_pool` threads.
+
+    Args:
+        tamanho_pool: Conexões mantidas abertas por host
+
+    Returns:
+        requests.Session com HTTPAdapter dimensionado
+    """
+    sessao = requests.Session()
+    adaptador = HTTPAdapter(
+        pool_connections=1, pool_maxsize=tamanho_pool, pool_block=True
+    )
+    sessao.mount("https://", adaptador)
+    sessao.mount("http://", adaptador)
+    return sessao
+
+
+class LimitadorTaxa:
+    """Token bucket: no máximo `taxa` requisições por segundo, com rajadas de `capacidade`."""
+
+    def __init__(
+        self,
+        taxa: float,
+        capacidade: int,
+        relogio: Callable[[], float] = time.monotonic,
+        dormir: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            taxa: Requisições por segundo (0 desativa o limitador)
+            capacidade: Requisições que podem sair de uma vez
+            relogio: Relógio monotônico (substituível em testes)
+            dormir: Função de espera (substituível em testes)
+        """
+        self.taxa = taxa
+        self.capacidade = max(1, capacidade)
+        self._relogio = relogio
+        self._dormir = dormir
+        self._tokens = float(self.capacidade)
+        self._ultimo = relogio()
+        self._lock = threading.Lock()
+
+    def adquirir(self) -> float:
+        """
+        Reserva um token, aguardando se necessário.
+
+        Returns:
+            Segundos aguardados
+        """
+        with self._lock:
+            agora = self._reabastecer()
+            if self.taxa <= 0:
+                # Sem cota configurada, apenas uma pausa (Retry-After) faz esperar
+                espera = self._ultimo - agora
+            else:
+                # Reserva: o saldo pode ficar negativo, e cada thread espera a sua vez
+                self._tokens -= 1
+                espera = (self._ultimo - agora) + max(0.0, -self._tokens / self.taxa)
+
+        if espera > 0:
+            self._dormir(espera)
+        return max(espera, 0.0)
+
+    def pausar(self, segundos: float) -> None:
+        """Suspende a liberação de tokens por `segundos` (ex.: Retry-After)."""
+        with self._lock:
+            retomar_em = self._reabastecer() + segundos
+            if retomar_em > self._ultimo:
+                self._ultimo = retomar_em
+            self._tokens = min(self._tokens, 0.0)
+
+    def _reabastecer(self) -> float:
+        """Credita os tokens acumulados desde a última leitura (chamar com o lock)."""
+        agora = self._relogio()
+        if agora > self._ultimo and self.taxa > 0:
+            self._tokens = min(
+                self.capacidade, self._tokens + (agora - self._ultimo) * self.taxa
+            )
+            self._ultimo = agora
+        return agora
+
+
+class CircuitoEmail:
+    """Circuit breaker para a API de e-mail."""
+
+    def __init__(
+        self,
+        limite_falhas: int,
+        tempo_abertura: float,
+        relogio: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            limite_falhas: Falhas seguidas que abrem o circuito
+            tempo_abertura: Segundos com o circuito aberto antes da requisição de teste
+            relogio: Relógio monotônico (substituível em testes)
+        """
+        self.limite_falhas = max(1, limite_falhas)
+        self.tempo_abertura = tempo_abertura
+        self._relogio = relogio
+        self.estado = CIRCUITO_FECHADO
+        self.falhas_seguidas = 0
+        self.aberturas = 0
+        self._aberto_em = 0.0
+        self._teste_em_andamento = False
+        self._lock = threading.Lock()
+
+    def permitir(self) -> bool:
+        """Indica se uma requisição pode ser feita agora."""
+        with self._lock:
+            if self.estado == CIRCUITO_FECHADO:
+                return True
+            if self.estado == CIRCUITO_ABERTO:
+                if self._relogio() - self._aberto_em < self.tempo_abertura:
+                    return False
+                self.estado = CIRCUITO_MEIO_ABERTO
+                self._teste_em_andamento = False
+            # Meio aberto: apenas uma requisição de teste por vez
+            if self._teste_em_andamento:
+                return False
+            self._teste_em_andamento = True
+            return True
+
+    def consultar(self) -> str:
+        """
+        Retorna o estado efetivo do circuito sem reservar a requisição de teste.
+
+        ABERTO enquanto as requisições seriam recusadas (inclusive com um teste
+        meio aberto em andamento) e MEIO_ABERTO quando a requisição de teste
+        seria liberada.
+        """
+        with self._lock:
+            if self.estado == CIRCUITO_FECHADO:
+                return CIRCUITO_FECHADO
+            if self.estado == CIRCUITO_ABERTO:
+                if self._relogio() - self._aberto_em < self.tempo_abertura:
+                    return CIRCUITO_ABERTO
+                return CIRCUITO_MEIO_ABERTO
+            if self._teste_em_andamento:
+                return CIRCUITO_ABERTO
+            return CIRCUITO_MEIO_ABERTO
+
+    def registrar_sucesso(self) -> None:
+        """Registra uma resposta saudável do provedor e fecha o circuito."""
+        with self._lock:
+            if self.estado != CIRCUITO_FECHADO:
+                logger.info("✅ Circuito de e-mail fechado: provedor respondendo")
+            self.estado = CIRCUITO_FECHADO
+            self.falhas_seguidas = 0
+            self._teste_em_andamento = False
+
+    def registrar_falha(self) -> None:
+        """Registra uma falha do provedor; abre o circuito ao atingir o limite."""
+        with self._lock:
+            self.falhas_seguidas += 1
+            self._teste_em_andamento = False
+            if (
+                self.estado == CIRCUITO_MEIO_ABERTO
+                or self.falhas_seguidas >= self.limite_falhas
+            ) and self.estado != CIRCUITO_ABERTO:
+                self.estado = CIRCUITO_ABERTO
+                self._aberto_em = self._relogio()
+                self.aberturas += 1
+                logger.warning(
+                    f"⚠️ Circuito de e-mail aberto após {self.falhas_seguidas} falhas: "
+                    f"envios suspensos por {self.tempo_abertura:g}s"
+                )
+            elif self.estado == CIRCUITO_ABERTO:
+                self._aberto_em = self._relogio()
+
+
+def interpretar_retry_after(valor: Optional[str]) -> Optional[float]:
+    """
+    Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos de espera.
+
+    Returns:
+        Segundos a aguardar, ou None se o cabeçalho estiver ausente ou inválido
+    """
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        data = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if data.tzinfo is None:
+        data = data.replace(tzinfo=timezone.utc)
+    return max(0.0, (data - datetime.now(timezone.utc)).total_seconds())
+
+
+def _contar_mensagens(corpo: Any) -> int:
+    """Destinatários de um corpo de envio ("to" ou "messageVersions")."""
+    if not isinstance(corpo, dict):
+        return 1
+    versoes = corpo.get("messageVersions") or [corpo]
+    return sum(len(versao.get("to") or []) for versao in versoes) or 1
+
+
+class DespachanteEmail:
+    """Executa envios de e-mail com concorrência limitada e sessão HTTP compartilhada."""
+
+    def __init__(
+        self,
+        max_concorrencia: Optional[int] = None,
+        limitador: Optional[LimitadorTaxa] = None,
+        circuito: Optional[CircuitoEmail] = None,
+        metricas: Optional[ColetorMetricasEmail] = None,
+    ):
+        """
+        Args:
+            max_concorrencia: Requisições simultâneas (padrão: EMAIL_MAX_CONCURRENCY)
+            limitador: Limitador de taxa (padrão: EMAIL_RATE_LIMIT_*)
+            circuito: Circuit breaker (padrão: EMAIL_CIRCUIT_*)
+            metricas: Coletor das métricas de envio (padrão: metricas_email)
+        """
+        self.max_concorrencia = max(
+            1, max_concorrencia or settings.email_max_concurrency
+        )
+        self.limitador = limitador or LimitadorTaxa(
+            settings.email_rate_limit_per_second, settings.email_rate_limit_burst
+        )
+        self.circuito = circuito or CircuitoEmail(
+            settings.email_circuit_failure_threshold,
+            settings.email_circuit_reset_seconds,
+        )
+        self.metricas = metricas or metricas_email
+        self.timeout = (
+            settings.email_connect_timeout_seconds,
+            settings.email_read_timeout_seconds,
+        )
+        self._sessao: Optional["requests.Session"] = None
+        self._lock = threading.Lock()
+        self._metricas: Dict[str, float] = dict.fromkeys(
+            (
+                "requisicoes",
+                "sucessos",
+                "recusadas",
+                "erros_servidor",
+                "limitadas_429",
+                "timeouts",
+                "erros_conexao",
+                "bloqueadas_circuito",
+                "espera_limitador_s",
+            ),
+            0,
+        )
+
+    @property
+    def sessao(self) -> "requests.Session":
+        """Sessão HTTP compartilhada (criada no primeiro uso)."""
+        if self._sessao is None:
+            with self._lock:
+                if self._sessao is None:
+                    self._sessao = criar_sessao_http(self.max_concorrencia)
+        return self._sessao
+
+    def post(self, url: str, **kwargs: Any) -> "requests.Response":
+        """
+        Faz um POST à API respeitando limitador, timeouts, Retry-After e circuito.
+
+        Args:
+            url: Endpoint da API
+            **kwargs: Argumentos repassados a requests.Session.post
+
+        Returns:
+            Resposta da API (inclusive 4xx/5xx e um 429 persistente)
+
+        Raises:
+            RuntimeError: Se o circuito estiver aberto
+            requests.RequestException: Em timeouts e erros de conexão
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        mensagens = _contar_mensagens(kwargs.get("json"))
+
+        for tentativa in range(EMAIL_RETRY_AFTER_ATTEMPTS + 1):
+            if tentativa:
+                self.metricas.registrar_retentativa()
+            if not self.circuito.permitir():
+                self._contar("bloqueadas_circuito")
+                self.metricas.registrar_requisicao(STATUS_CIRCUITO_ABERTO, 0.0)
+                raise RuntimeError(
+                    "Circuito de e-mail aberto: provedor indisponível, envio adiado"
+                )
+
+            self._contar("espera_limitador_s", self.limitador.adquirir())
+            self._contar("requisicoes")
+            inicio = time.perf_counter()
+            try:
+                resposta = self.sessao.post(url, **kwargs)
+            except requests.Timeout:
+                self._contar("timeouts")
+                self.metricas.registrar_requisicao(
+                    STATUS_TIMEOUT, time.perf_counter() - inicio, mensagens
+                )
+                self.circuito.registrar_falha()
+                raise
+            except requests.RequestException:
+                self._contar("erros_conexao")
+                self.metricas.registrar_requisicao(
+                    STATUS_ERRO_CONEXAO, time.perf_counter() - inicio, mensagens
+                )
+                self.circuito.registrar_falha()
+                raise
+            self.metricas.registrar_requisicao(
+                str(resposta.status_code), time.perf_counter() - inicio, mensagens
+            )
+
+            if resposta.status_code == 429:
+                self._contar("limitadas_429")
+                # Cota excedida não é falha do provedor: não conta para o circuito
+                self.circuito.registrar_sucesso()
+                espera = interpretar_retry_after(resposta.headers.get("Retry-After"))
+                if espera is None:
+                    espera = 2**tentativa
+                if (
+                    tentativa == EMAIL_RETRY_AFTER_ATTEMPTS
+                    or espera > EMAIL_RETRY_AFTER_MAX_SECONDS
+                ):
+                    return resposta
+                logger.warning(
+                    f"⚠️ Limite do provedor atingido (429): envios pausados por {espera:g}s"
+                )
+                self.limitador.pausar(espera)
+                continue
+
+            if resposta.status_code >= 500:
+                self._contar("erros_servidor")
+                self.circuito.registrar_falha()
+            else:
+                self._contar("sucessos" if resposta.ok else "recusadas")
+                self.circuito.registrar_sucesso()
+            return resposta
+
+        return resposta
+
+    def obter_metricas(self) -> Dict[str, Any]:
+        """Retorna os contadores de requisições e o estado do circuito."""
+        with self._lock:
+            metricas = dict(self._metricas)
+        metricas["espera_limitador_s"] = round(metricas["espera_limitador_s"], 3)
+        metricas["estado_circuito"] = self.circuito.estado
+        metricas["aberturas_circuito"] = self.circuito.aberturas
+        metricas["falhas_seguidas"] = self.circuito.falhas_seguidas
+        return metricas
+
+    def _contar(self, metrica: str, valor: float = 1) -> None:
+        with self._lock:
+            self._metricas[metrica] += valor
+
+    def despachar(
+        self,
+        itens: Iterable[T],
+        enviar: Callable[[T], bool],
+        identificar: Callable[[T], str] = str,
+    ) -> ResultadoDespacho:
+        """
+        Envia os itens em paralelo, com no máximo `max_concorrencia` envios em andamento.
+
+        Args:
+            itens: Mensagens a enviar
+            enviar: Função que envia uma mensagem e retorna True em caso de sucesso
+            identificar: Função que identifica a mensagem nos resultados (ex.: e-mail)
+
+        Returns:
+            ResultadoDespacho com sucessos, falhas, itens que falharam e duração
+        """
+        inicio = time.perf_counter()
+        falhados: List[str] = []
+        contagem = {"sucessos": 0, "processados": 0}
+        lock = threading.Lock()
+        # Limita também a fila do executor: no máximo 2x a concorrência aguardando
+        vagas = threading.BoundedSemaphore(self.max_concorrencia * 2)
+
+        def _executar(item: T) -> None:
+            try:
+                try:
+                    sucesso = enviar(item)
+                except Exception as e:
+                    logger.error(f"❌ Erro no envio para {identificar(item)}: {e}")
+                    sucesso = False
+                with lock:
+                    contagem["processados"] += 1
+                    if sucesso:
+                        contagem["sucessos"] += 1
+                    else:
+                        falhados.append(identificar(item))
+                    if contagem["processados"] % EMAIL_PROGRESS_LOG_EVERY == 0:
+                        logger.info(
+                            f"📧 {contagem['processados']} e-mails processados "
+                            f"({contagem['sucessos']} sucessos)"
+                        )
+            finally:
+                vagas.release()
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_concorrencia, thread_name_prefix="email-dispatch"
+        ) as executor:
+            for item in itens:
+                vagas.acquire()
+                executor.submit(_executar, item)
+
+        return ResultadoDespacho(
+            sucessos=contagem["sucessos"],
+            falhas=len(falhados),
+            falhados=falhados,
+            duracao_s=time.perf_counter() - inicio,
+        )
@@ -0,0 +1,284 @@
+"""
+Métricas de Envio de E-mails
+
+Cada requisição à API de e-mail (DespachanteEmail.post) e cada mensagem
+enviada pela fila (app/email_outbox.py) alimentam um coletor em memória, que
+agrega os dados em intervalos de EMAIL_METRICS_INTERVAL_SECONDS:
+
+- Latência das requisições (média, p95 e máxima)
+- Distribuição de status HTTP (além de timeouts, erros de conexão e
+  requisições bloqueadas pelo circuit breaker)
+- Retentativas após 429
+- Tempo de espera das mensagens na fila
+- Mensagens aceitas por segundo
+
+Os intervalos encerrados são gravados na tabela email_metricas pela thread da
+fila de e-mails e removidos após EMAIL_METRICS_RETENTION_DAYS dias. A aba
+📧 E-mails da Administração mostra a série.
+
+Uso:
+    from app.email_metrics import metricas_email
+
+    metricas_email.registrar_requisicao("201", latencia_s=0.12, mensagens=1)
+"""
+
+import atexit
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from .core import settings
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Latências guardadas por intervalo para o cálculo do p95
+LATENCIAS_MAXIMAS_POR_INTERVALO = 10000
+
+# Status registrados para falhas sem resposta HTTP
+STATUS_TIMEOUT = "timeout"
+STATUS_ERRO_CONEXAO = "erro_conexao"
+STATUS_CIRCUITO_ABERTO = "circuito"
+
+
+def _percentil(valores: List[float], fracao: float) -> Optional[float]:
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(fracao * len(ordenados)))]
+
+
+class IntervaloMetricas:
+    """Agregado das métricas de um intervalo de tempo."""
+
+    def __init__(self, inicio: datetime):
+        self.inicio = inicio
+        self.requisicoes = 0
+        self.mensagens = 0
+        self.por_status: Dict[str, int] = {}
+        self.retentativas = 0
+        self.latencias: List[float] = []
+        self.latencia_total = 0.0
+        self.latencia_max = 0.0
+        self.esperas = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+
+    @property
+    def vazio(self) -> bool:
+        return not (self.requisicoes or self.esperas or self.retentativas)
+
+    def como_registro(self, fim: datetime) -> Dict[str, Any]:
+        """Converte o intervalo em um registro da tabela email_metricas."""
+        medidas = self.requisicoes
+        return {
+            "inicio": self.inicio.isoformat(),
+            "duracao_s": max((fim - self.inicio).total_seconds(), 0.001),
+            "requisicoes": self.requisicoes,
+            "mensagens": self.mensagens,
+            "por_status": dict(self.por_status),
+            "retentativas": self.retentativas,
+            "latencia_media_ms": (
+                round(self.latencia_total / medidas * 1000, 1) if medidas else None
+            ),
+            "latencia_p95_ms": (
+                round(_percentil(self.latencias, 0.95) * 1000, 1)
+                if self.latencias
+                else None
+            ),
+            "latencia_max_ms": round(self.latencia_max * 1000, 1) if medidas else None,
+            "espera_fila_media_s": (
+                round(self.espera_total / self.esperas, 2) if self.esperas else None
+            ),
+            "espera_fila_max_s": round(self.espera_max, 2) if self.esperas else None,
+        }
+
+
+class ColetorMetricasEmail:
+    """Coleta as métricas de envio em intervalos e os grava no banco."""
+
+    def __init__(
+        self,
+        intervalo_s: Optional[float] = None,
+        fabrica_sessoes: Optional[Callable[[], Session]] = None,
+        relogio: Callable[[], datetime] = datetime.now,
+    ):
+        """
+        Args:
+            intervalo_s: Duração de cada intervalo (padrão: EMAIL_METRICS_INTERVAL_SECONDS)
+            fabrica_sessoes: Fábrica de sessões (padrão: sessões de segundo plano)
+            relogio: Relógio (substituível em testes)
+        """
+        self.intervalo_s = intervalo_s or settings.email_metrics_interval_seconds
+        self._fabrica_sessoes = fabrica_sessoes
+        self._relogio = relogio
+        self._lock = threading.Lock()
+        self._atual = IntervaloMetricas(relogio())
+        self._encerrados: List[Dict[str, Any]] = []
+        self._ultima_limpeza: Optional[datetime] = None
+
+    # ============= REGISTRO =============
+
+    def registrar_requisicao(
+        self, status: str, latencia_s: float, mensagens: int = 1
+    ) -> None:
+        """
+        Registra uma requisição à API de e-mail.
+
+        Args:
+            status: Código HTTP ("201", "429"...) ou STATUS_TIMEOUT,
+                STATUS_ERRO_CONEXAO, STATUS_CIRCUITO_ABERTO
+            latencia_s: Duração da requisição
+            mensagens: Destinatários na requisição (contados como enviados se 2xx)
+        """
+        with self._lock:
+            intervalo = self._intervalo_atual()
+            intervalo.por_status[status] = intervalo.por_status.get(status, 0) + 1
+            if status == STATUS_CIRCUITO_ABERTO:
+                return
+            intervalo.requisicoes += 1
+            intervalo.latencia_total += latencia_s
+            intervalo.latencia_max = max(intervalo.latencia_max, latencia_s)
+            if len(intervalo.latencias) < LATENCIAS_MAXIMAS_POR_INTERVALO:
+                intervalo.latencias.append(latencia_s)
+            if status.startswith("2"):
+                intervalo.mensagens += mensagens
+
+    def registrar_retentativa(self) -> None:
+        """Registra a repetição de uma requisição (ex.: após 429)."""
+        with self._lock:
+            self._intervalo_atual().retentativas += 1
+
+    def registrar_espera_fila(self, esperas_s: List[float]) -> None:
+        """Registra quanto tempo as mensagens enviadas esperaram na fila."""
+        if not esperas_s:
+            return
+        with self._lock:
+            intervalo = self._intervalo_atual()
+            intervalo.esperas += len(esperas_s)
+            intervalo.espera_total += sum(esperas_s)
+            intervalo.espera_max = max(intervalo.espera_max, max(esperas_s))
+
+    def _intervalo_atual(self) -> IntervaloMetricas:
+        """Encerra o intervalo vencido e retorna o atual (chamar com o lock)."""
+        agora = self._relogio()
+        if (agora - self._atual.inicio).total_seconds() >= self.intervalo_s:
+            if not self._atual.vazio:
+                self._encerrados.append(self._atual.como_registro(agora))
+            self._atual = IntervaloMetricas(agora)
+        return self._atual
+
+    # ============= CONSULTA E PERSISTÊNCIA =============
+
+    def resumo_atual(self) -> Dict[str, Any]:
+        """Retorna o intervalo em andamento no formato da tabela."""
+        with self._lock:
+            return self._intervalo_atual().como_registro(self._relogio())
+
+    def persistir(self) -> int:
+        """
+        Grava os intervalos encerrados e remove os antigos.
+
+        Returns:
+            Quantidade de intervalos gravados
+        """
+        from .db import get_email_metrica_repository
+
+        with self._lock:
+            self._intervalo_atual()
+            encerrados, self._encerrados = self._encerrados, []
+
+        agora = self._relogio()
+        limpar = (
+            self._ultima_limpeza is None
+            or (agora - self._ultima_limpeza).total_seconds() >= 3600
+        )
+        if not encerrados and not limpar:
+            return 0
+
+        session = self._sessao()
+        try:
+            repo = get_email_metrica_repository(session)
+            repo.add_bulk(encerrados)
+            if limpar:
+                repo.delete_before(
+                    agora - timedelta(days=settings.email_metrics_retention_days)
+                )
+                self._ultima_limpeza = agora
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            # Os intervalos voltam para a próxima tentativa
+            with self._lock:
+                self._encerrados[:0] = encerrados
+            logger.error(f"❌ Erro ao gravar métricas de e-mail: {e}")
+            return 0
+        finally:
+            session.close()
+        return len(encerrados)
+
+    def encerrar(self) -> None:
+        """Fecha o intervalo atual e grava tudo (usado na saída do processo)."""
+        with self._lock:
+            if not self._atual.vazio:
+                agora = self._relogio()
+                self._encerrados.append(self._atual.como_registro(agora))
+                self._atual = IntervaloMetricas(agora)
+        if self._encerrados:
+            self.persistir()
+
+    def _sessao(self) -> Session:
+        if self._fabrica_sessoes is None:
+            from .db import db_manager
+
+            self._fabrica_sessoes = db_manager.get_background_session_factory()
+        return self._fabrica_sessoes()
+
+
+def obter_serie(horas: float = 24) -> List[Dict[str, Any]]:
+    """
+    Retorna a série de métricas das últimas `horas`, incluindo o intervalo atual.
+
+    Cada ponto traz também `mensagens_por_segundo`.
+    """
+    from .db import db_manager, get_email_metrica_repository
+
+    with db_manager.get_db_session() as session:
+        serie = [
+            {
+                coluna: getattr(metrica, coluna)
+                for coluna in (
+                    "inicio",
+                    "duracao_s",
+                    "requisicoes",
+                    "mensagens",
+                    "por_status",
+                    "retentativas",
+                    "latencia_media_ms",
+                    "latencia_p95_ms",
+                    "latencia_max_ms",
+                    "espera_fila_media_s",
+                    "espera_fila_max_s",
+                )
+            }
+            for metrica in get_email_metrica_repository(session).get_since(
+                datetime.now() - timedelta(hours=horas)
+            )
+        ]
+
+    atual = metricas_email.resumo_atual()
+    if atual["requisicoes"] or atual["espera_fila_media_s"] is not None:
+        serie.append(atual)
+    for ponto in serie:
+        ponto["mensagens_por_segundo"] = round(
+            ponto["mensagens"] / ponto["duracao_s"], 2
+        )
+    return serie
+
+
+# Instância global
+metricas_email = ColetorMetricasEmail()
+atexit.register(metricas_email.encerrar)
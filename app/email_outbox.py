@@ -0,0 +1,542 @@
+"""
+Fila Persistente de E-mails (outbox)
+
+Os e-mails não são mais enviados durante a requisição do usuário: a inscrição
+e a validação apenas gravam a mensagem na tabela `email_outbox`, na mesma
+transação da operação (um INSERT barato). Uma thread em segundo plano lê a
+fila e envia as mensagens pelo ServicoEmail:
+
+- Mensagens que falham são reagendadas com backoff exponencial
+  (EMAIL_OUTBOX_BACKOFF_SECONDS, 2x, 4x... até EMAIL_OUTBOX_BACKOFF_MAX_SECONDS)
+- Após EMAIL_OUTBOX_MAX_ATTEMPTS tentativas a mensagem vai para a dead-letter
+  (status "falhou") e pode ser reprocessada pela Administração
+- Com o circuito de e-mail aberto nada é reservado, e as mensagens recusadas
+  enquanto ele abria são adiadas sem consumir tentativas; meio aberto, apenas
+  uma mensagem é reservada por vez
+- Mensagens que ficaram "enviando" por uma interrupção do processo voltam à
+  fila quando o processador inicia
+- O tempo de espera na fila entra nas métricas de envio, que a thread grava
+  periodicamente (app/email_metrics.py)
+
+O destinatário e os dados da mensagem são gravados criptografados.
+
+Uso:
+    from app.email_outbox import processador_outbox, TIPO_CERTIFICADO_LIBERADO
+
+    processador_outbox.enfileirar_lote(TIPO_CERTIFICADO_LIBERADO, destinatarios)
+"""
+
+import atexit
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .core import settings
+from .db import db_manager, get_email_outbox_repository
+from .email_dispatch import CIRCUITO_ABERTO, CIRCUITO_MEIO_ABERTO, CircuitoEmail
+from .email_metrics import metricas_email
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Tipos de mensagem
+TIPO_CONFIRMACAO_INSCRICAO = "confirmacao_inscricao"
+TIPO_CERTIFICADO_LIBERADO = "certificado_liberado"
+
+# Status das mensagens na fila
+STATUS_PENDENTE = "pendente"
+STATUS_ENVIANDO = "enviando"
+STATUS_ENVIADO = "enviado"
+STATUS_FALHOU = "falhou"
+
+# Intervalo mínimo (em segundos) entre as limpezas de mensagens enviadas
+OUTBOX_PURGE_INTERVAL = 3600
+
+
+def _criptografar_payload(payload: Dict[str, Any]) -> bytes:
+    from .services import servico_criptografia
+
+    return servico_criptografia.criptografar(json.dumps(payload, ensure_ascii=False))
+
+
+def _descriptografar_payload(dados: bytes) -> Dict[str, Any]:
+    from .services import servico_criptografia
+
+    return json.loads(servico_criptografia.descriptografar(dados))
+
+
+def calcular_proxima_tentativa(tentativas: int, agora: datetime) -> datetime:
+    """
+    Calcula o horário da próxima tentativa com backoff exponencial.
+
+    Args:
+        tentativas: Tentativas já realizadas (1 após a primeira falha)
+        agora: Horário da falha
+
+    Returns:
+        Horário a partir do qual a mensagem volta a ser enviada
+    """
+    atraso = min(
+        settings.email_outbox_backoff_seconds * 2 ** max(tentativas - 1, 0),
+        settings.email_outbox_backoff_max_seconds,
+    )
+    return agora + timedelta(seconds=atraso)
+
+
+def enviar_pelo_servico_email(mensagens: List[Dict[str, Any]]) -> List[int]:
+    """
+    Envia mensagens da fila pelo ServicoEmail.
+
+    Certificados liberados usam o envio em lote (messageVersions) ou, com
+    EMAIL_ATTACH_CERTIFICATES, o pipeline de certificados anexados; confirmações
+    de inscrição são enviadas individualmente pelo despachante concorrente.
+
+    Args:
+        mensagens: Dicionários com id, tipo e payload (descriptografado)
+
+    Returns:
+        IDs das mensagens enviadas com sucesso
+    """
+    from .services import servico_email
+
+    if not servico_email.is_configured():
+        raise RuntimeError("Serviço de e-mail não configurado")
+
+    enviados: List[int] = []
+
+    certificados = []
+    for m in mensagens:
+        if m["tipo"] != TIPO_CERTIFICADO_LIBERADO:
+            continue
+        # Sem e-mail não há envio: a mensagem é reagendada até a dead-letter
+        if not m["payload"].get("email"):
+            logger.warning(f"⚠️ Mensagem {m['id']} da fila sem e-mail de destino")
+            continue
+        certificados.append(m)
+    # Com EMAIL_ATTACH_CERTIFICATES, o PDF segue anexado (mensagens enfileiradas
+    # antes da opção, sem participante_id, continuam apenas com o link)
+    anexados = []
+    if settings.email_attach_certificates:
+        anexados = [m for m in certificados if m["payload"].get("participante_id")]
+        certificados = [m for m in certificados if m not in anexados]
+    for grupo, enviar in (
+        (anexados, servico_email.enviar_certificados_anexados),
+        (certificados, servico_email.enviar_certificados_liberados),
+    ):
+        if grupo:
+            # Falhas identificadas pelo ID da mensagem: o mesmo e-mail pode estar
+            # em mais de uma mensagem do lote
+            resultado = enviar(
+                [{**m["payload"], "mensagem_id": m["id"]} for m in grupo],
+                identificar=lambda dest: str(dest["mensagem_id"]),
+            )
+            falhados = set(resultado.falhados)
+            enviados += [m["id"] for m in grupo if str(m["id"]) not in falhados]
+
+    confirmacoes = [m for m in mensagens if m["tipo"] == TIPO_CONFIRMACAO_INSCRICAO]
+    if confirmacoes:
+        resultado = servico_email.despachante.despachar(
+            confirmacoes,
+            lambda m: servico_email.enviar_email_confirmacao_inscricao(
+                m["payload"]["nome"], m["payload"]["email"], m["payload"]["dados"]
+            ),
+            identificar=lambda m: str(m["id"]),
+        )
+        falhados = set(resultado.falhados)
+        enviados += [m["id"] for m in confirmacoes if str(m["id"]) not in falhados]
+
+    return enviados
+
+
+class ProcessadorOutbox:
+    """Fila persistente de e-mails com envio em segundo plano."""
+
+    def __init__(
+        self,
+        fabrica_sessoes: Optional[Callable[[], Session]] = None,
+        enviar: Optional[Callable[[List[Dict[str, Any]]], List[int]]] = None,
+        intervalo: Optional[float] = None,
+        tamanho_lote: Optional[int] = None,
+        max_tentativas: Optional[int] = None,
+        iniciar_automaticamente: bool = True,
+        circuito: Optional[CircuitoEmail] = None,
+    ):
+        """
+        Args:
+            fabrica_sessoes: Factory de sessões do processador (padrão: banco configurado)
+            enviar: Função que envia as mensagens e retorna os IDs enviados
+                (padrão: enviar_pelo_servico_email)
+            intervalo: Segundos entre as verificações da fila (EMAIL_OUTBOX_POLL_SECONDS)
+            tamanho_lote: Mensagens lidas da fila por ciclo (EMAIL_OUTBOX_BATCH_SIZE)
+            max_tentativas: Tentativas antes da dead-letter (EMAIL_OUTBOX_MAX_ATTEMPTS)
+            iniciar_automaticamente: Inicia a thread ao enfileirar a primeira mensagem
+            circuito: Circuit breaker consultado antes de reservar mensagens
+                (padrão: o do despachante do ServicoEmail, com o envio padrão)
+        """
+        self._fabrica_sessoes = fabrica_sessoes
+        self._enviar = enviar or enviar_pelo_servico_email
+        self.intervalo = (
+            intervalo if intervalo is not None else settings.email_outbox_poll_seconds
+        )
+        self.tamanho_lote = tamanho_lote or settings.email_outbox_batch_size
+        self.max_tentativas = max_tentativas or settings.email_outbox_max_attempts
+        self.iniciar_automaticamente = iniciar_automaticamente
+        self._circuito = circuito
+
+        self._condicao = threading.Condition()
+        self._lock_processamento = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._parando = False
+        self._sinalizado = False
+        self._ultima_limpeza: Optional[datetime] = None
+
+    # ============= ENFILEIRAMENTO =============
+
+    def enfileirar(
+        self, tipo: str, payload: Dict[str, Any], sessao: Optional[Session] = None
+    ) -> int:
+        """
+        Enfileira uma mensagem.
+
+        Args:
+            tipo: Tipo da mensagem (TIPO_CONFIRMACAO_INSCRICAO, TIPO_CERTIFICADO_LIBERADO)
+            payload: Destinatário (nome, email) e dados da mensagem
+            sessao: Grava na transação do chamador; o processador é acordado no commit
+
+        Returns:
+            Quantidade de mensagens enfileiradas
+        """
+        return self.enfileirar_lote(tipo, [payload], sessao=sessao)
+
+    def enfileirar_lote(
+        self,
+        tipo: str,
+        payloads: List[Dict[str, Any]],
+        sessao: Optional[Session] = None,
+    ) -> int:
+        """
+        Enfileira várias mensagens do mesmo tipo em um único INSERT.
+
+        Args:
+            tipo: Tipo das mensagens
+            payloads: Destinatários (nome, email) e dados de cada mensagem
+            sessao: Grava na transação do chamador; o processador é acordado no commit
+
+        Returns:
+            Quantidade de mensagens enfileiradas
+        """
+        if not payloads:
+            return 0
+
+        registros = [
+            {"tipo": tipo, "payload_encrypted": _criptografar_payload(payload)}
+            for payload in payloads
+        ]
+
+        if sessao is not None:
+            get_email_outbox_repository(sessao).enqueue_bulk(registros)
+            event.listen(sessao, "after_commit", lambda _: self.notificar(), once=True)
+        else:
+            with db_manager.get_db_session() as session:
+                get_email_outbox_repository(session).enqueue_bulk(registros)
+            self.notificar()
+
+        logger.info(f"📧 {len(registros)} e-mail(s) enfileirado(s): {tipo}")
+        return len(registros)
+
+    # ============= PROCESSAMENTO =============
+
+    def processar_pendentes(self) -> Dict[str, int]:
+        """
+        Envia as mensagens prontas para envio, em lotes, até esvaziar a fila.
+
+        Returns:
+            Dicionário com enviados, reagendados e falhas (dead-letter)
+        """
+        totais = {"enviados": 0, "reagendados": 0, "falhas": 0}
+        with self._lock_processamento:
+            while not self._parando:
+                resultado = self._processar_lote()
+                if resultado is None:
+                    break
+                for chave, valor in resultado.items():
+                    totais[chave] += valor
+        if totais["enviados"] or totais["reagendados"] or totais["falhas"]:
+            logger.info(
+                f"📧 Fila de e-mails: {totais['enviados']} enviados, "
+                f"{totais['reagendados']} reagendados, {totais['falhas']} na dead-letter"
+            )
+        return totais
+
+    def _processar_lote(self) -> Optional[Dict[str, int]]:
+        """Reserva, envia e registra o resultado de um lote. Retorna None se a fila está vazia."""
+        circuito = self._circuito_envio()
+        estado_circuito = circuito.consultar() if circuito else None
+        if estado_circuito == CIRCUITO_ABERTO:
+            # Provedor fora do ar: as mensagens ficam na fila sem gastar tentativas
+            return None
+        # Meio aberto, só a requisição de teste passa: reserva uma única mensagem
+        limite = 1 if estado_circuito == CIRCUITO_MEIO_ABERTO else self.tamanho_lote
+
+        session = self._sessao()
+        try:
+            claimed = get_email_outbox_repository(session).claim_due(
+                datetime.now(), limite
+            )
+            reservadas = [
+                (m.id, m.tipo, m.payload_encrypted, m.tentativas) for m in claimed
+            ]
+            criadas_em = {m.id: m.criado_em for m in claimed}
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        if not reservadas:
+            return None
+
+        mensagens = []
+        erros: Dict[int, str] = {}
+        invalidas = set()
+        for mensagem_id, tipo, dados, _ in reservadas:
+            try:
+                payload = _descriptografar_payload(dados)
+            except Exception as e:
+                erros[mensagem_id] = f"Payload inválido: {e}"
+                invalidas.add(mensagem_id)
+                continue
+            mensagens.append({"id": mensagem_id, "tipo": tipo, "payload": payload})
+
+        enviados: List[int] = []
+        try:
+            enviados = self._enviar(mensagens) if mensagens else []
+        except Exception as e:
+            logger.error(f"❌ Erro ao enviar lote da fila de e-mails: {e}")
+            for mensagem in mensagens:
+                erros.setdefault(mensagem["id"], str(e))
+
+        enviados_set = set(enviados)
+        agora = datetime.now()
+        metricas_email.registrar_espera_fila(
+            [
+                (
+                    agora - datetime.fromisoformat(criadas_em[mensagem_id])
+                ).total_seconds()
+                for mensagem_id in enviados_set
+                if criadas_em.get(mensagem_id)
+            ]
+        )
+        resultado = {"enviados": len(enviados_set), "reagendados": 0, "falhas": 0}
+        # Se o circuito abriu durante o lote, as recusas são do provedor fora do ar:
+        # as mensagens são adiadas até a reabertura sem consumir tentativas
+        circuito_aberto = (
+            circuito is not None and circuito.consultar() == CIRCUITO_ABERTO
+        )
+
+        session = self._sessao()
+        try:
+            repo = get_email_outbox_repository(session)
+            repo.mark_sent(list(enviados_set))
+            for mensagem_id, _, _, tentativas in reservadas:
+                if mensagem_id in enviados_set:
+                    continue
+                erro = erros.get(mensagem_id, "Envio recusado pelo provedor")
+                if circuito_aberto and mensagem_id not in invalidas:
+                    repo.mark_retry(
+                        mensagem_id,
+                        agora + timedelta(seconds=circuito.tempo_abertura),
+                        erro,
+                        contar_tentativa=False,
+                    )
+                    resultado["reagendados"] += 1
+                    continue
+                tentativas += 1
+                if tentativas >= self.max_tentativas:
+                    repo.mark_retry(mensagem_id, None, erro)
+                    resultado["falhas"] += 1
+                else:
+                    repo.mark_retry(
+                        mensagem_id, calcular_proxima_tentativa(tentativas, agora), erro
+                    )
+                    resultado["reagendados"] += 1
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        return resultado
+
+    def _circuito_envio(self) -> Optional[CircuitoEmail]:
+        """Circuit breaker do envio; com o envio padrão, o do despachante do ServicoEmail."""
+        if self._circuito is None and self._enviar is enviar_pelo_servico_email:
+            from .services import servico_email
+
+            self._circuito = servico_email.despachante.circuito
+        return self._circuito
+
+    def _sessao(self) -> Session:
+        if self._fabrica_sessoes is None:
+            self._fabrica_sessoes = db_manager.get_background_session_factory()
+        return self._fabrica_sessoes()
+
+    def _limpar_enviados(self) -> None:
+        """Remove periodicamente as mensagens enviadas há mais de EMAIL_OUTBOX_RETENTION_DAYS."""
+        agora = datetime.now()
+        if self._ultima_limpeza and (
+            (agora - self._ultima_limpeza).total_seconds() < OUTBOX_PURGE_INTERVAL
+        ):
+            return
+        self._ultima_limpeza = agora
+
+        session = self._sessao()
+        try:
+            removidos = get_email_outbox_repository(session).delete_sent_before(
+                agora - timedelta(days=settings.email_outbox_retention_days)
+            )
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        if removidos:
+            logger.info(f"🗑️ {removidos} e-mails enviados removidos da fila")
+
+    # ============= THREAD =============
+
+    def notificar(self) -> None:
+        """Acorda o processador para enviar as mensagens recém-enfileiradas."""
+        with self._condicao:
+            self._sinalizado = True
+            self._condicao.notify()
+        if self.iniciar_automaticamente:
+            self.iniciar()
+
+    def iniciar(self) -> None:
+        """Inicia a thread do processador (idempotente)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._condicao:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._parando = False
+            self._thread = threading.Thread(
+                target=self._executar, name="email-outbox", daemon=True
+            )
+            self._thread.start()
+
+    def parar(self, timeout: float = 5.0) -> None:
+        """Encerra a thread do processador. Mensagens não enviadas continuam na fila."""
+        with self._condicao:
+            self._parando = True
+            self._condicao.notify()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _executar(self) -> None:
+        """Laço da thread: processa a fila quando notificado ou a cada intervalo."""
+        try:
+            session = self._sessao()
+            try:
+                devolvidas = get_email_outbox_repository(session).reset_in_flight()
+                session.commit()
+            finally:
+                session.close()
+            if devolvidas:
+                logger.warning(
+                    f"⚠️ {devolvidas} e-mails interrompidos devolvidos à fila"
+                )
+        except Exception as e:
+            logger.error(f"❌ Erro ao recuperar a fila de e-mails: {e}")
+
+        while True:
+            try:
+                self.processar_pendentes()
+                self._limpar_enviados()
+                metricas_email.persistir()
+            except Exception as e:
+                logger.error(f"❌ Erro no processador da fila de e-mails: {e}")
+
+            with self._condicao:
+                self._condicao.wait_for(
+                    lambda: self._parando or self._sinalizado, timeout=self.intervalo
+                )
+                self._sinalizado = False
+                if self._parando:
+                    return
+
+
+def obter_status_fila() -> Dict[str, Any]:
+    """
+    Retorna a profundidade da fila de e-mails.
+
+    Returns:
+        Dicionário com a quantidade por status (pendente, enviando, enviado,
+        falhou) e a data da mensagem pendente mais antiga
+    """
+    with db_manager.get_db_session() as session:
+        repo = get_email_outbox_repository(session)
+        contagem = repo.get_status_counts()
+        mais_antiga = repo.get_oldest_pending()
+
+    status = {
+        s: contagem.get(s, 0)
+        for s in (STATUS_PENDENTE, STATUS_ENVIANDO, STATUS_ENVIADO, STATUS_FALHOU)
+    }
+    status["pendente_mais_antigo"] = mais_antiga
+    return status
+
+
+def listar_falhas(limite: int = 100) -> List[Dict[str, Any]]:
+    """Retorna as mensagens da dead-letter com o destinatário descriptografado."""
+    with db_manager.get_db_session() as session:
+        mensagens = get_email_outbox_repository(session).get_failed(limite)
+        falhas = []
+        for mensagem in mensagens:
+            try:
+                email = _descriptografar_payload(mensagem.payload_encrypted).get(
+                    "email"
+                )
+            except Exception:
+                email = None
+            falhas.append(
+                {
+                    "id": mensagem.id,
+                    "tipo": mensagem.tipo,
+                    "email": email,
+                    "tentativas": mensagem.tentativas,
+                    "ultimo_erro": mensagem.ultimo_erro,
+                    "criado_em": mensagem.criado_em,
+                }
+            )
+    return falhas
+
+
+def reprocessar_falhas(ids: Optional[List[int]] = None) -> int:
+    """
+    Devolve mensagens da dead-letter à fila.
+
+    Args:
+        ids: Mensagens a reprocessar (padrão: todas)
+
+    Returns:
+        Quantidade de mensagens devolvidas à fila
+    """
+    with db_manager.get_db_session() as session:
+        devolvidas = get_email_outbox_repository(session).requeue_failed(ids)
+    processador_outbox.notificar()
+    return devolvidas
+
+
+# Instância global do processador da fila de e-mails
+processador_outbox = ProcessadorOutbox()
+atexit.register(processador_outbox.parar)
@@ -0,0 +1,248 @@
+"""
+Modelos de e-mail carregados do disco (templates/emails).
+
+Cada mensagem tem uma versão HTML (`<nome>.html`) e uma versão em texto puro
+(`<nome>.txt`). Um ano de evento pode ter modelos próprios em
+`templates/emails/<ano>/`; na ausência deles, valem os modelos da raiz.
+
+Os modelos usam a sintaxe de string.Template ($campo ou ${campo}) e são
+compilados uma única vez em uma lista de trechos fixos e campos. A compilação
+fica em cache até o arquivo ser alterado (mtime), de modo que editar um modelo
+não exige reiniciar a aplicação.
+
+Em envios em lote, `preencher` substitui os campos comuns a todos os
+destinatários e devolve um modelo menor, em que restam apenas os campos
+individuais.
+"""
+
+import html
+import logging
+import os
+import threading
+from pathlib import Path
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .core import settings
+
+logger = logging.getLogger(__name__)
+
+# Mensagens disponíveis (nome dos arquivos, sem extensão)
+MODELO_CONFIRMACAO_INSCRICAO = "confirmacao_inscricao"
+MODELO_CERTIFICADO_LIBERADO = "certificado_liberado"
+
+# Formatos de conteúdo (EMAIL_CONTENT_FORMAT)
+FORMATO_HTML = "html"
+FORMATO_TEXTO = "texto"
+FORMATO_AMBOS = "ambos"
+
+# Extensão do arquivo e campo da API Brevo de cada versão do conteúdo
+VERSOES_CONTEUDO = {
+    ".html": "htmlContent",
+    ".txt": "textContent",
+}
+
+# Trecho fixo (str) ou nome de campo (tupla de um elemento)
+Trecho = Union[str, Tuple[str]]
+
+
+class ModeloEmail:
+    """Modelo compilado: trechos fixos intercalados com campos."""
+
+    def __init__(self, trechos: List[Trecho], escapar_html: bool, origem: str):
+        self._trechos = trechos
+        self.escapar_html = escapar_html
+        self.origem = origem
+
+    @classmethod
+    def compilar(
+        cls, texto: str, escapar_html: bool = False, origem: str = "<texto>"
+    ) -> "ModeloEmail":
+        """
+        Compila o texto de um modelo.
+
+        Args:
+            texto: Conteúdo com campos $campo ou ${campo} ($$ para um $ literal)
+            escapar_html: Escapa os valores substituídos (modelos HTML)
+            origem: Identificação do modelo nas mensagens de erro
+
+        Returns:
+            ModeloEmail compilado
+
+        Raises:
+            ValueError: Se houver um campo mal formado
+        """
+        trechos: List[Trecho] = []
+        fixo: List[str] = []
+        posicao = 0
+        for marca in Template.pattern.finditer(texto):
+            fixo.append(texto[posicao : marca.start()])
+            posicao = marca.end()
+            if marca.group("escaped") is not None:
+                fixo.append("$")
+                continue
+            campo = marca.group("named") or marca.group("braced")
+            if campo is None:
+                linha = texto.count("\n", 0, marca.start()) + 1
+                raise ValueError(f"Campo inválido no modelo {origem}, linha {linha}")
+            if fixo:
+                trechos.append("".join(fixo))
+                fixo = []
+            trechos.append((campo,))
+        fixo.append(texto[posicao:])
+        trechos.append("".join(fixo))
+        return cls([t for t in trechos if t != ""], escapar_html, origem)
+
+    @property
+    def campos(self) -> set:
+        """Campos ainda não preenchidos."""
+        return {t[0] for t in self._trechos if isinstance(t, tuple)}
+
+    def preencher(self, **valores: Any) -> "ModeloEmail":
+        """
+        Substitui parte dos campos e devolve um novo modelo com os demais.
+
+        Trechos fixos consecutivos são unidos, então renderizar o modelo
+        resultante custa apenas a substituição dos campos restantes.
+        """
+        trechos: List[Trecho] = []
+        for trecho in self._trechos:
+            if isinstance(trecho, tuple) and trecho[0] in valores:
+                trecho = self._formatar(valores[trecho[0]])
+            if isinstance(trecho, str) and trechos and isinstance(trechos[-1], str):
+                trechos[-1] += trecho
+            else:
+                trechos.append(trecho)
+        return ModeloEmail(trechos, self.escapar_html, self.origem)
+
+    def renderizar(self, **valores: Any) -> str:
+        """
+        Gera o texto final.
+
+        Raises:
+            KeyError: Se faltar o valor de algum campo
+        """
+        try:
+            return "".join(
+                (
+                    self._formatar(valores[trecho[0]])
+                    if isinstance(trecho, tuple)
+                    else trecho
+                )
+                for trecho in self._trechos
+            )
+        except KeyError as e:
+            raise KeyError(f"Campo {e} sem valor no modelo {self.origem}") from None
+
+    def _formatar(self, valor: Any) -> str:
+        texto = str(valor)
+        return html.escape(texto) if self.escapar_html else texto
+
+
+class RepositorioModelos:
+    """Carrega os modelos de e-mail e mantém a compilação em cache por mtime."""
+
+    def __init__(self, diretorio: Optional[Path] = None):
+        """
+        Args:
+            diretorio: Pasta dos modelos (padrão: EMAIL_TEMPLATES_DIR)
+        """
+        self._diretorio = diretorio
+        self._cache: Dict[Path, Tuple[int, ModeloEmail]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def diretorio(self) -> Path:
+        return Path(self._diretorio or settings.email_templates_dir)
+
+    def caminho(self, nome: str, ano: Optional[int] = None) -> Path:
+        """
+        Resolve o arquivo de um modelo, preferindo o do ano do evento.
+
+        Args:
+            nome: Nome do arquivo (ex.: "certificado_liberado.html")
+            ano: Ano do evento
+
+        Returns:
+            Caminho do modelo
+        """
+        if ano is not None:
+            especifico = self.diretorio / str(ano) / nome
+            if especifico.is_file():
+                return especifico
+        return self.diretorio / nome
+
+    def obter(self, nome: str, ano: Optional[int] = None) -> ModeloEmail:
+        """
+        Retorna o modelo compilado, recompilando se o arquivo mudou.
+
+        Raises:
+            FileNotFoundError: Se o modelo não existir
+        """
+        caminho = self.caminho(nome, ano)
+        mtime = os.stat(caminho).st_mtime_ns
+
+        with self._lock:
+            em_cache = self._cache.get(caminho)
+            if em_cache and em_cache[0] == mtime:
+                return em_cache[1]
+
+        modelo = ModeloEmail.compilar(
+            caminho.read_text(encoding="utf-8"),
+            escapar_html=caminho.suffix == ".html",
+            origem=str(caminho),
+        )
+        with self._lock:
+            self._cache[caminho] = (mtime, modelo)
+        logger.debug(f"📧 Modelo de e-mail compilado: {caminho}")
+        return modelo
+
+    def obter_conteudo(
+        self, nome: str, ano: Optional[int] = None, formato: Optional[str] = None
+    ) -> Dict[str, ModeloEmail]:
+        """
+        Retorna os modelos de uma mensagem no formato configurado.
+
+        Args:
+            nome: Nome da mensagem (ex.: MODELO_CERTIFICADO_LIBERADO)
+            ano: Ano do evento
+            formato: "html", "texto" ou "ambos" (padrão: EMAIL_CONTENT_FORMAT)
+
+        Returns:
+            Dicionário {campo da API Brevo: modelo}, ex.: {"htmlContent": ...}
+        """
+        formato = formato or settings.email_content_format
+        if formato not in (FORMATO_HTML, FORMATO_TEXTO, FORMATO_AMBOS):
+            raise ValueError(f"Formato de e-mail inválido: {formato}")
+
+        extensoes = {
+            FORMATO_HTML: [".html"],
+            FORMATO_TEXTO: [".txt"],
+            FORMATO_AMBOS: [".html", ".txt"],
+        }[formato]
+        return {
+            VERSOES_CONTEUDO[extensao]: self.obter(nome + extensao, ano)
+            for extensao in extensoes
+        }
+
+    def limpar_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+def preencher_conteudo(
+    conteudo: Dict[str, ModeloEmail], **valores: Any
+) -> Dict[str, ModeloEmail]:
+    """Aplica ModeloEmail.preencher a todas as versões do conteúdo."""
+    return {campo: modelo.preencher(**valores) for campo, modelo in conteudo.items()}
+
+
+def renderizar_conteudo(
+    conteudo: Dict[str, ModeloEmail], **valores: Any
+) -> Dict[str, str]:
+    """Renderiza todas as versões do conteúdo ({"htmlContent": "...", ...})."""
+    return {campo: modelo.renderizar(**valores) for campo, modelo in conteudo.items()}
+
+
+# Instância global
+modelos_email = RepositorioModelos()
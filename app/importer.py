@@ -0,0 +1,444 @@
+"""
+Importação em Lote de Participantes
+
+Este módulo implementa o pipeline de importação de participantes a partir de
+arquivos CSV ou XLSX, usado pela página de administração e pelo script
+utils/import_participants.py:
+
+- Leitura em streaming (o arquivo nunca é carregado inteiro em memória)
+- Validação por linha com relatório de erros
+- Hash e criptografia do email (e criptografia do nome) em paralelo, por lote
+- Deduplicação contra o banco com uma query por lote (email_hash IN ...)
+- Inserção em massa com uma transação por lote
+"""
+
+import csv
+import io
+import logging
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import insert
+
+from .archive import obter_eventos_arquivados
+from .audit import registrador_auditoria
+from .db import (
+    db_manager,
+    get_cidade_repository,
+    get_evento_repository,
+    get_funcao_repository,
+    get_participante_repository,
+)
+from .models import Evento, Participante
+from .services import servico_criptografia
+from .utils import validar_email
+
+# Check if openpyxl is available (necessário apenas para arquivos .xlsx)
+try:
+    import openpyxl
+
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Quantidade de linhas processadas (validadas, criptografadas e inseridas) por transação
+IMPORT_BATCH_SIZE = 1000
+
+# Threads usadas para criptografar e gerar hashes de cada lote
+IMPORT_WORKERS = 4
+
+# Nomes de colunas aceitos (normalizados: minúsculas, sem acentos) para cada campo
+COLUNAS_IMPORTACAO = {
+    "nome": ("nome", "nome completo", "nome_completo"),
+    "email": ("email", "e-mail", "e mail"),
+    "cidade": ("cidade", "cidade-uf", "cidade/uf"),
+    "funcao": ("funcao", "função"),
+    "datas": ("datas", "data", "datas participacao", "datas_participacao"),
+    "titulo": ("titulo", "titulo apresentacao", "titulo_apresentacao"),
+}
+
+
+def _normalizar(texto: Any) -> str:
+    """Normaliza texto para comparação: minúsculas, sem acentos e sem espaços extras."""
+    if texto is None:
+        return ""
+    texto = unicodedata.normalize("NFKD", str(texto))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(texto.lower().split())
+
+
+def _mapear_cabecalho(cabecalho: List[Any]) -> Dict[str, int]:
+    """Mapeia cada campo conhecido para o índice da coluna correspondente no arquivo."""
+    indices = {}
+    normalizados = [_normalizar(c) for c in cabecalho]
+    for campo, aliases in COLUNAS_IMPORTACAO.items():
+        for i, coluna in enumerate(normalizados):
+            if coluna in aliases:
+                indices[campo] = i
+                break
+    return indices
+
+
+def _ler_linhas_csv(arquivo: BinaryIO) -> Iterator[List[Any]]:
+    """Lê um CSV linha a linha, detectando o separador (vírgula ou ponto e vírgula)."""
+    texto = io.TextIOWrapper(arquivo, encoding="utf-8-sig", newline="")
+    amostra = texto.read(4096)
+    texto.seek(0)
+    try:
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=",;")
+    except csv.Error:
+        dialeto = csv.excel
+    yield from csv.reader(texto, dialeto)
+    texto.detach()
+
+
+def _ler_linhas_xlsx(arquivo: BinaryIO) -> Iterator[List[Any]]:
+    """Lê a primeira planilha de um XLSX em modo somente leitura (streaming)."""
+    if not OPENPYXL_AVAILABLE:
+        raise ValueError(
+            "Importação de arquivos .xlsx requer a biblioteca openpyxl. "
+            "Instale com: pip install openpyxl"
+        )
+
+    workbook = openpyxl.load_workbook(arquivo, read_only=True, data_only=True)
+    try:
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            yield list(row)
+    finally:
+        workbook.close()
+
+
+def ler_linhas_arquivo(arquivo: BinaryIO, nome_arquivo: str) -> Iterator[List[Any]]:
+    """Retorna um iterador sobre as linhas do arquivo, escolhendo o leitor pela extensão."""
+    if nome_arquivo.lower().endswith(".xlsx"):
+        return _ler_linhas_xlsx(arquivo)
+    return _ler_linhas_csv(arquivo)
+
+
+def _parse_datas(valor: Any) -> str:
+    """
+    Converte as datas de participação para ISO separadas por vírgula.
+
+    Aceita DD/MM/YYYY, YYYY-MM-DD ou células de data do Excel.
+    """
+    if isinstance(valor, datetime):
+        return valor.date().isoformat()
+
+    datas = []
+    for d in str(valor).replace(";", ",").split(","):
+        d = d.strip()
+        if not d:
+            continue
+        try:
+            datas.append(datetime.strptime(d, "%d/%m/%Y").date().isoformat())
+        except ValueError:
+            try:
+                datas.append(datetime.fromisoformat(d).date().isoformat())
+            except ValueError:
+                raise ValueError(f"Data inválida: {d}. Use o formato DD/MM/YYYY")
+
+    if not datas:
+        raise ValueError("Nenhuma data de participação informada")
+    return ", ".join(datas)
+
+
+def _criptografar_linha(linha: Dict[str, Any]) -> Dict[str, Any]:
+    """Criptografa nome e email de uma linha validada e calcula o hash do email."""
+    linha["email_hash"] = servico_criptografia.gerar_hash_email(linha["email"])
+    linha["nome_completo_encrypted"] = servico_criptografia.criptografar_nome(
+        linha.pop("nome")
+    )
+    linha["email_encrypted"] = servico_criptografia.criptografar_email(
+        linha.pop("email")
+    )
+    return linha
+
+
+class ImportadorParticipantes:
+    """Pipeline de importação em lote de participantes para um evento."""
+
+    def __init__(
+        self,
+        evento_id: int,
+        funcao_padrao_id: Optional[int] = None,
+        validado: bool = False,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        workers: int = IMPORT_WORKERS,
+    ):
+        self.evento_id = evento_id
+        self.funcao_padrao_id = funcao_padrao_id
+        self.validado = validado
+        self.batch_size = batch_size
+        self.workers = workers
+
+        # Dados de referência carregados uma única vez por importação
+        with db_manager.get_db_session() as session:
+            evento = get_evento_repository(session).get_by_id(Evento, evento_id)
+            if not evento:
+                raise ValueError("Evento não encontrado")
+            if evento_id in obter_eventos_arquivados(session):
+                raise ValueError(
+                    f"O evento {evento.ano} está arquivado e não recebe novas inscrições"
+                )
+            self._datas_evento = set(evento.datas_evento or [])
+
+            # Nome sozinho só identifica a cidade se não houver homônimas em
+            # outros estados; nesse caso o valor é None e a linha precisa da UF
+            self._cidades: Dict[str, Optional[int]] = {}
+            for cidade in get_cidade_repository(session).get_all_ordered():
+                nome = _normalizar(cidade.nome)
+                if nome in self._cidades and self._cidades[nome] != cidade.id:
+                    self._cidades[nome] = None
+                else:
+                    self._cidades[nome] = cidade.id
+                for chave in (
+                    f"{cidade.nome}-{cidade.estado}",
+                    f"{cidade.nome}/{cidade.estado}",
+                    f"{cidade.nome} - {cidade.estado}",
+                ):
+                    self._cidades[_normalizar(chave)] = cidade.id
+
+            self._funcoes = {
+                _normalizar(funcao.nome_funcao): funcao.id
+                for funcao in get_funcao_repository(session).get_all_ordered()
+            }
+
+    def _validar_linha(
+        self, valores: List[Any], colunas: Dict[str, int]
+    ) -> Dict[str, Any]:
+        """Valida uma linha e retorna os campos prontos para inserção (exceto hash e criptografia)."""
+
+        def campo(nome: str) -> str:
+            indice = colunas.get(nome)
+            if indice is None or indice >= len(valores) or valores[indice] is None:
+                return ""
+            valor = valores[indice]
+            return valor if isinstance(valor, datetime) else str(valor).strip()
+
+        nome = campo("nome")
+        email = campo("email").lower()
+        if not nome:
+            raise ValueError("Nome não informado")
+        if not email or not validar_email(email):
+            raise ValueError(f"E-mail inválido: '{email}'")
+
+        chave_cidade = _normalizar(campo("cidade"))
+        if chave_cidade not in self._cidades:
+            raise ValueError(f"Cidade não cadastrada: '{campo('cidade')}'")
+        cidade_id = self._cidades[chave_cidade]
+        if cidade_id is None:
+            raise ValueError(
+                f"Cidade '{campo('cidade')}' existe em mais de um estado: "
+                "informe a UF (ex.: Cidade-UF)"
+            )
+
+        funcao_nome = campo("funcao")
+        funcao_id = (
+            self._funcoes.get(_normalizar(funcao_nome))
+            if funcao_nome
+            else self.funcao_padrao_id
+        )
+        if not funcao_id:
+            raise ValueError(f"Função não cadastrada: '{funcao_nome}'")
+
+        datas = _parse_datas(campo("datas"))
+        if not any(d.strip() in self._datas_evento for d in datas.split(",")):
+            raise ValueError(f"Datas fora do período do evento: {datas}")
+
+        return {
+            "nome": nome,
+            "email": email,
+            "titulo_apresentacao": campo("titulo") or None,
+            "evento_id": self.evento_id,
+            "cidade_id": cidade_id,
+            "funcao_id": funcao_id,
+            "datas_participacao": datas,
+            "validado": self.validado,
+        }
+
+    def _inserir_lote(
+        self, lote: List[Tuple[int, Dict[str, Any]]], executor: ThreadPoolExecutor
+    ) -> Tuple[int, List[int]]:
+        """
+        Calcula hashes e criptografa o lote em paralelo, deduplica contra o banco e
+        insere em uma transação.
+
+        Returns:
+            Tupla com (inseridos, números das linhas duplicadas no banco)
+        """
+        # Hash e criptografia rodam antes da transação, sem segurar o banco
+        registros = list(
+            executor.map(_criptografar_linha, [linha for _, linha in lote])
+        )
+
+        with db_manager.get_db_session() as session:
+            existentes = get_participante_repository(session).get_existing_email_hashes(
+                self.evento_id, [registro["email_hash"] for registro in registros]
+            )
+            duplicadas = [
+                numero
+                for (numero, _), registro in zip(lote, registros)
+                if registro["email_hash"] in existentes
+            ]
+            novos = [r for r in registros if r["email_hash"] not in existentes]
+
+            if novos:
+                data_inscricao = datetime.now().isoformat()
+                for registro in novos:
+                    registro["data_inscricao"] = data_inscricao
+                session.execute(insert(Participante), novos)
+
+        return len(novos), duplicadas
+
+    def importar(
+        self, linhas: Iterator[List[Any]], coordenador_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Executa a importação a partir de um iterador de linhas (a primeira é o cabeçalho).
+
+        Args:
+            linhas: Iterador de linhas, como retornado por ler_linhas_arquivo
+            coordenador_id: Coordenador responsável, para registro de auditoria
+
+        Returns:
+            Dicionário com total_linhas, importados, duplicados e erros
+            (lista de {"linha": número, "erro": mensagem})
+        """
+        inicio = datetime.now()
+        resultado = {"total_linhas": 0, "importados": 0, "duplicados": 0, "erros": []}
+
+        cabecalho = next(linhas, None)
+        if not cabecalho:
+            raise ValueError("Arquivo vazio")
+
+        colunas = _mapear_cabecalho(cabecalho)
+        obrigatorias = {"nome", "email", "cidade", "datas"}
+        if not self.funcao_padrao_id:
+            obrigatorias.add("funcao")
+        faltantes = obrigatorias - colunas.keys()
+        if faltantes:
+            raise ValueError(
+                f"Colunas obrigatórias ausentes: {', '.join(sorted(faltantes))}"
+            )
+
+        emails_vistos = set()
+        lote: List[Tuple[int, Dict[str, Any]]] = []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+
+            def processar_lote():
+                inseridos, duplicadas = self._inserir_lote(lote, executor)
+                resultado["importados"] += inseridos
+                resultado["duplicados"] += len(duplicadas)
+                for numero in duplicadas:
+                    resultado["erros"].append(
+                        {"linha": numero, "erro": "E-mail já inscrito neste evento"}
+                    )
+                lote.clear()
+
+            # Linha 1 é o cabeçalho
+            for numero, valores in enumerate(linhas, start=2):
+                if not any(v not in (None, "") for v in valores):
+                    continue  # Ignorar linhas em branco
+
+                resultado["total_linhas"] += 1
+                try:
+                    linha = self._validar_linha(valores, colunas)
+                except ValueError as e:
+                    resultado["erros"].append({"linha": numero, "erro": str(e)})
+                    continue
+
+                # O email já está normalizado (minúsculas), como no hash
+                if linha["email"] in emails_vistos:
+                    resultado["duplicados"] += 1
+                    resultado["erros"].append(
+                        {"linha": numero, "erro": "E-mail repetido no arquivo"}
+                    )
+                    continue
+                emails_vistos.add(linha["email"])
+
+                lote.append((numero, linha))
+                if len(lote) >= self.batch_size:
+                    processar_lote()
+
+            if lote:
+                processar_lote()
+
+        resultado["erros"].sort(key=lambda e: e["linha"])
+
+        if coordenador_id and resultado["importados"]:
+            registrador_auditoria.registrar(
+                coordenador_id=coordenador_id,
+                acao="IMPORT_PARTICIPANTES",
+                detalhes=(
+                    f"{resultado['importados']} participantes importados "
+                    f"para o evento {self.evento_id}"
+                ),
+            )
+
+        duracao = (datetime.now() - inicio).total_seconds()
+        logger.info(
+            f"📥 Importação concluída em {duracao:.1f}s: "
+            f"{resultado['importados']} importados, {resultado['duplicados']} duplicados, "
+            f"{len(resultado['erros'])} linhas com erro"
+        )
+        return resultado
+
+
+def importar_participantes(
+    arquivo: Union[str, Path, BinaryIO],
+    evento_id: int,
+    nome_arquivo: Optional[str] = None,
+    funcao_padrao_id: Optional[int] = None,
+    validado: bool = False,
+    coordenador_id: Optional[int] = None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Função de conveniência para importar participantes de um arquivo CSV ou XLSX.
+
+    Args:
+        arquivo: Caminho do arquivo ou objeto binário (ex.: upload do Streamlit)
+        evento_id: ID do evento de destino
+        nome_arquivo: Nome do arquivo (para detectar o formato quando arquivo é um objeto)
+        funcao_padrao_id: Função usada quando a coluna de função estiver ausente ou vazia
+        validado: Se os participantes importados já entram como validados
+        coordenador_id: Coordenador responsável, para registro de auditoria
+        batch_size: Linhas por transação
+
+    Returns:
+        Dicionário de resultado (ver ImportadorParticipantes.importar)
+    """
+    importador = ImportadorParticipantes(
+        evento_id,
+        funcao_padrao_id=funcao_padrao_id,
+        validado=validado,
+        batch_size=batch_size,
+    )
+
+    if isinstance(arquivo, (str, Path)):
+        with open(arquivo, "rb") as f:
+            return importador.importar(
+                ler_linhas_arquivo(f, str(arquivo)), coordenador_id
+            )
+
+    return importador.importar(
+        ler_linhas_arquivo(arquivo, nome_arquivo or getattr(arquivo, "name", "")),
+        coordenador_id,
+    )
+
+
+def gerar_relatorio_erros_csv(erros: List[Dict[str, Any]]) -> str:
+    """Gera o relatório de erros da importação em formato CSV."""
+    saida = io.StringIO()
+    writer = csv.writer(saida)
+    writer.writerow(["linha", "erro"])
+    for erro in erros:
+        writer.writerow([erro["linha"], erro["erro"]])
+    return saida.getvalue()
@@ -0,0 +1,252 @@
+"""
+Instrumentação de Consultas SQL
+
+Este módulo registra, via eventos da engine do SQLAlchemy, as consultas
+executadas em cada execução de página ou chamada de serviço:
+
+- Quantidade de consultas e tempo total
+- Consultas mais lentas
+- Log de consultas acima do limite (SQL_SLOW_QUERY_MS)
+- Detecção de N+1: o mesmo SQL repetido várias vezes na mesma medição
+
+Uso:
+    with medir_consultas("Participantes"):
+        main()
+
+    @instrumentar("baixar_certificado")
+    def baixar_certificado(...): ...
+"""
+
+import functools
+import logging
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Dict, Generator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .core import settings
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Quantidade de medições mantidas em memória para o painel de administração
+HISTORICO_MAXIMO = 100
+
+# Consultas mais lentas guardadas por medição
+CONSULTAS_LENTAS_POR_MEDICAO = 5
+
+# Tamanho máximo do SQL exibido em logs e no painel
+SQL_MAX_CHARS = 300
+
+
+class ColetorConsultas:
+    """Acumula as consultas executadas durante uma medição."""
+
+    def __init__(self, nome: str, pai: Optional["ColetorConsultas"] = None):
+        self.nome = nome
+        self.pai = pai
+        self.inicio = datetime.now()
+        self.total_consultas = 0
+        self.tempo_total_ms = 0.0
+        self.statements: Counter = Counter()
+        self.mais_lentas: List[Dict[str, Any]] = []
+
+    def registrar(self, statement: str, duracao_ms: float) -> None:
+        """Registra uma consulta nesta medição e nas medições externas."""
+        coletor = self
+        while coletor is not None:
+            coletor._registrar(statement, duracao_ms)
+            coletor = coletor.pai
+
+    def _registrar(self, statement: str, duracao_ms: float) -> None:
+        self.total_consultas += 1
+        self.tempo_total_ms += duracao_ms
+        self.statements[statement] += 1
+
+        self.mais_lentas.append({"sql": statement, "duracao_ms": duracao_ms})
+        self.mais_lentas.sort(key=lambda c: c["duracao_ms"], reverse=True)
+        del self.mais_lentas[CONSULTAS_LENTAS_POR_MEDICAO:]
+
+    def candidatos_n_mais_um(self) -> List[Dict[str, Any]]:
+        """Retorna os SQLs repetidos ao menos SQL_N_PLUS_ONE_THRESHOLD vezes."""
+        return [
+            {"sql": sql, "repeticoes": total}
+            for sql, total in self.statements.most_common()
+            if total >= settings.sql_n_plus_one_threshold
+        ]
+
+    def resumo(self) -> Dict[str, Any]:
+        """Retorna um dicionário com os números desta medição."""
+        return {
+            "nome": self.nome,
+            "inicio": self.inicio.isoformat(timespec="seconds"),
+            "total_consultas": self.total_consultas,
+            "tempo_total_ms": round(self.tempo_total_ms, 2),
+            "mais_lentas": [
+                {
+                    "sql": c["sql"][:SQL_MAX_CHARS],
+                    "duracao_ms": round(c["duracao_ms"], 2),
+                }
+                for c in self.mais_lentas
+            ],
+            "n_mais_um": [
+                {"sql": c["sql"][:SQL_MAX_CHARS], "repeticoes": c["repeticoes"]}
+                for c in self.candidatos_n_mais_um()
+            ],
+        }
+
+
+# Medição ativa no contexto atual (thread/sessão do Streamlit)
+_coletor_atual: ContextVar[Optional[ColetorConsultas]] = ContextVar(
+    "coletor_consultas", default=None
+)
+
+_historico: deque = deque(maxlen=HISTORICO_MAXIMO)
+_historico_lock = threading.Lock()
+
+
+# O início fica no contexto de execução, que é exclusivo de cada statement: a
+# conexão é compartilhada entre threads (StaticPool) e não pode guardar esse estado
+def _antes_de_executar(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._inicio_consulta = time.perf_counter()
+
+
+def _depois_de_executar(conn, cursor, statement, parameters, context, executemany):
+    inicio = getattr(context, "_inicio_consulta", None)
+    if inicio is None:
+        return
+    del context._inicio_consulta
+    duracao_ms = (time.perf_counter() - inicio) * 1000
+
+    if duracao_ms >= settings.sql_slow_query_ms:
+        logger.warning(
+            f"⚠️ Consulta lenta ({duracao_ms:.1f} ms): "
+            f"{' '.join(statement.split())[:SQL_MAX_CHARS]}"
+        )
+
+    coletor = _coletor_atual.get()
+    if coletor is not None:
+        coletor.registrar(statement, duracao_ms)
+
+
+def _ao_falhar(exception_context):
+    # Statements com erro não chegam a after_cursor_execute
+    context = exception_context.execution_context
+    if context is not None and hasattr(context, "_inicio_consulta"):
+        del context._inicio_consulta
+
+
+def instalar_instrumentacao(engine: Engine) -> None:
+    """Registra os eventos de instrumentação na engine (idempotente)."""
+    if not settings.sql_instrumentation_enabled:
+        return
+    if not event.contains(engine, "before_cursor_execute", _antes_de_executar):
+        event.listen(engine, "before_cursor_execute", _antes_de_executar)
+        event.listen(engine, "after_cursor_execute", _depois_de_executar)
+        event.listen(engine, "handle_error", _ao_falhar)
+
+
+@contextmanager
+def medir_consultas(nome: str) -> Generator[ColetorConsultas, None, None]:
+    """
+    Mede as consultas executadas dentro do bloco.
+
+    Medições podem ser aninhadas (ex.: um serviço chamado por uma página);
+    as consultas internas também contam na medição externa.
+
+    Args:
+        nome: Nome da página ou serviço medido
+
+    Yields:
+        O coletor da medição
+    """
+    coletor = ColetorConsultas(nome, pai=_coletor_atual.get())
+    token = _coletor_atual.set(coletor)
+    try:
+        yield coletor
+    finally:
+        _coletor_atual.reset(token)
+        _finalizar_medicao(coletor)
+
+
+def _finalizar_medicao(coletor: ColetorConsultas) -> None:
+    """Registra a medição no histórico e reporta candidatos a N+1."""
+    if not coletor.total_consultas:
+        return
+
+    for candidato in coletor.candidatos_n_mais_um():
+        logger.warning(
+            f"⚠️ Possível N+1 em '{coletor.nome}': SQL repetido "
+            f"{candidato['repeticoes']}x: "
+            f"{' '.join(candidato['sql'].split())[:SQL_MAX_CHARS]}"
+        )
+
+    logger.debug(
+        f"{coletor.nome}: {coletor.total_consultas} consultas "
+        f"em {coletor.tempo_total_ms:.1f} ms"
+    )
+
+    with _historico_lock:
+        _historico.append(coletor.resumo())
+
+
+def instrumentar(nome: Optional[str] = None) -> Callable:
+    """Decorator que mede as consultas de cada chamada da função."""
+
+    def decorator(func: Callable) -> Callable:
+        nome_medicao = nome or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with medir_consultas(nome_medicao):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def obter_historico() -> List[Dict[str, Any]]:
+    """Retorna as medições mais recentes, da mais nova para a mais antiga."""
+    with _historico_lock:
+        return list(reversed(_historico))
+
+
+def obter_resumo_por_nome() -> List[Dict[str, Any]]:
+    """Agrega o histórico por página/serviço."""
+    resumo: Dict[str, Dict[str, Any]] = {}
+    for medicao in obter_historico():
+        item = resumo.setdefault(
+            medicao["nome"],
+            {
+                "nome": medicao["nome"],
+                "execucoes": 0,
+                "consultas": 0,
+                "max_consultas": 0,
+                "tempo_total_ms": 0.0,
+                "n_mais_um": 0,
+            },
+        )
+        item["execucoes"] += 1
+        item["consultas"] += medicao["total_consultas"]
+        item["max_consultas"] = max(item["max_consultas"], medicao["total_consultas"])
+        item["tempo_total_ms"] += medicao["tempo_total_ms"]
+        item["n_mais_um"] += len(medicao["n_mais_um"])
+
+    for item in resumo.values():
+        item["media_consultas"] = round(item["consultas"] / item["execucoes"], 1)
+        item["tempo_total_ms"] = round(item["tempo_total_ms"], 2)
+    return sorted(resumo.values(), key=lambda i: i["consultas"], reverse=True)
+
+
+def limpar_historico() -> None:
+    """Remove todas as medições do histórico."""
+    with _historico_lock:
+        _historico.clear()
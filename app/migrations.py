@@ -0,0 +1,450 @@
+"""
+Migrações de Esquema Versionadas
+
+Este módulo substitui os scripts de migração avulsos por um executor único:
+
+- Tabela schema_version com as migrações já aplicadas
+- Migrações numeradas, aplicadas em ordem e idempotentes
+- Backfills de dados em lotes de tamanho limitado, cada lote em sua própria
+  transação junto com o checkpoint (schema_migration_checkpoints), de modo que
+  uma execução interrompida continua do último lote gravado e a aplicação
+  segue atendendo leituras entre os lotes
+- Migrações de manutenção (que reescrevem uma tabela inteira e seguram o
+  bloqueio de escrita do SQLite durante a cópia) só rodam quando pedidas
+  explicitamente, em uma janela de manutenção; até lá, o executor as pula e
+  segue com as demais
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    Table,
+    Text,
+    inspect,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.orm import Session
+
+from .db import db_manager
+from .models import Participante
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Linhas processadas por lote (e por transação) nos backfills
+MIGRATION_BATCH_SIZE = 500
+
+# Pausa entre lotes, em segundos, para liberar o banco para as leituras da aplicação
+MIGRATION_BATCH_PAUSE = 0.05
+
+# Tabelas de controle ficam fora de Base.metadata: não são modelos de domínio
+metadata_migracoes = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    metadata_migracoes,
+    Column("versao", Integer, primary_key=True),
+    Column("descricao", Text, nullable=False),
+    Column("aplicada_em", Text, nullable=False),
+)
+
+schema_migration_checkpoints = Table(
+    "schema_migration_checkpoints",
+    metadata_migracoes,
+    Column("versao", Integer, primary_key=True),
+    Column("ultimo_id", Integer, nullable=False),
+    Column("processados", Integer, nullable=False),
+    Column("atualizado_em", Text, nullable=False),
+)
+
+
+class Migracao:
+    """
+    Uma migração versionada.
+
+    Migrações de esquema implementam `aplicar(session)` e rodam em uma única
+    transação curta. Backfills implementam `processar_lote(session, ultimo_id,
+    tamanho)`, que processa até `tamanho` linhas com id > ultimo_id e retorna
+    (novo_ultimo_id, processados), ou None quando não há mais linhas.
+
+    Migrações de manutenção informam `manutencao(session)`, que retorna True
+    quando ainda há trabalho pesado a fazer no banco. Nesse caso o executor
+    as pula (ficam pendentes) e continua com as seguintes, a menos que a
+    janela de manutenção seja autorizada.
+    """
+
+    def __init__(
+        self,
+        versao: int,
+        descricao: str,
+        aplicar: Optional[Callable[[Session], None]] = None,
+        processar_lote: Optional[Callable[[Session, int, int], Optional[tuple]]] = None,
+        manutencao: Optional[Callable[[Session], bool]] = None,
+    ):
+        self.versao = versao
+        self.descricao = descricao
+        self.aplicar = aplicar
+        self.processar_lote = processar_lote
+        self.manutencao = manutencao
+
+    @property
+    def is_backfill(self) -> bool:
+        return self.processar_lote is not None
+
+
+# Registro de migrações, em ordem de versão
+MIGRACOES: List[Migracao] = []
+
+
+def migracao(
+    versao: int,
+    descricao: str,
+    backfill: bool = False,
+    manutencao: Optional[Callable[[Session], bool]] = None,
+):
+    """
+    Decorator que registra uma função como migração de esquema ou backfill.
+
+    `manutencao` marca a migração como passo de janela de manutenção (ver Migracao).
+    """
+
+    def decorator(func):
+        if any(m.versao == versao for m in MIGRACOES):
+            raise ValueError(f"Versão de migração duplicada: {versao}")
+        if backfill:
+            MIGRACOES.append(Migracao(versao, descricao, processar_lote=func))
+        else:
+            MIGRACOES.append(
+                Migracao(versao, descricao, aplicar=func, manutencao=manutencao)
+            )
+        MIGRACOES.sort(key=lambda m: m.versao)
+        return func
+
+    return decorator
+
+
+def _colunas(session: Session, tabela: str) -> List[str]:
+    """Retorna os nomes das colunas de uma tabela."""
+    return [c["name"] for c in inspect(session.connection()).get_columns(tabela)]
+
+
+def _indice(session: Session, tabela: str, nome: str) -> Optional[Dict]:
+    """Retorna a definição de um índice da tabela (None se não existir)."""
+    for indice in inspect(session.connection()).get_indexes(tabela):
+        if indice["name"] == nome:
+            return indice
+    return None
+
+
+# ============= MIGRAÇÕES =============
+
+
+@migracao(1, "Adicionar coluna hash_validacao em participantes")
+def _adicionar_hash_validacao(session: Session) -> None:
+    if "hash_validacao" not in _colunas(session, "participantes"):
+        session.execute(
+            text("ALTER TABLE participantes ADD COLUMN hash_validacao VARCHAR(64)")
+        )
+
+    # Bancos antigos podem ter o índice sem UNIQUE: recriar com a definição atual
+    indice = _indice(session, "participantes", "ix_participantes_hash_validacao")
+    if indice is not None and (
+        not indice["unique"] or indice["column_names"] != ["hash_validacao"]
+    ):
+        logger.warning(
+            "⚠️ Índice ix_participantes_hash_validacao difere do esperado; recriando"
+        )
+        session.execute(text("DROP INDEX ix_participantes_hash_validacao"))
+
+    session.execute(
+        text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_participantes_hash_validacao "
+            "ON participantes (hash_validacao)"
+        )
+    )
+
+
+@migracao(2, "Gerar hash_validacao dos participantes validados", backfill=True)
+def _gerar_hashes_validacao(
+    session: Session, ultimo_id: int, tamanho: int
+) -> Optional[tuple]:
+    from .services import servico_criptografia
+
+    rows = session.execute(
+        select(
+            Participante.id,
+            Participante.evento_id,
+            Participante.email_encrypted,
+            Participante.nome_completo_encrypted,
+            Participante.validado,
+            Participante.hash_validacao,
+        )
+        .where(Participante.id > ultimo_id)
+        .order_by(Participante.id)
+        .limit(tamanho)
+    ).all()
+    if not rows:
+        return None
+
+    valores = []
+    for row in rows:
+        if not row.validado or row.hash_validacao:
+            continue
+        try:
+            valores.append(
+                {
+                    "pid": row.id,
+                    "hash_validacao": servico_criptografia.gerar_hash_validacao_certificado(
+                        row.id,
+                        row.evento_id,
+                        servico_criptografia.descriptografar(row.email_encrypted),
+                        servico_criptografia.descriptografar(
+                            row.nome_completo_encrypted
+                        ),
+                    ),
+                }
+            )
+        except ValueError as e:
+            logger.warning(f"⚠️ Participante {row.id} sem hash de validação: {e}")
+
+    if valores:
+        session.execute(
+            text(
+                "UPDATE participantes SET hash_validacao = :hash_validacao WHERE id = :pid"
+            ),
+            valores,
+        )
+    return rows[-1].id, len(valores)
+
+
+def _tem_carga_horaria_calculada(session: Session) -> bool:
+    return "carga_horaria_calculada" in _colunas(session, "participantes")
+
+
+@migracao(
+    3,
+    "Remover coluna carga_horaria_calculada de participantes",
+    manutencao=_tem_carga_horaria_calculada,
+)
+def _remover_carga_horaria_calculada(session: Session) -> None:
+    if _tem_carga_horaria_calculada(session):
+        # DROP COLUMN reescreve a tabela inteira no SQLite, segurando o bloqueio de
+        # escrita durante a cópia: por isso é um passo de janela de manutenção.
+        # A coluna é anulável e não é mais lida, então pode ficar até lá.
+        session.execute(
+            text("ALTER TABLE participantes DROP COLUMN carga_horaria_calculada")
+        )
+
+
+@migracao(4, "Criar índice de listagem (evento_id, data_inscricao, id)")
+def _criar_indice_listagem(session: Session) -> None:
+    session.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_participantes_evento_inscricao_id "
+            "ON participantes (evento_id, data_inscricao, id)"
+        )
+    )
+
+
+@migracao(5, "Criar índices de navegação da auditoria")
+def _criar_indices_auditoria(session: Session) -> None:
+    for nome, colunas in (
+        ("ix_auditoria_timestamp_id", "timestamp, id"),
+        ("ix_auditoria_coordenador_timestamp_id", "coordenador_id, timestamp, id"),
+        ("ix_auditoria_acao_timestamp_id", "acao, timestamp, id"),
+    ):
+        session.execute(
+            text(f"CREATE INDEX IF NOT EXISTS {nome} ON auditoria ({colunas})")
+        )
+
+
+# ============= EXECUTOR =============
+
+
+def _garantir_tabelas_controle() -> None:
+    """Cria as tabelas de controle de versão se não existirem."""
+    if not db_manager._initialized:
+        db_manager.initialize()
+    metadata_migracoes.create_all(bind=db_manager.engine)
+
+
+def obter_versoes_aplicadas() -> Dict[int, str]:
+    """Retorna {versao: aplicada_em} das migrações já aplicadas."""
+    _garantir_tabelas_controle()
+    with db_manager.get_db_session() as session:
+        rows = session.execute(
+            select(schema_version.c.versao, schema_version.c.aplicada_em)
+        ).all()
+    return {versao: aplicada_em for versao, aplicada_em in rows}
+
+
+def obter_status_migracoes() -> List[Dict]:
+    """Retorna o status de cada migração registrada, incluindo checkpoints de backfills."""
+    aplicadas = obter_versoes_aplicadas()
+    with db_manager.get_db_session() as session:
+        checkpoints = {
+            row.versao: row
+            for row in session.execute(select(schema_migration_checkpoints)).all()
+        }
+
+    status = []
+    for m in MIGRACOES:
+        checkpoint = checkpoints.get(m.versao)
+        status.append(
+            {
+                "versao": m.versao,
+                "descricao": m.descricao,
+                "aplicada_em": aplicadas.get(m.versao),
+                "ultimo_id": checkpoint.ultimo_id if checkpoint else None,
+                "processados": checkpoint.processados if checkpoint else 0,
+                "manutencao": m.manutencao is not None,
+            }
+        )
+    return status
+
+
+def _registrar_versao(session: Session, m: Migracao) -> None:
+    session.execute(
+        insert(schema_version).values(
+            versao=m.versao,
+            descricao=m.descricao,
+            aplicada_em=datetime.now().isoformat(),
+        )
+    )
+
+
+def _executar_backfill(
+    m: Migracao, tamanho_lote: int, pausa: float, max_lotes: Optional[int]
+) -> bool:
+    """
+    Executa um backfill lote a lote a partir do último checkpoint.
+
+    Returns:
+        True se o backfill terminou, False se parou por max_lotes
+    """
+    with db_manager.get_db_session() as session:
+        checkpoint = session.execute(
+            select(schema_migration_checkpoints).where(
+                schema_migration_checkpoints.c.versao == m.versao
+            )
+        ).first()
+        if checkpoint is None:
+            session.execute(
+                insert(schema_migration_checkpoints).values(
+                    versao=m.versao,
+                    ultimo_id=0,
+                    processados=0,
+                    atualizado_em=datetime.now().isoformat(),
+                )
+            )
+            ultimo_id, processados = 0, 0
+        else:
+            ultimo_id, processados = checkpoint.ultimo_id, checkpoint.processados
+            logger.info(
+                f"🔄 Migração {m.versao}: retomando a partir do id {ultimo_id} "
+                f"({processados} linhas já processadas)"
+            )
+
+    lotes = 0
+    while max_lotes is None or lotes < max_lotes:
+        # Lote e checkpoint na mesma transação: uma interrupção nunca perde ou repete trabalho
+        with db_manager.get_db_session() as session:
+            resultado = m.processar_lote(session, ultimo_id, tamanho_lote)
+            if resultado is None:
+                _registrar_versao(session, m)
+                session.execute(
+                    schema_migration_checkpoints.delete().where(
+                        schema_migration_checkpoints.c.versao == m.versao
+                    )
+                )
+                return True
+
+            ultimo_id, processados_lote = resultado
+            processados += processados_lote
+            session.execute(
+                update(schema_migration_checkpoints)
+                .where(schema_migration_checkpoints.c.versao == m.versao)
+                .values(
+                    ultimo_id=ultimo_id,
+                    processados=processados,
+                    atualizado_em=datetime.now().isoformat(),
+                )
+            )
+
+        lotes += 1
+        logger.debug(f"Migração {m.versao}: lote até id {ultimo_id} gravado")
+        if pausa:
+            time.sleep(pausa)
+
+    logger.info(f"⏸️ Migração {m.versao} pausada no id {ultimo_id}")
+    return False
+
+
+def aplicar_migracoes(
+    ate_versao: Optional[int] = None,
+    tamanho_lote: int = MIGRATION_BATCH_SIZE,
+    pausa: float = MIGRATION_BATCH_PAUSE,
+    max_lotes: Optional[int] = None,
+    permitir_manutencao: bool = False,
+) -> List[int]:
+    """
+    Aplica, em ordem, as migrações pendentes.
+
+    Args:
+        ate_versao: Última versão a aplicar (padrão: todas)
+        tamanho_lote: Linhas por lote nos backfills
+        pausa: Pausa entre lotes, em segundos
+        max_lotes: Interrompe backfills após esta quantidade de lotes
+            (a próxima execução continua do checkpoint)
+        permitir_manutencao: Aplica também as migrações de manutenção que
+            reescrevem tabelas; sem isso, elas são puladas e ficam pendentes
+
+    Returns:
+        Lista das versões aplicadas nesta execução
+    """
+    aplicadas = obter_versoes_aplicadas()
+    novas = []
+
+    for m in MIGRACOES:
+        if m.versao in aplicadas:
+            continue
+        if ate_versao is not None and m.versao > ate_versao:
+            break
+
+        if m.manutencao is not None and not permitir_manutencao:
+            with db_manager.get_db_session() as session:
+                pendente = m.manutencao(session)
+            if pendente:
+                logger.warning(
+                    f"⏸️ Migração {m.versao} exige janela de manutenção "
+                    f"({m.descricao}); execute utils/migrate.py --manutencao"
+                )
+                continue
+
+        logger.info(f"🔧 Aplicando migração {m.versao}: {m.descricao}")
+        if m.is_backfill:
+            if not _executar_backfill(m, tamanho_lote, pausa, max_lotes):
+                break
+        else:
+            with db_manager.get_db_session() as session:
+                m.aplicar(session)
+                _registrar_versao(session, m)
+
+        novas.append(m.versao)
+        logger.info(f"✅ Migração {m.versao} aplicada")
+
+    return novas
+
+
+def obter_versao_atual() -> int:
+    """Retorna a maior versão de esquema aplicada (0 se nenhuma)."""
+    return max(obter_versoes_aplicadas(), default=0)
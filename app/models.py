@@ -15,9 +15,14 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     Date,
+    Float,
     Text,
     ForeignKey,
+    Index,
     LargeBinary,
+    MetaData,
+    Table,
+    UniqueConstraint,
     create_engine,
 )
 from sqlalchemy.dialects.sqlite import JSON
@@ -179,6 +184,12 @@ class Participante(Base):
     """Modelo SQLAlchemy para a tabela participantes."""
 
     __tablename__ = "participantes"
+    __table_args__ = (
+        # Índice para paginação por cursor (keyset) na listagem de participantes
+        Index(
+            "ix_participantes_evento_inscricao_id", "evento_id", "data_inscricao", "id"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     nome_completo_encrypted = Column(LargeBinary, nullable=False)
@@ -265,10 +276,88 @@ class Participante(Base):
         return ", ".join(datas_br)
 
 
+# ============= ARQUIVO DE EVENTOS ENCERRADOS =============
+
+# Nome do banco SQLite anexado (ATTACH) que guarda os participantes arquivados
+ESQUEMA_ARQUIVO = "arquivo"
+
+# Tabelas do banco de arquivo (metadata separada: só existem com o banco anexado)
+metadata_arquivo = MetaData()
+
+participantes_arquivo = Table(
+    "participantes",
+    metadata_arquivo,
+    # Mesmas colunas de participantes; os IDs são preservados na cópia
+    *(
+        Column(
+            coluna.name,
+            coluna.type,
+            primary_key=coluna.primary_key,
+            nullable=coluna.nullable,
+            autoincrement=False,
+        )
+        for coluna in Participante.__table__.columns
+    ),
+    Index("ix_arquivo_participantes_evento_email", "evento_id", "email_hash"),
+    Index("ix_arquivo_participantes_hash_validacao", "hash_validacao", unique=True),
+    Index(
+        "ix_arquivo_participantes_evento_inscricao_id",
+        "evento_id",
+        "data_inscricao",
+        "id",
+    ),
+    schema=ESQUEMA_ARQUIVO,
+)
+
+eventos_arquivados = Table(
+    "eventos_arquivados",
+    metadata_arquivo,
+    Column("evento_id", Integer, primary_key=True, autoincrement=False),
+    Column("ano", Integer, nullable=False),
+    Column("participantes", Integer, nullable=False),
+    Column("arquivado_em", Text, nullable=False),
+    schema=ESQUEMA_ARQUIVO,
+)
+
+
+class ParticipanteArquivado(Base):
+    """Participante de um evento encerrado, guardado no banco de arquivo."""
+
+    __table__ = participantes_arquivo
+
+    # Sem chaves estrangeiras entre bancos: junções explícitas e somente leitura
+    evento = relationship(
+        "Evento",
+        primaryjoin="foreign(ParticipanteArquivado.evento_id) == Evento.id",
+        viewonly=True,
+    )
+    cidade = relationship(
+        "Cidade",
+        primaryjoin="foreign(ParticipanteArquivado.cidade_id) == Cidade.id",
+        viewonly=True,
+    )
+    funcao = relationship(
+        "Funcao",
+        primaryjoin="foreign(ParticipanteArquivado.funcao_id) == Funcao.id",
+        viewonly=True,
+    )
+
+    def __repr__(self):
+        return f"<ParticipanteArquivado(id={self.id}, validado={self.validado})>"
+
+
 class Auditoria(Base):
     """Modelo SQLAlchemy para a tabela auditoria."""
 
     __tablename__ = "auditoria"
+    __table_args__ = (
+        # Índices para paginação por cursor (keyset) na tela de auditoria
+        Index("ix_auditoria_timestamp_id", "timestamp", "id"),
+        Index(
+            "ix_auditoria_coordenador_timestamp_id", "coordenador_id", "timestamp", "id"
+        ),
+        Index("ix_auditoria_acao_timestamp_id", "acao", "timestamp", "id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     timestamp = Column(Text, nullable=False, default=lambda: datetime.now().isoformat())
@@ -283,6 +372,91 @@ class Auditoria(Base):
         return f"<Auditoria(id={self.id}, acao={self.acao}, coordenador_id={self.coordenador_id})>"
 
 
+class EmailOutbox(Base):
+    """Modelo SQLAlchemy para a fila persistente de e-mails (tabela email_outbox)."""
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Busca das mensagens prontas para envio pelo processador
+        Index("ix_email_outbox_status_proxima_id", "status", "proxima_tentativa", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    tipo = Column(Text, nullable=False)
+    # Destinatário e dados da mensagem (JSON criptografado: contém PII)
+    payload_encrypted = Column(LargeBinary, nullable=False)
+    status = Column(Text, nullable=False, default="pendente")
+    tentativas = Column(Integer, nullable=False, default=0)
+    proxima_tentativa = Column(
+        Text, nullable=False, default=lambda: datetime.now().isoformat()
+    )
+    ultimo_erro = Column(Text, nullable=True)
+    criado_em = Column(Text, nullable=False, default=lambda: datetime.now().isoformat())
+    enviado_em = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<EmailOutbox(id={self.id}, tipo={self.tipo}, status={self.status})>"
+
+
+class NotificacaoEnfileirada(Base):
+    """
+    Modelo SQLAlchemy para o registro de notificações enfileiradas (tabela notificacoes_enfileiradas).
+
+    A linha é gravada na mesma transação que coloca o e-mail na fila
+    (app/email_outbox.py), não na entrega: registra que o aviso já foi
+    emitido, para não enfileirá-lo de novo. A entrega é acompanhada pela fila.
+    """
+
+    __tablename__ = "notificacoes_enfileiradas"
+    __table_args__ = (
+        # Uma linha por participante, evento e tipo de mensagem
+        UniqueConstraint(
+            "participante_id",
+            "evento_id",
+            "tipo",
+            name="uq_notificacoes_enfileiradas_participante_evento_tipo",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # Sem chave estrangeira: participantes de eventos encerrados vão para o
+    # banco de arquivo (app/archive.py) mantendo o mesmo ID
+    participante_id = Column(Integer, nullable=False)
+    evento_id = Column(Integer, ForeignKey("eventos.id"), nullable=False)
+    tipo = Column(Text, nullable=False)
+    enfileiramentos = Column(Integer, nullable=False, default=1)
+    enfileirado_em = Column(
+        Text, nullable=False, default=lambda: datetime.now().isoformat()
+    )
+
+    def __repr__(self):
+        return f"<NotificacaoEnfileirada(participante_id={self.participante_id}, tipo={self.tipo})>"
+
+
+class EmailMetrica(Base):
+    """Modelo SQLAlchemy para a série temporal de métricas de envio (tabela email_metricas)."""
+
+    __tablename__ = "email_metricas"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # Início do intervalo agregado (EMAIL_METRICS_INTERVAL_SECONDS)
+    inicio = Column(Text, nullable=False, index=True)
+    duracao_s = Column(Float, nullable=False)
+    requisicoes = Column(Integer, nullable=False, default=0)
+    mensagens = Column(Integer, nullable=False, default=0)
+    # {"201": 120, "429": 3, "timeout": 1, ...}
+    por_status = Column(JSON, nullable=False)
+    retentativas = Column(Integer, nullable=False, default=0)
+    latencia_media_ms = Column(Float, nullable=True)
+    latencia_p95_ms = Column(Float, nullable=True)
+    latencia_max_ms = Column(Float, nullable=True)
+    espera_fila_media_s = Column(Float, nullable=True)
+    espera_fila_max_s = Column(Float, nullable=True)
+
+    def __repr__(self):
+        return f"<EmailMetrica(inicio={self.inicio}, requisicoes={self.requisicoes})>"
+
+
 # ============= MODELOS PYDANTIC =============
 
 
@@ -456,6 +630,9 @@ def get_all_table_models() -> List[type]:
         CoordenadorCidadeLink,
         Participante,
         Auditoria,
+        EmailOutbox,
+        NotificacaoEnfileirada,
+        EmailMetrica,
     ]
 
 
@@ -0,0 +1,135 @@
+"""
+Modelos de Leitura (Projeções)
+
+Consultas de listagem que selecionam apenas as colunas necessárias e retornam
+registros imutáveis (NamedTuple) em vez de objetos ORM. Os registros não
+passam pelo identity map nem pelo controle de alterações da sessão e podem
+ser usados depois que a sessão é fechada, sem cópia manual para dicionários.
+
+Use estes registros para exibição. Para alterar dados, continue usando os
+repositórios de app/db.py.
+"""
+
+from typing import Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .archive import entidade_participante
+from .models import Cidade, Coordenador, Evento, Funcao
+
+
+class EventoResumo(NamedTuple):
+    id: int
+    ano: int
+    datas_evento: List[str]
+    data_criacao: str
+
+
+class CidadeResumo(NamedTuple):
+    id: int
+    nome: str
+    estado: str
+
+
+class FuncaoResumo(NamedTuple):
+    id: int
+    nome_funcao: str
+
+
+class CoordenadorResumo(NamedTuple):
+    id: int
+    nome: str
+    email: str
+    is_superadmin: bool
+
+
+class ParticipanteLinha(NamedTuple):
+    id: int
+    nome_completo_encrypted: bytes
+    email_encrypted: bytes
+    cidade_id: int
+    funcao_id: int
+    titulo_apresentacao: Optional[str]
+    datas_participacao: str
+    validado: bool
+    data_inscricao: str
+
+
+def _colunas(model: type, registro: type) -> list:
+    """Colunas do modelo na ordem dos campos do registro."""
+    return [getattr(model, campo) for campo in registro._fields]
+
+
+class ReadModelRepository:
+    """Consultas de listagem projetadas em registros leves."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _listar(self, registro: type, query) -> list:
+        return [registro._make(row) for row in self.session.execute(query)]
+
+    def listar_eventos(self) -> List[EventoResumo]:
+        """Retorna todos os eventos, do mais recente para o mais antigo."""
+        return self._listar(
+            EventoResumo,
+            select(*_colunas(Evento, EventoResumo)).order_by(Evento.ano.desc()),
+        )
+
+    def obter_evento_atual(self) -> Optional[EventoResumo]:
+        """Retorna o evento mais recente (ano maior)."""
+        row = self.session.execute(
+            select(*_colunas(Evento, EventoResumo)).order_by(Evento.ano.desc()).limit(1)
+        ).first()
+        return EventoResumo._make(row) if row else None
+
+    def listar_cidades(self) -> List[CidadeResumo]:
+        """Retorna todas as cidades ordenadas por estado e nome."""
+        return self._listar(
+            CidadeResumo,
+            select(*_colunas(Cidade, CidadeResumo)).order_by(
+                Cidade.estado, Cidade.nome
+            ),
+        )
+
+    def listar_funcoes(self) -> List[FuncaoResumo]:
+        """Retorna todas as funções ordenadas por nome."""
+        return self._listar(
+            FuncaoResumo,
+            select(*_colunas(Funcao, FuncaoResumo)).order_by(Funcao.nome_funcao),
+        )
+
+    def listar_coordenadores(self) -> List[CoordenadorResumo]:
+        """Retorna todos os coordenadores ordenados por ID."""
+        return self._listar(
+            CoordenadorResumo,
+            select(*_colunas(Coordenador, CoordenadorResumo)).order_by(Coordenador.id),
+        )
+
+    def listar_participantes(
+        self, evento_id: int, cidade_ids: Optional[Iterable[int]] = None
+    ) -> List[ParticipanteLinha]:
+        """
+        Retorna os participantes de um evento (opcionalmente de um conjunto de cidades).
+
+        Participantes de eventos arquivados são lidos do banco de arquivo.
+        Ordenação: data de inscrição e ID decrescentes.
+        """
+        if cidade_ids is not None:
+            cidade_ids = list(cidade_ids)
+            if not cidade_ids:
+                return []
+
+        P = entidade_participante(self.session, evento_id)
+        query = select(*_colunas(P, ParticipanteLinha)).where(P.evento_id == evento_id)
+        if cidade_ids is not None:
+            query = query.where(P.cidade_id.in_(cidade_ids))
+        return self._listar(
+            ParticipanteLinha, query.order_by(P.data_inscricao.desc(), P.id.desc())
+        )
+
+
+def get_read_model_repository(session: Session) -> ReadModelRepository:
+    """Retorna uma instância do repositório de modelos de leitura."""
+    return ReadModelRepository(session)
@@ -0,0 +1,118 @@
+"""
+Cache de Dados de Referência
+
+Eventos, cidades e funções mudam poucas vezes por ano, mas são lidos a cada
+execução das páginas (formulário de inscrição, validação, administração).
+Este módulo mantém esses dados em memória no processo, como registros leves
+de app/read_models.py, e só consulta o banco quando a versão muda.
+
+A versão é incrementada pelos formulários de criação, edição e exclusão da
+Administração, após o commit da transação (write-through): a próxima leitura
+recarrega as listas. Alterações feitas fora do processo da aplicação (ex.:
+utils/seed_database.py) só aparecem após reiniciá-la.
+
+Uso:
+    from app.reference_data import dados_referencia
+
+    dados = dados_referencia.obter()
+    dados.evento_atual, dados.cidades, dados.funcoes_por_id[funcao_id]
+
+    # Em um formulário que altera eventos, cidades ou funções:
+    dados_referencia.invalidar_apos_commit(session)
+"""
+
+import logging
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .db import DatabaseManager, db_manager
+from .read_models import (
+    CidadeResumo,
+    EventoResumo,
+    FuncaoResumo,
+    get_read_model_repository,
+)
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class DadosReferencia(NamedTuple):
+    """Listas de referência carregadas em uma versão do cache."""
+
+    versao: int
+    eventos: List[EventoResumo]
+    cidades: List[CidadeResumo]
+    funcoes: List[FuncaoResumo]
+    cidades_por_id: Dict[int, CidadeResumo]
+    funcoes_por_id: Dict[int, FuncaoResumo]
+
+    @property
+    def evento_atual(self) -> Optional[EventoResumo]:
+        """Evento mais recente (as listas vêm do ano maior para o menor)."""
+        return self.eventos[0] if self.eventos else None
+
+
+class CacheReferencia:
+    """Mantém os dados de referência em memória, recarregados quando a versão muda."""
+
+    def __init__(self, gerenciador: Optional[DatabaseManager] = None):
+        """
+        Args:
+            gerenciador: DatabaseManager usado nas consultas (padrão: db_manager)
+        """
+        self._gerenciador = gerenciador or db_manager
+        self._lock = threading.Lock()
+        self._versao = 0
+        self._dados: Optional[DadosReferencia] = None
+        self.carregamentos = 0
+
+    @property
+    def versao(self) -> int:
+        return self._versao
+
+    def obter(self) -> DadosReferencia:
+        """Retorna os dados da versão atual, consultando o banco apenas se necessário."""
+        dados = self._dados
+        if dados is not None and dados.versao == self._versao:
+            return dados
+
+        with self._lock:
+            if self._dados is None or self._dados.versao != self._versao:
+                self._dados = self._carregar(self._versao)
+            return self._dados
+
+    def invalidar(self) -> None:
+        """Incrementa a versão: a próxima leitura recarrega as listas."""
+        with self._lock:
+            self._versao += 1
+        logger.debug(f"Dados de referência invalidados (versão {self._versao})")
+
+    def invalidar_apos_commit(self, sessao: Session) -> None:
+        """Invalida o cache quando a transação da sessão for confirmada."""
+        event.listen(sessao, "after_commit", lambda _: self.invalidar(), once=True)
+
+    def _carregar(self, versao: int) -> DadosReferencia:
+        """Consulta eventos, cidades e funções (chamar com o lock)."""
+        with self._gerenciador.get_db_session() as session:
+            leitura = get_read_model_repository(session)
+            eventos = leitura.listar_eventos()
+            cidades = leitura.listar_cidades()
+            funcoes = leitura.listar_funcoes()
+
+        self.carregamentos += 1
+        return DadosReferencia(
+            versao=versao,
+            eventos=eventos,
+            cidades=cidades,
+            funcoes=funcoes,
+            cidades_por_id={cidade.id: cidade for cidade in cidades},
+            funcoes_por_id={funcao.id: funcao for funcao in funcoes},
+        )
+
+
+# Instância global
+dados_referencia = CacheReferencia()
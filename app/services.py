@@ -9,14 +9,16 @@ Este módulo contém a lógica de negócio central do sistema, incluindo:
 - Validação de regras de negócio
 """
 
+import base64
 import logging
 import re
+import time
 import uuid
 import json
 from datetime import datetime, timedelta
 from io import BytesIO
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Callable, List, Optional, Dict, Any, Tuple
 from cryptography.fernet import Fernet
 
 import streamlit as st
@@ -55,12 +57,30 @@ from .models import (
 from .db import (
     db_manager,
     get_evento_repository,
+    get_notificacao_repository,
     get_cidade_repository,
     get_funcao_repository,
     get_participante_repository,
-    get_auditoria_repository,
+    get_coordenador_repository,
 )
+from .audit import registrador_auditoria
 from .auth import get_current_user_info
+from .certificate_pipeline import PipelineCertificados
+from .email_dispatch import DespachanteEmail, ResultadoDespacho
+from .email_templates import (
+    MODELO_CERTIFICADO_LIBERADO,
+    MODELO_CONFIRMACAO_INSCRICAO,
+    ModeloEmail,
+    modelos_email,
+    preencher_conteudo,
+    renderizar_conteudo,
+)
+from .email_outbox import (
+    TIPO_CERTIFICADO_LIBERADO,
+    TIPO_CONFIRMACAO_INSCRICAO,
+    processador_outbox,
+)
+from .instrumentation import instrumentar
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -355,18 +375,25 @@ class ServicoCalculoCargaHoraria:
             return False
 
 
+ASSUNTO_CERTIFICADO_LIBERADO = (
+    "Seu Certificado Pint of Science Brasil Está Disponível! 🎉"
+)
+
+
 class ServicoEmail:
     """Serviço para envio de e-mails usando Brevo API com requests."""
 
     def __init__(self):
         self._configured = REQUESTS_AVAILABLE and settings.is_email_configured
+        # Sessão HTTP com pool de conexões e envio concorrente limitado
+        self.despachante = DespachanteEmail()
 
         if not self._configured:
             logger.warning("⚠️ Serviço de e-mail não configurado")
             return
 
         try:
-            self.api_url = "https://api.brevo.com/v3/smtp/email"
+            self.api_url = settings.brevo_api_url
             self.api_key = settings.brevo_api_key
             self.sender_email = settings.brevo_sender_email
             self.sender_name = settings.brevo_sender_name
@@ -388,150 +415,113 @@ class ServicoEmail:
 
         try:
             assunto = "Confirmação de Inscrição - Pint of Science Brasil"
+            conteudo = modelos_email.obter_conteudo(
+                MODELO_CONFIRMACAO_INSCRICAO, dados_inscricao.get("evento_ano")
+            )
 
-            html_content = f"""
-            <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #e74c3c; text-align: center;">
-                        🍺 Pint of Science Brasil
-                    </h2>
-
-                    <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                        <h3>Olá, {nome}!</h3>
-                        <p>Recebemos sua inscrição para o Pint of Science Brasil com sucesso!</p>
-
-                        <h4>Detalhes da sua inscrição:</h4>
-                        <ul>
-                            <li><strong>Evento:</strong> {dados_inscricao.get('evento_ano', 'N/A')}</li>
-                            <li><strong>Cidade:</strong> {dados_inscricao.get('cidade_nome', 'N/A')}</li>
-                            <li><strong>Função:</strong> {dados_inscricao.get('funcao_nome', 'N/A')}</li>
-                            <li><strong>Datas de participação:</strong> {dados_inscricao.get('datas_participacao', 'N/A')}</li>
-                            <li><strong>Carga horária:</strong> {dados_inscricao.get('carga_horaria', 0)} horas</li>
-                        </ul>
-
-                        <p><strong>Próximos passos:</strong></p>
-                        <ol>
-                            <li>Prepare-se para que sua participação se torne memorável</li>
-                            <li>Após sua apresentação, você receberá um e-mail com instruções para download de seu certificado</li>
-                            <li>Seu certificado estará disponível para download em {settings.base_url}</li>
-                            <li>Qualquer dúvida, entre em contato com os organizadores da sua cidade</li>
-                        </ol>
-                    </div>
-
-                    <div style="text-align: center; margin-top: 30px; padding: 20px; background-color: #e8f4f8; border-radius: 8px;">
-                        <p style="margin: 0;">
-                            <em>“Levando a ciência para o bar”</em>
-                        </p>
-                        <p style="margin: 5px 0 0 0; font-size: 0.9em; color: #666;">
-                            © Pint of Science Brasil
-                        </p>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-
-            return self._enviar_email(email, assunto, html_content)
+            return self._enviar_email(
+                email,
+                assunto,
+                renderizar_conteudo(
+                    conteudo,
+                    nome=nome,
+                    evento_ano=dados_inscricao.get("evento_ano", "N/A"),
+                    cidade_nome=dados_inscricao.get("cidade_nome", "N/A"),
+                    funcao_nome=dados_inscricao.get("funcao_nome", "N/A"),
+                    datas_participacao=dados_inscricao.get("datas_participacao", "N/A"),
+                    carga_horaria=dados_inscricao.get("carga_horaria", 0),
+                    base_url=settings.base_url,
+                ),
+            )
 
         except Exception as e:
             logger.error(f"❌ Erro ao enviar e-mail de confirmação: {e}")
             return False
 
     def enviar_email_certificado_liberado(
-        self, nome: str, email: str, link_download: str
+        self,
+        nome: str,
+        email: str,
+        link_download: str,
+        evento_ano: Optional[int] = None,
+        anexo: Optional[Tuple[str, bytes]] = None,
     ) -> bool:
-        """Envia e-mail informando que o certificado está liberado."""
+        """
+        Envia e-mail informando que o certificado está liberado.
+
+        Args:
+            nome: Nome do participante
+            email: E-mail do participante
+            link_download: Link para a página de download
+            evento_ano: Ano do evento (escolhe os modelos do e-mail)
+            anexo: (nome do arquivo, bytes do PDF) do certificado já gerado
+        """
         if not self._configured:
             logger.warning("⚠️ E-mail não enviado: serviço não configurado")
             return False
 
         try:
-            assunto = "Seu Certificado Pint of Science Brasil Está Disponível! 🎉"
-
-            html_content = f"""
-            <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #27ae60; text-align: center;">
-                        🎉 Certificado Disponível!
-                    </h2>
-
-                    <div style="background-color: #f8fff8; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #27ae60;">
-                        <h3>Parabéns, {nome}!</h3>
-                        <p>Sua participação no Pint of Science Brasil foi confirmada e seu certificado já está disponível para download!</p>
-
-                        <div style="text-align: center; margin: 30px 0;">
-                            <a href="{link_download}" style="
-                                background-color: #e74c3c;
-                                color: white;
-                                padding: 12px 24px;
-                                text-decoration: none;
-                                border-radius: 6px;
-                                font-weight: bold;
-                                display: inline-block;
-                            ">
-                                BAIXAR CERTIFICADO
-                            </a>
-                        </div>
-                        <p><strong>Como baixar:</strong></p>
-                        <ul>
-                            <li>Vá até a página principal do site</li>
-                            <li>Clique na aba “📜 Certificado”</li>
-                            <li>Digite o seu e-mail</li>
-                            <li>Clique no botão “👁️ Visualizar Certificado”</li>
-                        </ul>
-                        <p><strong>O certificado inclui:</strong></p>
-                        <ul>
-                            <li>Seu nome completo e função no evento</li>
-                            <li>Carga horária validada pelos organizadores</li>
-                            <li>Assinatura digital dos organizadores</li>
-                            <li>Validade e autenticidade garantidas</li>
-                        </ul>
-                    </div>
-
-                    <div style="background-color: #fff3cd; padding: 15px; border-radius: 6px; margin: 20px 0;">
-                        <p style="margin: 0; color: #856404;">
-                            <strong>⏰ Importante:</strong> Clique na aba “Certificado” na página principal e informe o seu e-mail para visualizar ou baixar o seu certificado em formato pdf.
-                        </p>
-                    </div>
-
-                    <div style="text-align: center; margin-top: 30px; padding: 20px; background-color: #e8f4f8; border-radius: 8px;">
-                        <p style="margin: 0;">
-                            <em>“Levando a ciência para o bar”</em>
-                        </p>
-                        <p style="margin: 5px 0 0 0; font-size: 0.9em; color: #666;">
-                            © Pint of Science Brasil
-                        </p>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-
-            return self._enviar_email(email, assunto, html_content)
+            conteudo = self._conteudo_certificado_liberado(evento_ano)
+
+            return self._enviar_email(
+                email,
+                ASSUNTO_CERTIFICADO_LIBERADO,
+                renderizar_conteudo(conteudo, nome=nome, link_download=link_download),
+                anexos=[anexo] if anexo else None,
+            )
 
         except Exception as e:
             logger.error(f"❌ Erro ao enviar e-mail de certificado: {e}")
             return False
 
-    def _enviar_email(self, destino: str, assunto: str, html_content: str) -> bool:
-        """Método interno para envio de e-mails usando requests."""
-        try:
-            headers = {
-                "accept": "application/json",
-                "api-key": self.api_key,
-                "content-type": "application/json",
-            }
+    def _conteudo_certificado_liberado(
+        self, evento_ano: Optional[int]
+    ) -> Dict[str, ModeloEmail]:
+        """Modelos do e-mail de certificado liberado, com os campos comuns preenchidos."""
+        return preencher_conteudo(
+            modelos_email.obter_conteudo(MODELO_CERTIFICADO_LIBERADO, evento_ano),
+            base_url=settings.base_url,
+        )
+
+    def _post_api(self, data: Dict[str, Any]) -> "requests.Response":
+        """Envia a requisição à API Brevo pela sessão HTTP compartilhada."""
+        headers = {
+            "accept": "application/json",
+            "api-key": self.api_key,
+            "content-type": "application/json",
+        }
+        return self.despachante.post(self.api_url, headers=headers, json=data)
 
+    def _enviar_email(
+        self,
+        destino: str,
+        assunto: str,
+        conteudo: Dict[str, str],
+        anexos: Optional[List[Tuple[str, bytes]]] = None,
+    ) -> bool:
+        """
+        Método interno para envio de e-mails usando requests.
+
+        Args:
+            destino: E-mail do destinatário
+            assunto: Assunto da mensagem
+            conteudo: {"htmlContent": ..., "textContent": ...} (um ou ambos)
+            anexos: Lista de (nome do arquivo, conteúdo)
+        """
+        try:
             data = {
                 "sender": {"name": self.sender_name, "email": self.sender_email},
                 "to": [{"email": destino}],
                 "subject": assunto,
-                "htmlContent": html_content,
+                **conteudo,
             }
+            if anexos:
+                data["attachment"] = [
+                    {"name": nome, "content": base64.b64encode(arquivo).decode()}
+                    for nome, arquivo in anexos
+                ]
 
-            response = requests.post(self.api_url, headers=headers, json=data)
+            response = self._post_api(data)
 
             if response.status_code == 201:
                 logger.info(f"✅ E-mail enviado com sucesso para {destino}")
@@ -546,11 +536,51 @@ class ServicoEmail:
             logger.error(f"❌ Erro na API Brevo: {e}")
             return False
 
+    def _enviar_versoes(
+        self, assunto: str, conteudo: Dict[str, str], versoes: List[Dict[str, Any]]
+    ) -> bool:
+        """
+        Envia uma única requisição com várias versões da mensagem (messageVersions).
+
+        O conteúdo usa a sintaxe de parâmetros da Brevo ({{ params.campo }}),
+        preenchida com os `params` de cada versão.
+
+        Args:
+            assunto: Assunto comum a todas as versões
+            conteudo: HTML e/ou texto comuns, com os campos por destinatário como parâmetros
+            versoes: Lista de {"to": [{"email", "name"}], "params": {...}}
+
+        Returns:
+            True se a API aceitou a requisição
+        """
+        try:
+            data = {
+                "sender": {"name": self.sender_name, "email": self.sender_email},
+                "subject": assunto,
+                **conteudo,
+                "messageVersions": versoes,
+            }
+
+            response = self._post_api(data)
+
+            if response.status_code == 201:
+                logger.info(f"✅ Lote de {len(versoes)} e-mails aceito pela API")
+                return True
+            logger.warning(
+                f"⚠️ Lote de {len(versoes)} e-mails recusado: "
+                f"{response.status_code} - {response.text}"
+            )
+            return False
+
+        except Exception as e:
+            logger.error(f"❌ Erro na API Brevo (lote): {e}")
+            return False
+
     def enviar_emails_certificado_liberado_batch(
         self, destinatarios: List[Dict[str, str]]
     ) -> Tuple[int, int]:
         """
-        Envia e-mails em lote usando processamento otimizado.
+        Envia e-mails em lote (ver enviar_certificados_liberados).
 
         Args:
             destinatarios: Lista de dicionários com 'nome', 'email', 'link_download'
@@ -562,54 +592,184 @@ class ServicoEmail:
             logger.warning("⚠️ E-mails não enviados: serviço não configurado")
             return 0, len(destinatarios)
 
-        if not destinatarios:
-            return 0, 0
+        resultado = self.enviar_certificados_liberados(destinatarios)
+        return resultado.sucessos, resultado.falhas
 
-        try:
-            # Processar em batches para evitar timeout e sobrecarga
-            BATCH_SIZE = 100  # Processar 100 emails por vez
-            total_sucesso = 0
-            total_falha = 0
+    def enviar_certificados_liberados(
+        self,
+        destinatarios: List[Dict[str, str]],
+        identificar: Optional[Callable[[Dict[str, Any]], str]] = None,
+    ) -> ResultadoDespacho:
+        """
+        Envia e-mails de certificado liberado em lote, em paralelo, reutilizando
+        as conexões com a API.
 
-            for i in range(0, len(destinatarios), BATCH_SIZE):
-                batch = destinatarios[i : i + BATCH_SIZE]
+        Com EMAIL_BATCH_MAX_RECIPIENTS > 1, cada requisição leva até esse número
+        de destinatários (messageVersions da Brevo); lotes recusados pela API são
+        reenviados individualmente. O conteúdo é montado uma vez por ano de
+        evento, a partir dos modelos daquele ano (ver app/email_templates.py).
 
-                logger.info(
-                    f"📧 Processando batch {i//BATCH_SIZE + 1}: {len(batch)} emails"
+        Args:
+            destinatarios: Lista de dicionários com 'nome', 'email', 'link_download'
+                e, opcionalmente, 'evento_ano'
+            identificar: Identifica o destinatário nas falhas (padrão: e-mail)
+
+        Returns:
+            ResultadoDespacho com sucessos, falhas e os destinatários que falharam
+        """
+        if not destinatarios:
+            return ResultadoDespacho(0, 0, [], 0.0)
+        identificar = identificar or (lambda dest: dest["email"])
+
+        validos = [dest for dest in destinatarios if dest.get("email")]
+        sem_email = len(destinatarios) - len(validos)
+        inicio = time.perf_counter()
+        sucessos_lotes = 0
+        individuais = validos
+
+        # Modelos compilados uma vez por ano de evento, com os campos comuns já
+        # preenchidos: por destinatário resta apenas substituir nome e link
+        por_ano: Dict[Optional[int], List[Dict[str, Any]]] = {}
+        for dest in validos:
+            por_ano.setdefault(dest.get("evento_ano"), []).append(dest)
+        conteudos = {ano: self._conteudo_certificado_liberado(ano) for ano in por_ano}
+
+        tamanho_lote = settings.email_batch_max_recipients
+        if tamanho_lote > 1 and len(validos) > 1:
+            lotes = [
+                grupo[i : i + tamanho_lote]
+                for grupo in por_ano.values()
+                for i in range(0, len(grupo), tamanho_lote)
+            ]
+            # Conteúdo comum a cada lote: nome e link entram como parâmetros de
+            # cada versão
+            conteudos_lote = {
+                ano: renderizar_conteudo(
+                    conteudo,
+                    nome="{{ params.nome }}",
+                    link_download="{{ params.link_download }}",
                 )
+                for ano, conteudo in conteudos.items()
+            }
+            recusados: List[List[Dict[str, str]]] = []
+
+            def enviar_lote(lote: List[Dict[str, str]]) -> bool:
+                versoes = [
+                    {
+                        "to": [
+                            {
+                                "email": dest["email"],
+                                "name": dest.get("nome", "Participante"),
+                            }
+                        ],
+                        "params": {
+                            "nome": dest.get("nome", "Participante"),
+                            "link_download": dest.get(
+                                "link_download", settings.base_url
+                            ),
+                        },
+                    }
+                    for dest in lote
+                ]
+                if self._enviar_versoes(
+                    ASSUNTO_CERTIFICADO_LIBERADO,
+                    conteudos_lote[lote[0].get("evento_ano")],
+                    versoes,
+                ):
+                    return True
+                recusados.append(lote)
+                return False
 
-                for dest in batch:
-                    nome = dest.get("nome", "Participante")
-                    email = dest.get("email")
-                    link_download = dest.get("link_download", settings.base_url)
+            logger.info(
+                f"📧 Enviando {len(validos)} emails em {len(lotes)} requisições "
+                f"(até {tamanho_lote} destinatários cada)"
+            )
+            self.despachante.despachar(
+                lotes, enviar_lote, identificar=lambda lote: lote[0]["email"]
+            )
 
-                    if not email:
-                        total_falha += 1
-                        continue
+            # Lotes recusados são reenviados um a um: apenas os destinatários
+            # com problema falham
+            individuais = [dest for lote in recusados for dest in lote]
+            sucessos_lotes = len(validos) - len(individuais)
+            if individuais:
+                logger.warning(
+                    f"⚠️ {len(recusados)} lote(s) recusado(s): reenviando "
+                    f"{len(individuais)} emails individualmente"
+                )
 
-                    # Enviar email individual usando o método existente
-                    sucesso = self.enviar_email_certificado_liberado(
-                        nome, email, link_download
-                    )
+        resultado = self.despachante.despachar(
+            individuais,
+            lambda dest: self._enviar_email(
+                dest["email"],
+                ASSUNTO_CERTIFICADO_LIBERADO,
+                renderizar_conteudo(
+                    conteudos[dest.get("evento_ano")],
+                    nome=dest.get("nome", "Participante"),
+                    link_download=dest.get("link_download", settings.base_url),
+                ),
+            ),
+            identificar=identificar,
+        )
 
-                    if sucesso:
-                        total_sucesso += 1
-                    else:
-                        total_falha += 1
+        total_sucesso = sucessos_lotes + resultado.sucessos
+        total_falha = resultado.falhas + sem_email
+        duracao = time.perf_counter() - inicio
+        logger.info(
+            f"🎉 Envio em lote concluído em {duracao:.1f}s: "
+            f"{total_sucesso} sucessos, {total_falha} falhas"
+        )
+        return ResultadoDespacho(
+            total_sucesso, total_falha, resultado.falhados, duracao
+        )
 
-                logger.info(
-                    f"✅ Batch {i//BATCH_SIZE + 1} concluído: "
-                    f"{total_sucesso} sucessos até agora"
-                )
+    def enviar_certificados_anexados(
+        self,
+        destinatarios: List[Dict[str, Any]],
+        pipeline: Optional[PipelineCertificados] = None,
+        identificar: Optional[Callable[[Dict[str, Any]], str]] = None,
+    ) -> ResultadoDespacho:
+        """
+        Envia os e-mails de certificado liberado com o PDF anexado.
 
-            logger.info(
-                f"🎉 Envio em lote concluído: {total_sucesso} sucessos, {total_falha} falhas"
+        Os certificados são gerados em processos paralelos enquanto os já
+        prontos são enviados (ver app/certificate_pipeline.py). Cada e-mail
+        segue em uma requisição própria: a API não aceita anexos diferentes
+        por versão da mensagem.
+
+        Args:
+            destinatarios: Lista de dicionários com 'participante_id', 'nome',
+                'email', 'link_download' e 'evento_ano'
+            pipeline: Pipeline a usar (padrão: configuração de Settings)
+            identificar: Identifica o destinatário nas falhas (padrão: e-mail)
+
+        Returns:
+            ResultadoDespacho com sucessos, falhas e os destinatários que falharam
+        """
+
+        def enviar(dest: Dict[str, Any], pdf: Optional[bytes]) -> bool:
+            anexo = None
+            if pdf is not None:
+                anexo = (
+                    gerador_certificado.gerar_nome_arquivo_certificado(
+                        dest.get("evento_ano") or datetime.now().year
+                    ),
+                    pdf,
+                )
+            return self.enviar_email_certificado_liberado(
+                dest.get("nome", "Participante"),
+                dest["email"],
+                dest.get("link_download", settings.base_url),
+                evento_ano=dest.get("evento_ano"),
+                anexo=anexo,
             )
-            return total_sucesso, total_falha
 
-        except Exception as e:
-            logger.error(f"❌ Erro no envio em lote: {e}")
-            return total_sucesso, len(destinatarios) - total_sucesso
+        return (pipeline or PipelineCertificados()).executar(
+            [dest for dest in destinatarios if dest.get("email")],
+            enviar,
+            self.despachante.despachar,
+            identificar=identificar,
+        )
 
 
 class GeradorCertificado:
@@ -799,7 +959,13 @@ class GeradorCertificado:
             return "COORDENADOR GERAL"
 
     def gerar_certificado_pdf(
-        self, participante: Participante, evento: Evento, cidade: Cidade, funcao: Funcao
+        self,
+        participante: Participante,
+        evento: Evento,
+        cidade: Cidade,
+        funcao: Funcao,
+        nome_completo: Optional[str] = None,
+        nome_coordenador: Optional[str] = None,
     ) -> bytes:
         """
         Gera um certificado PDF para um participante em formato A4 landscape.
@@ -809,6 +975,9 @@ class GeradorCertificado:
             evento: Objeto Evento
             cidade: Objeto Cidade
             funcao: Objeto Funcao
+            nome_completo: Nome já descriptografado (evita descriptografar de novo)
+            nome_coordenador: Nome do coordenador geral já consultado
+                (evita abrir outra sessão)
 
         Returns:
             Bytes do PDF gerado
@@ -818,16 +987,17 @@ class GeradorCertificado:
             from reportlab.pdfgen import canvas
             from reportlab.lib.utils import ImageReader
 
-            # Descriptografar dados sensíveis
-            nome_completo = self._servico_criptografia.descriptografar(
-                participante.nome_completo_encrypted
-            )
-            email = self._servico_criptografia.descriptografar(
-                participante.email_encrypted
-            )
+            # Descriptografar dados sensíveis (se o chamador ainda não o fez)
+            if nome_completo is None:
+                nome_completo = self._servico_criptografia.descriptografar(
+                    participante.nome_completo_encrypted
+                )
 
             # Gerar hash de validação se ainda não existe
             if not participante.hash_validacao:
+                email = self._servico_criptografia.descriptografar(
+                    participante.email_encrypted
+                )
                 hash_validacao = (
                     self._servico_criptografia.gerar_hash_validacao_certificado(
                         participante.id, evento.id, email, nome_completo
@@ -1169,7 +1339,8 @@ class GeradorCertificado:
                     )
 
                     # Nome do coordenador geral IMEDIATAMENTE abaixo da assinatura
-                    nome_coordenador = self._obter_nome_coordenador_geral()
+                    if nome_coordenador is None:
+                        nome_coordenador = self._obter_nome_coordenador_geral()
                     c.setFont("SpaceGrotesk", 9)
                     c.setFillColor(colors.HexColor(cores["cor_texto"]))
                     # Reduzido espaço de -10 para -5 (mais próximo)
@@ -1295,6 +1466,59 @@ class ServicoValidacao:
             logger.error(f"❌ Erro ao validar inscrição: {e}")
             return False, "Erro na validação da inscrição"
 
+    def _montar_participante_read(
+        self, participante: Participante, evento: Evento
+    ) -> ParticipanteRead:
+        """Cria o objeto de leitura (dados descriptografados) de um participante."""
+        return ParticipanteRead(
+            id=participante.id,
+            nome_completo=self._servico_criptografia.descriptografar(
+                participante.nome_completo_encrypted
+            ),
+            email=self._servico_criptografia.descriptografar(
+                participante.email_encrypted
+            ),
+            titulo_apresentacao=participante.titulo_apresentacao,
+            evento_id=participante.evento_id,
+            cidade_id=participante.cidade_id,
+            funcao_id=participante.funcao_id,
+            datas_participacao=participante.datas_participacao,
+            carga_horaria_calculada=servico_calculo_carga_horaria.calcular_carga_horaria(
+                participante.datas_participacao,
+                evento.datas_evento,
+                evento.ano,
+                participante.funcao_id,
+            ),
+            validado=participante.validado,
+            data_inscricao=participante.data_inscricao,
+        )
+
+    def _avaliar_download(
+        self, participante: Optional[Participante], evento: Optional[Evento]
+    ) -> Tuple[bool, Optional[ParticipanteRead], str]:
+        """Regras de download comuns às versões síncrona e assíncrona."""
+        if not participante:
+            return (
+                False,
+                None,
+                "Email não encontrado ou não inscrito neste evento",
+            )
+
+        # Verificar se está validado
+        if not participante.validado:
+            return (
+                False,
+                None,
+                "Sua participação ainda não foi validada pelos coordenadores",
+            )
+
+        if not evento:
+            return False, None, "Evento não encontrado"
+
+        participante_read = self._montar_participante_read(participante, evento)
+
+        return True, participante_read, "Certificado disponível para download"
+
     def validar_download_certificado(
         self, email: str, evento_id: int
     ) -> Tuple[bool, Optional[ParticipanteRead], str]:
@@ -1319,56 +1543,147 @@ class ServicoValidacao:
                     email_hash, evento_id
                 )
 
-                if not participante:
-                    return (
-                        False,
-                        None,
-                        "Email não encontrado ou não inscrito neste evento",
-                    )
+                # O evento só é consultado para participantes validados
+                evento = None
+                if participante and participante.validado:
+                    evento = evento_repo.get_by_id(Evento, evento_id)
 
-                # Verificar se está validado
-                if not participante.validado:
-                    return (
-                        False,
-                        None,
-                        "Sua participação ainda não foi validada pelos coordenadores",
-                    )
+                return self._avaliar_download(participante, evento)
 
-                # Buscar dados relacionados
-                evento = evento_repo.get_by_id(Evento, evento_id)
-                if not evento:
-                    return False, None, "Evento não encontrado"
+        except Exception as e:
+            logger.error(f"❌ Erro ao validar download: {e}")
+            return False, None, "Erro ao validar download do certificado"
 
-                # Criar objeto de leitura
-                participante_read = ParticipanteRead(
-                    id=participante.id,
-                    nome_completo=self._servico_criptografia.descriptografar(
-                        participante.nome_completo_encrypted
-                    ),
-                    email=self._servico_criptografia.descriptografar(
-                        participante.email_encrypted
-                    ),
-                    titulo_apresentacao=participante.titulo_apresentacao,
-                    evento_id=participante.evento_id,
-                    cidade_id=participante.cidade_id,
-                    funcao_id=participante.funcao_id,
-                    datas_participacao=participante.datas_participacao,
-                    carga_horaria_calculada=servico_calculo_carga_horaria.calcular_carga_horaria(
-                        participante.datas_participacao,
-                        evento.datas_evento,
-                        evento.ano,
-                        participante.funcao_id,
-                    ),
-                    validado=participante.validado,
-                    data_inscricao=participante.data_inscricao,
+    async def validar_download_certificado_async(
+        self, email: str, evento_id: int
+    ) -> Tuple[bool, Optional[ParticipanteRead], str]:
+        """
+        Versão assíncrona (aiosqlite) de validar_download_certificado.
+
+        Args:
+            email: Email do participante
+            evento_id: ID do evento
+
+        Returns:
+            Tupla com (pode_baixar, participante, mensagem)
+        """
+        from . import async_db
+
+        try:
+            async with async_db.async_db_manager.get_db_session() as session:
+                participante_repo = async_db.get_participante_repository(session)
+                evento_repo = async_db.get_evento_repository(session)
+
+                email_hash = self._servico_criptografia.gerar_hash_email(email)
+                participante = await participante_repo.get_by_email_hash(
+                    email_hash, evento_id
                 )
 
-                return True, participante_read, "Certificado disponível para download"
+                evento = None
+                if participante and participante.validado:
+                    evento = await evento_repo.get_by_id(Evento, evento_id)
+
+                return self._avaliar_download(participante, evento)
 
         except Exception as e:
             logger.error(f"❌ Erro ao validar download: {e}")
             return False, None, "Erro ao validar download do certificado"
 
+    async def verificar_elegibilidade_downloads(
+        self, emails: List[str], evento_id: int, concorrencia: int = 10
+    ) -> Dict[str, Tuple[bool, str]]:
+        """
+        Verifica em paralelo se cada email pode baixar o certificado do evento.
+
+        Args:
+            emails: Emails a verificar
+            evento_id: ID do evento
+            concorrencia: Máximo de consultas simultâneas
+
+        Returns:
+            Dicionário {email: (pode_baixar, mensagem)}
+        """
+        import asyncio
+
+        semaforo = asyncio.Semaphore(concorrencia)
+
+        async def verificar(email: str) -> Tuple[bool, str]:
+            async with semaforo:
+                pode_baixar, _, mensagem = (
+                    await self.validar_download_certificado_async(email, evento_id)
+                )
+                return pode_baixar, mensagem
+
+        resultados = await asyncio.gather(*(verificar(email) for email in emails))
+        return dict(zip(emails, resultados))
+
+    def _conferir_certificado(
+        self, participante: Optional[Participante], hash_validacao: str
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Confere a assinatura HMAC do certificado e monta os dados exibidos.
+
+        O participante deve vir com evento, cidade e função carregados.
+        """
+        if not participante:
+            return "nao_encontrado", None
+
+        nome_completo = self._servico_criptografia.descriptografar(
+            participante.nome_completo_encrypted
+        )
+        email = self._servico_criptografia.descriptografar(participante.email_encrypted)
+
+        # Verificar HMAC para garantir integridade
+        hash_esperado = self._servico_criptografia.gerar_hash_validacao_certificado(
+            participante.id, participante.evento_id, email, nome_completo
+        )
+        if hash_validacao != hash_esperado:
+            return "invalido", None
+
+        evento = participante.evento
+        carga_horaria, _ = self._servico_calculo.calcular_carga_horaria(
+            participante.datas_participacao,
+            evento.datas_evento,
+            evento.ano,
+            participante.funcao_id,
+        )
+        return "autentico", {
+            "nome_completo": nome_completo,
+            "funcao": participante.funcao.nome_funcao if participante.funcao else None,
+            "cidade": (
+                f"{participante.cidade.nome} - {participante.cidade.estado}"
+                if participante.cidade
+                else None
+            ),
+            "evento_ano": evento.ano,
+            "carga_horaria": carga_horaria,
+            "validado": participante.validado,
+            "titulo_apresentacao": participante.titulo_apresentacao,
+            "datas_participacao": participante.datas_participacao,
+            "data_inscricao": participante.data_inscricao,
+        }
+
+    async def verificar_certificado_async(
+        self, hash_validacao: str
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Verifica a autenticidade de um certificado pelo hash de validação.
+
+        Args:
+            hash_validacao: Código de validação impresso no certificado
+
+        Returns:
+            Tupla com (situacao, dados), onde situacao é "autentico",
+            "invalido" ou "nao_encontrado" e dados só existe se autêntico
+        """
+        from . import async_db
+
+        async with async_db.async_db_manager.get_db_session() as session:
+            participante = await async_db.get_participante_repository(
+                session
+            ).get_by_hash_validacao(hash_validacao)
+            return self._conferir_certificado(participante, hash_validacao)
+
 
 # ============= INSTÂNCIAS GLOBAIS =============
 
@@ -1382,6 +1697,7 @@ servico_validacao = ServicoValidacao()
 # ============= FUNÇÕES DE CONVENIÊNCIA =============
 
 
+@instrumentar()
 def inscrever_participante(
     dados_inscricao: ParticipanteCreate,
 ) -> Tuple[bool, str, Optional[int]]:
@@ -1441,7 +1757,7 @@ def inscrever_participante(
                 validado=False,  # Inicia como não validado
             )
 
-            # Enviar e-mail de confirmação
+            # Enfileirar e-mail de confirmação (enviado em segundo plano após o commit)
             if servico_email.is_configured():
                 cidade_repo = get_cidade_repository(session)
                 funcao_repo = get_funcao_repository(session)
@@ -1459,8 +1775,14 @@ def inscrever_participante(
                     "carga_horaria": carga_horaria,
                 }
 
-                servico_email.enviar_email_confirmacao_inscricao(
-                    dados_inscricao.nome_completo, dados_inscricao.email, dados_email
+                processador_outbox.enfileirar(
+                    TIPO_CONFIRMACAO_INSCRICAO,
+                    {
+                        "nome": dados_inscricao.nome_completo,
+                        "email": dados_inscricao.email,
+                        "dados": dados_email,
+                    },
+                    sessao=session,
                 )
 
             logger.info(f"✅ Participante inscrito: {dados_inscricao.email}")
@@ -1471,10 +1793,17 @@ def inscrever_participante(
         return False, f"Erro ao realizar inscrição: {str(e)}", None
 
 
+@instrumentar()
 def baixar_certificado(email: str, evento_id: int) -> Tuple[bool, Optional[bytes], str]:
     """
     Função de conveniência para baixar certificado.
 
+    Uma query com join traz participante, evento, cidade, função e o nome do
+    coordenador geral; nome e email são descriptografados uma única vez e o PDF
+    é gerado a partir desses dados. A única escrita é o hash de validação, no
+    primeiro download, em uma transação curta própria: o PDF só é gerado depois
+    que as sessões foram fechadas, sem segurar o bloqueio de escrita do SQLite.
+
     Args:
         email: Email do participante
         evento_id: ID do evento
@@ -1483,51 +1812,89 @@ def baixar_certificado(email: str, evento_id: int) -> Tuple[bool, Optional[bytes
         Tupla com (sucesso, pdf_bytes, mensagem)
     """
     try:
-        # Validar download
-        pode_baixar, participante, mensagem = (
-            servico_validacao.validar_download_certificado(email, evento_id)
-        )
-
-        if not pode_baixar:
-            return False, None, mensagem
+        email_hash = servico_criptografia.gerar_hash_email(email)
 
-        # Buscar dados relacionados
         with db_manager.get_db_session() as session:
-            evento_repo = get_evento_repository(session)
-            cidade_repo = get_cidade_repository(session)
-            funcao_repo = get_funcao_repository(session)
-            participante_repo = get_participante_repository(session)
+            dados = get_participante_repository(session).get_dados_certificado(
+                email_hash, evento_id
+            )
+            # Desanexar os objetos para usá-los depois que a sessão fechar
+            session.expunge_all()
 
-            evento = evento_repo.get_by_id(Evento, evento_id)
-            cidade = cidade_repo.get_by_id(Cidade, participante.cidade_id)
-            funcao = funcao_repo.get_by_id(Funcao, participante.funcao_id)
-            participante_db = participante_repo.get_by_id(Participante, participante.id)
+        if not dados:
+            return False, None, "Email não encontrado ou não inscrito neste evento"
 
-            if not all([evento, cidade, funcao, participante_db]):
-                return False, None, "Dados incompletos para gerar certificado"
+        participante, evento, cidade, funcao, nome_coordenador = dados
 
-            # Gerar PDF
-            pdf_bytes = gerador_certificado.gerar_certificado_pdf(
-                participante_db, evento, cidade, funcao
+        if not participante.validado:
+            return (
+                False,
+                None,
+                "Sua participação ainda não foi validada pelos coordenadores",
             )
 
-            logger.info(f"✅ Certificado baixado por: {email}")
-            return True, pdf_bytes, "Certificado gerado com sucesso!"
+        nome_completo = servico_criptografia.descriptografar(
+            participante.nome_completo_encrypted
+        )
+
+        # Gerar hash de validação no primeiro download (transação curta própria)
+        if not participante.hash_validacao:
+            hash_validacao = servico_criptografia.gerar_hash_validacao_certificado(
+                participante.id,
+                evento.id,
+                servico_criptografia.descriptografar(participante.email_encrypted),
+                nome_completo,
+            )
+            with db_manager.get_db_session() as session:
+                get_participante_repository(session).set_hash_validacao(
+                    participante.id, evento.id, hash_validacao
+                )
+            participante.hash_validacao = hash_validacao
+
+        # Gerar PDF (fora de qualquer transação)
+        pdf_bytes = gerador_certificado.gerar_certificado_pdf(
+            participante,
+            evento,
+            cidade,
+            funcao,
+            nome_completo=nome_completo,
+            nome_coordenador=(
+                nome_coordenador.upper() if nome_coordenador else "COORDENADOR GERAL"
+            ),
+        )
+
+        logger.info(f"✅ Certificado baixado por: {email}")
+        return True, pdf_bytes, "Certificado gerado com sucesso!"
 
     except Exception as e:
         logger.error(f"❌ Erro ao baixar certificado: {e}")
         return False, None, f"Erro ao gerar certificado: {str(e)}"
 
 
+@instrumentar()
 def validar_participantes(
-    participante_ids: List[int], validados: List[bool]
+    participante_ids: List[int], validados: List[bool], forcar_reenvio: bool = False
 ) -> Tuple[bool, str]:
     """
     Função para validar múltiplos participantes.
 
+    As alterações são aplicadas em lote: um SELECT com IN para ler o status atual,
+    um UPDATE ... WHERE id IN (...) por status, um SELECT com IN para coletar os
+    destinatários dos e-mails e um INSERT na fila de e-mails (outbox). A auditoria
+    é enfileirada no registrador assíncrono após o commit, que grava os registros
+    em um único INSERT (executemany).
+
+    Cada e-mail de certificado liberado é registrado em notificacoes_enfileiradas
+    na transação que o coloca na fila: participantes desvalidados e validados de
+    novo não recebem a mensagem outra vez, a menos que `forcar_reenvio` seja
+    informado. Com `forcar_reenvio`, participantes que já estavam validados e
+    continuam validados também recebem o e-mail de novo.
+
     Args:
         participante_ids: Lista de IDs dos participantes
         validados: Lista de status de validação correspondentes
+        forcar_reenvio: Reenvia o e-mail aos recém-validados já notificados e aos
+            que já estavam validados
 
     Returns:
         Tupla com (sucesso, mensagem)
@@ -1540,109 +1907,214 @@ def validar_participantes(
         if not current_user:
             return False, "Usuário não autenticado"
 
+        # Último status informado para cada ID prevalece
+        novo_status_por_id = {
+            int(participante_id): bool(validado)
+            for participante_id, validado in zip(participante_ids, validados)
+        }
+
+        # Coletar emails para envio em batch
+        emails_para_enviar = []
+
         with db_manager.get_db_session() as session:
             participante_repo = get_participante_repository(session)
-            auditoria_repo = get_auditoria_repository(session)
-
-            success_count = 0
-            error_count = 0
+            status_atual = participante_repo.get_validation_status(
+                novo_status_por_id.keys()
+            )
+            error_count = len(novo_status_por_id) - len(status_atual)
+            success_count = len(status_atual)
+
+            # Separar apenas os participantes cujo status realmente muda
+            ids_validar = [
+                pid
+                for pid, status in status_atual.items()
+                if not status and novo_status_por_id[pid]
+            ]
+            ids_invalidar = [
+                pid
+                for pid, status in status_atual.items()
+                if status and not novo_status_por_id[pid]
+            ]
 
-            # Coletar emails para envio em batch
-            emails_para_enviar = []
+            if ids_validar:
+                participante_repo.set_validado_bulk(ids_validar, True)
+            if ids_invalidar:
+                participante_repo.set_validado_bulk(ids_invalidar, False)
+
+            # Auditoria é gravada em lote pelo registrador após o commit
+            registros_auditoria = [
+                {
+                    "coordenador_id": current_user["id"],
+                    "acao": "VALIDATE_PARTICIPANTE",
+                    "detalhes": f"Participante {pid} validado",
+                }
+                for pid in ids_validar
+            ] + [
+                {
+                    "coordenador_id": current_user["id"],
+                    "acao": "INVALIDATE_PARTICIPANTE",
+                    "detalhes": f"Participante {pid} invalidado",
+                }
+                for pid in ids_invalidar
+            ]
 
-            for i, participante_id in enumerate(participante_ids):
-                try:
-                    participante = participante_repo.get_by_id(
-                        Participante, participante_id
-                    )
-                    if not participante:
-                        error_count += 1
-                        continue
+            # Coletar dados para envio de email em batch (apenas recém-validados
+            # que ainda não receberam o aviso, ou todos os validados no reenvio)
+            notificacao_repo = get_notificacao_repository(session)
+            ids_notificar = ids_validar
+            ids_reenviar: List[int] = []
+            ja_notificados = 0
+            if forcar_reenvio:
+                # Selecionados que já estavam validados e continuam validados
+                ids_reenviar = [
+                    pid
+                    for pid, status in status_atual.items()
+                    if status and novo_status_por_id[pid]
+                ]
+                ids_notificar = ids_validar + ids_reenviar
+            elif ids_validar:
+                notificados = notificacao_repo.get_enqueued_ids(
+                    TIPO_CERTIFICADO_LIBERADO, ids_validar
+                )
+                ids_notificar = [pid for pid in ids_validar if pid not in notificados]
+                ja_notificados = len(ids_validar) - len(ids_notificar)
 
-                    # Atualizar validação
-                    novo_status = validados[i]
-                    status_anterior = participante.validado
+            notificar: List[Tuple[int, int]] = []
+            if ids_notificar:
+                link_download = f"{settings.base_url}/"
+                evento_repo = get_evento_repository(session)
+                anos_evento: Dict[int, Optional[int]] = {}
+                for row in participante_repo.get_contact_rows(ids_notificar):
+                    if row.evento_id not in anos_evento:
+                        evento = evento_repo.get_by_id(Evento, row.evento_id)
+                        anos_evento[row.evento_id] = evento.ano if evento else None
+                    try:
+                        emails_para_enviar.append(
+                            {
+                                "nome": servico_criptografia.descriptografar(
+                                    row.nome_completo_encrypted
+                                ),
+                                "email": servico_criptografia.descriptografar(
+                                    row.email_encrypted
+                                ),
+                                "link_download": link_download,
+                                "evento_ano": anos_evento[row.evento_id],
+                                "participante_id": row.id,
+                            }
+                        )
+                        notificar.append((row.id, row.evento_id))
+                    except Exception as e:
+                        logger.warning(
+                            f"⚠️ Erro ao preparar email para participante {row.id}: {e}"
+                        )
 
-                    if status_anterior != novo_status:
-                        participante.validado = novo_status
-                        session.merge(participante)
+            # Os e-mails entram na fila na mesma transação da validação e são
+            # enviados em segundo plano após o commit
+            emails_enfileirados = 0
+            if emails_para_enviar and servico_email.is_configured():
+                emails_enfileirados = processador_outbox.enfileirar_lote(
+                    TIPO_CERTIFICADO_LIBERADO, emails_para_enviar, sessao=session
+                )
+                notificacao_repo.record_bulk(TIPO_CERTIFICADO_LIBERADO, notificar)
+
+        registrador_auditoria.registrar_lote(registros_auditoria)
+
+        mensagem = f"Processados {success_count + error_count} participantes. "
+        if success_count > 0:
+            mensagem += f"{success_count} atualizados com sucesso. "
+        if error_count > 0:
+            mensagem += f"{error_count} erros. "
+        if emails_enfileirados > 0:
+            mensagem += f"{emails_enfileirados} emails enfileirados para envio. "
+        if ids_reenviar:
+            mensagem += f"{len(ids_reenviar)} já validados com reenvio forçado. "
+        if ja_notificados > 0:
+            mensagem += (
+                f"{ja_notificados} já notificados anteriormente (e-mail não reenviado)."
+            )
 
-                        # Registrar auditoria
-                        acao = (
-                            "VALIDATE_PARTICIPANTE"
-                            if novo_status
-                            else "INVALIDATE_PARTICIPANTE"
-                        )
-                        detalhes = f"Participante {participante_id} {'validado' if novo_status else 'invalidado'}"
+        logger.info(f"✅ Validação em lote concluída: {mensagem}")
+        return True, mensagem
 
-                        auditoria_repo.create_audit_log(
-                            coordenador_id=current_user["id"],
-                            acao=acao,
-                            detalhes=detalhes,
-                        )
+    except Exception as e:
+        logger.error(f"❌ Erro ao validar participantes: {e}")
+        return False, f"Erro ao processar validação: {str(e)}"
 
-                        # Coletar dados para envio de email em batch (apenas se validado)
-                        if novo_status:
-                            try:
-                                nome = servico_criptografia.descriptografar(
-                                    participante.nome_completo_encrypted
-                                )
-                                email = servico_criptografia.descriptografar(
-                                    participante.email_encrypted
-                                )
-                                link_download = f"{settings.base_url}/"
-
-                                emails_para_enviar.append(
-                                    {
-                                        "nome": nome,
-                                        "email": email,
-                                        "link_download": link_download,
-                                    }
-                                )
-                            except Exception as e:
-                                logger.warning(
-                                    f"⚠️ Erro ao preparar email para participante {participante_id}: {e}"
-                                )
-
-                        success_count += 1
-                    else:
-                        # Status não mudou
-                        success_count += 1
 
-                except Exception as e:
-                    logger.error(
-                        f"❌ Erro ao validar participante {participante_id}: {e}"
-                    )
-                    error_count += 1
+# Tempo (em segundos) que as estatísticas agregadas ficam em cache
+ESTATISTICAS_CACHE_TTL = 60
 
-            # Flush changes to database BEFORE sending emails
-            session.flush()
 
-            # Enviar emails em batch (fora da sessão do banco para evitar locks)
-            emails_enviados = 0
-            emails_falhados = 0
+@st.cache_data(ttl=ESTATISTICAS_CACHE_TTL, show_spinner=False)
+@instrumentar()
+def obter_estatisticas_gerais() -> Dict[str, Any]:
+    """
+    Calcula estatísticas gerais do sistema com consultas agregadas (COUNT/GROUP BY).
 
-            if emails_para_enviar and servico_email.is_configured():
-                logger.info(f"📧 Enviando {len(emails_para_enviar)} emails em batch...")
-                emails_enviados, emails_falhados = (
-                    servico_email.enviar_emails_certificado_liberado_batch(
-                        emails_para_enviar
-                    )
-                )
+    Cada dimensão é resolvida com uma única query no banco, sem carregar objetos
+    ORM. O resultado fica em cache por ESTATISTICAS_CACHE_TTL segundos.
 
-            mensagem = f"Processados {success_count + error_count} participantes. "
-            if success_count > 0:
-                mensagem += f"{success_count} atualizados com sucesso. "
-            if error_count > 0:
-                mensagem += f"{error_count} erros. "
-            if emails_enviados > 0:
-                mensagem += f"{emails_enviados} emails enviados. "
-            if emails_falhados > 0:
-                mensagem += f"{emails_falhados} emails falharam."
+    Returns:
+        Dicionário com totais por tabela, participantes por evento e, para o
+        evento atual, distribuição por cidade, função, status de validação e dia.
+    """
+    with db_manager.get_db_session() as session:
+        evento_repo = get_evento_repository(session)
+        cidade_repo = get_cidade_repository(session)
+        funcao_repo = get_funcao_repository(session)
+        coord_repo = get_coordenador_repository(session)
+        participante_repo = get_participante_repository(session)
+
+        evento_atual = evento_repo.get_current_event()
+        anos_por_evento = dict(session.query(Evento.id, Evento.ano).all())
+        por_evento = participante_repo.count_by_evento()
+
+        estatisticas = {
+            "totais": {
+                "eventos": len(anos_por_evento),
+                "cidades": cidade_repo.count(Cidade),
+                "funcoes": funcao_repo.count(Funcao),
+                "coordenadores": coord_repo.count(Coordenador),
+                "participantes": sum(por_evento.values()),
+            },
+            "participantes_por_evento": {
+                anos_por_evento.get(evento_id, evento_id): total
+                for evento_id, total in por_evento.items()
+            },
+            "evento_atual": None,
+            "validacao": {"validados": 0, "pendentes": 0},
+            "por_cidade": [],
+            "por_funcao": [],
+            "por_dia": [],
+        }
 
-            logger.info(f"✅ Validação em lote concluída: {mensagem}")
-            return True, mensagem
+        if evento_atual:
+            validacao = participante_repo.count_by_validado(evento_atual.id)
+            estatisticas["evento_atual"] = {
+                "id": evento_atual.id,
+                "ano": evento_atual.ano,
+            }
+            estatisticas["validacao"] = {
+                "validados": validacao[True],
+                "pendentes": validacao[False],
+            }
+            estatisticas["por_cidade"] = [
+                {"cidade": f"{nome}-{estado}", "total": total}
+                for nome, estado, total in participante_repo.count_by_cidade(
+                    evento_atual.id
+                )
+            ]
+            estatisticas["por_funcao"] = [
+                {"funcao": nome_funcao, "total": total}
+                for nome_funcao, total in participante_repo.count_by_funcao(
+                    evento_atual.id
+                )
+            ]
+            estatisticas["por_dia"] = [
+                {"dia": dia, "total": total}
+                for dia, total in participante_repo.count_by_dia_inscricao(
+                    evento_atual.id
+                )
+            ]
 
-    except Exception as e:
-        logger.error(f"❌ Erro ao validar participantes: {e}")
-        return False, f"Erro ao processar validação: {str(e)}"
+        return estatisticas
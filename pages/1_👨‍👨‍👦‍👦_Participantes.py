@@ -16,7 +16,16 @@ import time
 from app.auth import require_login, get_current_user_info, auth_manager, SESSION_KEYS
 from app.core import settings
 from app.db import db_manager
+from app.instrumentation import medir_consultas
 from app.models import Evento, Cidade, Funcao, Participante
+from app.read_models import (
+    CidadeResumo,
+    EventoResumo,
+    FuncaoResumo,
+    ParticipanteLinha,
+    get_read_model_repository,
+)
+from app.reference_data import dados_referencia
 from app.services import (
     servico_criptografia,
     validar_participantes,
@@ -115,118 +124,54 @@ def mostrar_informacoes_usuario():
 def carregar_dados_validacao() -> Optional[tuple]:
     """Carrega dados necessários para a validação."""
     try:
-        with db_manager.get_db_session() as session:
-            from app.db import (
-                get_evento_repository,
-                get_cidade_repository,
-                get_funcao_repository,
-                get_participante_repository,
-            )
+        # Evento atual, cidades e funções vêm do cache de referência (registros
+        # leves indexados por ID)
+        referencia = dados_referencia.obter()
+        evento_info = referencia.evento_atual
+        cidades = referencia.cidades_por_id
+        funcoes = referencia.funcoes_por_id
 
-            evento_repo = get_evento_repository(session)
-            cidade_repo = get_cidade_repository(session)
-            funcao_repo = get_funcao_repository(session)
-            participante_repo = get_participante_repository(session)
-
-            # Buscar evento atual
-            evento_atual = evento_repo.get_current_event()
-
-            # Preparar informações do evento (acessar atributos dentro da sessão)
-            evento_info = None
-            if evento_atual:
-                evento_info = {
-                    "id": evento_atual.id,
-                    "ano": evento_atual.ano,
-                    "datas_evento": evento_atual.datas_evento,
-                }
-
-            # Buscar cidades e funções (extrair dados dentro da sessão)
-            cidades_raw = cidade_repo.get_all_ordered()
-            cidades = {}
-            for cidade in cidades_raw:
-                cidades[cidade.id] = {
-                    "id": cidade.id,
-                    "nome": cidade.nome,
-                    "estado": cidade.estado,
-                }
-
-            funcoes_raw = funcao_repo.get_all_ordered()
-            funcoes = {}
-            for funcao in funcoes_raw:
-                funcoes[funcao.id] = {
-                    "id": funcao.id,
-                    "nome_funcao": funcao.nome_funcao,
-                }
+        with db_manager.get_db_session() as session:
+            leitura = get_read_model_repository(session)
 
             # Verificar se é coordenador com cidades restritas
             is_superadmin = st.session_state.get(SESSION_KEYS["is_superadmin"], False)
             allowed_cities = st.session_state.get(SESSION_KEYS["allowed_cities"], [])
 
-            # Buscar participantes (extrair dados dentro da sessão)
+            # Buscar participantes (projeção de colunas, uma única query)
             participantes_data = []
             if evento_info:
                 if is_superadmin:
                     # Superadmin vê todos os participantes
-                    participantes_raw = participante_repo.get_by_evento_cidade(
-                        evento_info["id"]
-                    )
+                    participantes_data = leitura.listar_participantes(evento_info.id)
                 elif allowed_cities:
                     # Coordenador vê apenas participantes de suas cidades
-                    participantes_raw = []
-                    for cidade_id in allowed_cities:
-                        participantes_cidade = participante_repo.get_by_evento_cidade(
-                            evento_info["id"], cidade_id
-                        )
-                        participantes_raw.extend(participantes_cidade)
+                    participantes_data = leitura.listar_participantes(
+                        evento_info.id, allowed_cities
+                    )
                 else:
                     # Coordenador sem cidades associadas não vê nenhum participante
-                    participantes_raw = []
                     st.warning(
                         "⚠️ Você não está associado a nenhuma cidade. "
                         "Entre em contato com o administrador para associar cidades ao seu perfil."
                     )
 
-                print(
-                    f"DEBUG: Data loading - Found {len(participantes_raw)} participants for event {evento_info['id']}"
+                logger.debug(
+                    f"Carregados {len(participantes_data)} participantes do evento {evento_info.id}"
                 )
-                for i, participante in enumerate(participantes_raw):
-                    nome_decrypted = servico_criptografia.descriptografar(
-                        participante.nome_completo_encrypted
-                    )
-                    email_decrypted = servico_criptografia.descriptografar(
-                        participante.email_encrypted
-                    )
-                    if i < 3:  # Log first 3 participants with validation status
-                        print(
-                            f"DEBUG: Participant {i+1}: ID={participante.id}, Name='{nome_decrypted}', Validado={participante.validado}"
-                        )
-
-                    participantes_data.append(
-                        {
-                            "id": participante.id,
-                            "nome_completo_encrypted": participante.nome_completo_encrypted,
-                            "email_encrypted": participante.email_encrypted,
-                            "cidade_id": participante.cidade_id,
-                            "funcao_id": participante.funcao_id,
-                            "titulo_apresentacao": participante.titulo_apresentacao,
-                            "datas_participacao": participante.datas_participacao,
-                            "validado": participante.validado,
-                            "data_inscricao": participante.data_inscricao,
-                        }
-                    )
 
             return evento_info, cidades, funcoes, participantes_data
 
     except Exception as e:
-        print(f"DEBUG: Error in data loading: {str(e)}")
+        logger.error(f"❌ Erro ao carregar dados de validação: {e}")
         return None
 
 
 def preparar_dataframe_participantes(
-    participantes: List[Dict[str, Any]],
-    cidades: Dict[int, Dict[str, Any]],
-    funcoes: Dict[int, Dict[str, Any]],
-    evento_info: Dict[str, Any],
+    participantes: List[ParticipanteLinha],
+    cidades: Dict[int, CidadeResumo],
+    funcoes: Dict[int, FuncaoResumo],
+    evento_info: EventoResumo,
 ) -> pd.DataFrame:
     """Prepara um DataFrame com os dados dos participantes para exibição."""
 
@@ -236,46 +181,46 @@ def preparar_dataframe_participantes(
         try:
             # Descriptografar dados sensíveis
             nome = servico_criptografia.descriptografar(
-                participante["nome_completo_encrypted"]
+                participante.nome_completo_encrypted
             )
             email = servico_criptografia.descriptografar(
-                participante["email_encrypted"]
+                participante.email_encrypted
             )
 
             # Obter informações relacionadas
-            cidade = cidades.get(participante["cidade_id"])
-            funcao = funcoes.get(participante["funcao_id"])
+            cidade = cidades.get(participante.cidade_id)
+            funcao = funcoes.get(participante.funcao_id)
 
             # Calcular carga horária on-the-fly
             carga_horaria, _ = servico_calculo_carga_horaria.calcular_carga_horaria(
-                participante["datas_participacao"],
-                evento_info["datas_evento"],
-                evento_info["ano"],
-                participante["funcao_id"],
+                participante.datas_participacao,
+                evento_info.datas_evento,
+                evento_info.ano,
+                participante.funcao_id,
             )
 
             # Preparar dados da linha
             linha = {
-                "ID": participante["id"],
+                "ID": participante.id,
                 "Nome": nome,
                 "Email": email,
-                "Cidade": f"{cidade['nome']}-{cidade['estado']}" if cidade else "N/A",
-                "Função": funcao["nome_funcao"] if funcao else "N/A",
-                "Título Apresentação": participante["titulo_apresentacao"] or "-",
+                "Cidade": f"{cidade.nome}-{cidade.estado}" if cidade else "N/A",
+                "Função": funcao.nome_funcao if funcao else "N/A",
+                "Título Apresentação": participante.titulo_apresentacao or "-",
                 "Datas Participação": Participante.format_datas_participacao_iso_to_br(
-                    participante["datas_participacao"]
+                    participante.datas_participacao
                 ),
                 "Carga Horária": f"{carga_horaria}h",
-                "Validado": participante["validado"],
+                "Validado": participante.validado,
                 "Data Inscrição": formatar_data_exibicao(
-                    participante["data_inscricao"]
+                    participante.data_inscricao
                 ),
             }
 
             dados.append(linha)
 
         except Exception as e:
-            st.warning(f"Erro ao processar participante {participante['id']}: {str(e)}")
+            st.warning(f"Erro ao processar participante {participante.id}: {str(e)}")
             continue
 
     # Criar DataFrame
@@ -302,11 +247,11 @@ def preparar_dataframe_participantes(
         return pd.DataFrame()
 
 
-def mostrar_estatisticas(participantes: List[Dict[str, Any]]) -> None:
+def mostrar_estatisticas(participantes: List[ParticipanteLinha]) -> None:
     """Exibe estatísticas sobre os participantes."""
 
     total = len(participantes)
-    validados = sum(1 for p in participantes if p["validado"])
+    validados = sum(1 for p in participantes if p.validado)
     pendentes = total - validados
 
     col1, col2, col3 = st.columns(3)
@@ -347,8 +292,8 @@ def mostrar_estatisticas(participantes: List[Dict[str, Any]]) -> None:
 
 def tabela_validacao_participantes(
     df_participantes: pd.DataFrame,
-    cidades: Dict[int, Dict[str, Any]],
-    funcoes: Dict[int, Dict[str, Any]],
+    cidades: Dict[int, CidadeResumo],
+    funcoes: Dict[int, FuncaoResumo],
 ) -> Optional[pd.DataFrame]:
     """Exibe tabela editável para validação de participação."""
 
@@ -415,8 +360,8 @@ def tabela_validacao_participantes(
     df_para_editor = df_para_editor.set_index("ID")
 
     # Preparar options para Cidade e Função dropdowns
-    cidade_options = [""] + [f"{c['nome']}-{c['estado']}" for c in cidades.values()]
-    funcao_options = [""] + [f["nome_funcao"] for f in funcoes.values()]
+    cidade_options = [""] + [f"{c.nome}-{c.estado}" for c in cidades.values()]
+    funcao_options = [""] + [f.nome_funcao for f in funcoes.values()]
 
     # Data editor com configurações
     edited_df = st.data_editor(
@@ -505,8 +450,8 @@ def tabela_validacao_participantes(
 def processar_validacao(
     df_original: pd.DataFrame,
     df_editado: pd.DataFrame,
-    cidades: Dict[int, Dict[str, Any]],
-    funcoes: Dict[int, Dict[str, Any]],
+    cidades: Dict[int, CidadeResumo],
+    funcoes: Dict[int, FuncaoResumo],
 ) -> str:
     """Processa a validação e edições dos participantes selecionados.
 
@@ -578,7 +523,7 @@ def processar_validacao(
                             (
                                 cid
                                 for cid, c in cidades.items()
-                                if f"{c['nome']}-{c['estado']}" == cidade_nome
+                                if f"{c.nome}-{c.estado}" == cidade_nome
                             ),
                             None,
                         )
@@ -595,7 +540,7 @@ def processar_validacao(
                             (
                                 fid
                                 for fid, f in funcoes.items()
-                                if f["nome_funcao"] == funcao_nome
+                                if f.nome_funcao == funcao_nome
                             ),
                             None,
                         )
@@ -633,6 +578,14 @@ def processar_validacao(
 
     with col1:
         if not selecionados.empty:
+            forcar_reenvio = st.checkbox(
+                "📧 Reenviar e-mail de certificado a quem já foi notificado",
+                value=False,
+                help="Por padrão, quem já recebeu o aviso de certificado liberado "
+                "não recebe o e-mail novamente ao ser validado outra vez. Com esta "
+                "opção, os selecionados já validados continuam validados e recebem "
+                "o e-mail de novo.",
+            )
             if st.button("🔄 Validar/Desvalidar", type="primary", width="content"):
                 with st.spinner("Alternando status de validação..."):
                     # Para cada participante selecionado, toggle seu status atual
@@ -644,7 +597,8 @@ def processar_validacao(
                             original_row = df_original.loc[idx]
                             # Toggle: se está validado (True), vira False; se não está (False), vira True
                             current_status = original_row["Validado"]
-                            new_status = not current_status
+                            # No reenvio forçado, já validados continuam validados
+                            new_status = not current_status or forcar_reenvio
                             validation_statuses.append(new_status)
                             ids_para_validar.append(idx)
                             logger.info(
@@ -662,7 +616,9 @@ def processar_validacao(
                         f"Calling validar_participantes with {len(ids_para_validar)} participants"
                     )
                     sucesso, mensagem = validar_participantes(
-                        ids_para_validar, validation_statuses
+                        ids_para_validar,
+                        validation_statuses,
+                        forcar_reenvio=forcar_reenvio,
                     )
                     logger.info(
                         f"validar_participantes returned: sucesso={sucesso}, mensagem={mensagem}"
@@ -908,9 +864,9 @@ def main():
 
     # Informações do evento
     # Formatar datas do evento para exibição amigável
-    datas_evento_str = ", ".join(evento_info["datas_evento"])
+    datas_evento_str = ", ".join(evento_info.datas_evento)
     st.info(
-        f"🎯 **Evento:** Pint of Science {evento_info['ano']}, dias: {datas_evento_str}"
+        f"🎯 **Evento:** Pint of Science {evento_info.ano}, dias: {datas_evento_str}"
     )
 
     # Preparar DataFrame
@@ -947,4 +903,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with medir_consultas("Participantes"):
+        main()
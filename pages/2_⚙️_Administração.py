@@ -6,6 +6,9 @@ Esta página permite que superadmins gerenciem todo o sistema:
 - CRUD de eventos
 - CRUD de cidades
 - CRUD de funções
+- Importação em lote de participantes
+- Instrumentação de consultas SQL
+- Navegação e arquivamento da auditoria
 - Gestão geral do sistema
 """
 
@@ -18,15 +21,34 @@ import json
 from pathlib import Path
 
 # Importar módulos do sistema
+from app.archive import arquivar_evento, listar_eventos_arquivados, restaurar_evento
+from app.audit_archive import arquivar_auditoria, listar_arquivos_auditoria
+from app.backup import criar_backup, listar_backups
 from app.auth import (
     require_superadmin,
     get_current_user_info,
     criar_coordenador,
     auth_manager,
 )
+from app.certificate_pipeline import obter_progresso as obter_progresso_certificados
 from app.core import settings
 from app.db import db_manager
-from app.models import Evento, Cidade, Funcao, Coordenador, Participante
+from app.email_metrics import obter_serie as obter_serie_metricas_email
+from app.email_outbox import (
+    listar_falhas,
+    obter_status_fila,
+    processador_outbox,
+    reprocessar_falhas,
+)
+from app.instrumentation import (
+    limpar_historico,
+    medir_consultas,
+    obter_historico,
+    obter_resumo_por_nome,
+)
+from app.models import Evento, Cidade, Funcao, Coordenador
+from app.reference_data import dados_referencia
+from app.services import obter_estatisticas_gerais, servico_email
 from app.utils import formatar_data_exibicao, limpar_texto, validar_email
 
 # Configure logging
@@ -120,82 +142,91 @@ def mostrar_informacoes_usuario():
 def mostrar_estatisticas_gerais():
     """Exibe estatísticas gerais do sistema."""
     try:
-        with db_manager.get_db_session() as session:
-            from app.db import (
-                get_evento_repository,
-                get_cidade_repository,
-                get_funcao_repository,
-                get_coordenador_repository,
-                get_participante_repository,
+        estatisticas = obter_estatisticas_gerais()
+        totais = estatisticas["totais"]
+
+        coordenadores_count = totais["coordenadores"]
+        cidades_count = totais["cidades"]
+        participantes_count = totais["participantes"]
+
+        # Participantes validados no evento atual
+        participantes_validados = estatisticas["validacao"]["validados"]
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.markdown(
+                f"""
+            <div class="admin-card">
+                <h3 style="color: #2c3e50; margin: 0;">{coordenadores_count}</h3>
+                <p style="color: #7f8c8d; margin: 0;">Coordenadores</p>
+            </div>
+            """,
+                unsafe_allow_html=True,
             )
 
-            evento_repo = get_evento_repository(session)
-            cidade_repo = get_cidade_repository(session)
-            funcao_repo = get_funcao_repository(session)
-            coord_repo = get_coordenador_repository(session)
-            participante_repo = get_participante_repository(session)
-
-            # Contar registros
-            eventos_count = len(evento_repo.get_all(Evento))
-            cidades_count = len(cidade_repo.get_all_ordered())
-            funcoes_count = len(funcao_repo.get_all_ordered())
-            coordenadores_count = len(coord_repo.get_all(Coordenador))
-            participantes_count = len(participante_repo.get_all(Participante))
-
-            # Participantes validados
-            participantes_validados = len(
-                participante_repo.get_validated_participants(
-                    evento_repo.get_current_event().id
-                    if evento_repo.get_current_event()
-                    else 1
-                )
+        with col2:
+            st.markdown(
+                f"""
+            <div class="admin-card">
+                <h3 style="color: #2c3e50; margin: 0;">{cidades_count}</h3>
+                <p style="color: #7f8c8d; margin: 0;">Cidades</p>
+            </div>
+            """,
+                unsafe_allow_html=True,
             )
 
-            col1, col2, col3, col4 = st.columns(4)
-
-            with col1:
-                st.markdown(
-                    f"""
-                <div class="admin-card">
-                    <h3 style="color: #2c3e50; margin: 0;">{coordenadores_count}</h3>
-                    <p style="color: #7f8c8d; margin: 0;">Coordenadores</p>
-                </div>
-                """,
-                    unsafe_allow_html=True,
-                )
+        with col3:
+            st.markdown(
+                f"""
+            <div class="admin-card">
+                <h3 style="color: #2c3e50; margin: 0;">{participantes_count}</h3>
+                <p style="color: #7f8c8d; margin: 0;">Participantes</p>
+            </div>
+            """,
+                unsafe_allow_html=True,
+            )
 
-            with col2:
-                st.markdown(
-                    f"""
-                <div class="admin-card">
-                    <h3 style="color: #2c3e50; margin: 0;">{cidades_count}</h3>
-                    <p style="color: #7f8c8d; margin: 0;">Cidades</p>
-                </div>
-                """,
-                    unsafe_allow_html=True,
-                )
+        with col4:
+            st.markdown(
+                f"""
+            <div class="admin-card">
+                <h3 style="color: #27ae60; margin: 0;">{participantes_validados}</h3>
+                <p style="color: #7f8c8d; margin: 0;">Validados</p>
+            </div>
+            """,
+                unsafe_allow_html=True,
+            )
 
-            with col3:
-                st.markdown(
-                    f"""
-                <div class="admin-card">
-                    <h3 style="color: #2c3e50; margin: 0;">{participantes_count}</h3>
-                    <p style="color: #7f8c8d; margin: 0;">Participantes</p>
-                </div>
-                """,
-                    unsafe_allow_html=True,
+        # Detalhamento do evento atual (contagens agregadas no banco)
+        evento_atual = estatisticas["evento_atual"]
+        if evento_atual and participantes_count:
+            with st.expander(
+                f"📈 Detalhamento do evento {evento_atual['ano']}", expanded=False
+            ):
+                validacao = estatisticas["validacao"]
+                st.write(
+                    f"**Validados:** {validacao['validados']} | "
+                    f"**Pendentes:** {validacao['pendentes']}"
                 )
 
-            with col4:
-                st.markdown(
-                    f"""
-                <div class="admin-card">
-                    <h3 style="color: #27ae60; margin: 0;">{participantes_validados}</h3>
-                    <p style="color: #7f8c8d; margin: 0;">Validados</p>
-                </div>
-                """,
-                    unsafe_allow_html=True,
-                )
+                if estatisticas["por_cidade"]:
+                    st.markdown("**Participantes por cidade**")
+                    st.bar_chart(
+                        pd.DataFrame(estatisticas["por_cidade"]).set_index("cidade")
+                    )
+
+                if estatisticas["por_funcao"]:
+                    st.markdown("**Participantes por função**")
+                    st.bar_chart(
+                        pd.DataFrame(estatisticas["por_funcao"]).set_index("funcao")
+                    )
+
+                if estatisticas["por_dia"]:
+                    st.markdown("**Inscrições por dia**")
+                    st.line_chart(
+                        pd.DataFrame(estatisticas["por_dia"]).set_index("dia")
+                    )
 
     except Exception as e:
         st.error(f"Erro ao carregar estatísticas: {str(e)}")
@@ -216,13 +247,11 @@ def modal_associar_cidades_coordenador(coordenador_id: int, coordenador_nome: st
     )
 
     try:
+        cidades = dados_referencia.obter().cidades
+
         with db_manager.get_db_session() as session:
-            from app.db import get_cidade_repository
             from app.models import CoordenadorCidadeLink
 
-            cidade_repo = get_cidade_repository(session)
-            cidades = cidade_repo.get_all_ordered()
-
             if not cidades:
                 st.warning(
                     "⚠️ Nenhuma cidade cadastrada. Cadastre cidades primeiro na aba **🏙️ Cidades**."
@@ -414,28 +443,18 @@ def listar_coordenadores():
     try:
         with db_manager.get_db_session() as session:
             from app.db import get_coordenador_repository
+            from app.read_models import get_read_model_repository
 
-            coord_repo = get_coordenador_repository(session)
-            coordenadores = coord_repo.get_all(Coordenador)
+            coordenadores = get_read_model_repository(session).listar_coordenadores()
 
             if not coordenadores:
                 st.info("📋 Nenhum coordenador cadastrado.")
                 return
 
-            # Preparar dados para exibição e edição
-            dados = []
-            for coord in coordenadores:
-                dados.append(
-                    {
-                        "ID": coord.id,
-                        "Nome": coord.nome,
-                        "Email": coord.email,
-                        "Superadmin": coord.is_superadmin,
-                    }
-                )
-
-            df = pd.DataFrame(dados)
-            df = df.sort_values("ID", ascending=True)
+            # Preparar dados para exibição e edição (registros já ordenados por ID)
+            df = pd.DataFrame(
+                coordenadores, columns=["ID", "Nome", "Email", "Superadmin"]
+            )
 
             # Instruções de uso
             st.markdown(
@@ -485,7 +504,11 @@ def listar_coordenadores():
             if st.button(
                 "💾 Salvar Alterações", type="primary", key="salvar_coordenadores"
             ):
-                salvar_alteracoes_coordenadores(edited_df, coordenadores, coord_repo)
+                # Objetos ORM só são carregados quando há alterações a salvar
+                coord_repo = get_coordenador_repository(session)
+                salvar_alteracoes_coordenadores(
+                    edited_df, coord_repo.get_all(Coordenador), coord_repo
+                )
 
     except Exception as e:
         st.error(f"❌ Erro ao listar coordenadores: {str(e)}")
@@ -643,7 +666,7 @@ def gerenciar_associacoes_coordenador_cidade():
 
     try:
         with db_manager.get_db_session() as session:
-            from app.db import get_coordenador_repository, get_cidade_repository
+            from app.db import get_coordenador_repository
             from app.models import CoordenadorCidadeLink
 
             # Force session to reload all data from database
@@ -651,13 +674,12 @@ def gerenciar_associacoes_coordenador_cidade():
             session.expire_all()
 
             coord_repo = get_coordenador_repository(session)
-            cidade_repo = get_cidade_repository(session)
 
             # Buscar coordenadores não-superadmin
             coordenadores = [
                 c for c in coord_repo.get_all(Coordenador) if not c.is_superadmin
             ]
-            cidades = cidade_repo.get_all_ordered()
+            cidades = dados_referencia.obter().cidades
 
             if not coordenadores:
                 st.info("📋 Nenhum coordenador (não-superadmin) cadastrado.")
@@ -794,6 +816,7 @@ def formulario_criar_evento() -> bool:
 
                     # Criar evento with parsed list
                     evento = evento_repo.create_evento(ano, datas_list)
+                    dados_referencia.invalidar_apos_commit(session)
 
                     if evento:
                         # Store success message in session state to show after rerun
@@ -822,36 +845,32 @@ def listar_eventos():
         del st.session_state["show_success_evento_edit"]
 
     try:
+        eventos = dados_referencia.obter().eventos
+
         with db_manager.get_db_session() as session:
             from app.db import get_evento_repository
 
-            evento_repo = get_evento_repository(session)
-            eventos = evento_repo.get_all(Evento)
-
             if not eventos:
                 st.info("📋 Nenhum evento cadastrado.")
                 return
 
-            # Preparar dados para exibição e edição
-            dados = []
-            for evento in eventos:
-                # Converter datas_evento (JSON) para string legível no formato brasileiro
-                datas_str = (
-                    Evento.format_datas_iso_to_br(evento.datas_evento)
-                    if evento.datas_evento
-                    else ""
-                )
-                dados.append(
+            # Preparar dados para exibição e edição (registros já ordenados por ano)
+            df = pd.DataFrame(
+                [
                     {
                         "ID": evento.id,
                         "Ano": evento.ano,
-                        "Datas": datas_str,
+                        # Converter datas_evento (JSON) para string legível no formato brasileiro
+                        "Datas": (
+                            Evento.format_datas_iso_to_br(evento.datas_evento)
+                            if evento.datas_evento
+                            else ""
+                        ),
                         "Data Criação": formatar_data_exibicao(evento.data_criacao),
                     }
-                )
-
-            df = pd.DataFrame(dados)
-            df = df.sort_values("Ano", ascending=False)
+                    for evento in eventos
+                ]
+            )
 
             # Usar data_editor para permitir edição
             st.markdown(
@@ -897,12 +916,106 @@ def listar_eventos():
 
             # Botão para salvar alterações
             if st.button("💾 Salvar Alterações", type="primary", key="salvar_eventos"):
-                salvar_alteracoes_eventos(edited_df, eventos, evento_repo)
+                # Objetos ORM só são carregados quando há alterações a salvar
+                evento_repo = get_evento_repository(session)
+                salvar_alteracoes_eventos(
+                    edited_df, evento_repo.get_all(Evento), evento_repo
+                )
 
     except Exception as e:
         st.error(f"❌ Erro ao listar eventos: {str(e)}")
 
 
+def gerenciar_arquivo_eventos():
+    """Arquiva eventos encerrados no banco de arquivo ou os restaura."""
+    st.subheader("🗄️ Arquivo de Eventos")
+
+    if not settings.archive_database_path:
+        st.info(
+            "ℹ️ Arquivo desabilitado. Defina ARCHIVE_DATABASE_PATH para mover os "
+            "participantes de eventos encerrados para um banco separado."
+        )
+        return
+
+    st.caption(
+        "Participantes de eventos arquivados ficam em "
+        f"{settings.archive_database_path}. Downloads e validações de certificados "
+        "continuam funcionando normalmente."
+    )
+
+    try:
+        arquivados = listar_eventos_arquivados()
+        ids_arquivados = {evento["evento_id"] for evento in arquivados}
+
+        if arquivados:
+            st.dataframe(
+                pd.DataFrame(
+                    [
+                        {
+                            "Ano": evento["ano"],
+                            "Participantes": evento["participantes"],
+                            "Arquivado em": formatar_data_exibicao(
+                                evento["arquivado_em"]
+                            ),
+                        }
+                        for evento in arquivados
+                    ]
+                ),
+                width="stretch",
+                hide_index=True,
+            )
+
+        eventos = dados_referencia.obter().eventos
+
+        # O evento atual (mais recente) nunca é arquivado
+        ativos = [e for e in eventos[1:] if e.id not in ids_arquivados]
+        col1, col2 = st.columns(2)
+        with col1:
+            evento_arquivar = st.selectbox(
+                "Evento encerrado",
+                options=ativos,
+                format_func=lambda e: str(e.ano),
+                index=None,
+                placeholder="Selecione",
+                key="arquivo_evento_arquivar",
+            )
+            if st.button(
+                "🗄️ Arquivar",
+                disabled=evento_arquivar is None,
+                key="arquivo_arquivar",
+            ):
+                resultado = arquivar_evento(evento_arquivar.id)
+                st.success(
+                    f"✅ Evento {resultado['ano']} arquivado: "
+                    f"{resultado['participantes']} participantes movidos."
+                )
+        with col2:
+            evento_restaurar = st.selectbox(
+                "Evento arquivado",
+                options=arquivados,
+                format_func=lambda e: str(e["ano"]),
+                index=None,
+                placeholder="Selecione",
+                key="arquivo_evento_restaurar",
+            )
+            if st.button(
+                "♻️ Restaurar",
+                disabled=evento_restaurar is None,
+                key="arquivo_restaurar",
+            ):
+                resultado = restaurar_evento(evento_restaurar["evento_id"])
+                st.success(
+                    f"✅ Evento {evento_restaurar['ano']} restaurado: "
+                    f"{resultado['participantes']} participantes movidos."
+                )
+
+    except ValueError as e:
+        st.error(f"❌ {str(e)}")
+    except Exception as e:
+        logger.error(f"❌ Erro no arquivo de eventos: {e}")
+        st.error(f"❌ Erro no arquivo de eventos: {str(e)}")
+
+
 def salvar_alteracoes_eventos(
     edited_df: pd.DataFrame, eventos_originais: list, evento_repo
 ):
@@ -999,6 +1112,7 @@ def salvar_alteracoes_eventos(
         if alteracoes > 0:
             # Commit explicitamente antes do rerun
             try:
+                dados_referencia.invalidar_apos_commit(evento_repo.session)
                 evento_repo.session.commit()
                 # Store success message in session state to show after rerun
                 st.session_state["show_success_evento_edit"] = (
@@ -1099,6 +1213,7 @@ def formulario_criar_cidade() -> bool:
 
                     # Criar cidade
                     cidade = cidade_repo.create_cidade(nome.strip(), estado)
+                    dados_referencia.invalidar_apos_commit(session)
 
                     if cidade:
                         # Store success message in session state to show after rerun
@@ -1122,32 +1237,18 @@ def listar_cidades():
     st.subheader("🏙️ Cidades Cadastradas")
 
     try:
-        with db_manager.get_db_session() as session:
-            from app.db import get_cidade_repository
-
-            cidade_repo = get_cidade_repository(session)
-            cidades = cidade_repo.get_all_ordered()
-
-            if not cidades:
-                st.info("📋 Nenhuma cidade cadastrada.")
-                return
+        cidades = dados_referencia.obter().cidades
 
-            # Preparar dados para exibição
-            dados = []
-            for cidade in cidades:
-                dados.append(
-                    {
-                        "ID": cidade.id,
-                        "Nome": cidade.nome,
-                        "Estado": cidade.estado,
-                        "Completo": f"{cidade.nome}-{cidade.estado}",
-                    }
-                )
+        if not cidades:
+            st.info("📋 Nenhuma cidade cadastrada.")
+            return
 
-            df = pd.DataFrame(dados)
+        # Preparar dados para exibição
+        df = pd.DataFrame(cidades, columns=["ID", "Nome", "Estado"])
+        df["Completo"] = df["Nome"] + "-" + df["Estado"]
 
-            # Exibir tabela
-            st.dataframe(df, width="content")
+        # Exibir tabela
+        st.dataframe(df, width="content")
 
     except Exception as e:
         st.error(f"❌ Erro ao listar cidades: {str(e)}")
@@ -1187,6 +1288,7 @@ def formulario_criar_funcao() -> bool:
 
                     # Criar função
                     funcao = funcao_repo.create_funcao(nome_funcao.strip())
+                    dados_referencia.invalidar_apos_commit(session)
 
                     if funcao:
                         # Store success message in session state to show after rerun
@@ -1210,25 +1312,17 @@ def listar_funcoes():
     st.subheader("🎭 Funções Cadastradas")
 
     try:
-        with db_manager.get_db_session() as session:
-            from app.db import get_funcao_repository
-
-            funcao_repo = get_funcao_repository(session)
-            funcoes = funcao_repo.get_all_ordered()
-
-            if not funcoes:
-                st.info("📋 Nenhuma função cadastrada.")
-                return
+        funcoes = dados_referencia.obter().funcoes
 
-            # Preparar dados para exibição
-            dados = []
-            for funcao in funcoes:
-                dados.append({"ID": funcao.id, "Função": funcao.nome_funcao})
+        if not funcoes:
+            st.info("📋 Nenhuma função cadastrada.")
+            return
 
-            df = pd.DataFrame(dados)
+        # Preparar dados para exibição
+        df = pd.DataFrame(funcoes, columns=["ID", "Função"])
 
-            # Exibir tabela
-            st.dataframe(df, width="content")
+        # Exibir tabela
+        st.dataframe(df, width="content")
 
     except Exception as e:
         st.error(f"❌ Erro ao listar funções: {str(e)}")
@@ -1345,13 +1439,7 @@ def gerenciar_imagens_certificado():
     )
 
     # Buscar eventos disponíveis
-    with db_manager.get_db_session() as session:
-        from app.db import get_evento_repository
-
-        evento_repo = get_evento_repository(session)
-        eventos = session.query(Evento).order_by(Evento.ano.desc()).all()
-        # Eagerly load the anos before session closes
-        anos_disponiveis = [evento.ano for evento in eventos]
+    anos_disponiveis = [evento.ano for evento in dados_referencia.obter().eventos]
 
     if not anos_disponiveis:
         st.warning("⚠️ Nenhum evento cadastrado. Crie um evento primeiro.")
@@ -1553,13 +1641,7 @@ def configurar_cores_certificado():
     )
 
     # Buscar eventos disponíveis
-    with db_manager.get_db_session() as session:
-        from app.db import get_evento_repository
-
-        evento_repo = get_evento_repository(session)
-        eventos = session.query(Evento).order_by(Evento.ano.desc()).all()
-        # Eagerly load the anos before session closes
-        anos_disponiveis = [evento.ano for evento in eventos]
+    anos_disponiveis = [evento.ano for evento in dados_referencia.obter().eventos]
 
     if not anos_disponiveis:
         st.warning("⚠️ Nenhum evento cadastrado. Crie um evento primeiro.")
@@ -1777,18 +1859,10 @@ def configurar_carga_horaria():
         """
     )
 
-    # Buscar eventos disponíveis
-    with db_manager.get_db_session() as session:
-        from app.db import get_evento_repository, get_funcao_repository
-
-        evento_repo = get_evento_repository(session)
-        eventos = session.query(Evento).order_by(Evento.ano.desc()).all()
-        anos_disponiveis = [evento.ano for evento in eventos]
-
-        # Buscar funções disponíveis
-        funcao_repo = get_funcao_repository(session)
-        funcoes = funcao_repo.get_all_ordered()
-        funcoes_dict = {f.id: f.nome_funcao for f in funcoes}
+    # Buscar eventos e funções disponíveis
+    referencia = dados_referencia.obter()
+    anos_disponiveis = [evento.ano for evento in referencia.eventos]
+    funcoes_dict = {f.id: f.nome_funcao for f in referencia.funcoes}
     if not anos_disponiveis:
         st.warning("⚠️ Nenhum evento cadastrado. Crie um evento primeiro.")
         return
@@ -1972,6 +2046,555 @@ def configurar_carga_horaria():
     )
 
 
+def importar_participantes_arquivo():
+    """Interface para importação em lote de participantes a partir de CSV/XLSX."""
+    st.subheader("📥 Importação de Participantes")
+
+    st.info(
+        """
+        📥 **Importe participantes a partir de uma planilha:**
+        - Formatos aceitos: CSV (vírgula ou ponto e vírgula) e XLSX
+        - Colunas obrigatórias: Nome, E-mail, Cidade, Datas (DD/MM/YYYY, separadas por vírgula)
+        - Colunas opcionais: Função, Título
+        - E-mails já inscritos no evento ou repetidos no arquivo são ignorados
+        """
+    )
+
+    referencia = dados_referencia.obter()
+    eventos = [(evento.id, evento.ano) for evento in referencia.eventos]
+    funcoes = [(funcao.id, funcao.nome_funcao) for funcao in referencia.funcoes]
+
+    if not eventos:
+        st.warning("⚠️ Cadastre um evento antes de importar participantes.")
+        return
+
+    with st.form("form_importar_participantes"):
+        evento_id = st.selectbox(
+            "Evento *",
+            options=[evento_id for evento_id, _ in eventos],
+            format_func=lambda i: str(dict(eventos)[i]),
+        )
+        funcao_padrao_id = st.selectbox(
+            "Função padrão",
+            options=[None] + [funcao_id for funcao_id, _ in funcoes],
+            format_func=lambda i: (
+                "Usar coluna Função do arquivo" if i is None else dict(funcoes)[i]
+            ),
+            help="Usada quando a coluna Função estiver ausente ou vazia",
+        )
+        validado = st.checkbox("Importar participantes já validados", value=False)
+        arquivo = st.file_uploader("Arquivo *", type=["csv", "xlsx"])
+
+        submit_button = st.form_submit_button(
+            "📥 Importar", type="primary", width="content"
+        )
+
+    if submit_button:
+        if not arquivo:
+            st.error("❌ Selecione um arquivo para importar.")
+            return
+
+        from app.importer import importar_participantes
+
+        user_info = get_current_user_info()
+        try:
+            with st.spinner("Importando participantes..."):
+                resultado = importar_participantes(
+                    arquivo,
+                    evento_id,
+                    nome_arquivo=arquivo.name,
+                    funcao_padrao_id=funcao_padrao_id,
+                    validado=validado,
+                    coordenador_id=user_info["id"] if user_info else None,
+                )
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+        except Exception as e:
+            logger.error(f"❌ Erro na importação de participantes: {e}")
+            st.error(f"❌ Erro ao importar participantes: {str(e)}")
+            return
+
+        st.session_state["resultado_importacao"] = resultado
+
+    resultado = st.session_state.get("resultado_importacao")
+    if not resultado:
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Linhas", resultado["total_linhas"])
+    col2.metric("Importados", resultado["importados"])
+    col3.metric("Duplicados", resultado["duplicados"])
+    col4.metric("Com erro", len(resultado["erros"]))
+
+    if resultado["erros"]:
+        from app.importer import gerar_relatorio_erros_csv
+
+        st.dataframe(
+            pd.DataFrame(resultado["erros"]).rename(
+                columns={"linha": "Linha", "erro": "Erro"}
+            ),
+            width="stretch",
+            hide_index=True,
+        )
+        st.download_button(
+            "📝 Baixar relatório de erros",
+            data=gerar_relatorio_erros_csv(resultado["erros"]),
+            file_name="relatorio_importacao.csv",
+            mime="text/csv",
+        )
+
+
+def mostrar_instrumentacao_consultas():
+    """Painel com as consultas SQL medidas por página e serviço."""
+    st.subheader("🔬 Consultas SQL")
+
+    if not settings.sql_instrumentation_enabled:
+        st.info(
+            "ℹ️ Instrumentação desabilitada. Defina SQL_INSTRUMENTATION_ENABLED=true."
+        )
+        return
+
+    st.caption(
+        f"Consultas acima de {settings.sql_slow_query_ms:.0f} ms são registradas no log. "
+        f"SQL repetido {settings.sql_n_plus_one_threshold}x ou mais na mesma execução "
+        "é marcado como possível N+1."
+    )
+
+    resumo = obter_resumo_por_nome()
+    if not resumo:
+        st.info("📋 Nenhuma medição registrada ainda.")
+        return
+
+    st.dataframe(
+        pd.DataFrame(resumo).rename(
+            columns={
+                "nome": "Página/Serviço",
+                "execucoes": "Execuções",
+                "consultas": "Consultas",
+                "media_consultas": "Média",
+                "max_consultas": "Máximo",
+                "tempo_total_ms": "Tempo total (ms)",
+                "n_mais_um": "Possíveis N+1",
+            }
+        )[
+            [
+                "Página/Serviço",
+                "Execuções",
+                "Consultas",
+                "Média",
+                "Máximo",
+                "Tempo total (ms)",
+                "Possíveis N+1",
+            ]
+        ],
+        width="stretch",
+        hide_index=True,
+    )
+
+    st.markdown("**Execuções recentes**")
+    for medicao in obter_historico()[:20]:
+        alerta = " ⚠️" if medicao["n_mais_um"] else ""
+        with st.expander(
+            f"{medicao['inicio']} · {medicao['nome']} · "
+            f"{medicao['total_consultas']} consultas · "
+            f"{medicao['tempo_total_ms']:.1f} ms{alerta}"
+        ):
+            for candidato in medicao["n_mais_um"]:
+                st.warning(f"Possível N+1: repetido {candidato['repeticoes']}x")
+                st.code(candidato["sql"], language="sql")
+            st.markdown("Consultas mais lentas:")
+            for consulta in medicao["mais_lentas"]:
+                st.caption(f"{consulta['duracao_ms']:.2f} ms")
+                st.code(consulta["sql"], language="sql")
+
+    if st.button("🗑️ Limpar medições", key="limpar_medicoes_sql"):
+        limpar_historico()
+        st.rerun()
+
+
+# Registros por página na tela de auditoria
+AUDITORIA_POR_PAGINA = 50
+
+
+def navegar_auditoria():
+    """Tela de auditoria com filtros e paginação por cursor."""
+    st.subheader("🧾 Auditoria")
+
+    with db_manager.get_db_session() as session:
+        from app.db import get_auditoria_repository
+        from app.read_models import get_read_model_repository
+
+        coordenadores = get_read_model_repository(session).listar_coordenadores()
+        acoes = get_auditoria_repository(session).get_acoes()
+
+    col1, col2, col3 = st.columns([2, 2, 2])
+    with col1:
+        opcoes_coordenador = {None: "Todos"}
+        opcoes_coordenador.update({c.id: c.nome for c in coordenadores})
+        coordenador_id = st.selectbox(
+            "Coordenador",
+            options=list(opcoes_coordenador),
+            format_func=lambda cid: opcoes_coordenador[cid],
+            key="auditoria_coordenador",
+        )
+    with col2:
+        acao = st.selectbox(
+            "Ação",
+            options=[None] + acoes,
+            format_func=lambda a: a or "Todas",
+            key="auditoria_acao",
+        )
+    with col3:
+        periodo = st.date_input(
+            "Período", value=(), format="DD/MM/YYYY", key="auditoria_periodo"
+        )
+
+    data_inicio = periodo[0] if len(periodo) > 0 else None
+    data_fim = periodo[1] if len(periodo) > 1 else data_inicio
+
+    # Pilha de cursores das páginas visitadas; reinicia quando os filtros mudam
+    filtros = (coordenador_id, acao, data_inicio, data_fim)
+    if st.session_state.get("auditoria_filtros") != filtros:
+        st.session_state["auditoria_filtros"] = filtros
+        st.session_state["auditoria_cursores"] = [None]
+    cursores = st.session_state["auditoria_cursores"]
+
+    with db_manager.get_db_session() as session:
+        from app.db import get_auditoria_repository
+
+        linhas, proximo_cursor = get_auditoria_repository(session).get_page(
+            coordenador_id=coordenador_id,
+            acao=acao,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            cursor=cursores[-1],
+            limit=AUDITORIA_POR_PAGINA,
+        )
+
+    if not linhas:
+        st.info("📋 Nenhum registro de auditoria encontrado.")
+    else:
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "Data": formatar_data_exibicao(linha.timestamp),
+                        "Coordenador": linha.coordenador_nome
+                        or f"#{linha.coordenador_id}",
+                        "Ação": linha.acao,
+                        "Detalhes": linha.detalhes or "",
+                    }
+                    for linha in linhas
+                ]
+            ),
+            width="stretch",
+            hide_index=True,
+        )
+
+    col_anterior, col_pagina, col_proxima = st.columns([1, 2, 1])
+    with col_anterior:
+        if st.button(
+            "⬅️ Anterior", disabled=len(cursores) == 1, key="auditoria_anterior"
+        ):
+            cursores.pop()
+            st.rerun()
+    with col_pagina:
+        st.caption(f"Página {len(cursores)}")
+    with col_proxima:
+        if st.button(
+            "Próxima ➡️", disabled=proximo_cursor is None, key="auditoria_proxima"
+        ):
+            cursores.append(proximo_cursor)
+            st.rerun()
+
+    st.markdown("---")
+    st.markdown("**🗄️ Retenção**")
+    st.caption(
+        "Registros mais antigos que o período de retenção são movidos para arquivos "
+        f"comprimidos por dia em {settings.audit_archive_dir}."
+    )
+
+    dias_retencao = st.number_input(
+        "Manter na tabela (dias)",
+        min_value=1,
+        value=settings.audit_retention_days,
+        step=30,
+        key="auditoria_dias_retencao",
+    )
+    if st.button("🗄️ Arquivar registros antigos", key="auditoria_arquivar"):
+        try:
+            with st.spinner("Arquivando registros..."):
+                resultado = arquivar_auditoria(dias_retencao=int(dias_retencao))
+            st.success(
+                f"✅ {resultado['arquivados']} registros anteriores a "
+                f"{resultado['limite'][:10]} arquivados."
+            )
+            st.session_state.pop("auditoria_filtros", None)
+        except Exception as e:
+            logger.error(f"❌ Erro ao arquivar auditoria: {e}")
+            st.error(f"❌ Erro ao arquivar auditoria: {str(e)}")
+
+    arquivos = listar_arquivos_auditoria()
+    if arquivos:
+        with st.expander(f"📄 Arquivos ({len(arquivos)})"):
+            for arquivo in arquivos:
+                col_nome, col_baixar = st.columns([3, 1])
+                with col_nome:
+                    st.text(
+                        f"{arquivo['data'].strftime('%d/%m/%Y')} · "
+                        f"{arquivo['tamanho_bytes'] / 1024:.1f} KB"
+                    )
+                with col_baixar:
+                    st.download_button(
+                        "⬇️ Baixar",
+                        data=arquivo["caminho"].read_bytes(),
+                        file_name=arquivo["caminho"].name,
+                        mime="application/gzip",
+                        key=f"auditoria_arquivo_{arquivo['data'].isoformat()}",
+                    )
+
+
+def gerenciar_backups():
+    """Exibe os snapshots do banco e permite criar um backup imediato."""
+    st.subheader("💾 Backup do Banco de Dados")
+
+    info = db_manager.get_database_info()
+    if not settings.database_url.startswith("sqlite:///"):
+        st.info("ℹ️ Backup online disponível apenas para bancos SQLite em arquivo.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(
+            "Último backup",
+            (
+                formatar_data_exibicao(info["last_backup"])
+                if info["last_backup"]
+                else "Nunca"
+            ),
+        )
+    with col2:
+        st.metric(
+            "Intervalo",
+            (
+                f"{settings.backup_interval_hours:g} h"
+                if settings.backup_interval_hours > 0
+                else "Desativado"
+            ),
+        )
+    with col3:
+        st.metric("Snapshots mantidos", settings.backup_keep)
+
+    st.caption(f"Diretório: {settings.backup_dir}")
+
+    if st.button("💾 Criar backup agora", key="backup_criar"):
+        try:
+            with st.spinner("Copiando banco de dados..."):
+                resultado = criar_backup()
+            st.success(
+                f"✅ Backup criado em {resultado['duracao_s']:.1f}s: "
+                f"{resultado['tamanho_banco_bytes'] / 1024 / 1024:.1f} MB → "
+                f"{resultado['tamanho_bytes'] / 1024 / 1024:.1f} MB comprimidos."
+                + (" Banco de arquivo incluído." if resultado["banco_arquivo"] else "")
+            )
+        except Exception as e:
+            logger.error(f"❌ Erro ao criar backup: {e}")
+            st.error(f"❌ Erro ao criar backup: {str(e)}")
+
+    backups = listar_backups()
+    if not backups:
+        st.info("ℹ️ Nenhum backup encontrado.")
+        return
+
+    st.dataframe(
+        pd.DataFrame(
+            [
+                {
+                    "Arquivo": backup["arquivo"].name,
+                    "Criado em": formatar_data_exibicao(backup["criado_em"]),
+                    "Tamanho (MB)": round(backup["tamanho_bytes"] / 1024 / 1024, 2),
+                }
+                for backup in backups
+            ]
+        ),
+        width="stretch",
+        hide_index=True,
+    )
+
+
+def mostrar_fila_emails():
+    """Exibe a profundidade da fila de e-mails e a dead-letter."""
+    st.subheader("📧 Fila de E-mails")
+    st.caption(
+        "Confirmações de inscrição e certificados liberados são enviados em "
+        "segundo plano. Mensagens que falham são reenviadas com intervalos "
+        f"crescentes e, após {settings.email_outbox_max_attempts} tentativas, "
+        "ficam na lista de falhas."
+    )
+
+    try:
+        status = obter_status_fila()
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Na fila", status["pendente"] + status["enviando"])
+        with col2:
+            st.metric("Enviados", status["enviado"])
+        with col3:
+            st.metric("Falhas", status["falhou"])
+        with col4:
+            st.metric(
+                "Mais antigo na fila",
+                (
+                    formatar_data_exibicao(status["pendente_mais_antigo"])
+                    if status["pendente_mais_antigo"]
+                    else "-"
+                ),
+            )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("▶️ Processar fila agora", key="outbox_processar"):
+                processador_outbox.notificar()
+                st.success("✅ Processador acionado.")
+        with col2:
+            if st.button(
+                "♻️ Reprocessar falhas",
+                disabled=status["falhou"] == 0,
+                key="outbox_reprocessar",
+            ):
+                devolvidas = reprocessar_falhas()
+                st.success(f"✅ {devolvidas} mensagens devolvidas à fila.")
+                st.rerun()
+
+        if status["falhou"]:
+            st.dataframe(
+                pd.DataFrame(
+                    [
+                        {
+                            "ID": falha["id"],
+                            "Tipo": falha["tipo"],
+                            "E-mail": falha["email"],
+                            "Tentativas": falha["tentativas"],
+                            "Último erro": falha["ultimo_erro"],
+                            "Criado em": formatar_data_exibicao(falha["criado_em"]),
+                        }
+                        for falha in listar_falhas()
+                    ]
+                ),
+                width="stretch",
+                hide_index=True,
+            )
+
+        progresso = obter_progresso_certificados()
+        if settings.email_attach_certificates and progresso:
+            st.markdown("#### 📎 Certificados anexados")
+            st.progress(
+                progresso["enviados"] / max(progresso["total"], 1),
+                text=(
+                    f"{progresso['enviados']}/{progresso['total']} enviados · "
+                    f"{progresso['gerados']} gerados · "
+                    f"{progresso['falhas_geracao']} falhas de geração"
+                    + (" · concluído" if progresso["concluido"] else "")
+                ),
+            )
+
+        st.markdown("#### 🔌 Conexão com o provedor")
+        metricas = servico_email.despachante.obter_metricas()
+        estados_circuito = {
+            "fechado": "🟢 Fechado",
+            "meio_aberto": "🟡 Em teste",
+            "aberto": "🔴 Aberto",
+        }
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Circuito", estados_circuito[metricas["estado_circuito"]])
+        with col2:
+            st.metric("Requisições", metricas["requisicoes"])
+        with col3:
+            st.metric("Limitadas (429)", metricas["limitadas_429"])
+        with col4:
+            st.metric("Espera no limitador", f"{metricas['espera_limitador_s']:.1f}s")
+        st.caption(
+            f"Aceitas: {metricas['sucessos']} · Recusadas (4xx): {metricas['recusadas']} · "
+            f"Erros do provedor (5xx): {metricas['erros_servidor']} · "
+            f"Timeouts: {metricas['timeouts']} · Erros de conexão: {metricas['erros_conexao']} · "
+            f"Bloqueadas pelo circuito: {metricas['bloqueadas_circuito']} · "
+            f"Aberturas do circuito: {metricas['aberturas_circuito']}"
+        )
+
+        mostrar_metricas_envio()
+
+    except Exception as e:
+        logger.error(f"❌ Erro ao carregar a fila de e-mails: {e}")
+        st.error(f"❌ Erro ao carregar a fila de e-mails: {str(e)}")
+
+
+def mostrar_metricas_envio():
+    """Exibe a série de métricas de envio (vazão, latência, status e espera na fila)."""
+    st.markdown("#### 📈 Métricas de envio")
+    periodos = {"Última hora": 1, "Últimas 24 horas": 24, "Últimos 7 dias": 24 * 7}
+    periodo = st.selectbox(
+        "Período", list(periodos), index=1, key="email_metricas_periodo"
+    )
+    serie = obter_serie_metricas_email(periodos[periodo])
+    if not serie:
+        st.info("ℹ️ Nenhum envio registrado no período.")
+        return
+
+    df = pd.DataFrame(serie)
+    df["inicio"] = pd.to_datetime(df["inicio"])
+    df = df.set_index("inicio")
+
+    requisicoes = int(df["requisicoes"].sum())
+    retentativas = int(df["retentativas"].sum())
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Mensagens aceitas", int(df["mensagens"].sum()))
+    with col2:
+        st.metric("Pico de vazão", f"{df['mensagens_por_segundo'].max():.1f}/s")
+    with col3:
+        p95 = df["latencia_p95_ms"].max()
+        st.metric("Latência p95 (pior)", "-" if pd.isna(p95) else f"{p95:.0f} ms")
+    with col4:
+        st.metric(
+            "Retentativas",
+            retentativas,
+            help=f"{retentativas / max(requisicoes, 1):.1%} das requisições",
+        )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Mensagens por segundo**")
+        st.line_chart(df[["mensagens_por_segundo"]])
+    with col2:
+        st.markdown("**Latência (ms)**")
+        st.line_chart(df[["latencia_media_ms", "latencia_p95_ms"]])
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Respostas por status**")
+        por_status: Dict[str, int] = {}
+        for contagens in df["por_status"]:
+            for status, quantidade in (contagens or {}).items():
+                por_status[status] = por_status.get(status, 0) + quantidade
+        st.bar_chart(
+            pd.DataFrame(
+                {"status": list(por_status), "quantidade": list(por_status.values())}
+            ).set_index("status")
+        )
+    with col2:
+        st.markdown("**Espera na fila (s)**")
+        st.line_chart(df[["espera_fila_media_s", "espera_fila_max_s"]])
+
+    st.caption(
+        f"Intervalos de {settings.email_metrics_interval_seconds:g}s, guardados por "
+        f"{settings.email_metrics_retention_days} dias. O último ponto é o "
+        "intervalo em andamento."
+    )
+
+
 def main():
     """Função principal da página."""
 
@@ -1995,7 +2618,7 @@ def main():
     mostrar_estatisticas_gerais()
 
     # Abas para organizar o conteúdo
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10, tab11 = st.tabs(
         [
             "👤 Coordenadores",
             "📅 Eventos",
@@ -2003,6 +2626,11 @@ def main():
             "🎭 Funções",
             "🖼️ Certificado",
             "⏱️ Carga Horária",
+            "📥 Importação",
+            "🔬 Consultas SQL",
+            "🧾 Auditoria",
+            "💾 Backup",
+            "📧 E-mails",
         ]
     )
 
@@ -2050,6 +2678,10 @@ def main():
         # Lista de eventos
         listar_eventos()
 
+        st.markdown("---")
+        # Arquivo de eventos encerrados
+        gerenciar_arquivo_eventos()
+
     with tab3:
         # Show success message if it exists in session state
         if "show_success_cidade" in st.session_state:
@@ -2090,6 +2722,26 @@ def main():
         # Configuração de carga horária
         configurar_carga_horaria()
 
+    with tab7:
+        # Importação em lote de participantes
+        importar_participantes_arquivo()
+
+    with tab8:
+        # Instrumentação de consultas SQL
+        mostrar_instrumentacao_consultas()
+
+    with tab9:
+        # Navegação e retenção da auditoria
+        navegar_auditoria()
+
+    with tab10:
+        # Backups online do banco de dados
+        gerenciar_backups()
+
+    with tab11:
+        # Fila de e-mails (outbox)
+        mostrar_fila_emails()
+
     # Rodapé
     st.markdown(
         """
@@ -2102,4 +2754,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with medir_consultas("Administração"):
+        main()
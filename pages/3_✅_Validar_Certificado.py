@@ -5,18 +5,13 @@ Permite que qualquer pessoa valide a autenticidade de um certificado
 usando o hash de validação fornecido no certificado.
 """
 
+import asyncio
+
 import streamlit as st
 from datetime import datetime
-from app.db import (
-    db_manager,
-    get_participante_repository,
-    get_evento_repository,
-    get_cidade_repository,
-    get_funcao_repository,
-)
 from app.core import settings
-from app.models import Participante, Evento, Cidade, Funcao
-from app.services import servico_criptografia, servico_calculo_carga_horaria
+from app.instrumentation import medir_consultas
+from app.services import servico_validacao
 
 st.set_page_config(
     page_title=f"Validar Certificado - {settings.app_name}",
@@ -106,170 +101,107 @@ if st.button("🔍 Validar Certificado", type="primary", width="content"):
     else:
         with st.spinner("Verificando autenticidade..."):
             try:
-                with db_manager.get_db_session() as session:
-                    participante_repo = get_participante_repository(session)
-                    evento_repo = get_evento_repository(session)
-                    cidade_repo = get_cidade_repository(session)
-                    funcao_repo = get_funcao_repository(session)
-
-                    # Buscar participante pelo hash
-                    participante = (
-                        session.query(Participante)
-                        .filter(Participante.hash_validacao == hash_validacao)
-                        .first()
+                with medir_consultas("Validar Certificado"):
+                    situacao, certificado = asyncio.run(
+                        servico_validacao.verificar_certificado_async(hash_validacao)
+                    )
+
+                if situacao == "nao_encontrado":
+                    st.error(
+                        "❌ **Certificado NÃO ENCONTRADO**\n\n"
+                        "Este código de validação não corresponde a nenhum certificado "
+                        "emitido pelo Pint of Science Brasil.\n\n"
+                        "**Possíveis causas:**\n"
+                        "- Código digitado incorretamente\n"
+                        "- Certificado falsificado\n"
+                        "- Certificado ainda não foi emitido"
+                    )
+                elif situacao == "invalido":
+                    st.error(
+                        "❌ **Certificado INVÁLIDO**\n\n"
+                        "A assinatura digital deste certificado foi comprometida.\n"
+                        "Este certificado pode ter sido adulterado ou falsificado."
                     )
+                else:
+                    # Certificado válido
+                    st.success("✅ **CERTIFICADO AUTÊNTICO**")
+                    st.balloons()
 
-                    if not participante:
-                        st.error(
-                            "❌ **Certificado NÃO ENCONTRADO**\n\n"
-                            "Este código de validação não corresponde a nenhum certificado "
-                            "emitido pelo Pint of Science Brasil.\n\n"
-                            "**Possíveis causas:**\n"
-                            "- Código digitado incorretamente\n"
-                            "- Certificado falsificado\n"
-                            "- Certificado ainda não foi emitido"
+                    st.markdown("---")
+                    st.subheader("📋 Informações do Certificado")
+
+                    # Exibir informações em colunas
+                    col1, col2 = st.columns(2)
+
+                    with col1:
+                        st.metric("👤 Participante", certificado["nome_completo"])
+                        st.metric("🎭 Função", certificado["funcao"] or "N/A")
+                        st.metric("📍 Cidade", certificado["cidade"] or "N/A")
+
+                    with col2:
+                        st.metric(
+                            "📅 Evento", f"Pint of Science {certificado['evento_ano']}"
                         )
-                    else:
-                        # Descriptografar dados
-                        nome_completo = servico_criptografia.descriptografar(
-                            participante.nome_completo_encrypted
+                        st.metric(
+                            "⏱️ Carga Horária",
+                            f"{certificado['carga_horaria']}h",
                         )
-                        email = servico_criptografia.descriptografar(
-                            participante.email_encrypted
+                        st.metric(
+                            "✅ Status",
+                            (
+                                "Validado"
+                                if certificado["validado"]
+                                else "Aguardando validação"
+                            ),
                         )
 
-                        # Verificar HMAC para garantir integridade
-                        hash_esperado = (
-                            servico_criptografia.gerar_hash_validacao_certificado(
-                                participante.id,
-                                participante.evento_id,
-                                email,
-                                nome_completo,
-                            )
+                    # Informações adicionais
+                    st.markdown("---")
+                    st.markdown("**📄 Detalhes Adicionais:**")
+
+                    if certificado["titulo_apresentacao"]:
+                        st.markdown(
+                            f"**Título da apresentação:**  \n{certificado['titulo_apresentacao']}"
                         )
 
-                        if hash_validacao != hash_esperado:
-                            st.error(
-                                "❌ **Certificado INVÁLIDO**\n\n"
-                                "A assinatura digital deste certificado foi comprometida.\n"
-                                "Este certificado pode ter sido adulterado ou falsificado."
-                            )
-                        else:
-                            # Buscar dados relacionados
-                            evento = evento_repo.get_by_id(
-                                Evento, participante.evento_id
-                            )
-                            cidade = cidade_repo.get_by_id(
-                                Cidade, participante.cidade_id
-                            )
-                            funcao = funcao_repo.get_by_id(
-                                Funcao, participante.funcao_id
-                            )
-
-                            # Calcular carga horária on-the-fly
-                            carga_horaria, _ = (
-                                servico_calculo_carga_horaria.calcular_carga_horaria(
-                                    participante.datas_participacao,
-                                    evento.datas_evento,
-                                    evento.ano,
-                                    participante.funcao_id,
-                                )
-                            )
-
-                            # Certificado válido
-                            st.success("✅ **CERTIFICADO AUTÊNTICO**")
-                            st.balloons()
-
-                            st.markdown("---")
-                            st.subheader("📋 Informações do Certificado")
-
-                            # Exibir informações em colunas
-                            col1, col2 = st.columns(2)
-
-                            with col1:
-                                st.metric("👤 Participante", nome_completo)
-                                st.metric(
-                                    "🎭 Função", funcao.nome_funcao if funcao else "N/A"
-                                )
-                                st.metric(
-                                    "📍 Cidade",
-                                    (
-                                        f"{cidade.nome} - {cidade.estado}"
-                                        if cidade
-                                        else "N/A"
-                                    ),
-                                )
-
-                            with col2:
-                                st.metric(
-                                    "📅 Evento",
-                                    (
-                                        f"Pint of Science {evento.ano}"
-                                        if evento
-                                        else "N/A"
-                                    ),
-                                )
-                                st.metric(
-                                    "⏱️ Carga Horária",
-                                    f"{carga_horaria}h",
-                                )
-                                st.metric(
-                                    "✅ Status",
-                                    (
-                                        "Validado"
-                                        if participante.validado
-                                        else "Aguardando validação"
-                                    ),
-                                )
-
-                            # Informações adicionais
-                            st.markdown("---")
-                            st.markdown("**📄 Detalhes Adicionais:**")
-
-                            if participante.titulo_apresentacao:
-                                st.markdown(
-                                    f"**Título da apresentação:**  \n{participante.titulo_apresentacao}"
-                                )
-
-                            # Formatar datas de participação
-                            datas_list = [
-                                d.strip()
-                                for d in participante.datas_participacao.split(",")
-                            ]
-                            datas_formatadas = []
-                            for data in datas_list:
-                                try:
-                                    dt = datetime.fromisoformat(data)
-                                    datas_formatadas.append(dt.strftime("%d/%m/%Y"))
-                                except:
-                                    datas_formatadas.append(data)
-
-                            st.markdown(
-                                f"**Datas de participação:**  \n{', '.join(datas_formatadas)}"
-                            )
-
-                            # Data de inscrição
-                            try:
-                                dt_inscricao = datetime.fromisoformat(
-                                    participante.data_inscricao
-                                )
-                                st.markdown(
-                                    f"**Data de inscrição:**  \n{dt_inscricao.strftime('%d/%m/%Y às %H:%M')}"
-                                )
-                            except:
-                                st.markdown(
-                                    f"**Data de inscrição:**  \n{participante.data_inscricao}"
-                                )
-
-                            # Código de validação
-                            st.markdown("---")
-                            st.markdown("**🔒 Código de Validação (Hash):**")
-                            st.code(hash_validacao, language=None)
-
-                            st.info(
-                                "Este certificado foi verificado em "
-                                f"{datetime.now().strftime('%d/%m/%Y às %H:%M')} e confirmado como autêntico."
-                            )
+                    # Formatar datas de participação
+                    datas_list = [
+                        d.strip() for d in certificado["datas_participacao"].split(",")
+                    ]
+                    datas_formatadas = []
+                    for data in datas_list:
+                        try:
+                            dt = datetime.fromisoformat(data)
+                            datas_formatadas.append(dt.strftime("%d/%m/%Y"))
+                        except:
+                            datas_formatadas.append(data)
+
+                    st.markdown(
+                        f"**Datas de participação:**  \n{', '.join(datas_formatadas)}"
+                    )
+
+                    # Data de inscrição
+                    try:
+                        dt_inscricao = datetime.fromisoformat(
+                            certificado["data_inscricao"]
+                        )
+                        st.markdown(
+                            f"**Data de inscrição:**  \n{dt_inscricao.strftime('%d/%m/%Y às %H:%M')}"
+                        )
+                    except:
+                        st.markdown(
+                            f"**Data de inscrição:**  \n{certificado['data_inscricao']}"
+                        )
+
+                    # Código de validação
+                    st.markdown("---")
+                    st.markdown("**🔒 Código de Validação (Hash):**")
+                    st.code(hash_validacao, language=None)
+
+                    st.info(
+                        "Este certificado foi verificado em "
+                        f"{datetime.now().strftime('%d/%m/%Y às %H:%M')} e confirmado como autêntico."
+                    )
 
             except Exception as e:
                 st.error(f"❌ Erro ao validar certificado: {str(e)}")
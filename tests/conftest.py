@@ -0,0 +1,115 @@
+"""
+Fixtures compartilhadas pelos testes do sistema Pint of Science Brasil.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Adicionar o diretório raiz ao path para importar os módulos
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.models import (
+    Base,
+    Cidade,
+    Evento,
+    Funcao,
+    Participante,
+    create_database_engine,
+    get_session_factory,
+)
+
+
+@pytest.fixture
+def engine():
+    """Engine SQLite em memória com todas as tabelas criadas."""
+    engine = create_database_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    """Sessão isolada sobre o banco em memória."""
+    session = get_session_factory(engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def dados_basicos(session):
+    """Cria um evento, duas cidades e duas funções para os testes."""
+    evento = Evento(ano=2025, datas_evento=["2025-05-19", "2025-05-20"])
+    cidades = [Cidade(nome="Brasília", estado="DF"), Cidade(nome="Recife", estado="PE")]
+    funcoes = [Funcao(nome_funcao="Palestrante"), Funcao(nome_funcao="Voluntário(a)")]
+    session.add_all([evento, *cidades, *funcoes])
+    session.flush()
+    return {"evento": evento, "cidades": cidades, "funcoes": funcoes}
+
+
+@pytest.fixture
+def db_manager_memoria(engine):
+    """DatabaseManager já inicializado sobre o banco em memória."""
+    from app.db import DatabaseManager
+
+    manager = DatabaseManager()
+    manager.engine = engine
+    manager.session_factory = get_session_factory(engine)
+    manager._initialized = True
+    return manager
+
+
+@pytest.fixture
+def criar_referencias():
+    """Fábrica de eventos, da cidade Brasília-DF e da função Palestrante."""
+
+    def criar(session, anos=(2025,)):
+        eventos = [Evento(ano=ano, datas_evento=[f"{ano}-05-19"]) for ano in anos]
+        cidade = Cidade(nome="Brasília", estado="DF")
+        funcao = Funcao(nome_funcao="Palestrante")
+        session.add_all([*eventos, cidade, funcao])
+        session.flush()
+        return {"eventos": eventos, "cidade": cidade, "funcao": funcao}
+
+    return criar
+
+
+@pytest.fixture
+def criar_participantes():
+    """
+    Fábrica de participantes com nome e e-mail criptografados.
+
+    O participante i se chama "Pessoa {i}" e usa o e-mail "p{i}@x.com";
+    `validado` é um booleano ou uma função do índice.
+    """
+    from app.services import servico_criptografia
+
+    def criar(session, referencias, quantidade, evento=None, validado=True, inicio=0):
+        evento = evento or referencias["eventos"][-1]
+        participantes = []
+        for i in range(inicio, inicio + quantidade):
+            email = f"p{i}@x.com"
+            participantes.append(
+                Participante(
+                    nome_completo_encrypted=servico_criptografia.criptografar_nome(
+                        f"Pessoa {i}"
+                    ),
+                    email_encrypted=servico_criptografia.criptografar_email(email),
+                    email_hash=servico_criptografia.gerar_hash_email(email),
+                    evento_id=evento.id,
+                    cidade_id=referencias["cidade"].id,
+                    funcao_id=referencias["funcao"].id,
+                    datas_participacao=evento.datas_evento[0],
+                    validado=validado(i) if callable(validado) else validado,
+                )
+            )
+        session.add_all(participantes)
+        session.flush()
+        return participantes
+
+    return criar
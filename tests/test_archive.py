@@ -0,0 +1,149 @@
+"""
+Testes do arquivo de eventos encerrados (app/archive.py).
+"""
+
+import pytest
+
+from app.models import (
+    Base,
+    Evento,
+    Participante,
+    ParticipanteArquivado,
+    create_database_engine,
+)
+from app.services import servico_criptografia
+
+HASH_P1 = servico_criptografia.gerar_hash_email("p1@x.com")
+
+
+@pytest.fixture
+def manager_com_arquivo(monkeypatch, tmp_path):
+    """DatabaseManager em memória com o banco de arquivo anexado."""
+    import app.db
+    from app.archive import anexar_banco_arquivo, invalidar_cache_eventos_arquivados
+    from app.db import DatabaseManager
+    from app.models import get_session_factory
+
+    engine = create_database_engine("sqlite://")
+    anexar_banco_arquivo(engine, tmp_path / "arquivo.db")
+    Base.metadata.create_all(bind=engine)
+
+    manager = DatabaseManager()
+    manager.engine = engine
+    manager.session_factory = get_session_factory(engine)
+    manager._initialized = True
+    monkeypatch.setattr(app.db, "db_manager", manager)
+
+    yield manager
+    invalidar_cache_eventos_arquivados()
+    engine.dispose()
+
+
+@pytest.fixture
+def popular(criar_referencias, criar_participantes):
+    """Cria os eventos 2024 (3 participantes) e 2025 (2 participantes)."""
+
+    def popular(manager):
+        with manager.get_db_session() as session:
+            referencias = criar_referencias(session, anos=(2024, 2025))
+            evento_2024, evento_2025 = referencias["eventos"]
+            participantes = criar_participantes(
+                session, referencias, 3, evento=evento_2024, validado=lambda i: i == 0
+            ) + criar_participantes(
+                session, referencias, 2, evento=evento_2025, validado=False, inicio=3
+            )
+            participantes[0].hash_validacao = "validacao-0"
+            for i, participante in enumerate(participantes):
+                participante.data_inscricao = f"2025-04-{i + 1:02d}T10:00:00"
+            session.flush()
+            return evento_2024.id, evento_2025.id
+
+    return popular
+
+
+def test_arquivar_evento_direciona_leituras_para_o_arquivo(
+    manager_com_arquivo, popular
+):
+    """Participantes arquivados saem do banco principal e continuam acessíveis pelo repositório."""
+    from app.archive import arquivar_evento, listar_eventos_arquivados
+    from app.db import get_participante_repository
+    from app.read_models import get_read_model_repository
+
+    evento_2024, evento_2025 = popular(manager_com_arquivo)
+
+    resultado = arquivar_evento(evento_2024)
+    assert resultado == {"evento_id": evento_2024, "ano": 2024, "participantes": 3}
+    assert [e["ano"] for e in listar_eventos_arquivados()] == [2024]
+
+    with manager_com_arquivo.get_db_session() as session:
+        assert session.query(Participante).count() == 2
+        assert session.query(ParticipanteArquivado).count() == 3
+
+        repo = get_participante_repository(session)
+        participante = repo.get_by_email_hash(HASH_P1, evento_2024)
+        assert isinstance(participante, ParticipanteArquivado)
+        assert participante.evento.ano == 2024
+
+        linhas, cursor = repo.get_page(evento_2024)
+        assert len(linhas) == 3 and cursor is None
+        assert repo.count_filtered(evento_2024, validado=True) == 1
+        assert repo.count_by_evento() == {evento_2024: 3, evento_2025: 2}
+        leitura = get_read_model_repository(session)
+        assert [p.id for p in leitura.listar_participantes(evento_2024)] == [3, 2, 1]
+        assert [p.id for p in leitura.listar_participantes(evento_2025)] == [5, 4]
+
+        arquivado = repo.get_by_hash_validacao("validacao-0")
+        assert isinstance(arquivado, ParticipanteArquivado)
+
+        # Validação por ID alcança o arquivo; o hash é gravado no banco de arquivo
+        assert repo.set_validado_bulk([2, 4], True) == 2
+        assert repo.get_validation_status([1, 2, 3, 4]) == {
+            1: True,
+            2: True,
+            3: False,
+            4: True,
+        }
+        dados = repo.get_dados_certificado(HASH_P1, evento_2024)
+        dados[0].hash_validacao = "validacao-1"
+
+    with manager_com_arquivo.get_db_session() as session:
+        assert session.get(ParticipanteArquivado, 2).hash_validacao == "validacao-1"
+
+
+def test_arquivar_evento_recusa_evento_atual_e_restaura(manager_com_arquivo, popular):
+    """O evento atual não é arquivado e um evento arquivado pode voltar ao banco principal."""
+    from app.archive import arquivar_evento, restaurar_evento
+    from app.db import get_participante_repository
+
+    evento_2024, evento_2025 = popular(manager_com_arquivo)
+
+    with pytest.raises(ValueError, match="evento atual"):
+        arquivar_evento(evento_2025)
+
+    arquivar_evento(evento_2024)
+    with pytest.raises(ValueError, match="já está arquivado"):
+        arquivar_evento(evento_2024)
+
+    assert restaurar_evento(evento_2024)["participantes"] == 3
+    with manager_com_arquivo.get_db_session() as session:
+        assert session.query(Participante).count() == 5
+        assert session.query(ParticipanteArquivado).count() == 0
+        participante = get_participante_repository(session).get_by_email_hash(
+            HASH_P1, evento_2024
+        )
+        assert isinstance(participante, Participante)
+
+
+def test_arquivar_evento_preserva_ids_unicos(manager_com_arquivo, popular):
+    """Um evento com os maiores IDs do banco não é arquivado (o SQLite reutilizaria os IDs)."""
+    from app.archive import arquivar_evento
+
+    evento_2024, _ = popular(manager_com_arquivo)
+    with manager_com_arquivo.get_db_session() as session:
+        session.add(Evento(ano=2026, datas_evento=["2026-05-18"]))
+        session.query(Participante).filter(Participante.id > 3).update(
+            {"evento_id": evento_2024}
+        )
+
+    with pytest.raises(ValueError, match="inscrições mais recentes"):
+        arquivar_evento(evento_2024)
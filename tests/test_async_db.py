@@ -0,0 +1,151 @@
+"""
+Testes da camada assíncrona de banco de dados (app/async_db.py).
+"""
+
+import asyncio
+
+import pytest
+
+from app.models import (
+    Base,
+    Cidade,
+    Evento,
+    Funcao,
+    Participante,
+    create_database_engine,
+    get_session_factory,
+)
+
+
+@pytest.fixture
+def banco_arquivo(tmp_path):
+    """Banco SQLite em arquivo, compartilhado pelas engines síncrona e assíncrona."""
+    from app.services import servico_criptografia
+
+    caminho = tmp_path / "async.db"
+    engine = create_database_engine(f"sqlite:///{caminho}")
+    Base.metadata.create_all(bind=engine)
+    session = get_session_factory(engine)()
+
+    evento = Evento(ano=2025, datas_evento=["2025-05-19", "2025-05-20"])
+    cidade = Cidade(nome="Recife", estado="PE")
+    funcao = Funcao(nome_funcao="Palestrante")
+    session.add_all([evento, cidade, funcao])
+    session.flush()
+    for i in range(6):
+        email = f"p{i}@example.com"
+        session.add(
+            Participante(
+                nome_completo_encrypted=servico_criptografia.criptografar_nome(
+                    f"Pessoa {i}"
+                ),
+                email_encrypted=servico_criptografia.criptografar_email(email),
+                email_hash=servico_criptografia.gerar_hash_email(email),
+                evento_id=evento.id,
+                cidade_id=cidade.id,
+                funcao_id=funcao.id,
+                datas_participacao="2025-05-19",
+                validado=i % 2 == 0,
+                data_inscricao=f"2025-04-0{i + 1}T10:00:00",
+                hash_validacao=f"{i:064d}",
+            )
+        )
+    evento_id = evento.id
+    session.commit()
+    session.close()
+    engine.dispose()
+    return f"sqlite+aiosqlite:///{caminho}", evento_id
+
+
+def test_repositorios_assincronos_espelham_os_sincronos(banco_arquivo):
+    """As leituras assíncronas retornam os mesmos dados que as síncronas."""
+    from app.async_db import AsyncDatabaseManager, get_participante_repository
+
+    url, evento_id = banco_arquivo
+    manager = AsyncDatabaseManager(url)
+
+    async def executar():
+        async with manager.get_db_session() as session:
+            repo = get_participante_repository(session)
+            total = await repo.count(Participante)
+            validados = await repo.count_filtered(evento_id, validado=True)
+            paginas = [pagina async for pagina in repo.iter_pages(evento_id, limit=4)]
+            por_hash = await repo.get_by_hash_validacao(f"{3:064d}")
+            cidade_nome = por_hash.cidade.nome
+        await manager.dispose()
+        return total, validados, paginas, por_hash, cidade_nome
+
+    total, validados, paginas, por_hash, cidade_nome = asyncio.run(executar())
+
+    assert total == 6
+    assert validados == 3
+    assert [len(pagina) for pagina in paginas] == [4, 2]
+    ids = [linha.id for pagina in paginas for linha in pagina]
+    assert ids == [6, 5, 4, 3, 2, 1]
+    assert por_hash.id == 4
+    assert cidade_nome == "Recife"
+
+
+def test_verificar_elegibilidade_downloads_em_paralelo(monkeypatch, banco_arquivo):
+    """A verificação concorrente retorna o resultado de cada email."""
+    import app.async_db as async_db
+    from app.services import servico_validacao
+
+    url, evento_id = banco_arquivo
+    manager = async_db.AsyncDatabaseManager(url)
+    monkeypatch.setattr(async_db, "async_db_manager", manager)
+
+    async def executar():
+        resultado = await servico_validacao.verificar_elegibilidade_downloads(
+            ["p0@example.com", "p1@example.com", "naoinscrito@example.com"],
+            evento_id,
+            concorrencia=2,
+        )
+        await manager.dispose()
+        return resultado
+
+    resultado = asyncio.run(executar())
+
+    assert resultado["p0@example.com"] == (True, "Certificado disponível para download")
+    assert resultado["p1@example.com"][0] is False
+    assert "validada" in resultado["p1@example.com"][1]
+    assert resultado["naoinscrito@example.com"][0] is False
+
+
+def test_verificar_certificado_async(monkeypatch, banco_arquivo):
+    """A validação pública de certificados confere o HMAC pela camada assíncrona."""
+    import sqlite3
+
+    import app.async_db as async_db
+    from app.services import servico_criptografia, servico_validacao
+
+    url, evento_id = banco_arquivo
+    hash_real = servico_criptografia.gerar_hash_validacao_certificado(
+        1, evento_id, "p0@example.com", "Pessoa 0"
+    )
+    with sqlite3.connect(url.split("///", 1)[1]) as conexao:
+        conexao.execute(
+            "UPDATE participantes SET hash_validacao = ? WHERE id = 1", (hash_real,)
+        )
+
+    manager = async_db.AsyncDatabaseManager(url)
+    monkeypatch.setattr(async_db, "async_db_manager", manager)
+
+    async def executar():
+        resultados = [
+            await servico_validacao.verificar_certificado_async(codigo)
+            for codigo in (hash_real, f"{3:064d}", "f" * 64)
+        ]
+        await manager.dispose()
+        return resultados
+
+    autentico, adulterado, inexistente = asyncio.run(executar())
+
+    situacao, certificado = autentico
+    assert situacao == "autentico"
+    assert certificado["nome_completo"] == "Pessoa 0"
+    assert certificado["cidade"] == "Recife - PE"
+    assert certificado["funcao"] == "Palestrante"
+    assert certificado["evento_ano"] == 2025
+    assert adulterado == ("invalido", None)
+    assert inexistente == ("nao_encontrado", None)
@@ -0,0 +1,181 @@
+"""
+Testes do registrador assíncrono de auditoria (app/audit.py).
+"""
+
+import time
+
+import pytest
+
+from app.audit import RegistradorAuditoria
+from app.models import Auditoria, Coordenador
+
+
+@pytest.fixture
+def coordenador_id(db_manager_memoria):
+    with db_manager_memoria.get_db_session() as session:
+        coordenador = Coordenador(nome="Coord", email="c@x.com", senha_hash="x")
+        session.add(coordenador)
+        session.flush()
+        return coordenador.id
+
+
+def _acoes(manager):
+    with manager.get_db_session() as session:
+        return [a.acao for a in session.query(Auditoria).order_by(Auditoria.id)]
+
+
+# O banco em memória compartilha uma única conexão com a thread do registrador:
+# enquanto uma gravação pode estar em andamento, os testes observam apenas a fila
+# e só consultam o banco depois de parar(), que espera a thread e grava o restante.
+def _aguardar(condicao, timeout=5.0):
+    limite = time.monotonic() + timeout
+    while not condicao() and time.monotonic() < limite:
+        time.sleep(0.01)
+    return condicao()
+
+
+def test_registros_sao_gravados_em_lote_ao_atingir_o_tamanho(
+    db_manager_memoria, coordenador_id
+):
+    """A thread grava quando a fila atinge o tamanho do lote, sem esperar o intervalo."""
+    registrador = RegistradorAuditoria(
+        db_manager_memoria.session_factory, intervalo=60, tamanho_lote=5
+    )
+    try:
+        for i in range(4):
+            registrador.registrar(coordenador_id, f"ACAO_{i}")
+        assert registrador.pendentes == 4
+        assert _acoes(db_manager_memoria) == []
+
+        # Com intervalo de 60s, só o tamanho do lote esvazia a fila
+        registrador.registrar(coordenador_id, "ACAO_4")
+        assert _aguardar(lambda: registrador.pendentes == 0)
+    finally:
+        registrador.parar()
+    assert _acoes(db_manager_memoria) == [f"ACAO_{i}" for i in range(5)]
+
+
+def test_registros_sao_gravados_no_intervalo_e_no_encerramento(
+    db_manager_memoria, coordenador_id
+):
+    """Registros abaixo do lote são gravados pelo intervalo ou ao parar o registrador."""
+    registrador = RegistradorAuditoria(
+        db_manager_memoria.session_factory, intervalo=0.05, tamanho_lote=100
+    )
+    registrador.registrar(coordenador_id, "LOGIN_SUCCESS")
+    assert _aguardar(lambda: registrador.pendentes == 0)
+
+    registrador.intervalo = 60
+    registrador.registrar(coordenador_id, "LOGOUT")
+    registrador.parar()
+    assert _acoes(db_manager_memoria) == ["LOGIN_SUCCESS", "LOGOUT"]
+    assert registrador.pendentes == 0
+
+
+def test_modo_sincrono_grava_antes_de_retornar_e_preserva_a_ordem(
+    db_manager_memoria, coordenador_id
+):
+    """O modo síncrono grava os pendentes e o novo registro antes de retornar."""
+    registrador = RegistradorAuditoria(
+        db_manager_memoria.session_factory, intervalo=60, tamanho_lote=100
+    )
+    try:
+        registrador.registrar(coordenador_id, "PRIMEIRA")
+        registrador.registrar(coordenador_id, "CRITICA", sincrono=True)
+        assert _acoes(db_manager_memoria) == ["PRIMEIRA", "CRITICA"]
+
+        # Dentro da transação do chamador, o registro some junto com o rollback
+        with pytest.raises(RuntimeError):
+            with db_manager_memoria.get_db_session() as session:
+                registrador.registrar(
+                    coordenador_id, "DESFEITA", sincrono=True, sessao=session
+                )
+                raise RuntimeError("falha na operação")
+        assert _acoes(db_manager_memoria) == ["PRIMEIRA", "CRITICA"]
+    finally:
+        registrador.parar()
+
+
+def test_falha_na_gravacao_devolve_registros_e_fila_e_limitada(
+    db_manager_memoria, coordenador_id
+):
+    """Registros de um lote com erro voltam para a fila; o excedente mais antigo é descartado."""
+    registrador = RegistradorAuditoria(
+        db_manager_memoria.session_factory,
+        intervalo=60,
+        tamanho_lote=100,
+        max_pendentes=3,
+        assincrono=True,
+    )
+    # Impede a thread de ser iniciada para controlar a gravação no teste
+    registrador._garantir_thread = lambda: None
+
+    for i in range(5):
+        registrador.registrar(coordenador_id, f"ACAO_{i}")
+    assert registrador.pendentes == 3
+    assert registrador.descartados == 2
+
+    gravar = registrador._gravar
+
+    def _falhar(registros):
+        raise RuntimeError("banco indisponível")
+
+    registrador._gravar = _falhar
+    with pytest.raises(RuntimeError):
+        registrador.flush()
+    assert registrador.pendentes == 3
+
+    registrador._gravar = gravar
+    assert registrador.flush() == 3
+    assert _acoes(db_manager_memoria) == ["ACAO_2", "ACAO_3", "ACAO_4"]
+
+
+def test_arquivar_auditoria_move_registros_antigos_para_arquivos_por_dia(
+    monkeypatch, tmp_path, db_manager_memoria, coordenador_id
+):
+    """Registros antigos vão para arquivos comprimidos por dia e saem da tabela."""
+    from datetime import date, datetime
+
+    import app.audit_archive as audit_archive
+
+    monkeypatch.setattr(audit_archive, "db_manager", db_manager_memoria)
+    with db_manager_memoria.get_db_session() as session:
+        session.add_all(
+            Auditoria(
+                timestamp=timestamp,
+                coordenador_id=coordenador_id,
+                acao=acao,
+            )
+            for timestamp, acao in [
+                ("2024-01-10T08:00:00", "LOGIN_SUCCESS"),
+                ("2024-01-10T09:00:00", "LOGOUT"),
+                ("2024-02-05T10:00:00", "LOGIN_SUCCESS"),
+                ("2025-05-01T10:00:00", "LOGIN_SUCCESS"),
+            ]
+        )
+
+    resultado = audit_archive.arquivar_auditoria(
+        dias_retencao=30,
+        diretorio=tmp_path,
+        tamanho_lote=2,
+        agora=datetime(2025, 5, 10),
+    )
+
+    assert resultado["arquivados"] == 3
+    assert _acoes(db_manager_memoria) == ["LOGIN_SUCCESS"]
+    assert (tmp_path / "2024" / "01" / "auditoria-2024-01-10.jsonl.gz").exists()
+
+    arquivos = audit_archive.listar_arquivos_auditoria(tmp_path)
+    assert [a["data"] for a in arquivos] == [date(2024, 2, 5), date(2024, 1, 10)]
+
+    registros = audit_archive.ler_auditoria_arquivada(date(2024, 1, 10), tmp_path)
+    assert [r["acao"] for r in registros] == ["LOGIN_SUCCESS", "LOGOUT"]
+    assert registros[0]["coordenador_id"] == coordenador_id
+
+    # Uma nova execução não encontra mais nada a arquivar
+    assert (
+        audit_archive.arquivar_auditoria(
+            dias_retencao=30, diretorio=tmp_path, agora=datetime(2025, 5, 10)
+        )["arquivados"]
+        == 0
+    )
@@ -0,0 +1,122 @@
+"""
+Testes do backup online do banco de dados (app/backup.py).
+"""
+
+import gzip
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from app import backup
+from app.backup import criar_backup, listar_backups, obter_ultimo_backup
+
+
+@pytest.fixture
+def banco_arquivo(tmp_path):
+    """Banco SQLite em arquivo com alguns registros."""
+    caminho = tmp_path / "pint_of_science.db"
+    conn = sqlite3.connect(caminho)
+    conn.execute("CREATE TABLE eventos (id INTEGER PRIMARY KEY, ano INTEGER)")
+    conn.executemany(
+        "INSERT INTO eventos (ano) VALUES (?)", [(ano,) for ano in range(2000, 2500)]
+    )
+    conn.commit()
+    conn.close()
+    return caminho
+
+
+def test_criar_backup_gera_snapshot_comprimido_restauravel(banco_arquivo, tmp_path):
+    diretorio = tmp_path / "backups"
+
+    # Uma página por passo exercita a cópia incremental
+    resultado = criar_backup(
+        banco=banco_arquivo, diretorio=diretorio, paginas_por_passo=1, pausa_ms=0
+    )
+
+    assert resultado["paginas"] > 1
+    assert resultado["tamanho_banco_bytes"] == banco_arquivo.stat().st_size
+    assert resultado["tamanho_bytes"] < resultado["tamanho_banco_bytes"]
+    # Nenhum arquivo temporário fica para trás
+    assert list(diretorio.iterdir()) == [Path(resultado["arquivo"])]
+
+    restaurado = tmp_path / "restaurado.db"
+    with gzip.open(resultado["arquivo"], "rb") as entrada:
+        restaurado.write_bytes(entrada.read())
+    conn = sqlite3.connect(restaurado)
+    assert conn.execute("SELECT count(*) FROM eventos").fetchone()[0] == 500
+    conn.close()
+
+
+def test_rotacao_mantem_apenas_os_mais_recentes(banco_arquivo, tmp_path, monkeypatch):
+    diretorio = tmp_path / "backups"
+    horarios = iter(datetime(2025, 5, dia, 3, 0, 0) for dia in range(1, 6))
+
+    class _Relogio(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return next(horarios)
+
+    monkeypatch.setattr(backup, "datetime", _Relogio)
+    for _ in range(5):
+        criar_backup(banco=banco_arquivo, diretorio=diretorio, manter=2)
+
+    backups = listar_backups(banco_arquivo, diretorio)
+    assert [b["criado_em"].day for b in backups] == [5, 4]
+    assert obter_ultimo_backup(banco_arquivo, diretorio)["criado_em"] == datetime(
+        2025, 5, 5, 3, 0, 0
+    )
+
+
+def test_criar_backup_rejeita_banco_inexistente(tmp_path):
+    with pytest.raises(ValueError):
+        criar_backup(banco=tmp_path / "nao_existe.db", diretorio=tmp_path)
+
+
+def test_criar_backup_inclui_o_banco_de_arquivo(banco_arquivo, tmp_path, monkeypatch):
+    """Com ARCHIVE_DATABASE_PATH, o arquivo de eventos recebe snapshot e rotação próprios."""
+    arquivo_eventos = tmp_path / "pint_of_science_arquivo.db"
+    conn = sqlite3.connect(arquivo_eventos)
+    conn.execute("CREATE TABLE participantes_arquivados (id INTEGER PRIMARY KEY)")
+    conn.execute("INSERT INTO participantes_arquivados (id) VALUES (1)")
+    conn.commit()
+    conn.close()
+
+    diretorio = tmp_path / "backups"
+    horarios = iter(datetime(2025, 5, dia, 3, 0, 0) for dia in range(1, 4))
+
+    class _Relogio(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return next(horarios)
+
+    monkeypatch.setattr(backup, "datetime", _Relogio)
+    for _ in range(3):
+        resultado = criar_backup(
+            banco=banco_arquivo,
+            diretorio=diretorio,
+            manter=2,
+            banco_arquivo=arquivo_eventos,
+        )
+
+    copia = resultado["banco_arquivo"]
+    assert (
+        Path(copia["arquivo"]).name == "pint_of_science_arquivo-20250503-030000.db.gz"
+    )
+    assert copia["removidos"] == 1
+    assert [b["criado_em"].day for b in listar_backups(arquivo_eventos, diretorio)] == [
+        3,
+        2,
+    ]
+    # A rotação do banco principal não apaga os snapshots do arquivo
+    assert len(list(diretorio.iterdir())) == 4
+
+    restaurado = tmp_path / "arquivo_restaurado.db"
+    with gzip.open(copia["arquivo"], "rb") as entrada:
+        restaurado.write_bytes(entrada.read())
+    conn = sqlite3.connect(restaurado)
+    assert (
+        conn.execute("SELECT count(*) FROM participantes_arquivados").fetchone()[0] == 1
+    )
+    conn.close()
@@ -0,0 +1,84 @@
+"""
+Testes do servidor local compatível com a Brevo (app/brevo_stub.py).
+"""
+
+import time
+
+import requests
+
+from app.brevo_stub import CAMINHO_ESTATISTICAS, ServidorBrevoStub
+from app.email_dispatch import CircuitoEmail, DespachanteEmail, LimitadorTaxa
+from app.services import ServicoEmail
+
+
+def _servico(api_url, **kwargs):
+    servico = ServicoEmail()
+    servico._configured = True
+    servico.api_url = api_url
+    servico.api_key = "chave"
+    servico.sender_email = "certificados@pintofscience.com.br"
+    servico.sender_name = "Pint of Science Brasil"
+    servico.despachante = DespachanteEmail(
+        limitador=LimitadorTaxa(taxa=0, capacidade=1), **kwargs
+    )
+    return servico
+
+
+def test_contrato_da_api():
+    corpo = {
+        "sender": {"email": "a@x.com"},
+        "subject": "Teste",
+        "htmlContent": "<p>oi</p>",
+        "to": [{"email": "b@x.com"}],
+    }
+    with ServidorBrevoStub(latencia_s=0.05) as stub:
+        inicio = time.perf_counter()
+        resposta = requests.post(stub.url, headers={"api-key": "k"}, json=corpo)
+        assert resposta.status_code == 201
+        assert "messageId" in resposta.json()
+        assert time.perf_counter() - inicio >= 0.05
+
+        assert requests.post(stub.url, json=corpo).status_code == 401
+        invalido = dict(corpo, to=[{"email": "b@x.invalid"}])
+        resposta = requests.post(stub.url, headers={"api-key": "k"}, json=invalido)
+        assert resposta.status_code == 400
+
+        estatisticas = requests.get(
+            stub.url.replace("/v3/smtp/email", CAMINHO_ESTATISTICAS)
+        ).json()
+    assert estatisticas["por_status"] == {"201": 1, "401": 1, "400": 1}
+    assert estatisticas["mensagens_aceitas"] == 1
+
+
+def test_limite_de_taxa_responde_429_e_cliente_aguarda_retry_after():
+    with ServidorBrevoStub(limite_por_segundo=2) as stub:
+        servico = _servico(stub.url, max_concorrencia=1)
+
+        resultado = servico.despachante.despachar(
+            [f"p{i}@x.com" for i in range(4)],
+            lambda email: servico.enviar_email_confirmacao_inscricao("P", email, {}),
+        )
+
+        estatisticas = stub.estatisticas()
+    assert resultado.sucessos == 4
+    assert estatisticas["por_status"][201] == 4
+    assert estatisticas["por_status"][429] >= 1
+    assert servico.despachante.obter_metricas()["limitadas_429"] >= 1
+
+
+def test_erros_do_provedor_abrem_o_circuito():
+    with ServidorBrevoStub(taxa_erro=1.0, semente=1) as stub:
+        servico = _servico(
+            stub.url, circuito=CircuitoEmail(limite_falhas=3, tempo_abertura=60)
+        )
+
+        enviados = [
+            servico.enviar_email_confirmacao_inscricao("P", f"p{i}@x.com", {})
+            for i in range(5)
+        ]
+
+        estatisticas = stub.estatisticas()
+    assert not any(enviados)
+    # Após 3 respostas 500 o circuito abre e as demais nem chegam ao provedor
+    assert estatisticas["por_status"] == {500: 3}
+    assert servico.despachante.obter_metricas()["bloqueadas_circuito"] == 2
@@ -0,0 +1,182 @@
+"""
+Testes do pipeline de certificados anexados (app/certificate_pipeline.py).
+"""
+
+import base64
+import threading
+
+import pytest
+
+import app.certificate_pipeline as certificate_pipeline
+from app.certificate_pipeline import PipelineCertificados
+from app.email_dispatch import DespachanteEmail, LimitadorTaxa
+from app.models import Participante
+from app.services import ServicoEmail
+
+
+def _destinatarios(participantes):
+    """Payloads da fila de e-mails para os participantes criados pela fábrica."""
+    return [
+        {
+            "participante_id": participante.id,
+            "nome": f"Pessoa {i}",
+            "email": f"p{i}@x.com",
+            "link_download": "https://pint.exemplo/",
+            "evento_ano": 2025,
+        }
+        for i, participante in enumerate(participantes)
+    ]
+
+
+@pytest.fixture
+def popular(criar_referencias, criar_participantes):
+    """Cria participantes validados e retorna os payloads da fila de e-mails."""
+
+    def popular(manager, quantidade):
+        with manager.get_db_session() as session:
+            return _destinatarios(
+                criar_participantes(session, criar_referencias(session), quantidade)
+            )
+
+    return popular
+
+
+def _renderizar_falso(dados):
+    if dados["nome_completo"] == "Pessoa 3":
+        raise ValueError("fonte ausente")
+    return f"%PDF {dados['participante']['hash_validacao']}".encode()
+
+
+def test_pipeline_anexa_certificados_com_fila_limitada(db_manager_memoria, popular):
+    destinatarios = popular(db_manager_memoria, 12)
+    anexos = {}
+    em_andamento = {"maximo": 0}
+    lock = threading.Lock()
+
+    class _SessaoFalsa:
+        def post(self, url, json, **kwargs):
+            progresso = certificate_pipeline.obter_progresso()
+            with lock:
+                em_andamento["maximo"] = max(
+                    em_andamento["maximo"], progresso["em_andamento"]
+                )
+                anexos[json["to"][0]["email"]] = json.get("attachment")
+            return type("R", (), {"status_code": 201, "ok": True, "text": ""})()
+
+    servico = ServicoEmail()
+    servico._configured = True
+    servico.api_url = "http://brevo.local/v3/smtp/email"
+    servico.api_key = "chave"
+    servico.sender_email = "certificados@pintofscience.com.br"
+    servico.sender_name = "Pint of Science Brasil"
+    servico.despachante = DespachanteEmail(
+        max_concorrencia=2, limitador=LimitadorTaxa(taxa=0, capacidade=1)
+    )
+    servico.despachante._sessao = _SessaoFalsa()
+    pipeline = PipelineCertificados(
+        db_manager_memoria.session_factory,
+        processos=0,
+        tamanho_fila=4,
+        renderizar=_renderizar_falso,
+    )
+
+    resultado = servico.enviar_certificados_anexados(destinatarios, pipeline)
+
+    assert (resultado.sucessos, resultado.falhas) == (12, 0)
+    assert em_andamento["maximo"] <= 4
+    # Certificado não gerado: o e-mail segue apenas com o link
+    assert anexos["p3@x.com"] is None
+    anexo = anexos["p0@x.com"][0]
+    assert anexo["name"].startswith("Certificado-PintOfScience-2025-")
+    assert base64.b64decode(anexo["content"]).startswith(b"%PDF ")
+
+    # O hash de validação é gravado antes da geração, como no primeiro download
+    with db_manager_memoria.get_db_session() as session:
+        assert session.query(Participante).filter_by(hash_validacao=None).count() == 0
+
+    progresso = certificate_pipeline.obter_progresso()
+    assert progresso["concluido"]
+    assert (progresso["gerados"], progresso["falhas_geracao"]) == (11, 1)
+    assert (progresso["enviados"], progresso["em_andamento"]) == (12, 0)
+
+
+def test_geracao_em_processo_separado(db_manager_memoria, popular):
+    destinatarios = popular(db_manager_memoria, 2)
+    recebidos = {}
+
+    pipeline = PipelineCertificados(
+        db_manager_memoria.session_factory, processos=1, tamanho_fila=2
+    )
+    resultado = pipeline.executar(
+        destinatarios,
+        lambda dest, pdf: recebidos.setdefault(dest["email"], pdf) is not None,
+        DespachanteEmail(max_concorrencia=2).despachar,
+    )
+
+    assert resultado.sucessos == 2
+    assert all(pdf.startswith(b"%PDF") for pdf in recebidos.values())
+
+
+def test_pipeline_em_segundo_plano_anexa_certificados_arquivados(
+    monkeypatch, tmp_path, criar_referencias, criar_participantes
+):
+    """A factory de segundo plano enxerga o banco de arquivo anexado."""
+    import app.db
+    from app.archive import arquivar_evento, invalidar_cache_eventos_arquivados
+    from app.core import settings
+    from app.db import DatabaseManager
+
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{tmp_path / 'pint.db'}")
+    monkeypatch.setattr(settings, "archive_database_path", tmp_path / "arquivo.db")
+    manager = DatabaseManager()
+    manager.initialize()
+    monkeypatch.setattr(app.db, "db_manager", manager)
+    monkeypatch.setattr(certificate_pipeline, "db_manager", manager)
+
+    with manager.get_db_session() as session:
+        referencias = criar_referencias(session, anos=(2025, 2026))
+        evento_id = referencias["eventos"][0].id
+        destinatarios = _destinatarios(
+            criar_participantes(
+                session, referencias, 2, evento=referencias["eventos"][0]
+            )
+        )
+        # Só eventos encerrados, com inscrições mais recentes no evento atual,
+        # podem ser arquivados
+        criar_participantes(session, referencias, 1, inicio=2)
+    assert arquivar_evento(evento_id)["participantes"] == 2
+
+    recebidos = {}
+    pipeline = PipelineCertificados(processos=0, renderizar=_renderizar_falso)
+    try:
+        resultado = pipeline.executar(
+            destinatarios,
+            lambda dest, pdf: recebidos.setdefault(dest["email"], pdf) is not None,
+            DespachanteEmail(max_concorrencia=2).despachar,
+        )
+    finally:
+        invalidar_cache_eventos_arquivados()
+        manager.get_background_session_factory().kw["bind"].dispose()
+        manager.engine.dispose()
+
+    assert resultado.sucessos == 2
+    assert all(pdf.startswith(b"%PDF ") for pdf in recebidos.values())
+    assert all(pdf != b"%PDF None" for pdf in recebidos.values())
+
+
+def test_pool_de_processos_reaproveitado_entre_lotes(db_manager_memoria):
+    """Lotes seguintes usam o mesmo pool; encerrar_pool_processos o fecha."""
+    pipeline = PipelineCertificados(
+        db_manager_memoria.session_factory, processos=1, tamanho_fila=2
+    )
+    with pipeline._criar_executor() as primeiro:
+        pass
+    with pipeline._criar_executor() as segundo:
+        pass
+    assert primeiro is segundo
+    assert segundo.submit(pow, 2, 10).result(timeout=60) == 1024
+
+    certificate_pipeline.encerrar_pool_processos()
+    with pipeline._criar_executor() as novo:
+        assert novo is not primeiro
+    certificate_pipeline.encerrar_pool_processos()
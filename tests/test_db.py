@@ -0,0 +1,252 @@
+"""
+Testes dos repositórios de dados (app/db.py).
+"""
+
+from app.db import get_participante_repository
+from app.models import Evento, Participante
+
+
+def _criar_participantes(session, dados, quantidade):
+    """Cria participantes alternando cidade, função e status de validação."""
+    evento = dados["evento"]
+    cidades = dados["cidades"]
+    funcoes = dados["funcoes"]
+    participantes = []
+    for i in range(quantidade):
+        participantes.append(
+            Participante(
+                nome_completo_encrypted=f"nome-{i}".encode(),
+                email_encrypted=f"email-{i}".encode(),
+                email_hash=f"hash-{i}",
+                evento_id=evento.id,
+                cidade_id=cidades[i % 2].id,
+                funcao_id=funcoes[i % 2].id,
+                datas_participacao="2025-05-19",
+                validado=i % 3 == 0,
+                # Datas repetidas para exercitar o desempate por ID no cursor
+                data_inscricao=f"2025-04-{(i // 2) + 1:02d}T10:00:00",
+            )
+        )
+    session.add_all(participantes)
+    session.flush()
+    return participantes
+
+
+def test_get_page_percorre_todas_as_linhas_em_ordem(session, dados_basicos):
+    """A paginação por cursor retorna todas as linhas, sem repetição, na ordem esperada."""
+    _criar_participantes(session, dados_basicos, 25)
+    repo = get_participante_repository(session)
+    evento_id = dados_basicos["evento"].id
+
+    vistos = []
+    cursor = None
+    paginas = 0
+    while True:
+        linhas, cursor = repo.get_page(evento_id, cursor=cursor, limit=10)
+        vistos.extend(linhas)
+        paginas += 1
+        if cursor is None:
+            break
+
+    assert paginas == 3
+    assert len(vistos) == 25
+    assert len({linha.id for linha in vistos}) == 25
+
+    chaves = [(linha.data_inscricao, linha.id) for linha in vistos]
+    assert chaves == sorted(chaves, reverse=True)
+
+
+def test_get_page_aplica_filtros(session, dados_basicos):
+    """Filtros de cidade, função, validação e hash de email são aplicados no SQL."""
+    _criar_participantes(session, dados_basicos, 12)
+    repo = get_participante_repository(session)
+    evento_id = dados_basicos["evento"].id
+    cidade_id = dados_basicos["cidades"][0].id
+
+    linhas, cursor = repo.get_page(evento_id, cidade_ids={cidade_id}, limit=100)
+    assert cursor is None
+    assert len(linhas) == 6
+    assert all(linha.cidade_id == cidade_id for linha in linhas)
+
+    linhas, _ = repo.get_page(evento_id, validado=True, limit=100)
+    assert len(linhas) == repo.count_filtered(evento_id, validado=True) == 4
+
+    linhas, _ = repo.get_page(evento_id, email_hash="hash-5")
+    assert [linha.id for linha in linhas] == [6]
+
+    assert repo.get_page(evento_id, cidade_ids=set()) == ([], None)
+    assert repo.count_filtered(evento_id, cidade_ids=[]) == 0
+
+
+def test_listar_participantes_usa_uma_query(session, dados_basicos):
+    """Participantes de várias cidades vêm de uma query, em ordem global e com nomes resolvidos pelos IDs."""
+    from sqlalchemy import event
+
+    from app.read_models import get_read_model_repository
+
+    _criar_participantes(session, dados_basicos, 10)
+    session.expunge_all()
+    leitura = get_read_model_repository(session)
+    evento_id = dados_basicos["evento"].id
+    cidade_ids = {c.id for c in dados_basicos["cidades"]}
+
+    statements = []
+
+    def _contar(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", _contar)
+    try:
+        participantes = leitura.listar_participantes(evento_id, cidade_ids)
+    finally:
+        event.remove(engine, "before_cursor_execute", _contar)
+
+    assert len(statements) == 1
+    assert len(participantes) == 10
+    assert {p.cidade_id for p in participantes} == cidade_ids
+    chaves = [(p.data_inscricao, p.id) for p in participantes]
+    assert chaves == sorted(chaves, reverse=True)
+    assert leitura.listar_participantes(evento_id, []) == []
+
+
+def test_contagens_agregadas(session, dados_basicos):
+    """As contagens por dimensão batem com os dados inseridos."""
+    _criar_participantes(session, dados_basicos, 12)
+    repo = get_participante_repository(session)
+    evento_id = dados_basicos["evento"].id
+
+    assert repo.count(Participante) == 12
+    assert repo.count_by_evento() == {evento_id: 12}
+    assert repo.count_by_validado(evento_id) == {True: 4, False: 8}
+    assert sorted(total for _, _, total in repo.count_by_cidade(evento_id)) == [6, 6]
+    assert sorted(total for _, total in repo.count_by_funcao(evento_id)) == [6, 6]
+
+    por_dia = repo.count_by_dia_inscricao(evento_id)
+    assert por_dia[0] == ("2025-04-01", 2)
+    assert sum(total for _, total in por_dia) == 12
+
+
+def test_get_health_status_usa_cache(monkeypatch):
+    """O status leve é consultado uma vez e reaproveitado dentro do TTL."""
+    import app.db as db
+
+    chamadas = []
+
+    def _falso():
+        chamadas.append(1)
+        return {"status": "healthy", "connection": True, "initial_data": True}
+
+    monkeypatch.setattr(db, "_verificar_status_leve", _falso)
+    monkeypatch.setattr(db, "_health_status_cache", {"status": None, "timestamp": 0.0})
+
+    primeiro = db.get_health_status()
+    segundo = db.get_health_status()
+    assert primeiro["status"] == segundo["status"] == "healthy"
+    assert "checked_at" in primeiro
+    assert len(chamadas) == 1
+
+    db.get_health_status(force_refresh=True)
+    assert len(chamadas) == 2
+
+
+def test_contar_registros_tabelas_em_uma_query(session, dados_basicos):
+    """A contagem de todas as tabelas retorna um valor por tabela."""
+    from app.db import _contar_registros_tabelas
+
+    contagens = _contar_registros_tabelas(session)
+    assert contagens["eventos"] == 1
+    assert contagens["cidades"] == 2
+    assert contagens["participantes"] == 0
+    assert len(contagens) == 10
+
+
+def test_read_models_retornam_registros_leves(session, dados_basicos):
+    """As projeções retornam NamedTuples fora do identity map, com a ordenação dos repositórios."""
+    from app.read_models import (
+        CidadeResumo,
+        ParticipanteLinha,
+        get_read_model_repository,
+    )
+
+    session.add(Evento(ano=2024, datas_evento=["2024-05-20"]))
+    _criar_participantes(session, dados_basicos, 6)
+    session.expunge_all()
+    leitura = get_read_model_repository(session)
+
+    assert [e.ano for e in leitura.listar_eventos()] == [2025, 2024]
+    assert leitura.obter_evento_atual().ano == 2025
+
+    cidades = leitura.listar_cidades()
+    assert all(isinstance(c, CidadeResumo) for c in cidades)
+    assert [c.estado for c in cidades] == ["DF", "PE"]
+    assert [f.nome_funcao for f in leitura.listar_funcoes()] == [
+        "Palestrante",
+        "Voluntário(a)",
+    ]
+
+    evento_id = dados_basicos["evento"].id
+    linhas = leitura.listar_participantes(evento_id)
+    assert len(linhas) == 6
+    assert all(isinstance(linha, ParticipanteLinha) for linha in linhas)
+    chaves = [(linha.data_inscricao, linha.id) for linha in linhas]
+    assert chaves == sorted(chaves, reverse=True)
+
+    cidade_id = cidades[0].id
+    filtradas = leitura.listar_participantes(evento_id, cidade_ids=[cidade_id])
+    assert len(filtradas) == 3
+    assert {linha.cidade_id for linha in filtradas} == {cidade_id}
+    assert leitura.listar_participantes(evento_id, cidade_ids=[]) == []
+
+    # Nenhum objeto ORM foi carregado na sessão
+    assert len(session.identity_map) == 0
+
+
+def test_auditoria_get_page_filtra_e_pagina_por_cursor(session, dados_basicos):
+    """A navegação da auditoria aplica filtros e percorre as páginas sem repetição."""
+    from datetime import date
+
+    from app.db import get_auditoria_repository
+    from app.models import Auditoria, Coordenador
+
+    coordenadores = [
+        Coordenador(nome=f"Coord {i}", email=f"c{i}@x.com", senha_hash="x")
+        for i in range(2)
+    ]
+    session.add_all(coordenadores)
+    session.flush()
+    session.add_all(
+        Auditoria(
+            # Timestamps repetidos para exercitar o desempate por ID no cursor
+            timestamp=f"2025-05-{(i // 3) + 1:02d}T10:00:00",
+            coordenador_id=coordenadores[i % 2].id,
+            acao="LOGIN_SUCCESS" if i % 3 else "LOGOUT",
+        )
+        for i in range(15)
+    )
+    session.flush()
+    repo = get_auditoria_repository(session)
+
+    vistos = []
+    cursor = None
+    while True:
+        linhas, cursor = repo.get_page(cursor=cursor, limit=4)
+        vistos.extend(linhas)
+        if cursor is None:
+            break
+    assert len({linha.id for linha in vistos}) == 15
+    chaves = [(linha.timestamp, linha.id) for linha in vistos]
+    assert chaves == sorted(chaves, reverse=True)
+    assert vistos[0].coordenador_nome in ("Coord 0", "Coord 1")
+
+    linhas, _ = repo.get_page(
+        coordenador_id=coordenadores[0].id,
+        acao="LOGIN_SUCCESS",
+        data_inicio=date(2025, 5, 2),
+        data_fim=date(2025, 5, 3),
+    )
+    assert linhas
+    assert all(linha.coordenador_id == coordenadores[0].id for linha in linhas)
+    assert all(linha.acao == "LOGIN_SUCCESS" for linha in linhas)
+    assert all("2025-05-02" <= linha.timestamp[:10] <= "2025-05-03" for linha in linhas)
+    assert repo.get_acoes() == ["LOGIN_SUCCESS", "LOGOUT"]
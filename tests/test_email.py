@@ -0,0 +1,283 @@
+"""
+Testes do envio de e-mails em lote (app/email_dispatch.py e ServicoEmail).
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.brevo_stub import ServidorBrevoStub
+from app.core import settings
+from app.email_dispatch import (
+    CIRCUITO_ABERTO,
+    CIRCUITO_FECHADO,
+    CIRCUITO_MEIO_ABERTO,
+    CircuitoEmail,
+    DespachanteEmail,
+    LimitadorTaxa,
+)
+from app.services import ServicoEmail
+
+
+class _RespostaFalsa:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.ok = status_code < 400
+        self.text = ""
+
+
+class _Relogio:
+    """Relógio manual: dormir apenas avança o tempo."""
+
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+    def dormir(self, segundos):
+        self.agora += segundos
+
+
+def _servico_configurado(despachante, api_url="http://brevo.local/v3/smtp/email"):
+    servico = ServicoEmail()
+    servico._configured = True
+    servico.api_url = api_url
+    servico.api_key = "chave"
+    servico.sender_email = "certificados@pintofscience.com.br"
+    servico.sender_name = "Pint of Science Brasil"
+    servico.despachante = despachante
+    return servico
+
+
+def test_despachante_limita_envios_simultaneos():
+    despachante = DespachanteEmail(max_concorrencia=4)
+    em_andamento = {"atual": 0, "maximo": 0}
+    lock = threading.Lock()
+
+    def enviar(numero):
+        with lock:
+            em_andamento["atual"] += 1
+            em_andamento["maximo"] = max(em_andamento["maximo"], em_andamento["atual"])
+        time.sleep(0.01)
+        with lock:
+            em_andamento["atual"] -= 1
+        if numero == 7:
+            raise RuntimeError("falha de rede")
+        return numero % 10 != 3
+
+    resultado = despachante.despachar(range(40), enviar)
+
+    assert em_andamento["maximo"] == 4
+    assert resultado.sucessos == 35
+    assert sorted(map(int, resultado.falhados)) == [3, 7, 13, 23, 33]
+    # 40 envios de 10ms com 4 em paralelo: bem abaixo do tempo sequencial
+    assert resultado.duracao_s < 0.3
+
+
+def test_envio_em_lote_reutiliza_sessao_http(monkeypatch):
+    monkeypatch.setattr(settings, "email_batch_max_recipients", 1)
+    despachante = DespachanteEmail(
+        max_concorrencia=3, limitador=LimitadorTaxa(taxa=0, capacidade=1)
+    )
+    enviados = []
+
+    class _SessaoFalsa:
+        def post(self, url, headers, json, timeout):
+            enviados.append(json["to"][0]["email"])
+            falhou = json["to"][0]["email"].startswith("erro")
+            return _RespostaFalsa(400 if falhou else 201)
+
+    despachante._sessao = _SessaoFalsa()
+    servico = _servico_configurado(despachante)
+
+    destinatarios = [
+        {"nome": f"Pessoa {i}", "email": f"pessoa{i}@exemplo.com", "link_download": ""}
+        for i in range(10)
+    ]
+    destinatarios += [{"nome": "Sem e-mail"}, {"nome": "X", "email": "erro@x.com"}]
+
+    sucessos, falhas = servico.enviar_emails_certificado_liberado_batch(destinatarios)
+
+    assert (sucessos, falhas) == (10, 2)
+    assert sorted(enviados) == sorted(
+        [f"pessoa{i}@exemplo.com" for i in range(10)] + ["erro@x.com"]
+    )
+
+
+@pytest.fixture
+def stub_brevo():
+    """Servidor local compatível com POST /v3/smtp/email (app/brevo_stub.py)."""
+    with ServidorBrevoStub() as stub:
+        yield stub
+
+
+def _destinatarios(quantidade, invalidos=()):
+    return [
+        {
+            "nome": f"Pessoa {i}",
+            "email": f"pessoa{i}@exemplo.{'invalid' if i in invalidos else 'com'}",
+            "link_download": f"https://pint.exemplo/certificado/{i}",
+        }
+        for i in range(quantidade)
+    ]
+
+
+def test_envio_em_lote_usa_message_versions(monkeypatch, stub_brevo):
+    api_url = stub_brevo.url
+    monkeypatch.setattr(settings, "email_batch_max_recipients", 10)
+    servico = _servico_configurado(DespachanteEmail(max_concorrencia=2), api_url)
+
+    sucessos, falhas = servico.enviar_emails_certificado_liberado_batch(
+        _destinatarios(25)
+    )
+
+    requisicoes = [r["corpo"] for r in stub_brevo.requisicoes]
+    assert (sucessos, falhas) == (25, 0)
+    assert len(requisicoes) == 3
+    assert sorted(len(r["messageVersions"]) for r in requisicoes) == [5, 10, 10]
+    versao = next(
+        v
+        for r in requisicoes
+        for v in r["messageVersions"]
+        if v["to"][0]["email"] == "pessoa7@exemplo.com"
+    )
+    assert versao["params"] == {
+        "nome": "Pessoa 7",
+        "link_download": "https://pint.exemplo/certificado/7",
+    }
+    assert "{{ params.nome }}" in requisicoes[0]["htmlContent"]
+
+
+def test_lote_recusado_e_reenviado_individualmente(monkeypatch, stub_brevo):
+    api_url = stub_brevo.url
+    monkeypatch.setattr(settings, "email_batch_max_recipients", 10)
+    servico = _servico_configurado(DespachanteEmail(max_concorrencia=2), api_url)
+
+    sucessos, falhas = servico.enviar_emails_certificado_liberado_batch(
+        _destinatarios(25, invalidos={12})
+    )
+
+    # 3 requisições em lote + 10 envios individuais do lote recusado
+    requisicoes = [r["corpo"] for r in stub_brevo.requisicoes]
+    assert (sucessos, falhas) == (24, 1)
+    assert len(requisicoes) == 13
+    assert sum("messageVersions" not in r for r in requisicoes) == 10
+
+
+def test_limitador_respeita_taxa_e_rajada():
+    relogio = _Relogio()
+    limitador = LimitadorTaxa(
+        taxa=10, capacidade=3, relogio=relogio, dormir=relogio.dormir
+    )
+
+    esperas = [limitador.adquirir() for _ in range(5)]
+
+    # A rajada sai de imediato; depois, um token a cada 100ms
+    assert esperas[:3] == [0, 0, 0]
+    assert esperas[3:] == pytest.approx([0.1, 0.1])
+    assert relogio.agora == pytest.approx(0.2)
+
+    limitador.pausar(2)
+    assert limitador.adquirir() == pytest.approx(2.1)
+
+
+def test_circuito_abre_apos_falhas_e_fecha_com_teste_bem_sucedido():
+    relogio = _Relogio()
+    circuito = CircuitoEmail(limite_falhas=3, tempo_abertura=30, relogio=relogio)
+
+    for _ in range(3):
+        assert circuito.permitir()
+        circuito.registrar_falha()
+    assert circuito.estado == CIRCUITO_ABERTO
+    assert not circuito.permitir()
+
+    relogio.agora = 30
+    assert circuito.permitir()
+    assert circuito.estado == CIRCUITO_MEIO_ABERTO
+    # Apenas uma requisição de teste por vez
+    assert not circuito.permitir()
+    circuito.registrar_falha()
+    assert circuito.estado == CIRCUITO_ABERTO
+    assert circuito.aberturas == 2
+
+    relogio.agora = 60
+    assert circuito.permitir()
+    circuito.registrar_sucesso()
+    assert circuito.estado == CIRCUITO_FECHADO
+    assert circuito.permitir()
+
+
+def test_post_respeita_retry_after_e_timeout():
+    relogio = _Relogio()
+    despachante = DespachanteEmail(
+        limitador=LimitadorTaxa(
+            taxa=100, capacidade=1, relogio=relogio, dormir=relogio.dormir
+        )
+    )
+    respostas = [_RespostaFalsa(429, {"Retry-After": "3"}), _RespostaFalsa(201)]
+    chamadas = []
+
+    class _SessaoFalsa:
+        def post(self, url, **kwargs):
+            chamadas.append(kwargs)
+            return respostas.pop(0)
+
+    despachante._sessao = _SessaoFalsa()
+
+    assert despachante.post("http://brevo.local", json={}).status_code == 201
+    assert len(chamadas) == 2
+    assert chamadas[0]["timeout"] == (
+        settings.email_connect_timeout_seconds,
+        settings.email_read_timeout_seconds,
+    )
+    # A segunda tentativa aguardou o Retry-After
+    assert relogio.agora >= 3
+    metricas = despachante.obter_metricas()
+    assert (metricas["limitadas_429"], metricas["sucessos"]) == (1, 1)
+
+
+def test_timeouts_abrem_o_circuito():
+    import requests
+
+    despachante = DespachanteEmail(
+        limitador=LimitadorTaxa(taxa=0, capacidade=1),
+        circuito=CircuitoEmail(limite_falhas=2, tempo_abertura=60),
+    )
+
+    class _SessaoLenta:
+        def post(self, url, **kwargs):
+            raise requests.Timeout("read timeout")
+
+    despachante._sessao = _SessaoLenta()
+    servico = _servico_configurado(despachante)
+
+    assert not servico.enviar_email_confirmacao_inscricao("A", "a@x.com", {})
+    assert not servico.enviar_email_confirmacao_inscricao("B", "b@x.com", {})
+    with pytest.raises(RuntimeError, match="Circuito"):
+        despachante.post("http://brevo.local", json={})
+
+    metricas = despachante.obter_metricas()
+    assert metricas["estado_circuito"] == CIRCUITO_ABERTO
+    assert (metricas["timeouts"], metricas["bloqueadas_circuito"]) == (2, 1)
+
+
+def test_envio_em_lote_com_alternativa_em_texto(monkeypatch, stub_brevo):
+    api_url = stub_brevo.url
+    monkeypatch.setattr(settings, "email_content_format", "ambos")
+    servico = _servico_configurado(DespachanteEmail(max_concorrencia=2), api_url)
+    destinatarios = _destinatarios(4)
+    for dest in destinatarios[:2]:
+        dest["evento_ano"] = 2025
+
+    sucessos, falhas = servico.enviar_emails_certificado_liberado_batch(destinatarios)
+
+    # Um lote por ano de evento, cada um com HTML e texto montados uma única vez
+    requisicoes = [r["corpo"] for r in stub_brevo.requisicoes]
+    assert (sucessos, falhas) == (4, 0)
+    assert len(requisicoes) == 2
+    for requisicao in requisicoes:
+        assert "{{ params.nome }}" in requisicao["htmlContent"]
+        assert "{{ params.link_download }}" in requisicao["textContent"]
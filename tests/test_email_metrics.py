@@ -0,0 +1,123 @@
+"""
+Testes das métricas de envio de e-mails (app/email_metrics.py).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+import requests
+
+from app.db import get_email_metrica_repository
+from app.email_dispatch import DespachanteEmail, LimitadorTaxa
+from app.email_metrics import STATUS_TIMEOUT, ColetorMetricasEmail
+
+
+class _Relogio:
+    def __init__(self):
+        self.agora = datetime(2025, 5, 19, 20, 0, 0)
+
+    def __call__(self):
+        return self.agora
+
+    def avancar(self, segundos):
+        self.agora += timedelta(seconds=segundos)
+
+
+def test_intervalos_agregados_sao_gravados(db_manager_memoria):
+    relogio = _Relogio()
+    coletor = ColetorMetricasEmail(
+        intervalo_s=60,
+        fabrica_sessoes=db_manager_memoria.session_factory,
+        relogio=relogio,
+    )
+
+    for i in range(20):
+        coletor.registrar_requisicao("201", latencia_s=0.1 + i / 100, mensagens=5)
+    coletor.registrar_requisicao("429", latencia_s=0.05)
+    coletor.registrar_retentativa()
+    coletor.registrar_espera_fila([2.0, 4.0])
+
+    # Intervalo em andamento: nada é gravado ainda
+    assert coletor.persistir() == 0
+    relogio.avancar(61)
+    coletor.registrar_requisicao(STATUS_TIMEOUT, latencia_s=30)
+    assert coletor.persistir() == 1
+
+    with db_manager_memoria.get_db_session() as session:
+        (metrica,) = get_email_metrica_repository(session).get_since(
+            relogio() - timedelta(hours=1)
+        )
+        assert metrica.requisicoes == 21
+        assert metrica.mensagens == 100
+        assert metrica.por_status == {"201": 20, "429": 1}
+        assert metrica.retentativas == 1
+        assert metrica.latencia_p95_ms == pytest.approx(280.0)
+        assert metrica.latencia_max_ms == pytest.approx(290.0)
+        assert metrica.espera_fila_media_s == 3.0
+        assert metrica.espera_fila_max_s == 4.0
+        assert metrica.duracao_s == 61
+
+    assert coletor.resumo_atual()["por_status"] == {STATUS_TIMEOUT: 1}
+
+
+def test_intervalos_antigos_sao_removidos(db_manager_memoria):
+    relogio = _Relogio()
+    coletor = ColetorMetricasEmail(
+        intervalo_s=60,
+        fabrica_sessoes=db_manager_memoria.session_factory,
+        relogio=relogio,
+    )
+    with db_manager_memoria.get_db_session() as session:
+        get_email_metrica_repository(session).add_bulk(
+            [
+                {
+                    "inicio": (relogio() - timedelta(days=dias)).isoformat(),
+                    "duracao_s": 60,
+                    "requisicoes": 1,
+                    "mensagens": 1,
+                    "por_status": {"201": 1},
+                    "retentativas": 0,
+                }
+                for dias in (1, 30)
+            ]
+        )
+
+    coletor.persistir()
+
+    with db_manager_memoria.get_db_session() as session:
+        restantes = get_email_metrica_repository(session).get_since(datetime.min)
+        assert len(restantes) == 1
+
+
+def test_despachante_registra_status_latencia_e_retentativas():
+    coletor = ColetorMetricasEmail(intervalo_s=60)
+    respostas = iter([429, 201])
+
+    class _SessaoFalsa:
+        def post(self, url, **kwargs):
+            if kwargs["json"] is None:
+                raise requests.Timeout("lento")
+            status = next(respostas)
+            return type(
+                "R",
+                (),
+                {"status_code": status, "ok": status < 400, "headers": {}},
+            )()
+
+    despachante = DespachanteEmail(
+        limitador=LimitadorTaxa(taxa=0, capacidade=1), metricas=coletor
+    )
+    despachante.limitador.pausar = lambda segundos: None
+    despachante._sessao = _SessaoFalsa()
+
+    corpo = {"messageVersions": [{"to": [{"email": "a@x.com"}, {"email": "b@x.com"}]}]}
+    assert despachante.post("http://brevo.local", json=corpo).status_code == 201
+    with pytest.raises(requests.Timeout):
+        despachante.post("http://brevo.local", json=None)
+
+    resumo = coletor.resumo_atual()
+    assert resumo["por_status"] == {"429": 1, "201": 1, STATUS_TIMEOUT: 1}
+    assert resumo["requisicoes"] == 3
+    assert resumo["mensagens"] == 2
+    assert resumo["retentativas"] == 1
+    assert resumo["latencia_media_ms"] is not None
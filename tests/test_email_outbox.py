@@ -0,0 +1,211 @@
+"""
+Testes da fila persistente de e-mails (app/email_outbox.py).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import app.email_outbox as email_outbox
+from app.email_outbox import (
+    TIPO_CERTIFICADO_LIBERADO,
+    ProcessadorOutbox,
+    calcular_proxima_tentativa,
+)
+from app.models import EmailOutbox
+
+
+@pytest.fixture
+def outbox(monkeypatch, db_manager_memoria):
+    """Processador sobre o banco em memória, com um envio falso controlável."""
+    monkeypatch.setattr(email_outbox, "db_manager", db_manager_memoria)
+    estado = {"recusar": set(), "erro": None, "enviados": []}
+
+    def enviar(mensagens):
+        if estado["erro"]:
+            raise estado["erro"]
+        aceitas = [
+            m for m in mensagens if m["payload"]["email"] not in estado["recusar"]
+        ]
+        estado["enviados"].extend(m["payload"]["email"] for m in aceitas)
+        return [m["id"] for m in aceitas]
+
+    processador = ProcessadorOutbox(
+        db_manager_memoria.session_factory,
+        enviar=enviar,
+        max_tentativas=3,
+        iniciar_automaticamente=False,
+    )
+    monkeypatch.setattr(email_outbox, "processador_outbox", processador)
+    return processador, estado, db_manager_memoria
+
+
+def _destinatarios(quantidade):
+    return [
+        {"nome": f"Pessoa {i}", "email": f"p{i}@x.com", "link_download": "/"}
+        for i in range(quantidade)
+    ]
+
+
+def _reabrir(manager):
+    """Antecipa as próximas tentativas, simulando a passagem do tempo."""
+    with manager.get_db_session() as session:
+        session.query(EmailOutbox).update(
+            {"proxima_tentativa": datetime.now().isoformat()}
+        )
+
+
+def test_enfileirar_grava_payload_criptografado_e_envia(outbox):
+    processador, estado, manager = outbox
+
+    assert (
+        processador.enfileirar_lote(TIPO_CERTIFICADO_LIBERADO, _destinatarios(5)) == 5
+    )
+    with manager.get_db_session() as session:
+        payload = session.query(EmailOutbox.payload_encrypted).first()[0]
+    assert b"p0@x.com" not in payload
+    assert email_outbox.obter_status_fila()["pendente"] == 5
+
+    assert processador.processar_pendentes() == {
+        "enviados": 5,
+        "reagendados": 0,
+        "falhas": 0,
+    }
+    assert sorted(estado["enviados"]) == [f"p{i}@x.com" for i in range(5)]
+    status = email_outbox.obter_status_fila()
+    assert (status["pendente"], status["enviado"]) == (0, 5)
+
+
+def test_falhas_sao_reagendadas_e_vao_para_dead_letter(outbox):
+    processador, estado, manager = outbox
+    processador.enfileirar_lote(TIPO_CERTIFICADO_LIBERADO, _destinatarios(3))
+    estado["recusar"] = {"p1@x.com"}
+
+    assert processador.processar_pendentes()["reagendados"] == 1
+    # A próxima tentativa fica no futuro: nada a processar agora
+    assert processador.processar_pendentes()["reagendados"] == 0
+
+    _reabrir(manager)
+    assert processador.processar_pendentes()["reagendados"] == 1
+    _reabrir(manager)
+    assert processador.processar_pendentes()["falhas"] == 1
+
+    falhas = email_outbox.listar_falhas()
+    assert [(f["email"], f["tentativas"]) for f in falhas] == [("p1@x.com", 3)]
+
+    # Reprocessar devolve a mensagem à fila
+    estado["recusar"] = set()
+    assert email_outbox.reprocessar_falhas() == 1
+    assert processador.processar_pendentes()["enviados"] == 1
+    assert email_outbox.obter_status_fila()["enviado"] == 3
+
+
+def test_erro_do_provedor_reagenda_o_lote_inteiro(outbox):
+    processador, estado, manager = outbox
+    processador.enfileirar_lote(TIPO_CERTIFICADO_LIBERADO, _destinatarios(4))
+    estado["erro"] = ConnectionError("provedor fora do ar")
+
+    assert processador.processar_pendentes()["reagendados"] == 4
+    with manager.get_db_session() as session:
+        erros = {m.ultimo_erro for m in session.query(EmailOutbox)}
+    assert erros == {"provedor fora do ar"}
+
+
+def test_circuito_aberto_nao_consome_tentativas(outbox):
+    from app.email_dispatch import CircuitoEmail
+
+    _, _, manager = outbox
+    relogio = {"agora": 0.0}
+    circuito = CircuitoEmail(
+        limite_falhas=2, tempo_abertura=30, relogio=lambda: relogio["agora"]
+    )
+    lotes = []
+
+    def enviar(mensagens):
+        lotes.append(len(mensagens))
+        enviados = []
+        for m in mensagens:
+            if not circuito.permitir():
+                continue
+            if m["payload"]["email"] in {"p0@x.com", "p1@x.com"}:
+                circuito.registrar_falha()
+            else:
+                circuito.registrar_sucesso()
+                enviados.append(m["id"])
+        return enviados
+
+    processador = ProcessadorOutbox(
+        manager.session_factory,
+        enviar=enviar,
+        max_tentativas=3,
+        iniciar_automaticamente=False,
+        circuito=circuito,
+    )
+    processador.enfileirar_lote(TIPO_CERTIFICADO_LIBERADO, _destinatarios(5))
+
+    # O circuito abre no meio do lote: nada é enviado e nenhuma tentativa é gasta
+    assert processador.processar_pendentes() == {
+        "enviados": 0,
+        "reagendados": 5,
+        "falhas": 0,
+    }
+    with manager.get_db_session() as session:
+        assert {m.tentativas for m in session.query(EmailOutbox)} == {0}
+
+    # Aberto, nem reserva as mensagens
+    _reabrir(manager)
+    assert processador.processar_pendentes()["reagendados"] == 0
+    assert lotes == [5]
+
+    # Meio aberto, uma única mensagem de teste; com sucesso, o restante segue
+    relogio["agora"] = 31
+    with manager.get_db_session() as session:
+        session.query(EmailOutbox).filter(EmailOutbox.id <= 2).update(
+            {"proxima_tentativa": (datetime.now() + timedelta(hours=1)).isoformat()}
+        )
+    assert processador.processar_pendentes()["enviados"] == 3
+    assert lotes == [5, 1, 2]
+
+
+def test_backoff_exponencial_limitado(monkeypatch):
+    from app.core import settings
+
+    monkeypatch.setattr(settings, "email_outbox_backoff_seconds", 60)
+    monkeypatch.setattr(settings, "email_outbox_backoff_max_seconds", 300)
+    agora = datetime(2025, 5, 20, 12, 0, 0)
+
+    atrasos = [
+        calcular_proxima_tentativa(tentativas, agora) - agora
+        for tentativas in range(1, 6)
+    ]
+    assert atrasos == [timedelta(seconds=s) for s in (60, 120, 240, 300, 300)]
+
+
+def test_enviar_pelo_servico_email_identifica_falhas_pela_mensagem(monkeypatch):
+    """Falhas valem para a mensagem, não para o e-mail; payload sem e-mail não é enviado."""
+    from app.core import settings
+    from app.email_dispatch import ResultadoDespacho
+    from app.services import servico_email
+
+    recebidos = []
+
+    def enviar_certificados(destinatarios, identificar):
+        recebidos.extend(destinatarios)
+        # Apenas a primeira das duas mensagens para o mesmo endereço falha
+        falhados = [identificar(destinatarios[0])]
+        return ResultadoDespacho(len(destinatarios) - 1, 1, falhados, 0.1)
+
+    monkeypatch.setattr(settings, "email_attach_certificates", False)
+    monkeypatch.setattr(servico_email, "is_configured", lambda: True)
+    monkeypatch.setattr(
+        servico_email, "enviar_certificados_liberados", enviar_certificados
+    )
+
+    mensagens = [
+        {"id": 1, "tipo": TIPO_CERTIFICADO_LIBERADO, "payload": {"email": "a@x.com"}},
+        {"id": 2, "tipo": TIPO_CERTIFICADO_LIBERADO, "payload": {"email": "a@x.com"}},
+        {"id": 3, "tipo": TIPO_CERTIFICADO_LIBERADO, "payload": {"nome": "Sem"}},
+    ]
+
+    assert email_outbox.enviar_pelo_servico_email(mensagens) == [2]
+    assert [dest["mensagem_id"] for dest in recebidos] == [1, 2]
@@ -0,0 +1,61 @@
+"""
+Testes dos modelos de e-mail (app/email_templates.py).
+"""
+
+import os
+
+import pytest
+
+from app.email_templates import (
+    MODELO_CERTIFICADO_LIBERADO,
+    ModeloEmail,
+    RepositorioModelos,
+)
+
+
+def test_preencher_deixa_apenas_os_campos_individuais():
+    modelo = ModeloEmail.compilar(
+        "<p>Olá, $nome!</p><a href='${link}'>$$ $site</a>", escapar_html=True
+    )
+    assert modelo.campos == {"nome", "link", "site"}
+
+    parcial = modelo.preencher(site="Pint <BR>")
+    assert parcial.campos == {"nome", "link"}
+    assert (
+        parcial.renderizar(nome="Ana & Bia", link="/c?a=1")
+        == "<p>Olá, Ana &amp; Bia!</p><a href='/c?a=1'>$ Pint &lt;BR&gt;</a>"
+    )
+    with pytest.raises(KeyError, match="link"):
+        parcial.renderizar(nome="Ana")
+    with pytest.raises(ValueError, match="linha 2"):
+        ModeloEmail.compilar("ok\ncusto: $ 10")
+
+
+def test_repositorio_usa_modelo_do_ano_e_recompila_ao_alterar(tmp_path):
+    (tmp_path / "aviso.txt").write_text("Padrão: $nome", encoding="utf-8")
+    (tmp_path / "2025").mkdir()
+    especifico = tmp_path / "2025" / "aviso.txt"
+    especifico.write_text("2025: $nome", encoding="utf-8")
+    repositorio = RepositorioModelos(tmp_path)
+
+    assert repositorio.obter("aviso.txt", 2024).renderizar(nome="A") == "Padrão: A"
+    modelo = repositorio.obter("aviso.txt", 2025)
+    assert modelo.renderizar(nome="A") == "2025: A"
+    assert repositorio.obter("aviso.txt", 2025) is modelo
+
+    especifico.write_text("Novo 2025: $nome", encoding="utf-8")
+    mtime = os.stat(especifico).st_mtime_ns + 1_000_000_000
+    os.utime(especifico, ns=(mtime, mtime))
+    assert repositorio.obter("aviso.txt", 2025).renderizar(nome="A") == "Novo 2025: A"
+
+
+def test_modelos_padrao_tem_html_e_texto():
+    repositorio = RepositorioModelos()
+
+    conteudo = repositorio.obter_conteudo(MODELO_CERTIFICADO_LIBERADO, formato="ambos")
+
+    assert set(conteudo) == {"htmlContent", "textContent"}
+    for modelo in conteudo.values():
+        assert modelo.campos == {"nome", "link_download"}
+    texto = conteudo["textContent"].renderizar(nome="Ana", link_download="https://x/")
+    assert "Parabéns, Ana!" in texto and "<" not in texto
@@ -0,0 +1,105 @@
+"""
+Testes da importação em lote de participantes (app/importer.py).
+"""
+
+import io
+
+import pytest
+
+from app.models import Participante
+
+CSV_IMPORTACAO = """Nome;E-mail;Cidade;Função;Datas
+Ana Souza;ana@example.com;Brasília;Palestrante;19/05/2025
+Bruno Lima;bruno@example.com;Recife-PE;Voluntário(a);19/05/2025, 20/05/2025
+Carla Dias;email-invalido;Brasília;Palestrante;19/05/2025
+Ana Souza;ANA@example.com;Brasília;Palestrante;20/05/2025
+
+Diego Reis;diego@example.com;Cidade Inexistente;Palestrante;19/05/2025
+Elisa Melo;elisa@example.com;Recife;Palestrante;01/01/2020
+Fabio Cruz;fabio@example.com;Recife;;20/05/2025
+"""
+
+
+@pytest.fixture
+def importador(monkeypatch, session, dados_basicos, db_manager_memoria):
+    """Aponta o importador para o banco em memória com os dados básicos já gravados."""
+    import app.importer as importer
+
+    session.commit()
+    monkeypatch.setattr(importer, "db_manager", db_manager_memoria)
+    return importer
+
+
+def test_importar_csv_valida_deduplica_e_insere(importador, session, dados_basicos):
+    """Linhas válidas são inseridas em lote e as inválidas ou repetidas vão para o relatório."""
+    evento_id = dados_basicos["evento"].id
+
+    resultado = importador.importar_participantes(
+        io.BytesIO(CSV_IMPORTACAO.encode("utf-8")),
+        evento_id,
+        nome_arquivo="participantes.csv",
+        funcao_padrao_id=dados_basicos["funcoes"][1].id,
+        batch_size=2,
+    )
+
+    assert resultado["total_linhas"] == 7
+    assert resultado["importados"] == 3
+    assert resultado["duplicados"] == 1
+    assert [erro["linha"] for erro in resultado["erros"]] == [4, 5, 7, 8]
+
+    participantes = session.query(Participante).order_by(Participante.id).all()
+    assert len(participantes) == 3
+    assert participantes[1].datas_participacao == "2025-05-19, 2025-05-20"
+    assert participantes[2].funcao_id == dados_basicos["funcoes"][1].id
+
+    # Reimportar o mesmo arquivo não duplica participantes já inscritos
+    resultado = importador.importar_participantes(
+        io.BytesIO(CSV_IMPORTACAO.encode("utf-8")),
+        evento_id,
+        nome_arquivo="participantes.csv",
+        funcao_padrao_id=dados_basicos["funcoes"][1].id,
+    )
+    assert resultado["importados"] == 0
+    assert resultado["duplicados"] == 4
+    assert session.query(Participante).count() == 3
+
+    relatorio = importador.gerar_relatorio_erros_csv(resultado["erros"])
+    assert relatorio.splitlines()[0] == "linha,erro"
+
+
+def test_importar_sem_colunas_obrigatorias(importador, dados_basicos):
+    """Arquivos sem as colunas obrigatórias são rejeitados antes de qualquer inserção."""
+    with pytest.raises(ValueError, match="Colunas obrigatórias ausentes"):
+        importador.importar_participantes(
+            io.BytesIO(b"Nome,Cidade\nAna,Recife\n"),
+            dados_basicos["evento"].id,
+            nome_arquivo="participantes.csv",
+        )
+
+
+def test_cidade_homonima_exige_uf(importador, session, dados_basicos):
+    """Um nome de cidade presente em mais de um estado só é aceito com a UF."""
+    from app.models import Cidade
+
+    session.add_all(
+        [Cidade(nome="Bom Jesus", estado="PI"), Cidade(nome="Bom Jesus", estado="RS")]
+    )
+    session.commit()
+    rs_id = session.query(Cidade).filter_by(nome="Bom Jesus", estado="RS").one().id
+
+    csv = (
+        "Nome;E-mail;Cidade;Datas\n"
+        "Ana Souza;ana@example.com;Bom Jesus;19/05/2025\n"
+        "Bruno Lima;bruno@example.com;Bom Jesus-RS;19/05/2025\n"
+    )
+    resultado = importador.importar_participantes(
+        io.BytesIO(csv.encode("utf-8")),
+        dados_basicos["evento"].id,
+        nome_arquivo="participantes.csv",
+        funcao_padrao_id=dados_basicos["funcoes"][0].id,
+    )
+
+    assert resultado["importados"] == 1
+    assert [erro["linha"] for erro in resultado["erros"]] == [2]
+    assert "mais de um estado" in resultado["erros"][0]["erro"]
+    assert session.query(Participante).one().cidade_id == rs_id
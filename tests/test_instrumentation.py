@@ -0,0 +1,83 @@
+"""
+Testes da instrumentação de consultas SQL (app/instrumentation.py).
+"""
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from app import instrumentation
+from app.core import settings
+from app.models import Cidade
+
+
+@pytest.fixture
+def instrumentacao_ativa(monkeypatch):
+    monkeypatch.setattr(settings, "sql_instrumentation_enabled", True)
+
+
+def test_instrumentacao_desabilitada_por_padrao(engine):
+    instrumentation.instalar_instrumentacao(engine)
+    assert not event.contains(
+        engine, "before_cursor_execute", instrumentation._antes_de_executar
+    )
+
+
+def test_medir_consultas_conta_e_detecta_n_mais_um(
+    instrumentacao_ativa, engine, session, dados_basicos
+):
+    """Consultas são contadas por medição, inclusive aninhada, e repetições viram N+1."""
+    instrumentation.instalar_instrumentacao(engine)
+    instrumentation.instalar_instrumentacao(engine)  # idempotente
+    instrumentation.limpar_historico()
+    session.commit()
+    cidade_ids = [c.id for c in dados_basicos["cidades"]]
+
+    with instrumentation.medir_consultas("pagina") as pagina:
+        session.execute(text("SELECT 1"))
+        with instrumentation.medir_consultas("servico") as servico:
+            for _ in range(3):
+                for cidade_id in cidade_ids:
+                    session.expire_all()
+                    session.get(Cidade, cidade_id)
+
+    assert servico.total_consultas == 6
+    assert pagina.total_consultas == 7
+    assert len(pagina.candidatos_n_mais_um()) == 1
+    assert pagina.candidatos_n_mais_um()[0]["repeticoes"] == 6
+
+    historico = instrumentation.obter_historico()
+    assert [m["nome"] for m in historico] == ["pagina", "servico"]
+    assert len(historico[0]["mais_lentas"]) == 5
+
+    resumo = {r["nome"]: r for r in instrumentation.obter_resumo_por_nome()}
+    assert resumo["pagina"]["consultas"] == 7
+    assert resumo["servico"]["n_mais_um"] == 1
+
+    instrumentation.limpar_historico()
+    assert instrumentation.obter_historico() == []
+
+
+def test_consulta_com_erro_nao_afeta_as_seguintes(instrumentacao_ativa, engine):
+    """O início fica no contexto do statement; um erro não deixa estado na conexão."""
+    instrumentation.instalar_instrumentacao(engine)
+    contextos = []
+    event.listen(
+        engine,
+        "handle_error",
+        lambda ctx: contextos.append(ctx.execution_context),
+    )
+
+    with engine.connect() as conn:
+        with instrumentation.medir_consultas("erro") as medicao:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM tabela_inexistente"))
+            conn.execute(text("SELECT 1"))
+
+        assert medicao.total_consultas == 1
+        assert list(medicao.statements) == ["SELECT 1"]
+        assert "_inicio_consultas" not in conn.info
+    assert contextos[0] is not None
+    assert not hasattr(contextos[0], "_inicio_consulta")
+
+    instrumentation.limpar_historico()
@@ -0,0 +1,136 @@
+"""
+Testes do executor de migrações versionadas (app/migrations.py).
+"""
+
+from sqlalchemy import inspect, text
+
+from app.models import Participante
+
+
+def _banco_legado(session, dados, quantidade):
+    """Simula um banco antigo: sem hash_validacao e com carga_horaria_calculada."""
+    from app.services import servico_criptografia
+
+    session.execute(text("DROP INDEX ix_participantes_hash_validacao"))
+    session.execute(text("DROP INDEX ix_participantes_evento_inscricao_id"))
+    session.execute(text("ALTER TABLE participantes DROP COLUMN hash_validacao"))
+    session.execute(
+        text("ALTER TABLE participantes ADD COLUMN carga_horaria_calculada INTEGER")
+    )
+    for i in range(quantidade):
+        session.execute(
+            text(
+                "INSERT INTO participantes (nome_completo_encrypted, email_encrypted, "
+                "email_hash, evento_id, cidade_id, funcao_id, datas_participacao, "
+                "validado, data_inscricao) VALUES (:nome, :email, :hash, :evento, "
+                ":cidade, :funcao, '2025-05-19', :validado, '2025-04-01T10:00:00')"
+            ),
+            {
+                "nome": servico_criptografia.criptografar_nome(f"Pessoa {i}"),
+                "email": servico_criptografia.criptografar_email(f"p{i}@example.com"),
+                "hash": f"hash-{i}",
+                "evento": dados["evento"].id,
+                "cidade": dados["cidades"][0].id,
+                "funcao": dados["funcoes"][0].id,
+                "validado": i != 0,
+            },
+        )
+    session.commit()
+
+
+def test_aplicar_migracoes_retoma_backfill(
+    monkeypatch, session, dados_basicos, db_manager_memoria
+):
+    """O backfill para após max_lotes, retoma do checkpoint e as versões ficam registradas."""
+    import app.migrations as migrations
+
+    monkeypatch.setattr(migrations, "db_manager", db_manager_memoria)
+    _banco_legado(session, dados_basicos, 5)
+
+    # Primeira execução interrompida no meio do backfill
+    aplicadas = migrations.aplicar_migracoes(tamanho_lote=2, pausa=0, max_lotes=1)
+    assert aplicadas == [1]
+    status = {m["versao"]: m for m in migrations.obter_status_migracoes()}
+    assert status[2]["aplicada_em"] is None
+    assert status[2]["ultimo_id"] == 2
+    assert status[2]["processados"] == 1
+
+    # Segunda execução conclui o backfill e pula só a migração de manutenção
+    aplicadas = migrations.aplicar_migracoes(tamanho_lote=2, pausa=0)
+    assert aplicadas == [2, 4, 5]
+    status = {m["versao"]: m for m in migrations.obter_status_migracoes()}
+    assert status[3]["manutencao"] and status[3]["aplicada_em"] is None
+
+    # Na janela de manutenção, a migração pulada é aplicada
+    aplicadas = migrations.aplicar_migracoes(permitir_manutencao=True)
+    assert aplicadas == [3]
+    assert migrations.obter_versao_atual() == 5
+    assert migrations.aplicar_migracoes() == []
+
+    session.expire_all()
+    hashes = dict(session.query(Participante.id, Participante.hash_validacao).all())
+    assert hashes[1] is None
+    assert all(hashes[i] for i in range(2, 6))
+    assert len(set(hashes.values())) == 5
+
+    inspector = inspect(session.get_bind())
+    colunas = [c["name"] for c in inspector.get_columns("participantes")]
+    assert "carga_horaria_calculada" not in colunas
+    indices = [i["name"] for i in inspector.get_indexes("participantes")]
+    assert "ix_participantes_evento_inscricao_id" in indices
+
+
+def test_migracoes_sem_manutencao_criam_indices_posteriores(
+    monkeypatch, session, dados_basicos, db_manager_memoria
+):
+    """Sem a janela de manutenção, os índices das migrações seguintes são criados."""
+    import app.migrations as migrations
+
+    monkeypatch.setattr(migrations, "db_manager", db_manager_memoria)
+    _banco_legado(session, dados_basicos, 3)
+    for nome in (
+        "ix_auditoria_timestamp_id",
+        "ix_auditoria_coordenador_timestamp_id",
+        "ix_auditoria_acao_timestamp_id",
+    ):
+        session.execute(text(f"DROP INDEX IF EXISTS {nome}"))
+    session.commit()
+
+    assert migrations.aplicar_migracoes(pausa=0) == [1, 2, 4, 5]
+
+    inspector = inspect(session.get_bind())
+    assert "carga_horaria_calculada" in [
+        c["name"] for c in inspector.get_columns("participantes")
+    ]
+    assert "ix_participantes_evento_inscricao_id" in [
+        i["name"] for i in inspector.get_indexes("participantes")
+    ]
+    assert {
+        "ix_auditoria_timestamp_id",
+        "ix_auditoria_coordenador_timestamp_id",
+        "ix_auditoria_acao_timestamp_id",
+    } <= {i["name"] for i in inspector.get_indexes("auditoria")}
+
+
+def test_migracao_recria_indice_hash_validacao_nao_unico(
+    monkeypatch, session, dados_basicos, db_manager_memoria
+):
+    """Um índice antigo sem UNIQUE é recriado; sem a coluna legada nada exige manutenção."""
+    import app.migrations as migrations
+
+    monkeypatch.setattr(migrations, "db_manager", db_manager_memoria)
+    session.execute(text("DROP INDEX ix_participantes_hash_validacao"))
+    session.execute(
+        text(
+            "CREATE INDEX ix_participantes_hash_validacao "
+            "ON participantes (hash_validacao)"
+        )
+    )
+    session.commit()
+
+    assert migrations.aplicar_migracoes() == [1, 2, 3, 4, 5]
+
+    indices = {
+        i["name"]: i for i in inspect(session.get_bind()).get_indexes("participantes")
+    }
+    assert indices["ix_participantes_hash_validacao"]["unique"]
@@ -0,0 +1,71 @@
+"""
+Testes do cache de dados de referência (app/reference_data.py).
+"""
+
+import pytest
+
+from app.db import get_cidade_repository
+from app.models import Funcao
+from app.reference_data import CacheReferencia
+
+
+@pytest.fixture
+def popular(criar_referencias):
+    """Cria os eventos 2024 e 2025, a cidade Brasília e a função Palestrante."""
+
+    def popular(manager):
+        with manager.get_db_session() as session:
+            criar_referencias(session, anos=(2024, 2025))
+
+    return popular
+
+
+def test_dados_ficam_em_cache_ate_a_invalidacao(db_manager_memoria, popular):
+    popular(db_manager_memoria)
+    cache = CacheReferencia(db_manager_memoria)
+
+    dados = cache.obter()
+    assert dados.evento_atual.ano == 2025
+    assert [e.ano for e in dados.eventos] == [2025, 2024]
+    assert [c.nome for c in dados.cidades_por_id.values()] == ["Brasília"]
+    assert [f.nome_funcao for f in dados.funcoes] == ["Palestrante"]
+
+    # Leituras seguintes não consultam o banco
+    assert cache.obter() is dados
+    assert cache.carregamentos == 1
+
+    # Escrita sem invalidação: o cache continua servindo a versão antiga
+    with db_manager_memoria.get_db_session() as session:
+        session.add(Funcao(nome_funcao="Organizador(a)"))
+    assert len(cache.obter().funcoes) == 1
+
+    cache.invalidar()
+    assert [f.nome_funcao for f in cache.obter().funcoes] == [
+        "Organizador(a)",
+        "Palestrante",
+    ]
+    assert cache.carregamentos == 2
+
+
+def test_invalidacao_acontece_somente_apos_o_commit(db_manager_memoria, popular):
+    popular(db_manager_memoria)
+    cache = CacheReferencia(db_manager_memoria)
+    cache.obter()
+
+    session = db_manager_memoria.session_factory()
+    try:
+        get_cidade_repository(session).create_cidade("Recife", "PE")
+        cache.invalidar_apos_commit(session)
+        session.rollback()
+    finally:
+        session.close()
+    assert cache.versao == 0
+
+    with db_manager_memoria.get_db_session() as session:
+        get_cidade_repository(session).create_cidade("Salvador", "BA")
+        cache.invalidar_apos_commit(session)
+        # Antes do commit a versão não muda
+        assert cache.versao == 0
+
+    assert cache.versao == 1
+    assert [c.nome for c in cache.obter().cidades] == ["Salvador", "Brasília"]
@@ -0,0 +1,212 @@
+"""
+Testes da camada de serviços (app/services.py).
+"""
+
+import pytest
+from sqlalchemy import event
+
+import app.services as services
+from app.audit import RegistradorAuditoria
+from app.email_outbox import ProcessadorOutbox
+from app.models import Auditoria, Coordenador, Participante
+
+
+@pytest.fixture
+def popular(criar_referencias, criar_participantes):
+    """Cria coordenador e participantes (ímpares validados); retorna o ID do coordenador."""
+
+    def popular(manager, quantidade):
+        with manager.get_db_session() as session:
+            coordenador = Coordenador(nome="Coord", email="c@x.com", senha_hash="x")
+            session.add(coordenador)
+            criar_participantes(
+                session,
+                criar_referencias(session),
+                quantidade,
+                validado=lambda i: i % 2 == 1,
+            )
+            return coordenador.id
+
+    return popular
+
+
+def test_validar_participantes_em_lote(monkeypatch, db_manager_memoria, popular):
+    """A validação em lote usa poucas queries, independente da quantidade de participantes."""
+    coordenador_id = popular(db_manager_memoria, 40)
+    enviados = []
+
+    monkeypatch.setattr(services, "db_manager", db_manager_memoria)
+    monkeypatch.setattr(
+        services,
+        "registrador_auditoria",
+        RegistradorAuditoria(db_manager_memoria.session_factory),
+    )
+    monkeypatch.setattr(
+        services, "get_current_user_info", lambda: {"id": coordenador_id}
+    )
+    monkeypatch.setattr(services.servico_email, "is_configured", lambda: True)
+    processador = ProcessadorOutbox(
+        db_manager_memoria.session_factory,
+        enviar=lambda mensagens: (
+            enviados.extend(m["payload"] for m in mensagens)
+            or [m["id"] for m in mensagens]
+        ),
+        iniciar_automaticamente=False,
+    )
+    monkeypatch.setattr(services, "processador_outbox", processador)
+
+    statements = []
+
+    def _contar(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_manager_memoria.engine, "before_cursor_execute", _contar)
+    try:
+        # IDs ímpares estão pendentes e serão validados; pares serão invalidados;
+        # o ID 999 não existe
+        ids = list(range(1, 41)) + [999]
+        status = [i % 2 == 1 for i in range(1, 41)] + [True]
+        sucesso, mensagem = services.validar_participantes(ids, status)
+    finally:
+        event.remove(db_manager_memoria.engine, "before_cursor_execute", _contar)
+
+    assert sucesso, mensagem
+    assert "1 erros" in mensagem
+    assert "20 emails enfileirados" in mensagem
+    assert len(statements) <= 9
+
+    # A auditoria fica na fila até a gravação em lote
+    assert services.registrador_auditoria.pendentes == 40
+    assert services.registrador_auditoria.flush() == 40
+
+    with db_manager_memoria.get_db_session() as session:
+        validados = session.query(Participante).filter_by(validado=True).count()
+        acoes = [a.acao for a in session.query(Auditoria).all()]
+
+    assert validados == 20
+    assert len(acoes) == 40
+    assert acoes.count("VALIDATE_PARTICIPANTE") == 20
+
+    # Os e-mails são enviados pelo processador da fila, fora da requisição
+    assert enviados == []
+    assert processador.processar_pendentes()["enviados"] == 20
+    assert len(enviados) == 20
+    assert {d["email"] for d in enviados} == {f"p{i}@x.com" for i in range(0, 40, 2)}
+
+
+def test_validar_novamente_nao_reenvia_email(monkeypatch, db_manager_memoria, popular):
+    """Quem já recebeu o aviso de certificado só é notificado de novo com reenvio forçado."""
+    from app.models import NotificacaoEnfileirada
+
+    coordenador_id = popular(db_manager_memoria, 4)
+    monkeypatch.setattr(services, "db_manager", db_manager_memoria)
+    monkeypatch.setattr(
+        services,
+        "registrador_auditoria",
+        RegistradorAuditoria(db_manager_memoria.session_factory),
+    )
+    monkeypatch.setattr(
+        services, "get_current_user_info", lambda: {"id": coordenador_id}
+    )
+    monkeypatch.setattr(services.servico_email, "is_configured", lambda: True)
+    enviados = []
+    processador = ProcessadorOutbox(
+        db_manager_memoria.session_factory,
+        enviar=lambda mensagens: (
+            enviados.extend(m["payload"]["email"] for m in mensagens)
+            or [m["id"] for m in mensagens]
+        ),
+        iniciar_automaticamente=False,
+    )
+    monkeypatch.setattr(services, "processador_outbox", processador)
+
+    # IDs 1 e 3 (pendentes) são validados e notificados
+    services.validar_participantes([1, 3], [True, True])
+    processador.processar_pendentes()
+    assert sorted(enviados) == ["p0@x.com", "p2@x.com"]
+
+    # Desvalidar e validar de novo não gera outro e-mail
+    services.validar_participantes([1, 3], [False, False])
+    sucesso, mensagem = services.validar_participantes([1, 3], [True, True])
+    assert sucesso and "2 já notificados" in mensagem
+    assert processador.processar_pendentes()["enviados"] == 0
+
+    # O reenvio forçado notifica novamente e incrementa o contador
+    services.validar_participantes([1], [False])
+    services.validar_participantes([1], [True], forcar_reenvio=True)
+    assert processador.processar_pendentes()["enviados"] == 1
+    assert enviados[-1] == "p0@x.com"
+
+    # Também para quem já estava validado e continua validado
+    sucesso, mensagem = services.validar_participantes([3], [True], forcar_reenvio=True)
+    assert sucesso and "1 já validados com reenvio forçado" in mensagem
+    assert processador.processar_pendentes()["enviados"] == 1
+    assert enviados[-1] == "p2@x.com"
+    with db_manager_memoria.get_db_session() as session:
+        enfileiramentos = {
+            n.participante_id: n.enfileiramentos
+            for n in session.query(NotificacaoEnfileirada)
+        }
+    assert enfileiramentos == {1: 2, 3: 2}
+
+
+def test_baixar_certificado_em_uma_query(monkeypatch, db_manager_memoria, popular):
+    """O download busca tudo com uma query e só escreve o hash no primeiro download."""
+    from app.instrumentation import instalar_instrumentacao, medir_consultas
+
+    popular(db_manager_memoria, 2)
+    with db_manager_memoria.get_db_session() as session:
+        session.query(Coordenador).update({"is_superadmin": True})
+        evento_id = session.query(Participante.evento_id).first()[0]
+
+    monkeypatch.setattr(services, "db_manager", db_manager_memoria)
+    monkeypatch.setattr(services.settings, "sql_instrumentation_enabled", True)
+    instalar_instrumentacao(db_manager_memoria.engine)
+
+    with medir_consultas("primeiro download") as primeiro:
+        sucesso, pdf, mensagem = services.baixar_certificado("p1@x.com", evento_id)
+    assert sucesso, mensagem
+    assert pdf.startswith(b"%PDF")
+    assert primeiro.total_consultas == 2  # SELECT com join + UPDATE do hash
+
+    with medir_consultas("segundo download") as segundo:
+        sucesso, _, _ = services.baixar_certificado("p1@x.com", evento_id)
+    assert sucesso
+    assert segundo.total_consultas == 1
+
+    sucesso, _, mensagem = services.baixar_certificado("p0@x.com", evento_id)
+    assert not sucesso and "validada" in mensagem
+    sucesso, _, mensagem = services.baixar_certificado("nao@x.com", evento_id)
+    assert not sucesso and "não encontrado" in mensagem
+
+
+def test_baixar_certificado_libera_escrita_antes_do_pdf(
+    monkeypatch, db_manager_memoria, popular
+):
+    """O hash é gravado e confirmado antes da geração do PDF, sem transação aberta."""
+    popular(db_manager_memoria, 2)
+    with db_manager_memoria.get_db_session() as session:
+        evento_id = session.query(Participante.evento_id).first()[0]
+
+    monkeypatch.setattr(services, "db_manager", db_manager_memoria)
+    conexao = db_manager_memoria.engine.raw_connection()
+    durante_pdf = {}
+
+    def gerar_pdf(participante, *args, **kwargs):
+        durante_pdf["em_transacao"] = conexao.driver_connection.in_transaction
+        with db_manager_memoria.get_db_session() as session:
+            durante_pdf["hash_gravado"] = session.get(
+                Participante, participante.id
+            ).hash_validacao
+        durante_pdf["hash_pdf"] = participante.hash_validacao
+        return b"%PDF"
+
+    monkeypatch.setattr(
+        services.gerador_certificado, "gerar_certificado_pdf", gerar_pdf
+    )
+
+    sucesso, _, mensagem = services.baixar_certificado("p1@x.com", evento_id)
+    assert sucesso, mensagem
+    assert durante_pdf["em_transacao"] is False
+    assert durante_pdf["hash_gravado"]
+    assert durante_pdf["hash_pdf"] == durante_pdf["hash_gravado"]
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Script para arquivar registros antigos da auditoria (app/audit_archive.py).
+
+Registros mais antigos que o período de retenção são movidos da tabela
+`auditoria` para arquivos comprimidos por dia em AUDIT_ARCHIVE_DIR.
+
+Uso:
+    python utils/archive_audit.py [--dias N] [--dir DIRETORIO] [--batch-size N]
+    python utils/archive_audit.py --listar
+
+Opções:
+    --dias          Dias mantidos na tabela (padrão: AUDIT_RETENTION_DAYS)
+    --dir           Diretório do arquivo morto (padrão: AUDIT_ARCHIVE_DIR)
+    --batch-size    Registros por transação (padrão: 5000)
+    --listar        Apenas lista os arquivos existentes
+    --verbose       Mostra informações detalhadas durante o processo
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Adicionar o diretório raiz do projeto ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.audit_archive import (
+    AUDIT_ARCHIVE_BATCH_SIZE,
+    arquivar_auditoria,
+    listar_arquivos_auditoria,
+)
+from app.core import settings
+
+
+def setup_logging(verbose: bool = False) -> None:
+    """Configura o logging do script."""
+    level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+
+def show_archive_files(diretorio: Path) -> None:
+    """Exibe as partições arquivadas."""
+    arquivos = listar_arquivos_auditoria(diretorio)
+    print(f"\n🗄️ Arquivos em {diretorio}: {len(arquivos)}")
+    for arquivo in arquivos:
+        print(
+            f"  {arquivo['data'].isoformat()}  "
+            f"{arquivo['tamanho_bytes'] / 1024:.1f} KB  {arquivo['caminho']}"
+        )
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(
+        description="Arquiva registros antigos da auditoria"
+    )
+    parser.add_argument(
+        "--dias",
+        type=int,
+        default=settings.audit_retention_days,
+        help=f"Dias mantidos na tabela (padrão: {settings.audit_retention_days})",
+    )
+    parser.add_argument(
+        "--dir",
+        type=Path,
+        default=settings.audit_archive_dir,
+        help=f"Diretório do arquivo morto (padrão: {settings.audit_archive_dir})",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=AUDIT_ARCHIVE_BATCH_SIZE,
+        help=f"Registros por transação (padrão: {AUDIT_ARCHIVE_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--listar", action="store_true", help="Apenas lista os arquivos existentes"
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Mostra informações detalhadas durante o processo",
+    )
+
+    args = parser.parse_args()
+    setup_logging(args.verbose)
+
+    print("🔧 Pint of Science Brasil - Arquivamento da Auditoria")
+    print("=" * 50)
+
+    if args.listar:
+        show_archive_files(args.dir)
+        sys.exit(0)
+
+    try:
+        resultado = arquivar_auditoria(
+            dias_retencao=args.dias, diretorio=args.dir, tamanho_lote=args.batch_size
+        )
+    except Exception as e:
+        logging.error(f"Erro no arquivamento: {e}", exc_info=True)
+        print("\n💥 Arquivamento falhou! Execute novamente para continuar.")
+        sys.exit(1)
+
+    print(
+        f"\n✅ {resultado['arquivados']} registros anteriores a "
+        f"{resultado['limite'][:10]} arquivados"
+    )
+    for caminho in resultado["arquivos"]:
+        print(f"  📄 {caminho}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Script para mover eventos encerrados para o banco de arquivo (app/archive.py).
+
+Os participantes do evento saem do banco principal e passam a ser lidos do
+arquivo SQLite configurado em ARCHIVE_DATABASE_PATH. Downloads e validações
+de certificados do evento continuam funcionando.
+
+Uso:
+    python utils/archive_events.py --listar
+    python utils/archive_events.py --arquivar ANO [--vacuum]
+    python utils/archive_events.py --restaurar ANO
+
+Opções:
+    --listar        Lista os eventos arquivados
+    --arquivar      Arquiva o evento do ano informado
+    --restaurar     Devolve o evento do ano informado ao banco principal
+    --vacuum        Compacta o banco principal após o arquivamento
+    --verbose       Mostra informações detalhadas durante o processo
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Adicionar o diretório raiz do projeto ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.archive import (
+    arquivar_evento,
+    compactar_banco_principal,
+    listar_eventos_arquivados,
+    restaurar_evento,
+)
+from app.core import settings
+from app.db import db_manager, get_evento_repository
+
+
+def setup_logging(verbose: bool = False) -> None:
+    """Configura o logging do script."""
+    level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+
+def show_archived_events() -> None:
+    """Exibe os eventos arquivados."""
+    eventos = listar_eventos_arquivados()
+    print(
+        f"\n🗄️ Eventos arquivados em {settings.archive_database_path}: {len(eventos)}"
+    )
+    for evento in eventos:
+        print(
+            f"  {evento['ano']}  {evento['participantes']} participantes  "
+            f"(arquivado em {evento['arquivado_em'][:19]})"
+        )
+
+
+def obter_evento_id(ano: int) -> int:
+    """Retorna o ID do evento de um ano ou encerra o script."""
+    with db_manager.get_db_session() as session:
+        evento = get_evento_repository(session).get_by_ano(ano)
+        if not evento:
+            print(f"❌ Evento {ano} não encontrado")
+            sys.exit(1)
+        return evento.id
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(
+        description="Move eventos encerrados para o banco de arquivo"
+    )
+    grupo = parser.add_mutually_exclusive_group(required=True)
+    grupo.add_argument(
+        "--listar", action="store_true", help="Lista os eventos arquivados"
+    )
+    grupo.add_argument("--arquivar", type=int, metavar="ANO", help="Arquiva o evento")
+    grupo.add_argument(
+        "--restaurar", type=int, metavar="ANO", help="Restaura o evento arquivado"
+    )
+    parser.add_argument(
+        "--vacuum",
+        action="store_true",
+        help="Compacta o banco principal após o arquivamento",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Mostra informações detalhadas durante o processo",
+    )
+
+    args = parser.parse_args()
+    setup_logging(args.verbose)
+
+    print("🔧 Pint of Science Brasil - Arquivo de Eventos")
+    print("=" * 50)
+
+    if not settings.archive_database_path:
+        print("❌ ARCHIVE_DATABASE_PATH não configurado. Verifique o arquivo .env")
+        sys.exit(1)
+
+    if args.listar:
+        show_archived_events()
+        sys.exit(0)
+
+    try:
+        if args.arquivar:
+            resultado = arquivar_evento(obter_evento_id(args.arquivar))
+            print(
+                f"\n✅ Evento {resultado['ano']} arquivado: "
+                f"{resultado['participantes']} participantes movidos"
+            )
+            if args.vacuum:
+                compactar_banco_principal()
+                print("✅ Banco principal compactado")
+        else:
+            resultado = restaurar_evento(obter_evento_id(args.restaurar))
+            print(
+                f"\n✅ Evento {args.restaurar} restaurado: "
+                f"{resultado['participantes']} participantes movidos"
+            )
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+    except Exception as e:
+        logging.error(f"Erro no arquivamento: {e}", exc_info=True)
+        print("\n💥 Operação falhou! Nenhuma alteração foi gravada.")
+        sys.exit(1)
+
+    show_archived_events()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Script para criar backups online do banco de dados (app/backup.py).
+
+A cópia usa a API de backup online do SQLite: a aplicação pode continuar em
+uso durante o backup. Os snapshots são comprimidos em BACKUP_DIR e apenas os
+BACKUP_KEEP mais recentes são mantidos.
+
+Uso:
+    python utils/backup.py [--dir DIRETORIO] [--manter N]
+    python utils/backup.py --listar
+    python utils/backup.py --agendar
+
+Opções:
+    --dir           Diretório dos snapshots (padrão: BACKUP_DIR)
+    --manter        Snapshots mantidos após a rotação (padrão: BACKUP_KEEP)
+    --listar        Apenas lista os snapshots existentes
+    --agendar       Executa continuamente, criando um backup a cada BACKUP_INTERVAL_HOURS
+    --verbose       Mostra informações detalhadas durante o processo
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Adicionar o diretório raiz do projeto ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.backup import AgendadorBackup, criar_backup, listar_backups
+from app.core import settings
+
+
+def setup_logging(verbose: bool = False) -> None:
+    """Configura o logging do script."""
+    level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+
+def show_backups(diretorio: Path) -> None:
+    """Exibe os snapshots existentes."""
+    backups = listar_backups(diretorio=diretorio)
+    print(f"\n💾 Backups em {diretorio}: {len(backups)}")
+    for backup in backups:
+        print(
+            f"  {backup['criado_em'].isoformat(sep=' ')}  "
+            f"{backup['tamanho_bytes'] / 1024 / 1024:.1f} MB  {backup['arquivo'].name}"
+        )
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(
+        description="Cria backups online do banco de dados"
+    )
+    parser.add_argument(
+        "--dir",
+        type=Path,
+        default=settings.backup_dir,
+        help=f"Diretório dos snapshots (padrão: {settings.backup_dir})",
+    )
+    parser.add_argument(
+        "--manter",
+        type=int,
+        default=settings.backup_keep,
+        help=f"Snapshots mantidos após a rotação (padrão: {settings.backup_keep})",
+    )
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument(
+        "--listar", action="store_true", help="Apenas lista os snapshots existentes"
+    )
+    grupo.add_argument(
+        "--agendar",
+        action="store_true",
+        help="Cria um backup a cada BACKUP_INTERVAL_HOURS até ser interrompido",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Mostra informações detalhadas durante o processo",
+    )
+
+    args = parser.parse_args()
+    setup_logging(args.verbose)
+
+    print("🔧 Pint of Science Brasil - Backup do Banco de Dados")
+    print("=" * 50)
+
+    if args.listar:
+        show_backups(args.dir)
+        sys.exit(0)
+
+    if args.agendar:
+        if settings.backup_interval_hours <= 0:
+            print("❌ BACKUP_INTERVAL_HOURS deve ser maior que zero")
+            sys.exit(1)
+        settings.backup_dir = args.dir
+        settings.backup_keep = args.manter
+        agendador = AgendadorBackup()
+        agendador.iniciar()
+        print(
+            f"⏱️ Backups a cada {settings.backup_interval_hours:g} h (Ctrl+C para sair)"
+        )
+        try:
+            agendador._thread.join()
+        except KeyboardInterrupt:
+            agendador.parar()
+            print("\n👋 Agendador encerrado")
+        sys.exit(0)
+
+    try:
+        resultado = criar_backup(diretorio=args.dir, manter=args.manter)
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+    except Exception as e:
+        logging.error(f"Erro no backup: {e}", exc_info=True)
+        print("\n💥 Backup falhou!")
+        sys.exit(1)
+
+    print(
+        f"\n✅ Backup criado em {resultado['duracao_s']:.1f}s: {resultado['arquivo']}"
+    )
+    print(
+        f"   {resultado['tamanho_banco_bytes'] / 1024 / 1024:.1f} MB → "
+        f"{resultado['tamanho_bytes'] / 1024 / 1024:.1f} MB comprimidos, "
+        f"{resultado['removidos']} snapshot(s) antigo(s) removido(s)"
+    )
+    if resultado["banco_arquivo"]:
+        print(f"   Banco de arquivo: {resultado['banco_arquivo']['arquivo']}")
+    show_backups(args.dir)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
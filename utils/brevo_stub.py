@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Servidor local compatível com a API de e-mail da Brevo (app/brevo_stub.py).
+
+Sem --benchmark, o servidor fica no ar até Ctrl+C: aponte a aplicação para ele
+com BREVO_API_URL=http://127.0.0.1:<porta>/v3/smtp/email. As estatísticas
+ficam em GET /stub/estatisticas.
+
+Com --benchmark N, envia N e-mails de certificado liberado pelo ServicoEmail
+contra o servidor e mede a vazão, sem tocar na API real.
+
+Uso:
+    python utils/brevo_stub.py [--porta 8025] [--latencia-ms 80] [--taxa-erro 0.02]
+    python utils/brevo_stub.py --benchmark 2000 --latencia-ms 80 --limite-por-segundo 50
+
+Opções:
+    --porta               Porta de escuta (padrão: 8025; 0 no benchmark)
+    --latencia-ms         Latência de cada resposta em ms
+    --variacao-ms         Variação (±) da latência em ms
+    --taxa-erro           Fração das requisições respondidas com erro 500
+    --limite-por-segundo  Cota de requisições por segundo (429 acima dela)
+    --benchmark N         Envia N e-mails e mostra a vazão
+    --verbose             Mostra informações detalhadas durante o processo
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Adicionar o diretório raiz do projeto ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.brevo_stub import ServidorBrevoStub
+from app.core import settings
+
+
+def setup_logging(verbose: bool = False) -> None:
+    """Configura o logging do script."""
+    level = logging.DEBUG if verbose else logging.WARNING
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+
+def run_benchmark(stub: ServidorBrevoStub, quantidade: int) -> None:
+    """Envia `quantidade` e-mails pelo ServicoEmail contra o stub."""
+    from app.services import ServicoEmail
+
+    settings.brevo_api_url = stub.url
+    settings.brevo_api_key = settings.brevo_api_key or "stub"
+    settings.brevo_sender_email = (
+        settings.brevo_sender_email or "certificados@pintofscience.com.br"
+    )
+    servico = ServicoEmail()
+    if not servico.is_configured():
+        print("❌ Serviço de e-mail indisponível (biblioteca requests ausente?)")
+        sys.exit(1)
+
+    destinatarios = [
+        {
+            "nome": f"Participante {i}",
+            "email": f"participante{i}@exemplo.com",
+            "link_download": f"{settings.base_url}/",
+        }
+        for i in range(quantidade)
+    ]
+
+    print(
+        f"📧 Enviando {quantidade} e-mails "
+        f"(concorrência {settings.email_max_concurrency}, "
+        f"até {settings.email_batch_max_recipients} por requisição)"
+    )
+    inicio = time.perf_counter()
+    resultado = servico.enviar_certificados_liberados(destinatarios)
+    duracao = time.perf_counter() - inicio
+
+    print(
+        f"\n✅ {resultado.sucessos} enviados, {resultado.falhas} falhas "
+        f"em {duracao:.2f}s ({resultado.sucessos / duracao:.1f} e-mails/s)"
+    )
+    print(f"   Servidor: {stub.estatisticas()}")
+    print(f"   Cliente:  {servico.despachante.obter_metricas()}")
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(
+        description="Servidor local compatível com a API de e-mail da Brevo"
+    )
+    parser.add_argument("--porta", type=int, default=None, help="Porta de escuta")
+    parser.add_argument("--latencia-ms", type=float, default=0, help="Latência (ms)")
+    parser.add_argument(
+        "--variacao-ms", type=float, default=0, help="Variação da latência (ms)"
+    )
+    parser.add_argument(
+        "--taxa-erro", type=float, default=0, help="Fração de respostas 500"
+    )
+    parser.add_argument(
+        "--limite-por-segundo",
+        type=float,
+        default=0,
+        help="Cota de requisições por segundo (429 acima dela)",
+    )
+    parser.add_argument(
+        "--benchmark", type=int, metavar="N", help="Envia N e-mails e mede a vazão"
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Mostra informações detalhadas durante o processo",
+    )
+
+    args = parser.parse_args()
+    setup_logging(args.verbose)
+
+    print("🔧 Pint of Science Brasil - Stub da API de E-mail")
+    print("=" * 50)
+
+    porta = args.porta if args.porta is not None else (0 if args.benchmark else 8025)
+    stub = ServidorBrevoStub(
+        porta=porta,
+        latencia_s=args.latencia_ms / 1000,
+        variacao_s=args.variacao_ms / 1000,
+        taxa_erro=args.taxa_erro,
+        limite_por_segundo=args.limite_por_segundo,
+    )
+
+    with stub:
+        if args.benchmark:
+            run_benchmark(stub, args.benchmark)
+            sys.exit(0)
+
+        print(f"📡 Ouvindo em {stub.url} (Ctrl+C para sair)")
+        print(f"   BREVO_API_URL={stub.url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print(f"\n📊 {stub.estatisticas()}")
+            print("👋 Stub encerrado")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Script para importar participantes em lote a partir de um arquivo CSV ou XLSX.
+
+O arquivo deve ter um cabeçalho com as colunas Nome, E-mail, Cidade e Datas
+(DD/MM/YYYY, separadas por vírgula). As colunas Função e Título são opcionais
+quando uma função padrão é informada.
+
+Uso:
+    python utils/import_participants.py ARQUIVO --ano 2025 [--funcao NOME] [--validado]
+
+Opções:
+    --ano           Ano do evento de destino (padrão: evento atual)
+    --funcao        Função usada quando a coluna Função estiver vazia
+    --validado      Importa os participantes já validados
+    --batch-size    Linhas por transação (padrão: 1000)
+    --relatorio     Caminho para salvar o relatório de erros em CSV
+    --verbose       Mostra informações detalhadas durante o processo
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Adicionar o diretório raiz do projeto ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core import settings
+from app.db import (
+    db_manager,
+    get_evento_repository,
+    get_funcao_repository,
+    init_database,
+)
+from app.importer import (
+    IMPORT_BATCH_SIZE,
+    gerar_relatorio_erros_csv,
+    importar_participantes,
+)
+
+
+def setup_logging(verbose: bool = False) -> None:
+    """Configura o logging do script."""
+    level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(
+        description="Importa participantes em lote a partir de um arquivo CSV ou XLSX"
+    )
+    parser.add_argument("arquivo", help="Arquivo .csv ou .xlsx a importar")
+    parser.add_argument("--ano", type=int, help="Ano do evento (padrão: evento atual)")
+    parser.add_argument(
+        "--funcao", help="Função usada quando a coluna Função estiver vazia"
+    )
+    parser.add_argument(
+        "--validado",
+        action="store_true",
+        help="Importa os participantes já validados",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=IMPORT_BATCH_SIZE,
+        help=f"Linhas por transação (padrão: {IMPORT_BATCH_SIZE})",
+    )
+    parser.add_argument("--relatorio", help="Salva o relatório de erros neste CSV")
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Mostra informações detalhadas durante o processo",
+    )
+
+    args = parser.parse_args()
+    setup_logging(args.verbose)
+
+    print("📥 Pint of Science Brasil - Importação de Participantes")
+    print("=" * 50)
+
+    if not settings.encryption_key:
+        print("❌ ENCRYPTION_KEY não configurada. Verifique o arquivo .env")
+        sys.exit(1)
+
+    arquivo = Path(args.arquivo)
+    if not arquivo.exists():
+        print(f"❌ Arquivo não encontrado: {arquivo}")
+        sys.exit(1)
+
+    init_database()
+
+    with db_manager.get_db_session() as session:
+        evento_repo = get_evento_repository(session)
+        evento = (
+            evento_repo.get_by_ano(args.ano)
+            if args.ano
+            else evento_repo.get_current_event()
+        )
+        if not evento:
+            print("❌ Evento não encontrado")
+            sys.exit(1)
+        evento_id, evento_ano = evento.id, evento.ano
+
+        funcao_id = None
+        if args.funcao:
+            funcao = get_funcao_repository(session).get_by_name(args.funcao)
+            if not funcao:
+                print(f"❌ Função não encontrada: {args.funcao}")
+                sys.exit(1)
+            funcao_id = funcao.id
+
+    print(f"📅 Evento: {evento_ano}")
+    print(f"📄 Arquivo: {arquivo}")
+
+    try:
+        resultado = importar_participantes(
+            arquivo,
+            evento_id,
+            funcao_padrao_id=funcao_id,
+            validado=args.validado,
+            batch_size=args.batch_size,
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"\n📊 Linhas processadas: {resultado['total_linhas']}")
+    print(f"✅ Importados: {resultado['importados']}")
+    print(f"⚠️ Duplicados: {resultado['duplicados']}")
+    print(f"❌ Linhas com erro: {len(resultado['erros'])}")
+
+    if resultado["erros"]:
+        if args.relatorio:
+            Path(args.relatorio).write_text(
+                gerar_relatorio_erros_csv(resultado["erros"]), encoding="utf-8"
+            )
+            print(f"\n📝 Relatório de erros salvo em {args.relatorio}")
+        else:
+            for erro in resultado["erros"][:20]:
+                print(f"  Linha {erro['linha']}: {erro['erro']}")
+            if len(resultado["erros"]) > 20:
+                print("  ... use --relatorio para ver todos os erros")
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
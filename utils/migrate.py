@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Script para aplicar as migrações de esquema versionadas (app/migrations.py).
+
+Backfills de dados rodam em lotes, cada um em sua própria transação com
+checkpoint: a aplicação pode continuar no ar e uma execução interrompida
+continua de onde parou.
+
+Migrações marcadas como de manutenção reescrevem uma tabela inteira e bloqueiam
+as escritas enquanto rodam: a execução normal as pula (as demais seguem sendo
+aplicadas), e elas só são aplicadas com --manutencao, em uma janela com a
+aplicação fora do ar.
+
+Uso:
+    python utils/migrate.py [--status] [--ate VERSAO] [--batch-size N] [--pausa S] [--manutencao]
+
+Opções:
+    --status        Apenas mostra as migrações aplicadas e pendentes
+    --ate           Aplica migrações somente até esta versão
+    --batch-size    Linhas por lote nos backfills (padrão: 500)
+    --pausa         Pausa entre lotes em segundos (padrão: 0.05)
+    --max-lotes     Interrompe os backfills após N lotes (retomável)
+    --manutencao    Aplica também as migrações de janela de manutenção
+    --verbose       Mostra informações detalhadas durante o processo
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Adicionar o diretório raiz do projeto ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core import settings
+from app.migrations import (
+    MIGRATION_BATCH_PAUSE,
+    MIGRATION_BATCH_SIZE,
+    aplicar_migracoes,
+    obter_status_migracoes,
+)
+
+
+def setup_logging(verbose: bool = False) -> None:
+    """Configura o logging do script."""
+    level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+
+def show_migration_status() -> None:
+    """Exibe as migrações aplicadas e pendentes."""
+    print("\n🔍 Status das migrações:")
+    for m in obter_status_migracoes():
+        if m["aplicada_em"]:
+            print(f"  ✅ {m['versao']:03d} {m['descricao']} ({m['aplicada_em']})")
+        elif m["ultimo_id"] is not None:
+            print(
+                f"  ⏸️ {m['versao']:03d} {m['descricao']} "
+                f"(em andamento: id {m['ultimo_id']}, {m['processados']} processados)"
+            )
+        elif m["manutencao"]:
+            print(f"  🛠️ {m['versao']:03d} {m['descricao']} (janela de manutenção)")
+        else:
+            print(f"  ⏳ {m['versao']:03d} {m['descricao']}")
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(
+        description="Aplica as migrações de esquema pendentes"
+    )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Apenas mostra as migrações aplicadas e pendentes",
+    )
+    parser.add_argument("--ate", type=int, help="Aplica migrações até esta versão")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=MIGRATION_BATCH_SIZE,
+        help=f"Linhas por lote nos backfills (padrão: {MIGRATION_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--pausa",
+        type=float,
+        default=MIGRATION_BATCH_PAUSE,
+        help=f"Pausa entre lotes em segundos (padrão: {MIGRATION_BATCH_PAUSE})",
+    )
+    parser.add_argument(
+        "--max-lotes", type=int, help="Interrompe os backfills após N lotes"
+    )
+    parser.add_argument(
+        "--manutencao",
+        action="store_true",
+        help="Aplica também as migrações que reescrevem tabelas (janela de manutenção)",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Mostra informações detalhadas durante o processo",
+    )
+
+    args = parser.parse_args()
+    setup_logging(args.verbose)
+
+    print("🔧 Pint of Science Brasil - Migrações de Esquema")
+    print("=" * 50)
+
+    if not settings.database_url:
+        print("❌ DATABASE_URL não configurada. Verifique o arquivo .env")
+        sys.exit(1)
+
+    if args.status:
+        show_migration_status()
+        sys.exit(0)
+
+    try:
+        aplicadas = aplicar_migracoes(
+            ate_versao=args.ate,
+            tamanho_lote=args.batch_size,
+            pausa=args.pausa,
+            max_lotes=args.max_lotes,
+            permitir_manutencao=args.manutencao,
+        )
+    except Exception as e:
+        logging.error(f"Erro na migração: {e}", exc_info=True)
+        print("\n💥 Migração falhou! Execute novamente para retomar do último lote.")
+        sys.exit(1)
+
+    if aplicadas:
+        print(f"\n✅ Migrações aplicadas: {', '.join(map(str, aplicadas))}")
+    else:
+        print("\n✅ Nenhuma migração aplicada")
+
+    show_migration_status()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
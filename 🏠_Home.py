@@ -14,9 +14,13 @@ from typing import Optional, Dict, Any
 from pathlib import Path
 
 # Importar módulos do sistema
+from app.backup import iniciar_agendador_backup
 from app.core import settings
-from app.db import init_database, db_manager
-from app.models import Evento, Cidade, Funcao, ParticipanteCreate
+from app.db import init_database
+from app.email_outbox import processador_outbox
+from app.instrumentation import medir_consultas
+from app.models import Cidade, Funcao, ParticipanteCreate
+from app.reference_data import dados_referencia
 from app.services import inscrever_participante, baixar_certificado
 from app.auth import (
     show_login,
@@ -133,71 +137,12 @@ def mostrar_mensagem(tipo: str, mensagem: str) -> None:
 
 
 def carregar_dados_formulario() -> tuple:
-    """Carrega dados para os formulários (eventos, cidades, funções)."""
+    """Carrega dados para os formulários (eventos, cidades, funções) do cache de referência."""
     try:
-        with db_manager.get_db_session() as session:
-            from app.db import (
-                get_evento_repository,
-                get_cidade_repository,
-                get_funcao_repository,
-            )
-
-            evento_repo = get_evento_repository(session)
-            cidade_repo = get_cidade_repository(session)
-            funcao_repo = get_funcao_repository(session)
-
-            # Buscar evento atual
-            evento_atual = evento_repo.get_current_event()
-
-            # Buscar TODOS os eventos (para permitir download de certificados de anos anteriores)
-            todos_eventos = evento_repo.get_all(Evento)
-
-            # Buscar cidades e funções
-            cidades = cidade_repo.get_all_ordered()
-            funcoes = funcao_repo.get_all_ordered()
-
-            # Extrair dados do evento atual antes de fechar a sessão
-            evento_data = None
-            if evento_atual:
-                evento_data = {
-                    "id": evento_atual.id,
-                    "ano": evento_atual.ano,
-                    "datas_evento": evento_atual.datas_evento,
-                }
-
-            # Extrair dados de TODOS os eventos antes de fechar a sessão
-            eventos_data = []
-            for evento in todos_eventos:
-                eventos_data.append(
-                    {
-                        "id": evento.id,
-                        "ano": evento.ano,
-                        "datas_evento": evento.datas_evento,
-                    }
-                )
-
-            # Extrair dados das cidades antes de fechar a sessão
-            cidades_data = []
-            for cidade in cidades:
-                cidades_data.append(
-                    {
-                        "id": cidade.id,
-                        "nome": cidade.nome,
-                        "estado": cidade.estado,
-                    }
-                )
-
-            # Extrair dados das funções antes de fechar a sessão
-            funcoes_data = []
-            for funcao in funcoes:
-                funcoes_data.append(
-                    {
-                        "id": funcao.id,
-                        "nome_funcao": funcao.nome_funcao,
-                    }
-                )
-
-            return evento_data, eventos_data, cidades_data, funcoes_data
+        # Todos os eventos (para permitir download de certificados de anos
+        # anteriores); o primeiro é o evento atual (ano maior)
+        dados = dados_referencia.obter()
+        return dados.evento_atual, dados.eventos, dados.cidades, dados.funcoes
 
     except Exception as e:
         st.error(f"Erro ao carregar dados: {str(e)}")
@@ -211,7 +156,7 @@ def formulario_inscricao(evento_atual, cidades, funcoes) -> Dict[str, Any]:
 
     # Informações do evento
     if evento_atual:
-        st.success(f"🎯 Evento Atual: **Pint of Science {evento_atual['ano']}**")
+        st.success(f"🎯 Evento Atual: **Pint of Science {evento_atual.ano}**")
 
     # Inicializar resultado
     resultado = {"sucesso": False, "mensagem": "", "email": ""}
@@ -237,7 +182,7 @@ def formulario_inscricao(evento_atual, cidades, funcoes) -> Dict[str, Any]:
             cidade_selecionada = st.selectbox(
                 "Cidade *",
                 options=[("", None)]
-                + [(f"{c['nome']} - {c['estado']}", c["id"]) for c in cidades],
+                + [(f"{c.nome} - {c.estado}", c.id) for c in cidades],
                 format_func=lambda x: x[0] if x and x[0] else "Selecione...",
                 help="Cidade onde você participará do evento",
                 index=0,
@@ -245,13 +190,13 @@ def formulario_inscricao(evento_atual, cidades, funcoes) -> Dict[str, Any]:
 
             # Find default index for "Palestrante"
             default_funcao_index = next(
-                (i for i, f in enumerate(funcoes) if f["nome_funcao"] == "Palestrante"),
+                (i for i, f in enumerate(funcoes) if f.nome_funcao == "Palestrante"),
                 0,  # Default to first option if "Palestrante" not found
             )
 
             funcao_selecionada = st.selectbox(
                 "Função *",
-                options=[(f["nome_funcao"], f["id"]) for f in funcoes],
+                options=[(f.nome_funcao, f.id) for f in funcoes],
                 format_func=lambda x: x[0] if x else "Selecione...",
                 help="Sua função no evento",
                 index=default_funcao_index,
@@ -265,7 +210,7 @@ def formulario_inscricao(evento_atual, cidades, funcoes) -> Dict[str, Any]:
 
         datas_participacao = st.multiselect(
             "Datas de Participação *",
-            options=evento_atual["datas_evento"] if evento_atual else [],
+            options=evento_atual.datas_evento if evento_atual else [],
             format_func=lambda x: (
                 datetime.fromisoformat(x).strftime("%d/%m/%Y")
                 if isinstance(x, str)
@@ -323,7 +268,7 @@ def formulario_inscricao(evento_atual, cidades, funcoes) -> Dict[str, Any]:
                 titulo_apresentacao=(
                     limpar_texto(titulo_apresentacao) if titulo_apresentacao else None
                 ),
-                evento_id=evento_atual["id"] if evento_atual else 1,
+                evento_id=evento_atual.id if evento_atual else 1,
                 cidade_id=cidade_selecionada[1],
                 funcao_id=funcao_selecionada[1],
                 datas_participacao=(
@@ -373,7 +318,7 @@ def formulario_download_certificado(evento_atual, todos_eventos) -> bool:
 
         # Sort events by year descending (most recent first)
         eventos_ordenados = (
-            sorted(todos_eventos, key=lambda e: e["ano"], reverse=True)
+            sorted(todos_eventos, key=lambda e: e.ano, reverse=True)
             if todos_eventos
             else []
         )
@@ -386,7 +331,7 @@ def formulario_download_certificado(evento_atual, todos_eventos) -> bool:
                     (
                         i
                         for i, e in enumerate(eventos_ordenados)
-                        if e["id"] == evento_atual["id"]
+                        if e.id == evento_atual.id
                     ),
                     0,  # Fallback to most recent if current event not found
                 )
@@ -397,7 +342,7 @@ def formulario_download_certificado(evento_atual, todos_eventos) -> bool:
             "Evento *",
             options=(
                 [
-                    (f"Pint of Science {evento['ano']}", evento["id"])
+                    (f"Pint of Science {evento.ano}", evento.id)
                     for evento in eventos_ordenados
                 ]
                 if eventos_ordenados
@@ -442,8 +387,8 @@ def formulario_download_certificado(evento_atual, todos_eventos) -> bool:
 
             # Get the selected event's year
             ano_selecionado = next(
-                (e["ano"] for e in eventos_ordenados if e["id"] == evento_id[1]),
-                evento_atual["ano"] if evento_atual else datetime.now().year,
+                (e.ano for e in eventos_ordenados if e.id == evento_id[1]),
+                evento_atual.ano if evento_atual else datetime.now().year,
             )
 
             nome_arquivo = f"Certificado-PintOfScience-{ano_selecionado}-{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
@@ -536,6 +481,8 @@ def main():
     # Inicializar banco de dados
     try:
         init_database()
+        iniciar_agendador_backup()
+        processador_outbox.iniciar()
     except Exception as e:
         st.error(f"❌ Erro ao inicializar banco de dados: {str(e)}")
         st.error(
@@ -594,9 +541,10 @@ def main():
 
         # Mostrar informações do sistema
         try:
-            from app.db import check_database_health
+            from app.db import get_health_status
 
-            health = check_database_health()
+            # Status leve e em cache (não conta registros a cada rerun)
+            health = get_health_status()
 
             if health["status"] == "healthy":
                 st.success("✅ Sistema Online")
@@ -680,4 +628,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with medir_consultas("Home"):
+        main()